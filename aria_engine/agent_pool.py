@@ -24,6 +24,7 @@ from sqlalchemy.orm import Session as _OrmSession
 
 from aria_engine.config import EngineConfig
 from aria_engine.exceptions import EngineError
+from aria_engine.routing_table import notify_agent_changed
 from db.models import EngineAgentState
 
 logger = logging.getLogger("aria.engine.agent_pool")
@@ -120,6 +121,7 @@ class EngineAgent:
                 max_tokens=kwargs.get("max_tokens", self.max_tokens),
                 tools=kwargs.get("tools"),
                 enable_thinking=kwargs.get("enable_thinking", False),
+                cache=kwargs.get("cache"),
             )
 
             # Add assistant response to context
@@ -278,6 +280,7 @@ class AgentPool:
             self._agents[row.agent_id] = agent
 
         logger.info("Loaded %d agents from database", len(self._agents))
+        notify_agent_changed()
         return len(self._agents)
 
     async def spawn_agent(
@@ -383,6 +386,7 @@ class AgentPool:
         agent._llm_gateway = self._llm_gateway
         self._agents[agent_id] = agent
 
+        notify_agent_changed()
         logger.info("Spawned agent: %s (model=%s)", agent_id, agent.model)
         return agent
 
@@ -426,6 +430,7 @@ class AgentPool:
 
         # Remove from pool
         del self._agents[agent_id]
+        notify_agent_changed()
 
         logger.info("Terminated agent: %s", agent_id)
         return True
@@ -582,6 +587,7 @@ class AgentPool:
                 .where(EngineAgentState.agent_id == agent_id)
                 .values(**update_vals)
             )
+        notify_agent_changed()
         return agent
 
     def get_status(self) -> dict[str, Any]:
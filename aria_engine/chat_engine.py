@@ -16,7 +16,6 @@ Uses:
 - ToolRegistry for function calling (S1-04)
 - ThinkingHandler for reasoning tokens (S1-03)
 """
-import asyncio
 import json
 import logging
 import time
@@ -26,13 +25,16 @@ from datetime import datetime, timezone
 from typing import Any
 
 from sqlalchemy import select, update, func, text
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from aria_engine.config import EngineConfig
+from aria_engine.context_manager import ContextManager
 from aria_engine.exceptions import SessionError, LLMError
 from aria_engine.llm_gateway import LLMGateway, LLMResponse
-from aria_engine.telemetry import log_model_usage, log_skill_invocation, _parse_skill_from_tool
+from aria_engine.telemetry import (
+    log_model_usage, log_skill_invocation, _parse_skill_from_tool, get_telemetry_writer,
+)
 from aria_engine.tool_registry import ToolRegistry, ToolResult
+from aria_engine.transcript_cache import get_transcript_cache
 from aria_engine.thinking import extract_thinking_from_response, strip_thinking_from_content
 
 logger = logging.getLogger("aria.engine.chat")
@@ -117,6 +119,9 @@ class ChatEngine:
         self.gateway = gateway
         self.tools = tool_registry
         self._db_factory = db_session_factory
+        self._context = ContextManager(config)
+        self._transcripts = get_transcript_cache(config)
+        get_telemetry_writer(db_session_factory, config)  # sized from config
         # Optional multi-agent orchestration (set by main.py after init)
         self._roundtable: Any | None = None
         self._swarm: Any | None = None
@@ -269,6 +274,7 @@ class ChatEngine:
         enable_thinking: bool = False,
         enable_tools: bool = True,
         context_messages: list[dict[str, str]] | None = None,
+        cache: bool | None = None,
     ) -> ChatResponse:
         """
         Send a user message and get an assistant response.
@@ -277,7 +283,8 @@ class ChatEngine:
         1. Persist user message to DB
         2. Build message list (system prompt + context window)
         3. Call LLMGateway.complete() with tools
-        4. If tool_calls returned — execute each, append results, re-call LLM
+        4. If tool_calls returned — execute them (bounded concurrency),
+           append results in tool_call order, re-call LLM
         5. Persist assistant message (and tool messages) to DB
         6. Update session counters (message_count, total_tokens, total_cost)
         7. Auto-generate title from first user message if none set
@@ -290,6 +297,8 @@ class ChatEngine:
             enable_tools: Whether to provide tool definitions to the LLM.
             context_messages: Pre-built context (from ContextManager). If None,
                               loads last N messages from DB.
+            cache: LLM response cache for this turn (see LLMGateway.complete);
+                   None follows config.llm_response_cache_enabled.
 
         Returns:
             ChatResponse with assistant content, thinking, tool_calls, usage.
@@ -345,6 +354,9 @@ class ChatEngine:
             )
             db.add(user_msg)
             await db.flush()
+            # Rows written this turn — published to the transcript cache
+            # only after the commit succeeds.
+            new_rows: list[Any] = [user_msg]
 
             # ── 2b. Slash command: /roundtable or /swarm ──────────────────
             slash_result = await self._handle_slash_command(
@@ -357,7 +369,9 @@ class ChatEngine:
             if context_messages is not None:
                 messages = list(context_messages)
             else:
-                messages = await self._build_context(db, session, content)
+                messages = await self._context.build_session_context(
+                    db, session, pending=[user_msg],
+                )
 
             # ── 4. LLM completion with tool-call loop ─────────────────────
             # Filter tools by agent's allowed skills (capability matching)
@@ -407,28 +421,31 @@ class ChatEngine:
                         max_tokens=session.max_tokens,
                         tools=tools_for_llm,
                         enable_thinking=enable_thinking,
+                        cache=cache,
                     )
                 except LLMError as e:
                     logger.error("LLM call failed in session %s: %s", sid, e)
-                    asyncio.ensure_future(log_model_usage(
+                    log_model_usage(
                         self._db_factory,
                         model=session.model or "unknown",
                         latency_ms=int((time.monotonic() - overall_start) * 1000),
                         success=False,
                         error_message=str(e)[:200],
-                    ))
+                    )
                     raise SessionError(f"LLM call failed: {e}") from e
 
-                total_input_tokens += llm_response.input_tokens
-                total_output_tokens += llm_response.output_tokens
-                total_cost += llm_response.cost_usd
+                # Cache hits carry the *saved* usage — don't bill the session
+                if not llm_response.cached:
+                    total_input_tokens += llm_response.input_tokens
+                    total_output_tokens += llm_response.output_tokens
+                    total_cost += llm_response.cost_usd
                 final_content = llm_response.content
                 final_thinking = llm_response.thinking or final_thinking
                 final_finish_reason = llm_response.finish_reason
 
                 # Telemetry → aria_data.model_usage
                 iter_latency = int((time.monotonic() - overall_start) * 1000)
-                asyncio.ensure_future(log_model_usage(
+                log_model_usage(
                     self._db_factory,
                     model=session.model or "unknown",
                     input_tokens=llm_response.input_tokens,
@@ -436,7 +453,8 @@ class ChatEngine:
                     cost_usd=llm_response.cost_usd,
                     latency_ms=iter_latency,
                     success=True,
-                ))
+                    cache_hit=llm_response.cached,
+                )
 
                 # No tool calls — done
                 if not llm_response.tool_calls:
@@ -475,8 +493,9 @@ class ChatEngine:
                 )
                 db.add(intermediate_msg)
                 await db.flush()
+                new_rows.append(intermediate_msg)
 
-                for tc in llm_response.tool_calls:
+                def _guard_tool(tc: dict[str, Any]) -> ToolResult | None:
                     fn_name = tc["function"]["name"]
 
                     # ── Per-tool failure cap ──────────────────────────────
@@ -485,7 +504,7 @@ class ChatEngine:
                             "Tool %s failed %d times in session %s — blocking further calls",
                             fn_name, tool_failure_counts[fn_name], sid,
                         )
-                        tool_result = ToolResult(
+                        return ToolResult(
                             tool_call_id=tc["id"],
                             name=fn_name,
                             content=json.dumps({
@@ -497,14 +516,14 @@ class ChatEngine:
                             success=False,
                         )
                     # Capability enforcement: reject tools outside agent's skills
-                    elif allowed_skills:
+                    if allowed_skills:
                         skill_part = fn_name.split("__")[0] if "__" in fn_name else ""
                         if skill_part and skill_part not in allowed_skills:
                             logger.warning(
                                 "Agent %s blocked from tool %s (skill %s not in %s)",
                                 session.agent_id, fn_name, skill_part, allowed_skills,
                             )
-                            tool_result = ToolResult(
+                            return ToolResult(
                                 tool_call_id=tc["id"],
                                 name=fn_name,
                                 content=json.dumps({
@@ -513,18 +532,27 @@ class ChatEngine:
                                 }),
                                 success=False,
                             )
-                        else:
-                            tool_result = await self.tools.execute(
-                                tool_call_id=tc["id"],
-                                function_name=fn_name,
-                                arguments=tc["function"]["arguments"],
-                            )
+                    return None
+
+                async def _track_failures(tc: dict[str, Any], tool_result: ToolResult) -> None:
+                    # Track per-tool failures for circuit-break
+                    fn_name = tc["function"]["name"]
+                    if tool_result.success:
+                        tool_failure_counts.pop(fn_name, None)
                     else:
-                        tool_result = await self.tools.execute(
-                            tool_call_id=tc["id"],
-                            function_name=fn_name,
-                            arguments=tc["function"]["arguments"],
-                        )
+                        tool_failure_counts[fn_name] = tool_failure_counts.get(fn_name, 0) + 1
+
+                # Independent tool calls run concurrently; results come back
+                # in tool_call order so the conversation stays well-formed.
+                tool_results = await self.tools.execute_batch(
+                    llm_response.tool_calls,
+                    max_concurrency=self.config.max_concurrent_tools,
+                    guard=_guard_tool,
+                    on_result=_track_failures,
+                )
+
+                for tc, tool_result in zip(llm_response.tool_calls, tool_results):
+                    fn_name = tc["function"]["name"]
                     accumulated_tool_results.append({
                         "tool_call_id": tool_result.tool_call_id,
                         "name": tool_result.name,
@@ -533,21 +561,15 @@ class ChatEngine:
                         "duration_ms": tool_result.duration_ms,
                     })
 
-                    # Track per-tool failures for circuit-break
-                    if tool_result.success:
-                        tool_failure_counts.pop(fn_name, None)
-                    else:
-                        tool_failure_counts[fn_name] = tool_failure_counts.get(fn_name, 0) + 1
-
                     # Telemetry → aria_data.skill_invocations
-                    asyncio.ensure_future(log_skill_invocation(
+                    log_skill_invocation(
                         self._db_factory,
                         skill_name=_parse_skill_from_tool(fn_name),
                         tool_name=fn_name,
                         duration_ms=tool_result.duration_ms,
                         success=tool_result.success,
                         model_used=session.model,
-                    ))
+                    )
 
                     # Append tool result to conversation for next LLM turn
                     messages.append({
@@ -567,6 +589,7 @@ class ChatEngine:
                         created_at=datetime.now(timezone.utc),
                     )
                     db.add(tool_msg)
+                    new_rows.append(tool_msg)
 
             # ── 4b. If loop exhausted (hit MAX_TOOL_ITERATIONS) or final
             #        content is empty, force one plain summary call ─────────
@@ -583,10 +606,22 @@ class ChatEngine:
                         max_tokens=session.max_tokens,
                         tools=None,  # No tools — force a plain text answer
                         enable_thinking=False,
+                        cache=cache,
+                    )
+                    if not summary_response.cached:
+                        total_input_tokens += summary_response.input_tokens
+                        total_output_tokens += summary_response.output_tokens
+                        total_cost += summary_response.cost_usd
+                    log_model_usage(
+                        self._db_factory,
+                        model=session.model or "unknown",
+                        input_tokens=summary_response.input_tokens,
+                        output_tokens=summary_response.output_tokens,
+                        cost_usd=summary_response.cost_usd,
+                        latency_ms=int((time.monotonic() - overall_start) * 1000),
+                        success=True,
+                        cache_hit=summary_response.cached,
                     )
-                    total_input_tokens += summary_response.input_tokens
-                    total_output_tokens += summary_response.output_tokens
-                    total_cost += summary_response.cost_usd
                     if summary_response.content:
                         final_content = summary_response.content
                         final_finish_reason = summary_response.finish_reason
@@ -614,6 +649,7 @@ class ChatEngine:
                 created_at=datetime.now(timezone.utc),
             )
             db.add(assistant_msg)
+            new_rows.append(assistant_msg)
 
             # ── 6. Update session counters ────────────────────────────────
             new_msg_count = 2  # user + assistant
@@ -630,6 +666,7 @@ class ChatEngine:
                 session.title = self._generate_title(content)
 
             await db.commit()
+            await self._transcripts.extend(sid, new_rows)
 
             logger.info(
                 "Message in session %s: in=%d out=%d cost=%.6f latency=%dms tools=%d",
@@ -655,141 +692,6 @@ class ChatEngine:
 
     # ── Private helpers ───────────────────────────────────────────────────
 
-    async def _build_context(
-        self,
-        db: AsyncSession,
-        session,
-        current_content: str,
-    ) -> list[dict[str, str]]:
-        """
-        Build conversation context from DB messages.
-
-        Always includes:
-        - System prompt (if set on session)
-        - Last N messages up to context_window limit
-        - Current user message
-        """
-        from db.models import EngineChatMessage
-
-        messages: list[dict[str, str]] = []
-
-        # System prompt
-        if session.system_prompt:
-            messages.append({"role": "system", "content": session.system_prompt})
-
-        # Load recent messages from DB.
-        # Fetch MORE than context_window so we can guarantee a minimum number
-        # of user/assistant turns survive even when tool messages dominate.
-        window = session.context_window or 50
-        MIN_CONVERSATION_TURNS = 10  # always keep at least this many user+assistant msgs
-        fetch_limit = max(window * 3, 200)  # over-fetch so we have room to pick
-        result = await db.execute(
-            select(EngineChatMessage)
-            .where(EngineChatMessage.session_id == session.id)
-            .order_by(EngineChatMessage.created_at.desc())
-            .limit(fetch_limit)
-        )
-        all_db_messages = list(reversed(result.scalars().all()))
-
-        # Split into conversation (user/assistant) and tool/system messages
-        conversation_msgs = [m for m in all_db_messages if m.role in ("user", "assistant")]
-        tool_msgs = [m for m in all_db_messages if m.role not in ("user", "assistant")]
-
-        # Always keep at least MIN_CONVERSATION_TURNS of conversation history
-        # plus the most recent tool messages that fit within the window
-        keep_conv = conversation_msgs[-max(MIN_CONVERSATION_TURNS, window // 2):]
-        keep_conv_ids = {id(m) for m in keep_conv}
-
-        # Budget remaining window slots for tool messages (most recent first)
-        tool_budget = max(window - len(keep_conv), 10)
-        keep_tools = tool_msgs[-tool_budget:]
-        keep_tool_ids = {id(m) for m in keep_tools}
-
-        # Merge back in original chronological order
-        db_messages = [
-            m for m in all_db_messages
-            if id(m) in keep_conv_ids or id(m) in keep_tool_ids
-        ]
-
-        if len(all_db_messages) > window:
-            logger.info(
-                "Context protection: %d total msgs → kept %d conversation + %d tool "
-                "(window=%d, fetched=%d)",
-                len(all_db_messages), len(keep_conv), len(keep_tools),
-                window, fetch_limit,
-            )
-
-        for msg in db_messages:
-            entry: dict[str, Any] = {"role": msg.role, "content": msg.content or ""}
-            if msg.tool_calls:
-                entry["tool_calls"] = msg.tool_calls
-            # Include thinking as reasoning_content for models that require it
-            # (e.g. Kimi/Moonshot rejects assistant tool-call msgs without it)
-            if msg.role == "assistant" and hasattr(msg, "thinking") and msg.thinking:
-                entry["reasoning_content"] = msg.thinking
-            # Tool messages MUST have a valid tool_call_id or the provider rejects them
-            if msg.role == "tool":
-                tc_id = (msg.tool_results or {}).get("tool_call_id", "") if msg.tool_results else ""
-                if tc_id:
-                    entry["tool_call_id"] = tc_id
-                else:
-                    continue  # Skip orphan / corrupt tool messages
-            messages.append(entry)
-
-        # ── Post-process: fix tool-call ordering anomalies ────────────────
-        # DB may store tool results BEFORE the assistant message that triggered
-        # them (race in persistence timing).  We re-order so each assistant
-        # with tool_calls is immediately followed by its tool results, and any
-        # orphaned tool/assistant messages are dropped.
-
-        # 1. Build a set of all tool_call_ids declared by assistant messages
-        declared_tc_ids: set[str] = set()
-        for m in messages:
-            if m.get("tool_calls"):
-                for tc in m["tool_calls"]:
-                    declared_tc_ids.add(tc.get("id", ""))
-
-        # 2. Separate tool messages into a map keyed by tool_call_id
-        tool_msgs_by_id: dict[str, dict] = {}
-        non_tool_msgs: list[dict[str, Any]] = []
-        for m in messages:
-            if m.get("role") == "tool" and m.get("tool_call_id"):
-                tc_id = m["tool_call_id"]
-                if tc_id in declared_tc_ids:
-                    tool_msgs_by_id[tc_id] = m
-                # else: orphan tool message — drop silently
-            else:
-                non_tool_msgs.append(m)
-
-        # 3. Rebuild: after each assistant with tool_calls, inject its tool results
-        cleaned: list[dict[str, Any]] = []
-        for m in non_tool_msgs:
-            if m.get("tool_calls"):
-                # Check which tool results exist for this assistant
-                owned_ids = [tc.get("id", "") for tc in m["tool_calls"]]
-                existing = [tool_msgs_by_id[tid] for tid in owned_ids if tid in tool_msgs_by_id]
-                if existing:
-                    cleaned.append(m)
-                    cleaned.extend(existing)
-                else:
-                    # No tool results found — strip tool_calls, drop if empty
-                    stripped = {k: v for k, v in m.items() if k != "tool_calls"}
-                    if stripped.get("role") == "assistant" and not stripped.get("content"):
-                        continue
-                    cleaned.append(stripped)
-            else:
-                # Drop empty assistant messages (no content, no tool_calls)
-                # — these are often artifacts from failed LLM calls.
-                if m.get("role") == "assistant" and not m.get("content") and not m.get("tool_calls"):
-                    continue
-                cleaned.append(m)
-        messages = cleaned
-
-        # NOTE: user message is already persisted (flush) before _build_context
-        # is called, so the DB query above includes it — do NOT append again.
-
-        return messages
-
     # ── Slash commands & auto-escalation ──────────────────────────────
 
     async def _handle_slash_command(
@@ -37,8 +37,46 @@ if HAS_PYDANTIC:
         max_concurrent_agents: int = 5
         agent_context_limit: int = 50
 
+        # LLM failover (routing.fallbacks) and hedged requests
+        llm_fallback_enabled: bool = True
+        llm_hedge_enabled: bool = False
+        llm_hedge_min_delay_seconds: float = 2.0
+
+        # LLM response cache (opt-in; per-call `cache=` overrides)
+        llm_response_cache_enabled: bool = False
+        llm_response_cache_max_entries: int = 1024
+        llm_response_cache_ttl_seconds: int = 3600
+        llm_response_cache_path: str = ""  # SQLite file for the disk tier ("" = memory only)
+        llm_response_cache_similarity: float = 0.0  # semantic match threshold (0 = exact only)
+        llm_embedding_model: str = "nomic-embed-text"
+
+        # Tool calling (max tool calls executed concurrently per LLM turn)
+        max_concurrent_tools: int = 4
+
+        # Transcript cache (in-process recent messages per session)
+        transcript_cache_max_sessions: int = 256
+        transcript_cache_ttl_seconds: int = 900
+
+        # Token-count cache (message token counts by tokenizer family + content hash)
+        token_cache_max_entries: int = 20000
+
+        # Telemetry writer (batched model_usage / skill_invocations inserts)
+        telemetry_queue_max: int = 10000
+        telemetry_batch_size: int = 200
+        telemetry_flush_interval_ms: int = 500
+
         # Scheduler
         scheduler_enabled: bool = True
+        # Cron prompt dispatch: "auto" (in-process ChatEngine when one is
+        # attached, else aria-api over HTTP), "direct" or "http"
+        scheduler_dispatch_mode: str = "auto"
+        # Job queue: per-agent slot cap (0 = none), token / USD budgets per
+        # window (0 = unlimited; critical jobs ignore them), start jitter
+        scheduler_max_concurrent_per_agent: int = 3
+        scheduler_token_budget: int = 0
+        scheduler_cost_budget_usd: float = 0.0
+        scheduler_budget_window_seconds: int = 3600
+        scheduler_start_jitter_seconds: float = 30.0
         heartbeat_interval_seconds: int = 3600
 
         # Paths
@@ -94,6 +132,13 @@ if HAS_PYDANTIC:
                 raise ValueError(f"max_concurrent_agents must be 1-50, got {v}")
             return v
 
+        @field_validator("max_concurrent_tools")
+        @classmethod
+        def validate_max_tools(cls, v: int) -> int:
+            if v < 1 or v > 32:
+                raise ValueError(f"max_concurrent_tools must be 1-32, got {v}")
+            return v
+
         @classmethod
         def from_env(cls) -> "EngineConfig":
             """Create config from environment variables."""
@@ -127,8 +172,46 @@ else:
         max_concurrent_agents: int = 5
         agent_context_limit: int = 50
 
+        # LLM failover (routing.fallbacks) and hedged requests
+        llm_fallback_enabled: bool = True
+        llm_hedge_enabled: bool = False
+        llm_hedge_min_delay_seconds: float = 2.0
+
+        # LLM response cache (opt-in; per-call `cache=` overrides)
+        llm_response_cache_enabled: bool = False
+        llm_response_cache_max_entries: int = 1024
+        llm_response_cache_ttl_seconds: int = 3600
+        llm_response_cache_path: str = ""  # SQLite file for the disk tier ("" = memory only)
+        llm_response_cache_similarity: float = 0.0  # semantic match threshold (0 = exact only)
+        llm_embedding_model: str = "nomic-embed-text"
+
+        # Tool calling (max tool calls executed concurrently per LLM turn)
+        max_concurrent_tools: int = 4
+
+        # Transcript cache (in-process recent messages per session)
+        transcript_cache_max_sessions: int = 256
+        transcript_cache_ttl_seconds: int = 900
+
+        # Token-count cache (message token counts by tokenizer family + content hash)
+        token_cache_max_entries: int = 20000
+
+        # Telemetry writer (batched model_usage / skill_invocations inserts)
+        telemetry_queue_max: int = 10000
+        telemetry_batch_size: int = 200
+        telemetry_flush_interval_ms: int = 500
+
         # Scheduler
         scheduler_enabled: bool = True
+        # Cron prompt dispatch: "auto" (in-process ChatEngine when one is
+        # attached, else aria-api over HTTP), "direct" or "http"
+        scheduler_dispatch_mode: str = "auto"
+        # Job queue: per-agent slot cap (0 = none), token / USD budgets per
+        # window (0 = unlimited; critical jobs ignore them), start jitter
+        scheduler_max_concurrent_per_agent: int = 3
+        scheduler_token_budget: int = 0
+        scheduler_cost_budget_usd: float = 0.0
+        scheduler_budget_window_seconds: int = 3600
+        scheduler_start_jitter_seconds: float = 30.0
         heartbeat_interval_seconds: int = 3600
 
         # Paths
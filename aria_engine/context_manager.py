@@ -5,11 +5,22 @@ Builds an optimal message list within a token budget by:
 1. Always including: system prompt, first user message (establishes identity)
 2. Always including: last N messages (recent context)
 3. Scoring middle messages by importance and keeping highest-scored within budget
-4. Token counting via litellm.token_counter (model-aware)
+4. Token counting via litellm.token_counter (model-aware), memoized in a
+   bounded LRU keyed by (tokenizer family, content hash) and batch-encoded
+   on misses (one tokenizer call per build)
+
+Also hosts the session context engine shared by ChatEngine and
+StreamManager (build_session_context): the transcript comes from the
+in-process transcript cache with per-message token counts precomputed,
+so the token-budgeted window is a prefix-sum lookup per turn.
 
 The goal: maximize context quality within the token budget.
 """
+import functools
+import hashlib
+import json
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -33,6 +44,22 @@ MIN_RECENT_MESSAGES = 4
 # Fallback tokens-per-message estimate when counting fails
 FALLBACK_TOKENS_PER_MESSAGE = 150
 
+# Session context: always keep at least this many user+assistant messages
+MIN_CONVERSATION_TURNS = 10
+
+# Session context: smallest history token budget (a large system prompt or
+# max_tokens near the context window must not cut the whole transcript)
+MIN_HISTORY_TOKEN_BUDGET = MIN_CONVERSATION_TURNS * FALLBACK_TOKENS_PER_MESSAGE
+
+# Session context: token budget when the model's contextWindow is unknown
+DEFAULT_CONTEXT_WINDOW_TOKENS = 32768
+
+# Tokenizer used for transcript token counts (model-agnostic estimate)
+TRANSCRIPT_TOKENIZER_MODEL = "gpt-4"
+
+# Token-count cache bound — override via EngineConfig.token_cache_max_entries
+DEFAULT_TOKEN_CACHE_ENTRIES = 20000
+
 
 @dataclass
 class ScoredMessage:
@@ -76,6 +103,7 @@ class ContextManager:
 
     def __init__(self, config: EngineConfig):
         self.config = config
+        self._token_cache = get_token_cache(config)
 
     def build_context(
         self,
@@ -105,10 +133,10 @@ class ContextManager:
             return [m for m in all_messages if m.get("role") == "system"][:1]
 
         # ── Score and tokenize all messages ───────────────────────────────
+        token_counts = self.count_tokens_batch(all_messages, model)
         scored: list[ScoredMessage] = []
-        for i, msg in enumerate(all_messages):
+        for i, (msg, tokens) in enumerate(zip(all_messages, token_counts)):
             role = msg.get("role", "user")
-            tokens = self._count_tokens(msg, model)
             importance = self._compute_importance(msg, i, len(all_messages))
             is_pinned = self._is_pinned(msg, i, len(all_messages))
 
@@ -226,23 +254,157 @@ class ContextManager:
             reserve_tokens=reserve_tokens,
         )
 
+    async def build_session_context(
+        self,
+        db,
+        session,
+        pending: list[Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Build the LLM message list for a chat session turn.
+
+        Shared by ChatEngine.send_message and StreamManager._handle_message.
+
+        Selection:
+        1. System prompt (if set on session)
+        2. Newest transcript messages that fit the model's token budget
+           (contextWindow - max_tokens - system prompt, at least
+           MIN_HISTORY_TOKEN_BUDGET), via prefix sums
+        3. Of those: at least MIN_CONVERSATION_TURNS user/assistant messages
+           plus the most recent tool messages within context_window slots
+        4. Tool-call ordering repair (results follow their assistant message,
+           orphans dropped)
+
+        Args:
+            db: AsyncSession of the current turn; on a cache miss the
+                transcript is read through a separate session on the same
+                bind, so only committed rows are cached.
+            session: EngineChatSession ORM row.
+            pending: Rows flushed in the current, uncommitted transaction
+                     (e.g. the new user message).
+
+        Returns:
+            List of message dicts ready for LLMGateway.
+        """
+        from aria_engine.transcript_cache import CachedMessage, get_transcript_cache
+        from db.models import EngineChatMessage
+        from sqlalchemy import select
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        transcripts = get_transcript_cache(self.config)
+        messages: list[dict[str, Any]] = []
+
+        if session.system_prompt:
+            messages.append({"role": "system", "content": session.system_prompt})
+
+        # Fetch MORE than context_window so we can guarantee a minimum number
+        # of user/assistant turns survive even when tool messages dominate.
+        window = session.context_window or 50
+        fetch_limit = max(window * 3, 200)  # over-fetch so we have room to pick
+
+        pending_rows = [CachedMessage.from_row(m) for m in pending or ()]
+        transcripts.count_tokens(pending_rows)
+        token_budget = (
+            self._context_window_tokens(session.model)
+            - (session.max_tokens or self.config.default_max_tokens)
+            - sum(self.count_tokens_batch(messages, TRANSCRIPT_TOKENIZER_MODEL))
+            - sum(r.tokens or 0 for r in pending_rows)
+        )
+        if token_budget < MIN_HISTORY_TOKEN_BUDGET:
+            logger.warning(
+                "Session %s: history token budget %d below floor, using %d",
+                session.id, token_budget, MIN_HISTORY_TOKEN_BUDGET,
+            )
+            token_budget = MIN_HISTORY_TOKEN_BUDGET
+
+        async def _load(limit: int) -> list[Any]:
+            # Separate read session: the turn's own session holds flushed but
+            # uncommitted rows (the new user message) that a rollback would
+            # remove from the DB but not from the cache.
+            async with AsyncSession(db.bind, expire_on_commit=False) as read_db:
+                result = await read_db.execute(
+                    select(EngineChatMessage)
+                    .where(EngineChatMessage.session_id == session.id)
+                    .order_by(EngineChatMessage.created_at.desc())
+                    .limit(limit)
+                )
+                return list(reversed(result.scalars().all()))
+
+        all_db_messages = await transcripts.get_or_load(
+            session.id, fetch_limit, _load, token_budget=token_budget,
+        )
+        # The turn's uncommitted rows are never in the result: _load reads
+        # through its own session and the cache is only extended after
+        # commit. Append them here (the id check skips any already cached).
+        if pending_rows:
+            cached_ids = {m.id for m in all_db_messages}
+            extra = [r for r in pending_rows if r.id not in cached_ids]
+            if extra:
+                all_db_messages = (list(all_db_messages) + extra)[-fetch_limit:]
+
+        # Split into conversation (user/assistant) and tool/system messages
+        conversation_msgs = [m for m in all_db_messages if m.role in ("user", "assistant")]
+        tool_msgs = [m for m in all_db_messages if m.role not in ("user", "assistant")]
+
+        # Always keep at least MIN_CONVERSATION_TURNS of conversation history
+        # plus the most recent tool messages that fit within the window
+        keep_conv = conversation_msgs[-max(MIN_CONVERSATION_TURNS, window // 2):]
+        keep_conv_ids = {id(m) for m in keep_conv}
+
+        # Budget remaining window slots for tool messages (most recent first)
+        tool_budget = max(window - len(keep_conv), 10)
+        keep_tools = tool_msgs[-tool_budget:]
+        keep_tool_ids = {id(m) for m in keep_tools}
+
+        # Merge back in original chronological order
+        db_messages = [
+            m for m in all_db_messages
+            if id(m) in keep_conv_ids or id(m) in keep_tool_ids
+        ]
+
+        if len(all_db_messages) > window:
+            logger.info(
+                "Context protection: %d total msgs → kept %d conversation + %d tool "
+                "(window=%d, fetched=%d, token_budget=%d)",
+                len(all_db_messages), len(keep_conv), len(keep_tools),
+                window, fetch_limit, token_budget,
+            )
+
+        for msg in db_messages:
+            entry = row_to_message(msg)
+            if entry is not None:
+                messages.append(entry)
+
+        # NOTE: the current user message is already persisted (flush) and
+        # merged via `pending` — callers must NOT append it again.
+        return repair_tool_call_order(messages)
+
+    def _context_window_tokens(self, model: str | None) -> int:
+        """Context window (tokens) for a model from models.yaml."""
+        try:
+            from aria_models.loader import get_model_entry
+            entry = get_model_entry(model or self.config.default_model) or {}
+            return int(entry.get("contextWindow") or DEFAULT_CONTEXT_WINDOW_TOKENS)
+        except Exception:
+            return DEFAULT_CONTEXT_WINDOW_TOKENS
+
     def _count_tokens(self, message: dict[str, Any], model: str) -> int:
         """
         Count tokens in a message using litellm's token counter.
 
         Falls back to a rough estimate if litellm fails.
         """
-        try:
-            from litellm import token_counter
-            # litellm.token_counter expects a list of messages
-            count = token_counter(model=model, messages=[message])
-            return count
-        except Exception:
-            # Fallback: rough estimate (4 chars ≈ 1 token)
-            content = message.get("content", "")
-            if isinstance(content, str):
-                return max(len(content) // 4, 1)
-            return FALLBACK_TOKENS_PER_MESSAGE
+        return self._token_cache.count([message], model)[0]
+
+    def count_tokens_batch(
+        self, messages: list[dict[str, Any]], model: str = "gpt-4"
+    ) -> list[int]:
+        """
+        Count tokens for many messages at once (same order as input).
+
+        Cached counts are reused; the rest are encoded in one tokenizer call.
+        """
+        return self._token_cache.count(messages, model)
 
     def _compute_importance(
         self, message: dict[str, Any], index: int, total: int
@@ -307,7 +469,7 @@ class ContextManager:
 
         Useful for checking whether a context fits before sending to LLM.
         """
-        return sum(self._count_tokens(m, model) for m in messages)
+        return sum(self.count_tokens_batch(messages, model))
 
     def get_window_stats(
         self, all_messages: list[dict[str, Any]], model: str = "gpt-4"
@@ -322,9 +484,8 @@ class ContextManager:
         role_tokens: dict[str, int] = {}
         total_tokens = 0
 
-        for msg in all_messages:
+        for msg, tokens in zip(all_messages, self.count_tokens_batch(all_messages, model)):
             role = msg.get("role", "unknown")
-            tokens = self._count_tokens(msg, model)
             total_tokens += tokens
             role_counts[role] = role_counts.get(role, 0) + 1
             role_tokens[role] = role_tokens.get(role, 0) + tokens
@@ -335,3 +496,277 @@ class ContextManager:
             "role_counts": role_counts,
             "role_tokens": role_tokens,
         }
+
+
+# ── Session transcript helpers ────────────────────────────────────────────────
+
+def row_to_message(row: Any) -> dict[str, Any] | None:
+    """
+    Convert a chat_messages row (ORM or cached snapshot) to an LLM message.
+
+    Returns None for tool messages without a tool_call_id — providers reject
+    them, so they are skipped.
+    """
+    entry: dict[str, Any] = {"role": row.role, "content": row.content or ""}
+    if row.tool_calls:
+        entry["tool_calls"] = row.tool_calls
+    # Include thinking as reasoning_content for models that require it
+    # (e.g. Kimi/Moonshot rejects assistant tool-call msgs without it)
+    if row.role == "assistant" and getattr(row, "thinking", None):
+        entry["reasoning_content"] = row.thinking
+    # Tool messages MUST have a valid tool_call_id or the provider rejects them
+    if row.role == "tool":
+        tc_id = (row.tool_results or {}).get("tool_call_id", "") if row.tool_results else ""
+        if not tc_id:
+            return None  # Skip orphan / corrupt tool messages
+        entry["tool_call_id"] = tc_id
+    return entry
+
+
+def repair_tool_call_order(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Fix tool-call ordering anomalies in a message list.
+
+    The DB may store tool results BEFORE the assistant message that triggered
+    them (race in persistence timing). Each assistant with tool_calls is made
+    to be immediately followed by its tool results; orphaned tool messages,
+    tool_calls without results and empty assistant messages are dropped.
+    """
+    # 1. Build a set of all tool_call_ids declared by assistant messages
+    declared_tc_ids: set[str] = set()
+    for m in messages:
+        if m.get("tool_calls"):
+            for tc in m["tool_calls"]:
+                declared_tc_ids.add(tc.get("id", ""))
+
+    # 2. Separate tool messages into a map keyed by tool_call_id
+    tool_msgs_by_id: dict[str, dict] = {}
+    non_tool_msgs: list[dict[str, Any]] = []
+    for m in messages:
+        if m.get("role") == "tool" and m.get("tool_call_id"):
+            tc_id = m["tool_call_id"]
+            if tc_id in declared_tc_ids:
+                tool_msgs_by_id[tc_id] = m
+            # else: orphan tool message — drop silently
+        else:
+            non_tool_msgs.append(m)
+
+    # 3. Rebuild: after each assistant with tool_calls, inject its tool results
+    cleaned: list[dict[str, Any]] = []
+    for m in non_tool_msgs:
+        if m.get("tool_calls"):
+            # Check which tool results exist for this assistant
+            owned_ids = [tc.get("id", "") for tc in m["tool_calls"]]
+            existing = [tool_msgs_by_id[tid] for tid in owned_ids if tid in tool_msgs_by_id]
+            if existing:
+                cleaned.append(m)
+                cleaned.extend(existing)
+            else:
+                # No tool results found — strip tool_calls, drop if empty
+                stripped = {k: v for k, v in m.items() if k != "tool_calls"}
+                if stripped.get("role") == "assistant" and not stripped.get("content"):
+                    continue
+                cleaned.append(stripped)
+        else:
+            # Drop empty assistant messages (no content, no tool_calls)
+            # — these are often artifacts from failed LLM calls.
+            if m.get("role") == "assistant" and not m.get("content") and not m.get("tool_calls"):
+                continue
+            cleaned.append(m)
+    return cleaned
+
+
+def count_cached_message_tokens(rows: list[Any]) -> list[int]:
+    """
+    Token counts for transcript rows, as sent to the LLM.
+
+    Used by the transcript cache to precompute per-message counts once when
+    a row enters the cache. Counts use TRANSCRIPT_TOKENIZER_MODEL — a
+    model-agnostic estimate that is good enough for window budgeting.
+    """
+    entries = [
+        row_to_message(row) or {"role": row.role, "content": row.content or ""}
+        for row in rows
+    ]
+    return get_token_cache().count(entries, TRANSCRIPT_TOKENIZER_MODEL)
+
+
+def _count_message_tokens(message: dict[str, Any], model: str) -> int:
+    """Count tokens in one message; rough estimate if litellm fails."""
+    try:
+        from litellm import token_counter
+        # litellm.token_counter expects a list of messages
+        return token_counter(model=model, messages=[message])
+    except Exception:
+        # Fallback: rough estimate (4 chars ≈ 1 token)
+        content = message.get("content", "")
+        if isinstance(content, str):
+            return max(len(content) // 4, 1)
+        return FALLBACK_TOKENS_PER_MESSAGE
+
+
+# ── Token-count cache ─────────────────────────────────────────────────────────
+
+class TokenCountCache:
+    """
+    Bounded LRU of per-message token counts.
+
+    Keyed by (tokenizer family, content hash) so models that share a
+    tokenizer share entries, and an edited message never reuses a stale
+    count. Misses are encoded in one batched tokenizer call.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TOKEN_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def count(self, messages: list[dict[str, Any]], model: str) -> list[int]:
+        """Token counts for ``messages`` (same order), encoding only misses."""
+        family = tokenizer_family(model)
+        keys = [(family, _message_digest(m)) for m in messages]
+        counts: list[int] = [0] * len(messages)
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            cached = self._counts.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                self._counts.move_to_end(key)
+                counts[i] = cached
+        self._hits += len(messages) - len(missing)
+        self._misses += len(missing)
+
+        if missing:
+            fresh = _encode_batch([messages[i] for i in missing], model)
+            for i, n in zip(missing, fresh):
+                counts[i] = n
+                self._counts[keys[i]] = n
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return counts
+
+    def clear(self) -> None:
+        """Drop every cached count."""
+        self._counts.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return cache statistics for monitoring."""
+        total = self._hits + self._misses
+        return {
+            "entries": len(self._counts),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+        }
+
+
+_token_cache: TokenCountCache | None = None
+
+
+def get_token_cache(config: Any | None = None) -> TokenCountCache:
+    """Get (or lazily create) the process-wide token-count cache."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenCountCache(
+            max_entries=getattr(config, "token_cache_max_entries", DEFAULT_TOKEN_CACHE_ENTRIES),
+        )
+    return _token_cache
+
+
+@functools.lru_cache(maxsize=256)
+def _select_tokenizer(model: str) -> dict[str, Any] | None:
+    try:
+        from litellm.utils import _select_tokenizer as select
+        return select(model)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def tokenizer_family(model: str) -> str:
+    """
+    Cache namespace for a model's tokenizer.
+
+    tiktoken encodings are shared by name (e.g. every OpenAI-style model on
+    cl100k_base); other tokenizers are namespaced per model.
+    """
+    selected = _select_tokenizer(model)
+    if selected is None:
+        return "estimate"
+    name = getattr(selected.get("tokenizer"), "name", None)
+    return f"{selected.get('type')}:{name or model}"
+
+
+@functools.lru_cache(maxsize=256)
+def _message_overhead(model: str) -> int | None:
+    """
+    Fixed per-message tokens litellm adds on top of role + content.
+
+    Calibrated once per model against litellm.token_counter so batched
+    counts match per-message counts exactly. None if not calibratable.
+    """
+    encoding = _batch_encoding(model)
+    if encoding is None:
+        return None
+    try:
+        from litellm import token_counter
+        probe = {"role": "user", "content": "x"}
+        total = token_counter(model=model, messages=[probe])
+        return total - len(encoding.encode("user")) - len(encoding.encode("x"))
+    except Exception:
+        return None
+
+
+def _batch_encoding(model: str) -> Any | None:
+    """tiktoken encoding for a model if it supports batch encoding."""
+    selected = _select_tokenizer(model)
+    if not selected or selected.get("type") != "openai_tokenizer":
+        return None
+    encoding = selected.get("tokenizer")
+    return encoding if hasattr(encoding, "encode_batch") else None
+
+
+def _is_plain(message: dict[str, Any]) -> bool:
+    """Role + string content only — countable as a batched encode."""
+    return (
+        isinstance(message.get("content"), str)
+        and isinstance(message.get("role"), str)
+        and len(message) == 2
+    )
+
+
+def _message_digest(message: dict[str, Any]) -> bytes:
+    if _is_plain(message):
+        raw = f"{message['role']}\x00{message['content']}".encode("utf-8", "surrogatepass")
+    else:
+        raw = json.dumps(message, sort_keys=True, default=str).encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _encode_batch(messages: list[dict[str, Any]], model: str) -> list[int]:
+    """Count uncached messages: plain ones in one encode_batch call."""
+    counts: list[int] = [0] * len(messages)
+    plain: list[int] = []
+    encoding = _batch_encoding(model)
+    overhead = _message_overhead(model) if encoding is not None else None
+    for i, msg in enumerate(messages):
+        if overhead is not None and _is_plain(msg):
+            plain.append(i)
+        else:
+            counts[i] = _count_message_tokens(msg, model)
+
+    if plain:
+        texts = [messages[i]["content"] for i in plain]
+        roles = {messages[i]["role"] for i in plain}
+        try:
+            encoded = encoding.encode_batch(texts, disallowed_special=())
+            role_tokens = {r: len(encoding.encode(r, disallowed_special=())) for r in roles}
+            for i, ids in zip(plain, encoded):
+                counts[i] = len(ids) + role_tokens[messages[i]["role"]] + overhead
+        except Exception:
+            for i in plain:
+                counts[i] = _count_message_tokens(messages[i], model)
+    return counts
@@ -0,0 +1,348 @@
+"""
+Embedding Service — Shared, batched, cached text embeddings.
+
+Memory storage, semantic search, the sentiment routers and the
+EmbeddingSentimentClassifier used to open a fresh ``httpx.AsyncClient``
+and send one ``/v1/embeddings`` request per text. This module gives them
+one pooled client and coalesces concurrent requests into list-input calls.
+
+Features:
+- One keep-alive ``httpx.AsyncClient`` per process (LiteLLM proxy)
+- Micro-batching: requests arriving within ``batch_window_seconds`` (or
+  until ``max_batch`` texts) go out as a single list-input call per model
+- Duplicate texts in a window / in flight share one request
+- Content-hash → vector cache: in-memory LRU plus an optional Postgres
+  tier (aria_data.embedding_cache) so re-embedding the same text is free;
+  prune_db() bounds the table by age and row count
+- embed_many() for callers that know their whole batch up front
+
+Usage:
+    service = get_embedding_service()
+    vector = await service.embed("some text")
+    vectors = await service.embed_many(texts, model="nomic-embed-text")
+
+    # API startup — enable the Postgres tier:
+    get_embedding_service(db_factory=AsyncSessionLocal)
+
+    # Periodic cleanup (src/api/main.py):
+    await get_embedding_service().prune_db()
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger("aria.engine.embeddings")
+
+DEFAULT_EMBEDDING_MODEL = "nomic-embed-text"
+DEFAULT_MAX_BATCH = 64
+DEFAULT_BATCH_WINDOW_SECONDS = 0.01
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+DEFAULT_TIMEOUT_SECONDS = 30.0
+DEFAULT_DB_TTL_DAYS = 30
+DEFAULT_DB_MAX_ROWS = 200_000
+
+
+def content_hash(model: str, text: str) -> str:
+    """Cache key for ``text`` embedded with ``model``."""
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class EmbeddingService:
+    """
+    Batched embedding client with a two-tier vector cache.
+
+    Cache tiers fail open: a Postgres error is logged and the text is
+    embedded as if it were a miss.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        batch_window_seconds: float = DEFAULT_BATCH_WINDOW_SECONDS,
+        cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        db_factory: Any | None = None,
+    ):
+        self.base_url = (base_url or os.environ.get("LITELLM_URL", "http://litellm:4000")).rstrip("/")
+        self.api_key = api_key if api_key is not None else os.environ.get("LITELLM_MASTER_KEY", "")
+        self.model = model
+        self.max_batch = max_batch
+        self.batch_window_seconds = batch_window_seconds
+        self.cache_max_entries = cache_max_entries
+        self.timeout = timeout
+        self.db_factory = db_factory
+        self._client: httpx.AsyncClient | None = None
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        # model -> {hash: (text, future)} waiting for the batch window
+        self._pending: dict[str, dict[str, tuple[str, asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = {
+            "requests": 0, "texts": 0, "memory_hits": 0, "db_hits": 0,
+            "api_calls": 0, "api_texts": 0, "errors": 0,
+        }
+
+    # ── Public API ───────────────────────────────────────────────
+
+    async def embed(
+        self,
+        text: str,
+        model: str | None = None,
+        timeout: float | None = None,
+    ) -> list[float]:
+        """Embedding vector for one text (batched with concurrent callers)."""
+        return (await self.embed_many([text], model=model, timeout=timeout))[0]
+
+    async def embed_many(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        timeout: float | None = None,
+    ) -> list[list[float]]:
+        """
+        Embedding vectors for ``texts`` (same order).
+
+        Cached texts are answered without a network call; the rest join
+        the current batch window. ``timeout`` bounds this caller's wait
+        only — the shared request keeps running for other waiters.
+        """
+        model = model or self.model
+        self._stats["requests"] += 1
+        self._stats["texts"] += len(texts)
+        keys = [content_hash(model, t) for t in texts]
+        found: dict[str, list[float]] = {}
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            vector = self._memory_get(key)
+            if vector is not None:
+                found[key] = vector
+                self._stats["memory_hits"] += 1
+            else:
+                missing[key] = text
+
+        if missing and self.db_factory is not None:
+            for key, vector in (await self._db_get(list(missing))).items():
+                found[key] = vector
+                self._memory_put(key, vector)
+                missing.pop(key, None)
+                self._stats["db_hits"] += 1
+
+        if missing:
+            futures = [self._enqueue(model, key, text) for key, text in missing.items()]
+            vectors = await asyncio.wait_for(
+                asyncio.gather(*(asyncio.shield(f) for f in futures)),
+                timeout=timeout or self.timeout,
+            )
+            found.update(zip(missing, vectors))
+
+        return [found[key] for key in keys]
+
+    async def aclose(self) -> None:
+        """Flush pending batches and close the pooled client."""
+        for model in list(self._pending):
+            self._dispatch(model)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def clear(self) -> None:
+        """Drop the in-memory vector cache."""
+        self._memory.clear()
+
+    async def prune_db(
+        self,
+        max_age_days: int = DEFAULT_DB_TTL_DAYS,
+        max_rows: int = DEFAULT_DB_MAX_ROWS,
+    ) -> int:
+        """
+        Delete Postgres cache rows older than ``max_age_days``, then the
+        oldest rows beyond ``max_rows``. Returns the number of rows deleted
+        (0 when the Postgres tier is disabled).
+        """
+        if self.db_factory is None:
+            return 0
+        from sqlalchemy import delete, func, select
+        from db.models import EmbeddingCache
+
+        async with self.db_factory() as db:
+            expired = await db.execute(
+                delete(EmbeddingCache).where(
+                    EmbeddingCache.created_at
+                    < func.now() - func.make_interval(0, 0, 0, max_age_days)
+                )
+            )
+            overflow = (
+                select(EmbeddingCache.content_hash)
+                .order_by(EmbeddingCache.created_at.desc())
+                .offset(max_rows)
+                .scalar_subquery()
+            )
+            capped = await db.execute(
+                delete(EmbeddingCache).where(EmbeddingCache.content_hash.in_(overflow))
+            )
+            await db.commit()
+        return (expired.rowcount or 0) + (capped.rowcount or 0)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return service statistics for monitoring."""
+        api_calls = self._stats["api_calls"]
+        return {
+            **self._stats,
+            "cached_vectors": len(self._memory),
+            "avg_batch_size": round(self._stats["api_texts"] / api_calls, 2) if api_calls else 0.0,
+            "db_tier": self.db_factory is not None,
+        }
+
+    # ── Batching ─────────────────────────────────────────────────
+
+    def _enqueue(self, model: str, key: str, text: str) -> asyncio.Future:
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return inflight
+        batch = self._pending.setdefault(model, {})
+        if key in batch:
+            return batch[key][1]
+        future = asyncio.get_running_loop().create_future()
+        batch[key] = (text, future)
+        if len(batch) >= self.max_batch:
+            self._dispatch(model)
+        elif model not in self._timers:
+            self._timers[model] = asyncio.get_running_loop().call_later(
+                self.batch_window_seconds, self._dispatch, model,
+            )
+        return future
+
+    def _dispatch(self, model: str) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(model, None)
+        if not batch:
+            return
+        for key, (_, future) in batch.items():
+            self._inflight[key] = future
+        self._spawn(self._send(model, batch))
+
+    async def _send(self, model: str, batch: dict[str, tuple[str, asyncio.Future]]) -> None:
+        keys = list(batch)
+        try:
+            vectors = await self._request(model, [batch[k][0] for k in keys])
+        except Exception as e:
+            self._stats["errors"] += 1
+            for key in keys:
+                self._inflight.pop(key, None)
+                if not batch[key][1].done():
+                    batch[key][1].set_exception(e)
+            return
+
+        for key, vector in zip(keys, vectors):
+            self._memory_put(key, vector)
+            self._inflight.pop(key, None)
+            if not batch[key][1].done():
+                batch[key][1].set_result(vector)
+        if self.db_factory is not None:
+            await self._db_put(model, dict(zip(keys, vectors)))
+
+    async def _request(self, model: str, texts: list[str]) -> list[list[float]]:
+        """One list-input ``/v1/embeddings`` call."""
+        self._stats["api_calls"] += 1
+        self._stats["api_texts"] += len(texts)
+        resp = await self._get_client().post(
+            f"{self.base_url}/v1/embeddings",
+            json={"model": model, "input": texts},
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        resp.raise_for_status()
+        data = sorted(resp.json()["data"], key=lambda d: d.get("index", 0))
+        if len(data) != len(texts):
+            raise ValueError(f"Embedding API returned {len(data)} vectors for {len(texts)} inputs")
+        return [d["embedding"] for d in data]
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ── Cache tiers ──────────────────────────────────────────────
+
+    def _memory_get(self, key: str) -> list[float] | None:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: str, vector: list[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.cache_max_entries:
+            self._memory.popitem(last=False)
+
+    async def _db_get(self, keys: list[str]) -> dict[str, list[float]]:
+        try:
+            from sqlalchemy import select
+            from db.models import EmbeddingCache
+
+            async with self.db_factory() as db:
+                rows = await db.execute(
+                    select(EmbeddingCache.content_hash, EmbeddingCache.embedding)
+                    .where(EmbeddingCache.content_hash.in_(keys))
+                )
+                return {h: list(v) for h, v in rows.all()}
+        except Exception as e:
+            logger.debug("Embedding cache read failed (treated as miss): %s", e)
+            return {}
+
+    async def _db_put(self, model: str, vectors: dict[str, list[float]]) -> None:
+        try:
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            from db.models import EmbeddingCache
+
+            async with self.db_factory() as db:
+                await db.execute(
+                    pg_insert(EmbeddingCache)
+                    .values([
+                        {"content_hash": h, "model": model, "embedding": v}
+                        for h, v in vectors.items()
+                    ])
+                    .on_conflict_do_nothing(index_elements=[EmbeddingCache.content_hash])
+                )
+                await db.commit()
+        except Exception as e:
+            logger.debug("Embedding cache write failed (non-fatal): %s", e)
+
+
+# ── Process-wide instance ─────────────────────────────────────────────────────
+
+_service: EmbeddingService | None = None
+
+
+def get_embedding_service(db_factory: Any | None = None) -> EmbeddingService:
+    """Get (or lazily create) the process-wide embedding service.
+
+    Passing ``db_factory`` enables the Postgres cache tier (first caller wins).
+    """
+    global _service
+    if _service is None:
+        _service = EmbeddingService(db_factory=db_factory)
+    elif db_factory is not None and _service.db_factory is None:
+        _service.db_factory = db_factory
+    return _service
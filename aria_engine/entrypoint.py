@@ -6,6 +6,7 @@ Boot sequence:
   Phase 1: Database connection
   Phase 2: Run pending migrations
   Phase 3: Load agent state
+  Phase 3b: In-process ChatEngine for cron dispatch
   Phase 4: Start scheduler
   Phase 5: Health endpoint on :8081
 
@@ -20,6 +21,7 @@ import sys
 import logging
 
 from aria_engine.config import EngineConfig
+from aria_engine.telemetry import shutdown_telemetry
 
 logger = logging.getLogger("aria_engine")
 
@@ -32,6 +34,8 @@ class AriaEngine:
         self._shutdown_event = asyncio.Event()
         self._scheduler = None
         self._agent_pool = None
+        self._chat_engine = None
+        self._prompt_assembler = None
         self._health_server = None
         self._db_engine = None
         self._session_factory = None
@@ -71,6 +75,9 @@ class AriaEngine:
         await self._init_agents()
         logger.info("✅ Phase 3: Agents initialized")
 
+        # Phase 3b: ChatEngine for in-process cron dispatch
+        await self._init_chat()
+
         # Phase 4: Start scheduler (cron jobs from DB)
         await self._init_scheduler()
         logger.info("✅ Phase 4: Scheduler started")
@@ -160,6 +167,29 @@ class AriaEngine:
         )
         await self._agent_pool.load_agents()
 
+    async def _init_chat(self):
+        """
+        Build a ChatEngine so cron prompt jobs run in-process instead of
+        round-tripping through aria-api (skipped for dispatch mode "http").
+        """
+        if self.config.scheduler_dispatch_mode == "http":
+            return
+        try:
+            from aria_engine.chat_engine import ChatEngine
+            from aria_engine.llm_gateway import get_llm_gateway
+            from aria_engine.prompts import PromptAssembler
+            from aria_engine.tool_registry import ToolRegistry
+
+            tool_registry = ToolRegistry()
+            tool_registry.discover_from_manifests()
+            self._chat_engine = ChatEngine(
+                self.config, get_llm_gateway(self.config), tool_registry, self._session_factory,
+            )
+            self._prompt_assembler = PromptAssembler(self.config)
+            logger.info("✅ Phase 3b: ChatEngine ready for direct cron dispatch")
+        except Exception as e:
+            logger.warning("ChatEngine init failed — cron jobs will dispatch via aria-api: %s", e)
+
     async def _init_scheduler(self):
         """Start APScheduler with PostgreSQL job store."""
         from aria_engine.scheduler import EngineScheduler
@@ -168,6 +198,8 @@ class AriaEngine:
             config=self.config,
             db_engine=self._db_engine,
             agent_pool=self._agent_pool,
+            chat_engine=self._chat_engine,
+            prompt_assembler=self._prompt_assembler,
         )
         await self._scheduler.start()
 
@@ -205,6 +237,7 @@ class AriaEngine:
             await self._agent_pool.shutdown()
         if self._health_server:
             await self._health_server.cleanup()
+        await shutdown_telemetry()
         if self._db_engine:
             await self._db_engine.dispose()
 
@@ -0,0 +1,306 @@
+"""
+Job queue — priority- and budget-aware execution slots for scheduled work.
+
+EngineScheduler used to gate execution with one asyncio.Semaphore: jobs
+firing together at the top of the hour competed FIFO, and a failing job
+slept through its retry backoff while holding a slot.
+
+Features:
+- Priority classes (critical > high > normal > low), FIFO within a class
+- Global slot limit plus a per-agent concurrency cap; a job never
+  overlaps a still-running run of itself
+- Token / cost budgets over a sliding window: once a budget is spent only
+  critical jobs start until older usage ages out of the window
+- Jittered start (0..jitter_seconds) for scheduled fires to spread
+  thundering herds; retries re-enter the queue with a not-before delay
+  instead of sleeping inside a slot
+- A job already waiting is not queued twice (fires coalesce)
+- stats(): depth per class, queue wait, slot utilization, budget use —
+  mirrored to Prometheus (aria_scheduler_queue_*, aria_scheduler_slots_*)
+
+Usage:
+    async def run(job: QueuedJob) -> dict | None:
+        ...  # one attempt; return {"total_tokens": …, "cost_usd": …}
+
+    queue = JobQueue(run, max_concurrent=5, per_agent_limit=2,
+                     token_budget=200_000, budget_window_seconds=3600)
+    queue.submit(QueuedJob("work_cycle", "aria", priority="normal"), jitter=True)
+    ...
+    await queue.close()
+"""
+import asyncio
+import itertools
+import logging
+import random
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable
+
+from aria_engine.metrics import METRICS
+
+logger = logging.getLogger("aria.engine.job_queue")
+
+# Lower rank runs first
+PRIORITIES: dict[str, int] = {"critical": 0, "high": 1, "normal": 2, "low": 3}
+DEFAULT_PRIORITY = "normal"
+
+# Queue waits kept for stats()
+WAIT_SAMPLES = 256
+
+
+def normalize_priority(priority: Any) -> str:
+    """Priority class name; unknown / missing values become 'normal'."""
+    name = str(priority or "").strip().lower()
+    return name if name in PRIORITIES else DEFAULT_PRIORITY
+
+
+@dataclass
+class QueuedJob:
+    """One pending run of a job; ``params`` is passed through to the worker."""
+    job_id: str
+    agent_id: str
+    params: dict[str, Any] = field(default_factory=dict)
+    priority: str = DEFAULT_PRIORITY
+    attempt: int = 0
+    not_before: float = 0.0
+    enqueued_at: float = 0.0
+    seq: int = 0
+
+    def __post_init__(self) -> None:
+        self.priority = normalize_priority(self.priority)
+
+    @property
+    def rank(self) -> int:
+        return PRIORITIES[self.priority]
+
+    def retry(self) -> "QueuedJob":
+        """Copy of this job for its next attempt."""
+        return replace(self, attempt=self.attempt + 1)
+
+
+class JobQueue:
+    """
+    Dispatches queued jobs to ``worker`` under slot, per-agent and budget limits.
+
+    The worker runs one attempt and returns the attempt's usage
+    (``total_tokens`` / ``cost_usd``) or None; exceptions are logged and
+    count as no usage. The dispatcher task starts on the first submit().
+    """
+
+    def __init__(
+        self,
+        worker: Callable[[QueuedJob], Awaitable[dict[str, Any] | None]],
+        *,
+        max_concurrent: int = 5,
+        per_agent_limit: int = 0,
+        token_budget: int = 0,
+        cost_budget_usd: float = 0.0,
+        budget_window_seconds: float = 3600.0,
+        jitter_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._worker = worker
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_agent_limit = max(0, per_agent_limit)  # 0 = no cap
+        self.token_budget = max(0, token_budget)  # 0 = unlimited
+        self.cost_budget_usd = max(0.0, cost_budget_usd)
+        self.budget_window_seconds = budget_window_seconds
+        self.jitter_seconds = max(0.0, jitter_seconds)
+        self._clock = clock
+
+        self._waiting: list[QueuedJob] = []
+        self._running: dict[str, tuple[QueuedJob, asyncio.Task]] = {}
+        self._usage: deque[tuple[float, int, float]] = deque()  # (at, tokens, cost)
+        self._waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self._closed = False
+
+    # ── Submission ───────────────────────────────────────────────────
+
+    def submit(self, job: QueuedJob, *, delay: float = 0.0, jitter: bool = False) -> bool:
+        """
+        Queue ``job`` to start no earlier than ``delay`` seconds from now
+        (plus a random 0..jitter_seconds when ``jitter``). Returns False
+        when the queue is closed or the job is already waiting.
+        """
+        if self._closed:
+            return False
+        if any(w.job_id == job.job_id for w in self._waiting):
+            logger.info("Job %s already queued — coalescing", job.job_id)
+            return False
+        now = self._clock()
+        spread = random.uniform(0, self.jitter_seconds) if jitter else 0.0
+        job.enqueued_at = now
+        job.not_before = now + max(0.0, delay) + spread
+        job.seq = next(self._seq)
+        self._waiting.append(job)
+        self._ensure_dispatcher()
+        self._wake.set()
+        self._publish()
+        return True
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    # ── Selection ────────────────────────────────────────────────────
+
+    def _spent(self, now: float) -> tuple[int, float]:
+        horizon = now - self.budget_window_seconds
+        while self._usage and self._usage[0][0] <= horizon:
+            self._usage.popleft()
+        return sum(u[1] for u in self._usage), sum(u[2] for u in self._usage)
+
+    def budget_exhausted(self, now: float | None = None) -> bool:
+        tokens, cost = self._spent(self._clock() if now is None else now)
+        return bool(
+            (self.token_budget and tokens >= self.token_budget)
+            or (self.cost_budget_usd and cost >= self.cost_budget_usd)
+        )
+
+    def _agent_load(self) -> dict[str, int]:
+        load: dict[str, int] = {}
+        for job, _ in self._running.values():
+            load[job.agent_id] = load.get(job.agent_id, 0) + 1
+        return load
+
+    def next_eligible(self, now: float) -> tuple[QueuedJob | None, float | None]:
+        """
+        Best job that may start at ``now``, else (None, seconds until a
+        time-based blocker clears — None when only a completion can help).
+        """
+        if len(self._running) >= self.max_concurrent:
+            return None, None
+        exhausted = self.budget_exhausted(now)
+        load = self._agent_load()
+        best: QueuedJob | None = None
+        retry_in: float | None = None
+
+        def _later(seconds: float) -> None:
+            nonlocal retry_in
+            retry_in = seconds if retry_in is None else min(retry_in, seconds)
+
+        for job in self._waiting:
+            if job.not_before > now:
+                _later(job.not_before - now)
+                continue
+            if job.job_id in self._running:
+                continue
+            if self.per_agent_limit and load.get(job.agent_id, 0) >= self.per_agent_limit:
+                continue
+            if exhausted and job.rank > PRIORITIES["critical"]:
+                if self._usage:
+                    _later(self._usage[0][0] + self.budget_window_seconds - now)
+                continue
+            if best is None or (job.rank, job.not_before, job.seq) < (best.rank, best.not_before, best.seq):
+                best = job
+        return (best, None) if best is not None else (None, retry_in)
+
+    # ── Dispatch ─────────────────────────────────────────────────────
+
+    async def _dispatch_loop(self) -> None:
+        while not self._closed:
+            self._wake.clear()
+            job, retry_in = self.next_eligible(self._clock())
+            if job is not None:
+                self._start(job)
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=retry_in)
+            except asyncio.TimeoutError:
+                pass
+
+    def _start(self, job: QueuedJob) -> None:
+        now = self._clock()
+        self._waiting.remove(job)
+        wait = max(0.0, now - max(job.enqueued_at, job.not_before))
+        self._waits.append(wait)
+        METRICS.scheduler_queue_wait.labels(priority=job.priority).observe(wait)
+        task = asyncio.get_running_loop().create_task(self._run(job))
+        self._running[job.job_id] = (job, task)
+        self._publish()
+
+    async def _run(self, job: QueuedJob) -> None:
+        usage: dict[str, Any] | None = None
+        try:
+            usage = await self._worker(job)
+        except Exception as exc:
+            logger.error("Queued job %s raised: %s", job.job_id, exc, exc_info=True)
+        finally:
+            if usage:
+                self._usage.append((
+                    self._clock(),
+                    int(usage.get("total_tokens") or 0),
+                    float(usage.get("cost_usd") or 0.0),
+                ))
+            self._running.pop(job.job_id, None)
+            self._wake.set()
+            self._publish()
+
+    async def close(self) -> None:
+        """Stop dispatching, cancel running jobs and drop waiting ones."""
+        self._closed = True
+        tasks = [task for _, task in self._running.values()]
+        if self._dispatcher is not None:
+            tasks.append(self._dispatcher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._running.clear()
+        self._waiting.clear()
+        self._dispatcher = None
+        self._publish()
+
+    # ── Introspection ────────────────────────────────────────────────
+
+    @property
+    def running(self) -> dict[str, asyncio.Task]:
+        """job_id → task for runs in progress."""
+        return {job_id: task for job_id, (_, task) in self._running.items()}
+
+    def stats(self) -> dict[str, Any]:
+        now = self._clock()
+        tokens, cost = self._spent(now)
+        waits = sorted(self._waits)
+        depth = {p: 0 for p in PRIORITIES}
+        for job in self._waiting:
+            depth[job.priority] += 1
+        return {
+            "depth": len(self._waiting),
+            "depth_by_priority": depth,
+            "ready": sum(1 for j in self._waiting if j.not_before <= now),
+            "running": len(self._running),
+            "running_by_agent": self._agent_load(),
+            "max_concurrent": self.max_concurrent,
+            "per_agent_limit": self.per_agent_limit,
+            "slot_utilization": round(len(self._running) / self.max_concurrent, 3),
+            "wait_ms": {
+                "mean": round(statistics.fmean(waits) * 1000, 1) if waits else None,
+                "p95": round(waits[int(0.95 * (len(waits) - 1))] * 1000, 1) if waits else None,
+                "max": round(waits[-1] * 1000, 1) if waits else None,
+            },
+            "budget": {
+                "window_seconds": self.budget_window_seconds,
+                "tokens_used": tokens,
+                "token_budget": self.token_budget or None,
+                "cost_usd_used": round(cost, 6),
+                "cost_budget_usd": self.cost_budget_usd or None,
+                "exhausted": self.budget_exhausted(now),
+            },
+        }
+
+    def _publish(self) -> None:
+        depth = {p: 0 for p in PRIORITIES}
+        for job in self._waiting:
+            depth[job.priority] += 1
+        for priority, count in depth.items():
+            METRICS.scheduler_queue_depth.labels(priority=priority).set(count)
+        METRICS.scheduler_slots_in_use.set(len(self._running))
+        METRICS.scheduler_slot_utilization.set(len(self._running) / self.max_concurrent)
+        tokens, cost = self._spent(self._clock())
+        METRICS.scheduler_budget_used.labels(resource="tokens").set(tokens)
+        METRICS.scheduler_budget_used.labels(resource="cost_usd").set(cost)
@@ -0,0 +1,116 @@
+"""
+Bounded quantile histograms for latency / throughput tracking.
+
+Fixed log-spaced buckets give p50/p95/p99 with a bounded relative error
+(the bucket growth factor) in constant memory, no matter how many values
+are recorded — unlike keeping raw samples in a list.
+
+Features:
+- O(1) record (bucket index from a logarithm), O(buckets) quantile
+- Constant memory per histogram (~140 floats for 1 ms – 10 min at 10%)
+- Optional decay: once ``decay_after`` observations accumulate, all buckets
+  are halved so quantiles track recent behaviour (used for hedge deadlines)
+- ModelLatency bundles the per-model LLM histograms (latency, TTFT, tokens/s)
+
+Usage:
+    hist = QuantileHistogram(min_value=0.001, max_value=600.0)
+    hist.record(0.42)
+    hist.quantile(0.95)        # ≈ p95 (within ±5%)
+    hist.snapshot(scale=1000)  # {"count", "p50", "p95", "p99", "mean"} in ms
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+# Default bucket growth factor — quantiles are within ±GROWTH/2 relative error
+DEFAULT_GROWTH = 1.1
+
+
+class QuantileHistogram:
+    """Fixed-bucket log histogram with approximate quantiles."""
+
+    __slots__ = (
+        "min_value", "max_value", "growth", "decay_after",
+        "_log_growth", "_counts", "_total", "_sum",
+    )
+
+    def __init__(
+        self,
+        min_value: float,
+        max_value: float,
+        growth: float = DEFAULT_GROWTH,
+        decay_after: int | None = None,
+    ):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.growth = growth
+        self.decay_after = decay_after
+        self._log_growth = math.log(growth)
+        n_buckets = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+        self._counts: list[float] = [0.0] * n_buckets
+        self._total = 0.0
+        self._sum = 0.0
+
+    @property
+    def count(self) -> int:
+        """Number of (possibly decayed) observations."""
+        return int(self._total)
+
+    def record(self, value: float) -> None:
+        """Add one observation (clamped to [min_value, max_value])."""
+        value = min(max(value, self.min_value), self.max_value)
+        index = int(math.log(value / self.min_value) / self._log_growth)
+        self._counts[min(index, len(self._counts) - 1)] += 1.0
+        self._total += 1.0
+        self._sum += value
+        if self.decay_after and self._total >= self.decay_after:
+            self._counts = [c / 2 for c in self._counts]
+            self._total /= 2
+            self._sum /= 2
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate q-quantile (geometric bucket midpoint), None if empty."""
+        if self._total <= 0:
+            return None
+        target = q * self._total
+        running = 0.0
+        for index, count in enumerate(self._counts):
+            running += count
+            if running >= target and count > 0:
+                return self.min_value * self.growth ** (index + 0.5)
+        return self.max_value
+
+    def snapshot(self, scale: float = 1.0, digits: int = 1) -> dict[str, Any]:
+        """Summary dict with count, mean and p50/p95/p99 (multiplied by ``scale``)."""
+        def _fmt(v: float | None) -> float | None:
+            return None if v is None else round(v * scale, digits)
+
+        return {
+            "count": self.count,
+            "mean": _fmt(self._sum / self._total if self._total else None),
+            "p50": _fmt(self.quantile(0.50)),
+            "p95": _fmt(self.quantile(0.95)),
+            "p99": _fmt(self.quantile(0.99)),
+        }
+
+
+@dataclass
+class ModelLatency:
+    """Per-model LLM latency histograms (seconds / tokens per second)."""
+    latency: QuantileHistogram = field(
+        default_factory=lambda: QuantileHistogram(0.001, 600.0, decay_after=10_000)
+    )
+    ttft: QuantileHistogram = field(
+        default_factory=lambda: QuantileHistogram(0.001, 600.0, decay_after=10_000)
+    )
+    tokens_per_sec: QuantileHistogram = field(
+        default_factory=lambda: QuantileHistogram(0.1, 10_000.0)
+    )
+
+    def snapshot(self) -> dict[str, Any]:
+        """Latency / TTFT in ms, throughput in tokens/s."""
+        return {
+            "latency_ms": self.latency.snapshot(scale=1000),
+            "ttft_ms": self.ttft.snapshot(scale=1000),
+            "tokens_per_sec": self.tokens_per_sec.snapshot(),
+        }
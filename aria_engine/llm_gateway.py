@@ -5,17 +5,20 @@ Zero-hop Python calls to litellm.
 Features:
 - Direct litellm.acompletion() with async streaming
 - Model routing from models.yaml
-- Fallback chain with automatic failover
+- Fallback chain with automatic failover (routing.fallbacks)
+- Per-model circuit breakers shared by complete() and stream()
+- Optional hedged requests (next fallback after a p95-based deadline)
+- Opt-in response cache for complete() (exact + semantic, memory + disk)
 - Token counting and cost tracking
 - Thinking token support (Qwen3, Claude)
 - Tool calling (function calling) support
-- Circuit breaker for resilience
 """
 import asyncio
 import logging
 import time
-from dataclasses import dataclass, field
-from typing import Any, AsyncIterator
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 import litellm
 from litellm import acompletion, token_counter
@@ -23,10 +26,23 @@ from litellm import acompletion, token_counter
 from aria_engine.config import EngineConfig
 from aria_engine.circuit_breaker import CircuitBreaker
 from aria_engine.exceptions import LLMError
+from aria_engine.latency import ModelLatency
+from aria_engine.metrics import METRICS
+from aria_engine.response_cache import ResponseCache, cache_key, semantic_scope
 from aria_models.loader import load_catalog, get_routing_config, normalize_model_id
 
 logger = logging.getLogger("aria.engine.llm")
 
+# Per-model circuit breaker settings
+CIRCUIT_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 30.0
+
+# Hedging: minimum latency observations for a model before hedging it
+HEDGE_MIN_SAMPLES = 20
+
+# llm_circuit_breaker_state gauge values
+_CIRCUIT_STATE_VALUES = {"closed": 0, "open": 1, "half-open": 2}
+
 
 @dataclass
 class LLMResponse:
@@ -40,16 +56,92 @@ class LLMResponse:
     cost_usd: float = 0.0
     latency_ms: int = 0
     finish_reason: str = ""
+    cached: bool = False  # served from the response cache (tokens/cost = saved)
 
 
 @dataclass
 class StreamChunk:
-    """Single chunk from streaming response."""
+    """Single chunk from streaming response.
+
+    ``tool_call_delta`` carries one *complete* tool call
+    ({id, function: {name, arguments}}, same shape as LLMResponse.tool_calls),
+    emitted as soon as the model has finished streaming that call.
+
+    The last chunk of every stream carries no deltas, only usage
+    (``input_tokens`` / ``output_tokens`` / ``cost_usd``).
+    """
     content: str = ""
     thinking: str = ""
     tool_call_delta: dict[str, Any] | None = None
     finish_reason: str | None = None
     is_thinking: bool = False
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+@dataclass
+class _Candidate:
+    """One entry of the failover chain, resolved from models.yaml."""
+    alias: str
+    model: str  # litellm model string — circuit breaker key
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+class _ToolCallAssembler:
+    """
+    Rebuild complete tool calls from streamed OpenAI-style deltas.
+
+    Deltas carry an ``index``; the first delta of a call has its id and
+    function name, later ones append argument fragments. A call is complete
+    once a delta for a later index arrives, or at flush() (stream end).
+    """
+
+    def __init__(self):
+        self._open: dict[int, dict[str, Any]] = {}
+
+    def feed(self, deltas: list[Any] | None) -> list[dict[str, Any]]:
+        """Consume one chunk's tool-call deltas; return calls that closed."""
+        closed: list[dict[str, Any]] = []
+        for raw in deltas or ():
+            index = _field(raw, "index")
+            if index is None:
+                index = max(self._open, default=0)
+            for earlier in sorted(i for i in self._open if i < index):
+                closed.append(self._finish(earlier))
+            call = self._open.setdefault(
+                index, {"id": "", "function": {"name": "", "arguments": ""}},
+            )
+            if _field(raw, "id"):
+                call["id"] = _field(raw, "id")
+            function = _field(raw, "function")
+            if function is not None:
+                if _field(function, "name"):
+                    call["function"]["name"] = _field(function, "name")
+                if _field(function, "arguments"):
+                    call["function"]["arguments"] += _field(function, "arguments")
+        return closed
+
+    def flush(self) -> list[dict[str, Any]]:
+        """Close every open call (end of stream)."""
+        return [self._finish(i) for i in sorted(self._open)]
+
+    def discard(self) -> None:
+        """Drop open calls (output cut off, arguments may be incomplete)."""
+        self._open.clear()
+
+    def _finish(self, index: int) -> dict[str, Any]:
+        call = self._open.pop(index)
+        if not call["id"]:
+            call["id"] = f"call_{uuid.uuid4().hex[:24]}"
+        return call
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Attribute or key access — litellm deltas may be objects or dicts."""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
 
 
 class LLMGateway:
@@ -68,12 +160,15 @@ class LLMGateway:
     def __init__(self, config: EngineConfig):
         self.config = config
         self._models_config: dict[str, Any] | None = None
-        self._cb = CircuitBreaker(name="llm", threshold=5, reset_after=30.0)
-        self._latency_samples: list[float] = []
-        # Manual circuit-breaker state used by stream()
-        self._circuit_failures: int = 0
-        self._circuit_threshold: int = 5
-        self._circuit_opened_at: float = 0.0
+        # One breaker per resolved model — a misbehaving provider only
+        # takes itself out of the chain.
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # Per-model latency / TTFT / tokens-per-sec histograms (constant
+        # memory per model; also feed the hedge deadline)
+        self._latency: dict[str, ModelLatency] = {}
+        self._fallbacks_used = 0
+        self._hedges_started = 0
+        self._response_cache: ResponseCache | None = None
 
         # Configure litellm
         # Note: Do NOT set litellm.api_base globally — each model specifies
@@ -137,9 +232,244 @@ class LLMGateway:
         fallbacks = routing.get("fallbacks", [])
         return [self._resolve_model(m)[0] for m in fallbacks]
 
-    def _is_circuit_open(self) -> bool:
-        """Check if circuit breaker is open."""
-        return self._cb.is_open()
+    def _candidates(self, model: str | None) -> list[_Candidate]:
+        """Primary model followed by routing.fallbacks, deduped by litellm model."""
+        aliases = [model or self.config.default_model]
+        if self.config.llm_fallback_enabled:
+            aliases += get_routing_config().get("fallbacks", [])
+        chain: list[_Candidate] = []
+        seen: set[str] = set()
+        for alias in aliases:
+            resolved, extra = self._resolve_model(alias)
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            chain.append(_Candidate(alias=alias, model=resolved, extra=extra))
+        return chain
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        """Circuit breaker for a resolved model (created on first use)."""
+        cb = self._breakers.get(model)
+        if cb is None:
+            cb = CircuitBreaker(
+                name=f"llm:{model}",
+                threshold=CIRCUIT_THRESHOLD,
+                reset_after=CIRCUIT_RESET_SECONDS,
+            )
+            self._breakers[model] = cb
+        return cb
+
+    def _record_outcome(self, model: str, ok: bool) -> None:
+        cb = self._breaker(model)
+        if ok:
+            cb.record_success()
+        else:
+            cb.record_failure()
+        METRICS.llm_request_total.labels(model=model, status="success" if ok else "error").inc()
+        METRICS.llm_circuit_breaker_state.labels(model=model).set(
+            _CIRCUIT_STATE_VALUES.get(cb.state, 0)
+        )
+
+    def _is_circuit_open(self, model: str | None = None) -> bool:
+        """
+        Check if circuit breakers are open.
+
+        With ``model``: that model's breaker. Without: True only when every
+        model in the default failover chain is open (gateway unusable).
+        """
+        if model is not None:
+            return self._breaker(self._resolve_model(model)[0]).is_open()
+        return all(self._breaker(c.model).is_open() for c in self._candidates(None))
+
+    def _latency_for(self, model: str) -> ModelLatency:
+        stats = self._latency.get(model)
+        if stats is None:
+            stats = self._latency[model] = ModelLatency()
+        return stats
+
+    def _hedge_delay(self, model: str, kind: str) -> float | None:
+        """
+        Seconds to wait on ``model`` before hedging, or None (no hedge).
+
+        ``kind`` picks the histogram: "latency" (complete) or "ttft" (stream).
+        """
+        if not self.config.llm_hedge_enabled:
+            return None
+        hist = getattr(self._latency_for(model), kind)
+        if hist.count < HEDGE_MIN_SAMPLES:
+            return None
+        return max(hist.quantile(0.95), self.config.llm_hedge_min_delay_seconds)
+
+    def _record_latency(
+        self,
+        model: str,
+        seconds: float,
+        ttft: float | None = None,
+        output_tokens: int = 0,
+    ) -> None:
+        """Record one successful call in the model's histograms + Prometheus."""
+        stats = self._latency_for(model)
+        stats.latency.record(seconds)
+        METRICS.llm_request_duration.labels(model=model).observe(seconds)
+        if ttft is not None:
+            stats.ttft.record(ttft)
+            METRICS.llm_time_to_first_token.labels(model=model).observe(ttft)
+        generation = seconds - (ttft or 0.0)
+        if output_tokens > 0 and generation > 0:
+            rate = output_tokens / generation
+            stats.tokens_per_sec.record(rate)
+            METRICS.llm_tokens_per_second.labels(model=model).observe(rate)
+
+    async def _run_with_failover(
+        self,
+        candidates: list[_Candidate],
+        attempt: Callable[[_Candidate], Awaitable[Any]],
+        discard: Callable[[Any], Awaitable[None]] | None = None,
+        hedge_on: str = "latency",
+    ) -> tuple[Any, _Candidate]:
+        """
+        Run ``attempt`` down the failover chain until one succeeds.
+
+        Models with an open breaker are skipped. If hedging is enabled and
+        the current attempt outlives its model's p95 ``hedge_on`` deadline
+        ("latency" or "ttft" histogram), the next
+        candidate is started alongside it and the first success wins (the
+        loser is cancelled, or passed to ``discard`` if it also finished).
+
+        Returns:
+            (result, candidate that produced it)
+
+        Raises:
+            LLMError: Every candidate failed or had its circuit open.
+        """
+        queue = list(candidates)
+        running: dict[asyncio.Task, _Candidate] = {}
+        tried: list[str] = []
+        last_error: BaseException | None = None
+        hedged = False
+
+        def _start_next() -> bool:
+            while queue:
+                cand = queue.pop(0)
+                if self._breaker(cand.model).is_open():
+                    logger.debug("Skipping %s — circuit open", cand.model)
+                    continue
+                if tried:
+                    logger.warning("LLM failover → %s (tried: %s)", cand.model, tried)
+                tried.append(cand.model)
+                running[asyncio.ensure_future(attempt(cand))] = cand
+                return True
+            return False
+
+        try:
+            while running or _start_next():
+                delay = None
+                if len(running) == 1 and not hedged and queue:
+                    delay = self._hedge_delay(next(iter(running.values())).model, hedge_on)
+                done, _ = await asyncio.wait(
+                    running, timeout=delay, return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Primary is past its p95 — race the next candidate
+                    hedged = True
+                    slow = next(iter(running.values())).model
+                    if _start_next():
+                        self._hedges_started += 1
+                        logger.info("LLM hedge: %s slower than %.1fs", slow, delay)
+                    continue
+                winner: tuple[Any, _Candidate] | None = None
+                for task in done:
+                    cand = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        last_error = e
+                        self._record_outcome(cand.model, ok=False)
+                        logger.error(
+                            "LLM call failed on %s (failures=%d): %s",
+                            cand.model, self._breaker(cand.model).failure_count, e,
+                        )
+                        continue
+                    self._record_outcome(cand.model, ok=True)
+                    if winner is None:
+                        winner = (result, cand)
+                    elif discard is not None:
+                        await discard(result)
+                if winner is not None:
+                    if winner[1] is not candidates[0]:
+                        self._fallbacks_used += 1
+                    return winner
+        finally:
+            for task in running:
+                task.cancel()
+
+        if not tried:
+            raise LLMError("Circuit breaker open — too many consecutive failures")
+        if isinstance(last_error, LLMError):
+            raise last_error
+        raise LLMError(f"LLM completion failed on {tried}: {last_error}") from last_error
+
+    def _build_kwargs(
+        self,
+        cand: _Candidate,
+        messages: list[dict[str, str]],
+        temperature: float | None,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+        enable_thinking: bool,
+        stream: bool = False,
+    ) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {
+            "model": cand.model,
+            "messages": messages,
+            "temperature": self._temperature(temperature),
+            "max_tokens": max_tokens or self.config.default_max_tokens,
+            "drop_params": True,  # let litellm drop unsupported params per provider
+        }
+        if stream:
+            kwargs["stream"] = True
+            kwargs["stream_options"] = {"include_usage": True}
+        # Per-model api_key / api_base from models.yaml
+        kwargs.update(cand.extra)
+
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
+
+        if enable_thinking:
+            from aria_engine.thinking import build_thinking_params
+            thinking_params = build_thinking_params(cand.model, enable=True)
+            kwargs.update(thinking_params)
+        return kwargs
+
+    def _temperature(self, temperature: float | None) -> float:
+        # 0.0 is a real setting (deterministic calls), not "unset"
+        return self.config.default_temperature if temperature is None else temperature
+
+    def _get_response_cache(self) -> ResponseCache:
+        """Lazily build the response cache from config."""
+        if self._response_cache is None:
+            self._response_cache = ResponseCache(
+                max_entries=self.config.llm_response_cache_max_entries,
+                ttl_seconds=self.config.llm_response_cache_ttl_seconds,
+                disk_path=self.config.llm_response_cache_path or None,
+                similarity_threshold=self.config.llm_response_cache_similarity,
+                embed=self.embed,
+            )
+        return self._response_cache
+
+    async def embed(self, text: str, model: str | None = None) -> list[float]:
+        """
+        Embedding vector for ``text`` via the shared EmbeddingService, so
+        semantic cache lookups are batched with (and cached alongside)
+        every other embedding request in the process.
+        """
+        from aria_engine.embeddings import get_embedding_service
+        return await get_embedding_service().embed(
+            text,
+            model=model or self.config.llm_embedding_model,
+            timeout=self.LLM_TIMEOUT,
+        )
 
     # Default timeout for LLM calls (seconds). Override via config.
     LLM_TIMEOUT: float = 120.0
@@ -152,10 +482,15 @@ class LLMGateway:
         max_tokens: int | None = None,
         tools: list[dict[str, Any]] | None = None,
         enable_thinking: bool = False,
+        cache: bool | None = None,
     ) -> LLMResponse:
         """
         Send a completion request to the LLM.
 
+        Fails over along routing.fallbacks when the model errors, times out
+        or has an open circuit; ``LLMResponse.model`` is the model that
+        actually answered.
+
         Args:
             messages: Chat messages [{role, content}]
             model: Model to use (resolved via models.yaml)
@@ -163,93 +498,131 @@ class LLMGateway:
             max_tokens: Override max tokens
             tools: Tool definitions for function calling
             enable_thinking: Request thinking/reasoning tokens
+            cache: Response cache for this call — None follows
+                   config.llm_response_cache_enabled, True opts in,
+                   False bypasses.
 
         Returns:
             LLMResponse with content, thinking, tool_calls, usage stats
+            (``cached=True`` when served from the response cache)
         """
-        if self._is_circuit_open():
-            raise LLMError("Circuit breaker open — too many consecutive failures")
-
-        resolved_model, model_extra = self._resolve_model(model or self.config.default_model)
-
-        kwargs: dict[str, Any] = {
-            "model": resolved_model,
-            "messages": messages,
-            "temperature": temperature or self.config.default_temperature,
-            "max_tokens": max_tokens or self.config.default_max_tokens,
-            "drop_params": True,  # let litellm drop unsupported params per provider
-        }
-        # Per-model api_key / api_base from models.yaml
-        kwargs.update(model_extra)
-
-        if tools:
-            kwargs["tools"] = tools
-            kwargs["tool_choice"] = "auto"
+        use_cache = self.config.llm_response_cache_enabled if cache is None else cache
+        if not use_cache:
+            if cache is False and self._response_cache is not None:
+                self._response_cache.record_bypass()
+            return await self._complete_uncached(
+                messages, model, temperature, max_tokens, tools, enable_thinking,
+            )
 
-        if enable_thinking:
-            from aria_engine.thinking import build_thinking_params
-            thinking_params = build_thinking_params(resolved_model, enable=True)
-            kwargs.update(thinking_params)
+        response_cache = self._get_response_cache()
+        requested = model or self.config.default_model
+        effective_temperature = self._temperature(temperature)
+        effective_max_tokens = max_tokens or self.config.default_max_tokens
+        key = cache_key(
+            requested, messages, tools, effective_temperature,
+            effective_max_tokens, enable_thinking,
+        )
+        # Near-duplicate matching only makes sense for deterministic calls
+        semantic = None
+        if effective_temperature == 0:
+            semantic = semantic_scope(
+                requested, messages, tools, effective_max_tokens, enable_thinking,
+            )
 
         start = time.monotonic()
-
-        try:
-            response = await asyncio.wait_for(
-                acompletion(**kwargs),
-                timeout=self.LLM_TIMEOUT,
+        hit = await response_cache.lookup(key, semantic)
+        if hit.payload is not None:
+            return LLMResponse(**{
+                **hit.payload,
+                "cached": True,
+                "latency_ms": int((time.monotonic() - start) * 1000),
+            })
+
+        response = await self._complete_uncached(
+            messages, model, temperature, max_tokens, tools, enable_thinking,
+        )
+        # Tool-call turns are not replayed from cache — the caller would
+        # re-run side-effecting tools against a stale decision.
+        if not response.tool_calls and response.finish_reason != "length":
+            payload = asdict(response)
+            payload.pop("cached", None)
+            await response_cache.store(key, payload, semantic, hit.embedding)
+        return response
+
+    async def _complete_uncached(
+        self,
+        messages: list[dict[str, str]],
+        model: str | None,
+        temperature: float | None,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+        enable_thinking: bool,
+    ) -> LLMResponse:
+        """complete() without the response cache (failover + hedging)."""
+        async def _attempt(cand: _Candidate) -> tuple[Any, int]:
+            kwargs = self._build_kwargs(
+                cand, messages, temperature, max_tokens, tools, enable_thinking,
             )
-            elapsed_ms = int((time.monotonic() - start) * 1000)
-            self._cb.record_success()
-            self._latency_samples.append(elapsed_ms)
-
-            choice = response.choices[0]
-            content = choice.message.content or ""
-            thinking = getattr(choice.message, "reasoning_content", None)
-
-            # Also check for thinking tag extraction
-            if not thinking:
-                from aria_engine.thinking import extract_thinking_from_response
-                thinking = extract_thinking_from_response(response)
-                if thinking:
-                    from aria_engine.thinking import strip_thinking_from_content
-                    content = strip_thinking_from_content(content)
-
-            tool_calls_raw = getattr(choice.message, "tool_calls", None)
-            tool_calls = None
-            if tool_calls_raw:
-                tool_calls = [
-                    {
-                        "id": tc.id,
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    }
-                    for tc in tool_calls_raw
-                ]
-
+            start = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    acompletion(**kwargs),
+                    timeout=self.LLM_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                raise LLMError(f"LLM completion timed out after {self.LLM_TIMEOUT}s")
+            elapsed = time.monotonic() - start
             usage = response.usage or {}
-
-            return LLMResponse(
-                content=content,
-                thinking=thinking,
-                tool_calls=tool_calls,
-                model=resolved_model,
-                input_tokens=getattr(usage, "prompt_tokens", 0),
-                output_tokens=getattr(usage, "completion_tokens", 0),
-                cost_usd=getattr(response, "_hidden_params", {}).get("response_cost", 0.0),
-                latency_ms=elapsed_ms,
-                finish_reason=choice.finish_reason or "",
+            self._record_latency(
+                cand.model, elapsed,
+                output_tokens=getattr(usage, "completion_tokens", 0) or 0,
             )
-
-        except asyncio.TimeoutError:
-            self._cb.record_failure()
-            logger.error("LLM call timed out after %.0fs (failures=%d)", self.LLM_TIMEOUT, self._cb.failure_count)
-            raise LLMError(f"LLM completion timed out after {self.LLM_TIMEOUT}s")
-        except Exception as e:
-            self._cb.record_failure()
-            logger.error("LLM call failed (failures=%d): %s", self._cb.failure_count, e)
-            raise LLMError(f"LLM completion failed: {e}") from e
+            return response, int(elapsed * 1000)
+
+        (response, elapsed_ms), cand = await self._run_with_failover(
+            self._candidates(model), _attempt,
+        )
+        resolved_model = cand.model
+
+        choice = response.choices[0]
+        content = choice.message.content or ""
+        thinking = getattr(choice.message, "reasoning_content", None)
+
+        # Also check for thinking tag extraction
+        if not thinking:
+            from aria_engine.thinking import extract_thinking_from_response
+            thinking = extract_thinking_from_response(response)
+            if thinking:
+                from aria_engine.thinking import strip_thinking_from_content
+                content = strip_thinking_from_content(content)
+
+        tool_calls_raw = getattr(choice.message, "tool_calls", None)
+        tool_calls = None
+        if tool_calls_raw:
+            tool_calls = [
+                {
+                    "id": tc.id,
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments,
+                    },
+                }
+                for tc in tool_calls_raw
+            ]
+
+        usage = response.usage or {}
+
+        return LLMResponse(
+            content=content,
+            thinking=thinking,
+            tool_calls=tool_calls,
+            model=resolved_model,
+            input_tokens=getattr(usage, "prompt_tokens", 0),
+            output_tokens=getattr(usage, "completion_tokens", 0),
+            cost_usd=getattr(response, "_hidden_params", {}).get("response_cost", 0.0),
+            latency_ms=elapsed_ms,
+            finish_reason=choice.finish_reason or "",
+        )
 
     async def stream(
         self,
@@ -263,69 +636,151 @@ class LLMGateway:
         """
         Stream a completion response chunk by chunk.
 
-        Yields StreamChunk objects with content/thinking deltas.
-        """
-        if self._is_circuit_open():
-            raise LLMError("Circuit breaker open — too many consecutive failures")
-
-        resolved_model, model_extra = self._resolve_model(model or self.config.default_model)
-
-        kwargs: dict[str, Any] = {
-            "model": resolved_model,
-            "messages": messages,
-            "temperature": temperature or self.config.default_temperature,
-            "max_tokens": max_tokens or self.config.default_max_tokens,
-            "stream": True,
-            "drop_params": True,  # let litellm drop unsupported params per provider
-        }
-        # Per-model api_key / api_base from models.yaml
-        kwargs.update(model_extra)
-
-        if tools:
-            kwargs["tools"] = tools
-            kwargs["tool_choice"] = "auto"
+        Failover (and hedging) happens until the first chunk arrives; once
+        output has been yielded the stream is committed to that model.
 
-        if enable_thinking:
-            from aria_engine.thinking import build_thinking_params
-            thinking_params = build_thinking_params(resolved_model, enable=True)
-            kwargs.update(thinking_params)
+        Tool-call argument deltas are accumulated per call index; each call
+        is yielded (``tool_call_delta``) once it closes — when the model
+        starts the next call or the stream finishes — so callers can start
+        executing it while later calls are still streaming. A call still
+        open when the output is cut off (finish_reason "length") is dropped.
 
-        try:
-            response = await asyncio.wait_for(
-                acompletion(**kwargs),
-                timeout=self.LLM_TIMEOUT,
+        Yields StreamChunk objects with content/thinking deltas, then one
+        final usage-only chunk.
+        """
+        async def _attempt(cand: _Candidate) -> tuple[Any, Any, float, float]:
+            kwargs = self._build_kwargs(
+                cand, messages, temperature, max_tokens, tools, enable_thinking,
+                stream=True,
             )
-
-            async for chunk in response:
-                delta = chunk.choices[0].delta if chunk.choices else None
-                if not delta:
-                    continue
-
-                yield StreamChunk(
-                    content=getattr(delta, "content", "") or "",
-                    thinking=getattr(delta, "reasoning_content", "") or "",
-                    tool_call_delta=None,  # TODO: streaming tool calls
-                    finish_reason=chunk.choices[0].finish_reason,
-                    is_thinking=bool(getattr(delta, "reasoning_content", "")),
+            start = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    acompletion(**kwargs),
+                    timeout=self.LLM_TIMEOUT,
                 )
-
-            self._circuit_failures = 0
-
-        except asyncio.TimeoutError:
-            self._circuit_failures += 1
-            if self._circuit_failures >= self._circuit_threshold:
-                self._circuit_opened_at = time.monotonic()
-            raise LLMError(f"LLM streaming timed out after {self.LLM_TIMEOUT}s")
+                iterator = response.__aiter__()
+                first = await asyncio.wait_for(
+                    anext(iterator, None),
+                    timeout=max(self.LLM_TIMEOUT - (time.monotonic() - start), 1.0),
+                )
+            except asyncio.TimeoutError:
+                raise LLMError(f"LLM streaming timed out after {self.LLM_TIMEOUT}s")
+            return iterator, first, start, time.monotonic() - start
+
+        async def _discard(result: tuple[Any, Any, float, float]) -> None:
+            aclose = getattr(result[0], "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception:
+                    pass
+
+        (iterator, first, start, ttft), cand = await self._run_with_failover(
+            self._candidates(model), _attempt, discard=_discard, hedge_on="ttft",
+        )
+
+        # Output tokens: provider usage if the stream reports it, otherwise
+        # one per content/thinking delta (providers stream ~1 token per delta)
+        deltas = 0
+        reported_tokens = 0
+        prompt_tokens = 0
+        tool_calls = _ToolCallAssembler()
+        try:
+            chunk = first
+            while chunk is not None:
+                usage = getattr(chunk, "usage", None)
+                if usage is not None:
+                    reported_tokens = getattr(usage, "completion_tokens", 0) or reported_tokens
+                    prompt_tokens = getattr(usage, "prompt_tokens", 0) or prompt_tokens
+                delta = chunk.choices[0].delta if chunk.choices else None
+                finish_reason = chunk.choices[0].finish_reason if chunk.choices else None
+                if delta:
+                    if getattr(delta, "content", None) or getattr(delta, "reasoning_content", None):
+                        deltas += 1
+                    closed = tool_calls.feed(getattr(delta, "tool_calls", None))
+                    if finish_reason == "length":
+                        tool_calls.discard()
+                    elif finish_reason:
+                        closed += tool_calls.flush()
+                    yield StreamChunk(
+                        content=getattr(delta, "content", "") or "",
+                        thinking=getattr(delta, "reasoning_content", "") or "",
+                        finish_reason=finish_reason,
+                        is_thinking=bool(getattr(delta, "reasoning_content", "")),
+                    )
+                    for call in closed:
+                        yield StreamChunk(tool_call_delta=call)
+                elif finish_reason == "length":
+                    tool_calls.discard()
+                elif finish_reason:
+                    for call in tool_calls.flush():
+                        yield StreamChunk(tool_call_delta=call)
+                chunk = await anext(iterator, None)
+            for call in tool_calls.flush():
+                yield StreamChunk(tool_call_delta=call)
         except Exception as e:
-            self._circuit_failures += 1
-            if self._circuit_failures >= self._circuit_threshold:
-                self._circuit_opened_at = time.monotonic()
+            self._record_outcome(cand.model, ok=False)
             raise LLMError(f"LLM streaming failed: {e}") from e
+        output_tokens = reported_tokens or deltas
+        self._record_latency(
+            cand.model, time.monotonic() - start,
+            ttft=ttft, output_tokens=output_tokens,
+        )
+        if not prompt_tokens:
+            try:
+                prompt_tokens = token_counter(model=cand.model, messages=messages)
+            except Exception:
+                prompt_tokens = 0
+        yield StreamChunk(
+            input_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            cost_usd=self._stream_cost(cand.model, prompt_tokens, output_tokens),
+        )
+
+    @staticmethod
+    def _stream_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+        """Cost of a streamed call from litellm's price map (0.0 if unpriced)."""
+        try:
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=model, prompt_tokens=input_tokens, completion_tokens=output_tokens,
+            )
+        except Exception:
+            return 0.0
+        return float(prompt_cost + completion_cost)
 
     def get_stats(self) -> dict[str, Any]:
         """Return gateway statistics."""
         return {
-            "circuit_failures": self._circuit_failures,
+            "circuit_failures": sum(cb.failure_count for cb in self._breakers.values()),
             "circuit_open": self._is_circuit_open(),
-            "latency_samples": len(self._latency_samples),
+            "circuits": {
+                model: {"state": cb.state, "failures": cb.failure_count}
+                for model, cb in self._breakers.items()
+            },
+            "fallbacks_used": self._fallbacks_used,
+            "hedges_started": self._hedges_started,
+            "response_cache": (
+                self._response_cache.get_stats() if self._response_cache else None
+            ),
+            "latency": {
+                model: stats.snapshot() for model, stats in self._latency.items()
+            },
         }
+
+
+# ── Process-wide instance ─────────────────────────────────────────────────────
+
+_gateway: LLMGateway | None = None
+
+
+def get_llm_gateway(config: EngineConfig | None = None) -> LLMGateway:
+    """Get (or lazily create) the process-wide gateway (first caller's config wins).
+
+    Sharing one instance shares its circuit breakers, latency stats and
+    response cache between the chat engine and helper callers.
+    """
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway(config or EngineConfig())
+    return _gateway
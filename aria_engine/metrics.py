@@ -87,12 +87,28 @@ class AriaMetrics:
 
         self.llm_request_duration = Histogram(
             "aria_llm_request_duration_seconds",
-            "LLM request duration (time to first token for streaming)",
+            "LLM request duration (full response, streaming included)",
             ["model"],
             buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
             registry=reg,
         )
 
+        self.llm_time_to_first_token = Histogram(
+            "aria_llm_time_to_first_token_seconds",
+            "Time from request to first streamed chunk",
+            ["model"],
+            buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+            registry=reg,
+        )
+
+        self.llm_tokens_per_second = Histogram(
+            "aria_llm_tokens_per_second",
+            "LLM output throughput (tokens/s after the first token)",
+            ["model"],
+            buckets=[1, 5, 10, 20, 40, 80, 160, 320],
+            registry=reg,
+        )
+
         self.llm_tokens_input = Counter(
             "aria_llm_tokens_input_total",
             "Total input tokens sent to LLM",
@@ -121,6 +137,13 @@ class AriaMetrics:
             registry=reg,
         )
 
+        self.llm_cache_requests = Counter(
+            "aria_llm_cache_requests_total",
+            "LLM response cache lookups by result",
+            ["result"],
+            registry=reg,
+        )
+
         self.llm_thinking_duration = Histogram(
             "aria_llm_thinking_duration_seconds",
             "Duration of thinking/reasoning phase",
@@ -140,7 +163,7 @@ class AriaMetrics:
         self.agent_routing_duration = Histogram(
             "aria_agent_routing_duration_seconds",
             "Time to make routing decision",
-            buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5],
+            buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5],
             registry=reg,
         )
 
@@ -191,6 +214,26 @@ class AriaMetrics:
             registry=reg,
         )
 
+        # -- Transcript cache metrics --
+        self.transcript_cache_requests = Counter(
+            "aria_transcript_cache_requests_total",
+            "Context-build transcript lookups by result",
+            ["result"],
+            registry=reg,
+        )
+
+        self.transcript_cache_evictions = Counter(
+            "aria_transcript_cache_evictions_total",
+            "Sessions evicted from the transcript cache (LRU)",
+            registry=reg,
+        )
+
+        self.transcript_cache_sessions = Gauge(
+            "aria_transcript_cache_sessions",
+            "Sessions currently held in the transcript cache",
+            registry=reg,
+        )
+
         # -- Scheduler metrics --
         self.scheduler_jobs_total = Gauge(
             "aria_scheduler_jobs_total",
@@ -221,6 +264,40 @@ class AriaMetrics:
             registry=reg,
         )
 
+        self.scheduler_queue_depth = Gauge(
+            "aria_scheduler_queue_depth",
+            "Scheduled runs waiting for an execution slot",
+            ["priority"],
+            registry=reg,
+        )
+
+        self.scheduler_queue_wait = Histogram(
+            "aria_scheduler_queue_wait_seconds",
+            "Time a ready run waited for an execution slot",
+            ["priority"],
+            buckets=[0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0],
+            registry=reg,
+        )
+
+        self.scheduler_slots_in_use = Gauge(
+            "aria_scheduler_slots_in_use",
+            "Scheduler execution slots currently occupied",
+            registry=reg,
+        )
+
+        self.scheduler_slot_utilization = Gauge(
+            "aria_scheduler_slot_utilization",
+            "Occupied / total scheduler execution slots",
+            registry=reg,
+        )
+
+        self.scheduler_budget_used = Gauge(
+            "aria_scheduler_budget_used",
+            "Tokens / USD spent by scheduled jobs in the current budget window",
+            ["resource"],
+            registry=reg,
+        )
+
         # -- Skill metrics --
         self.skill_execution_total = Counter(
             "aria_skill_executions_total",
@@ -265,6 +342,33 @@ class AriaMetrics:
             registry=reg,
         )
 
+        # -- Telemetry writer metrics --
+        self.telemetry_queue_depth = Gauge(
+            "aria_telemetry_queue_depth",
+            "Telemetry rows waiting to be flushed",
+            registry=reg,
+        )
+
+        self.telemetry_flush_duration = Gauge(
+            "aria_telemetry_flush_duration_seconds",
+            "Duration of the most recent telemetry flush",
+            registry=reg,
+        )
+
+        self.telemetry_rows_written = Counter(
+            "aria_telemetry_rows_written_total",
+            "Telemetry rows written by table",
+            ["table"],
+            registry=reg,
+        )
+
+        self.telemetry_rows_dropped = Counter(
+            "aria_telemetry_rows_dropped_total",
+            "Telemetry rows dropped because the queue was full",
+            ["table"],
+            registry=reg,
+        )
+
         # -- Error metrics --
         self.errors_total = Counter(
             "aria_errors_total",
@@ -0,0 +1,203 @@
+"""
+Pattern Scan — Literal-prefiltered multi-rule regex scanning.
+
+The API security middleware and PromptGuard run a list of injection
+regexes over every input. With IGNORECASE most of them lose the regex
+engine's literal fast path, so each rule walks the whole text even
+though benign input almost never contains their keywords.
+
+Features:
+- Required literals are derived from each compiled pattern (``ignore``,
+  ``<script``, ``--`` ...) and checked with plain substring search on a
+  lower-cased copy of the text — rules whose literals are absent are
+  never run
+- search(): first matching rule (in rule order), with the match
+- findall(): every matching rule with its matches
+- search_strings(): one pass over many strings (JSON keys / values) —
+  the prefilter runs once on all of them, each string is scanned once
+- Patterns the prefilter can't reason about always run (never a false
+  negative)
+
+A single combined alternation was measured slower than separate
+searches on CPython's ``re`` (it retries every branch at every offset),
+which is why the rules stay separate behind the prefilter.
+
+Usage:
+    scanner = PatternScanner([("xss", re.compile(r"<script[^>]*>", re.I))])
+    hit = scanner.search(text)
+    if hit is not None:
+        reject(hit.label)
+"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants
+    import sre_parse
+
+logger = logging.getLogger("aria.engine.pattern_scan")
+
+# Requirement: at least one literal of each frozenset must occur in the text
+Requirements = tuple[frozenset[str], ...]
+
+# Non-ASCII characters that IGNORECASE matches against ASCII letters but
+# str.lower() doesn't map onto them (found by exhaustive search)
+_CASE_EXTRAS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u212a": "k", "\u017f": "s"})
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+
+def _literal(code: int) -> str | None:
+    char = chr(code)
+    return char.lower() if char.isascii() else None
+
+
+def _best(requirements: list[frozenset[str]]) -> frozenset[str] | None:
+    """Most selective single requirement: longest shortest literal, fewest options."""
+    if not requirements:
+        return None
+    return max(requirements, key=lambda s: (min(map(len, s)), -len(s)))
+
+
+def _sequence(items: Any) -> list[frozenset[str]]:
+    """Requirements of a parsed sequence (literal runs + mandatory sub-items)."""
+    requirements: list[frozenset[str]] = []
+    run: list[str] = []
+
+    def close_run() -> None:
+        if run:
+            requirements.append(frozenset({"".join(run)}))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            char = _literal(av)
+            if char is not None:
+                run.append(char)
+                continue
+            close_run()
+            continue
+        close_run()
+        if op is sre_constants.SUBPATTERN:
+            requirements.extend(_sequence(av[-1]))
+        elif getattr(sre_constants, "ATOMIC_GROUP", None) is op:
+            requirements.extend(_sequence(av))
+        elif op in _REPEATS and av[0] >= 1:
+            requirements.extend(_sequence(av[2]))
+        elif op is sre_constants.BRANCH:
+            options: set[str] = set()
+            for alternative in av[1]:
+                best = _best(_sequence(alternative))
+                if best is None:
+                    break
+                options |= best
+            else:
+                requirements.append(frozenset(options))
+        elif op is sre_constants.IN:
+            chars = [_literal(v) if o is sre_constants.LITERAL else None for o, v in av]
+            if chars and None not in chars:
+                requirements.append(frozenset(chars))
+    close_run()
+    return requirements
+
+
+def required_literals(pattern: re.Pattern) -> Requirements:
+    """
+    Lower-cased literals a match of ``pattern`` must contain.
+
+    Each returned set is a disjunction; all sets must be satisfied. An
+    empty tuple means "no usable literal" and the pattern always runs.
+    """
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception as e:  # pragma: no cover - pattern compiled already
+        logger.debug("Cannot derive literals for %r: %s", pattern.pattern, e)
+        return ()
+    return tuple(dict.fromkeys(_sequence(parsed)))
+
+
+def _fold(text: str) -> str:
+    """Lower-case ``text`` for the literal prefilter."""
+    if not text.isascii():
+        text = text.translate(_CASE_EXTRAS)
+    return text.lower()
+
+
+@dataclass(frozen=True)
+class ScanMatch:
+    """A rule that matched: its label, pattern and the match object."""
+    label: Any
+    pattern: re.Pattern
+    match: re.Match
+
+
+class PatternScanner:
+    """Ordered (label, compiled pattern) rules behind a literal prefilter."""
+
+    def __init__(self, rules: Iterable[tuple[Any, re.Pattern]]):
+        self.rules = [(label, pattern, required_literals(pattern)) for label, pattern in rules]
+
+    def _active(self, lowered: str) -> Iterator[tuple[Any, re.Pattern]]:
+        for label, pattern, requirements in self.rules:
+            if all(any(lit in lowered for lit in options) for options in requirements):
+                yield label, pattern
+
+    def search(self, text: str) -> ScanMatch | None:
+        """First rule (in rule order) that matches ``text``."""
+        if not text:
+            return None
+        for label, pattern in self._active(_fold(text)):
+            match = pattern.search(text)
+            if match is not None:
+                return ScanMatch(label, pattern, match)
+        return None
+
+    def findall(self, text: str) -> list[tuple[Any, re.Pattern, list]]:
+        """Every matching rule with its ``pattern.findall(text)`` result."""
+        if not text:
+            return []
+        hits = []
+        for label, pattern in self._active(_fold(text)):
+            matches = pattern.findall(text)
+            if matches:
+                hits.append((label, pattern, matches))
+        return hits
+
+    def search_strings(self, strings: Iterable[str]) -> ScanMatch | None:
+        """
+        First rule matching any of ``strings`` (each scanned on its own).
+
+        Rules are tried in order; for each rule the strings in order.
+        """
+        strings = [s for s in strings if s]
+        if not strings:
+            return None
+        active = list(self._active(_fold("\x00".join(strings))))
+        for label, pattern in active:
+            for text in strings:
+                match = pattern.search(text)
+                if match is not None:
+                    return ScanMatch(label, pattern, match)
+        return None
+
+
+def iter_json_strings(data: Any) -> Iterator[str]:
+    """Every string key and value in a decoded JSON document (any depth)."""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            for key, value in reversed(list(item.items())):
+                stack.append(value)
+                stack.append(key)
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
@@ -0,0 +1,313 @@
+"""
+Rate Limit — Bucketed sliding-window counters with pluggable stores.
+
+Every rate limiter in the stack (API security middleware, aria_mind
+security, session protection) used to keep a list of request timestamps
+per key, rebuild it on every check and scan it once per window. This
+module replaces those lists with fixed sub-window rings.
+
+Features:
+- SlidingCounter: ring of ``buckets`` sub-window counts with a running
+  total — O(1) add / count, constant memory per key and window
+- SlidingWindow: one key's counters for several windows (burst/min/hour)
+- Window + SlidingWindowLimiter: check-and-record against a set of limits
+- Pluggable RateLimitStore:
+  - MemoryStore: per-process, LRU with idle-key eviction
+  - PostgresStore: per-bucket rows in aria_engine.rate_limit_buckets so
+    limits hold across uvicorn workers / containers
+- Counts are approximate by at most one sub-window (window / buckets)
+
+Usage:
+    limiter = SlidingWindowLimiter([
+        Window("burst", 5, 10),
+        Window("minute", 60, 300),
+    ])
+    violated = limiter.check_sync("10.0.0.1")          # MemoryStore only
+    violated = await limiter.check("10.0.0.1")          # any store
+    if violated is not None:
+        reject(violated.name)
+"""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Sequence
+
+logger = logging.getLogger("aria.engine.rate_limit")
+
+DEFAULT_BUCKETS = 60
+DEFAULT_WINDOWS = (5.0, 60.0, 3600.0)
+DEFAULT_MAX_KEYS = 100_000
+
+
+class SlidingCounter:
+    """Approximate event count over the last ``window`` seconds."""
+
+    __slots__ = ("window", "buckets", "width", "_counts", "_head", "_total")
+
+    def __init__(self, window: float, buckets: int = DEFAULT_BUCKETS):
+        self.window = window
+        self.buckets = buckets
+        self.width = window / buckets
+        self._counts = [0] * buckets
+        self._head: int | None = None  # absolute index of the newest bucket
+        self._total = 0
+
+    def add(self, n: int = 1, now: float | None = None) -> None:
+        """Record ``n`` events at ``now`` (events older than the window are ignored)."""
+        index = self._advance(time.time() if now is None else now)
+        if self._head - index >= self.buckets:
+            return
+        self._counts[index % self.buckets] += n
+        self._total += n
+
+    def count(self, now: float | None = None) -> int:
+        """Events in the window ending at ``now``."""
+        self._advance(time.time() if now is None else now)
+        return self._total
+
+    def _advance(self, now: float) -> int:
+        """Expire buckets that slid out of the window; returns now's bucket index."""
+        index = int(now // self.width)
+        if self._head is None:
+            self._head = index
+        elif index > self._head:
+            if index - self._head >= self.buckets:
+                self._counts = [0] * self.buckets
+                self._total = 0
+            else:
+                for i in range(self._head + 1, index + 1):
+                    slot = i % self.buckets
+                    self._total -= self._counts[slot]
+                    self._counts[slot] = 0
+            self._head = index
+        return index
+
+
+class SlidingWindow:
+    """Sliding-window counters for a single key across several windows."""
+
+    __slots__ = ("_counters", "last_seen")
+
+    def __init__(
+        self,
+        windows: Iterable[float] = DEFAULT_WINDOWS,
+        buckets: int = DEFAULT_BUCKETS,
+    ):
+        self._counters = {float(w): SlidingCounter(float(w), buckets) for w in windows}
+        self.last_seen = 0.0
+
+    def add(self, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        self.last_seen = max(self.last_seen, now)
+        for counter in self._counters.values():
+            counter.add(1, now)
+
+    def count_in_window(self, window_seconds: float, now: float | None = None) -> int:
+        counter = self._counters.get(float(window_seconds))
+        if counter is None:
+            raise ValueError(
+                f"Window {window_seconds}s not tracked (have {sorted(self._counters)})"
+            )
+        return counter.count(now)
+
+    @property
+    def max_window(self) -> float:
+        return max(self._counters)
+
+
+@dataclass(frozen=True)
+class Window:
+    """One limit: at most ``limit`` events per ``seconds``."""
+    name: str
+    seconds: float
+    limit: int
+
+
+# ── Stores ────────────────────────────────────────────────────────────────────
+
+class RateLimitStore:
+    """Backend interface: per-key counts for a set of windows."""
+
+    async def counts(self, key: str, windows: Sequence[float], now: float) -> list[int]:
+        raise NotImplementedError
+
+    async def add(self, key: str, windows: Sequence[float], now: float) -> None:
+        raise NotImplementedError
+
+
+class MemoryStore(RateLimitStore):
+    """
+    In-process store. Keys unused for longer than their largest window are
+    evicted (oldest first), as is anything beyond ``max_keys``.
+    """
+
+    def __init__(
+        self,
+        buckets: int = DEFAULT_BUCKETS,
+        max_keys: int = DEFAULT_MAX_KEYS,
+    ):
+        self.buckets = buckets
+        self.max_keys = max_keys
+        self._keys: OrderedDict[str, SlidingWindow] = OrderedDict()
+
+    def window_for(self, key: str, windows: Sequence[float], now: float) -> SlidingWindow:
+        """The key's SlidingWindow (created on first use), marked recently used."""
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = SlidingWindow(windows, self.buckets)
+            self._keys[key] = entry
+        else:
+            self._keys.move_to_end(key)
+        entry.last_seen = max(entry.last_seen, now)
+        self._evict(now)
+        return entry
+
+    def counts_sync(self, key: str, windows: Sequence[float], now: float) -> list[int]:
+        entry = self._keys.get(key)
+        if entry is None:
+            return [0] * len(windows)
+        return [entry.count_in_window(w, now) for w in windows]
+
+    def add_sync(self, key: str, windows: Sequence[float], now: float) -> None:
+        self.window_for(key, windows, now).add(now)
+
+    async def counts(self, key: str, windows: Sequence[float], now: float) -> list[int]:
+        return self.counts_sync(key, windows, now)
+
+    async def add(self, key: str, windows: Sequence[float], now: float) -> None:
+        self.add_sync(key, windows, now)
+
+    def get(self, key: str) -> SlidingWindow | None:
+        return self._keys.get(key)
+
+    def evict_idle(self, now: float, max_age_seconds: float) -> int:
+        """Drop keys not seen for ``max_age_seconds``; returns how many."""
+        stale = [k for k, e in self._keys.items() if now - e.last_seen > max_age_seconds]
+        for key in stale:
+            del self._keys[key]
+        return len(stale)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _evict(self, now: float) -> None:
+        while self._keys:
+            key, entry = next(iter(self._keys.items()))
+            if len(self._keys) <= self.max_keys and now - entry.last_seen <= entry.max_window:
+                break
+            del self._keys[key]
+
+
+class PostgresStore(RateLimitStore):
+    """
+    Shared store: one row per (key, window, bucket) in
+    aria_engine.rate_limit_buckets. Expired buckets are pruned every
+    ``prune_every`` writes. Errors fail open (count 0, write skipped).
+    """
+
+    TABLE = "aria_engine.rate_limit_buckets"
+
+    def __init__(self, db_factory, buckets: int = DEFAULT_BUCKETS, prune_every: int = 1000):
+        self.db_factory = db_factory
+        self.buckets = buckets
+        self.prune_every = prune_every
+        self._writes = 0
+
+    def _bucket(self, window: float, now: float) -> int:
+        return int(now // (window / self.buckets))
+
+    async def counts(self, key: str, windows: Sequence[float], now: float) -> list[int]:
+        from sqlalchemy import text
+
+        clauses, params = [], {"key": key}
+        for i, w in enumerate(windows):
+            clauses.append(f"(window_seconds = :w{i} AND bucket > :b{i})")
+            params[f"w{i}"] = int(w)
+            params[f"b{i}"] = self._bucket(w, now) - self.buckets
+        try:
+            async with self.db_factory() as db:
+                rows = await db.execute(text(
+                    f"SELECT window_seconds, SUM(count) FROM {self.TABLE} "
+                    f"WHERE key = :key AND ({' OR '.join(clauses)}) GROUP BY window_seconds"
+                ), params)
+                totals = {int(w): int(c) for w, c in rows.all()}
+        except Exception as e:
+            logger.debug("Rate limit store read failed (fail open): %s", e)
+            return [0] * len(windows)
+        return [totals.get(int(w), 0) for w in windows]
+
+    async def add(self, key: str, windows: Sequence[float], now: float) -> None:
+        from sqlalchemy import text
+
+        values, params = [], {"key": key}
+        for i, w in enumerate(windows):
+            values.append(f"(:key, :w{i}, :b{i}, 1, :e{i})")
+            params[f"w{i}"] = int(w)
+            params[f"b{i}"] = self._bucket(w, now)
+            params[f"e{i}"] = datetime.fromtimestamp(now + w, timezone.utc)
+        try:
+            async with self.db_factory() as db:
+                await db.execute(text(
+                    f"INSERT INTO {self.TABLE} AS b (key, window_seconds, bucket, count, expires_at) "
+                    f"VALUES {', '.join(values)} "
+                    f"ON CONFLICT (key, window_seconds, bucket) DO UPDATE SET count = b.count + 1"
+                ), params)
+                self._writes += 1
+                if self._writes % self.prune_every == 0:
+                    await db.execute(text(f"DELETE FROM {self.TABLE} WHERE expires_at < NOW()"))
+                await db.commit()
+        except Exception as e:
+            logger.debug("Rate limit store write failed (fail open): %s", e)
+
+
+# ── Limiter ───────────────────────────────────────────────────────────────────
+
+class SlidingWindowLimiter:
+    """Check-and-record a key against several windows on one store."""
+
+    def __init__(self, windows: Sequence[Window], store: RateLimitStore | None = None):
+        self.windows = list(windows)
+        self.store = store if store is not None else MemoryStore()
+        self._seconds = [w.seconds for w in self.windows]
+
+    def _violated(self, counts: list[int]) -> Window | None:
+        for window, count in zip(self.windows, counts):
+            if count >= window.limit:
+                return window
+        return None
+
+    async def check(self, key: str, now: float | None = None) -> Window | None:
+        """First window at its limit (nothing recorded), or None after recording."""
+        now = time.time() if now is None else now
+        violated = self._violated(await self.store.counts(key, self._seconds, now))
+        if violated is None:
+            await self.store.add(key, self._seconds, now)
+        return violated
+
+    def check_sync(self, key: str, now: float | None = None) -> Window | None:
+        """Synchronous check() — requires a MemoryStore."""
+        if not isinstance(self.store, MemoryStore):
+            raise TypeError("check_sync() needs a MemoryStore; use await check()")
+        now = time.time() if now is None else now
+        violated = self._violated(self.store.counts_sync(key, self._seconds, now))
+        if violated is None:
+            self.store.add_sync(key, self._seconds, now)
+        return violated
+
+    def counts_sync(self, key: str, now: float | None = None) -> dict[str, int]:
+        """Current count per window name (MemoryStore)."""
+        now = time.time() if now is None else now
+        counts = self.store.counts_sync(key, self._seconds, now)
+        return {w.name: c for w, c in zip(self.windows, counts)}
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "windows": {w.name: {"seconds": w.seconds, "limit": w.limit} for w in self.windows},
+            "store": type(self.store).__name__,
+            "keys": len(self.store) if isinstance(self.store, MemoryStore) else None,
+        }
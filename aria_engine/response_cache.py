@@ -0,0 +1,331 @@
+"""
+Response Cache — Opt-in exact / semantic cache for LLMGateway.complete().
+
+Routing/classification prompts, sentiment fallbacks and repeated work
+cycles send the same (or nearly the same) request over and over. This
+module serves those from cache instead of paying for another completion.
+
+Features:
+- Exact match on a SHA-256 of (model, messages, tools, temperature,
+  max_tokens, thinking)
+- Optional semantic match for temperature-0 calls: same conversation
+  prefix / model / tools, last user message within a cosine-similarity
+  threshold (embedding function injected by the gateway)
+- In-memory LRU with TTL, plus an optional on-disk SQLite tier that
+  survives restarts and is shared by processes on the same volume
+- Hit / miss counters and saved tokens / cost for telemetry
+
+Usage:
+    cache = ResponseCache(max_entries=1024, ttl_seconds=3600)
+    key = cache_key(model, messages, tools, temperature, max_tokens, False)
+    hit = await cache.lookup(key)
+    if hit.payload is None:
+        payload = ...  # call the LLM
+        await cache.store(key, payload)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from aria_engine.metrics import METRICS
+
+logger = logging.getLogger("aria.engine.response_cache")
+
+# Defaults — override via EngineConfig.llm_response_cache_* settings
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_DISK_MAX_ROWS = 50_000
+
+# Semantic candidates kept per conversation scope
+SEMANTIC_MAX_PER_SCOPE = 64
+
+Embedder = Callable[[str], Awaitable[list[float]]]
+
+
+def _digest(obj: Any) -> str:
+    raw = json.dumps(obj, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def cache_key(
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    temperature: float,
+    max_tokens: int,
+    enable_thinking: bool,
+) -> str:
+    """Exact-match key for a completion request."""
+    return _digest({
+        "model": model,
+        "messages": messages,
+        "tools": tools or [],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "thinking": enable_thinking,
+    })
+
+
+def semantic_scope(
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    max_tokens: int,
+    enable_thinking: bool,
+) -> tuple[str, str] | None:
+    """
+    (scope key, query text) for semantic matching, or None.
+
+    The scope is everything except the last user message's text, so only
+    requests that differ in that one message are compared.
+    """
+    if not messages or messages[-1].get("role") != "user":
+        return None
+    query = messages[-1].get("content")
+    if not isinstance(query, str) or not query.strip():
+        return None
+    scope = _digest({
+        "model": model,
+        "prefix": messages[:-1],
+        "tools": tools or [],
+        "max_tokens": max_tokens,
+        "thinking": enable_thinking,
+    })
+    return scope, query
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a))
+    nb = math.sqrt(sum(y * y for y in b))
+    return dot / (na * nb) if na and nb else 0.0
+
+
+@dataclass
+class CacheLookup:
+    """Result of ResponseCache.lookup()."""
+    payload: dict[str, Any] | None = None
+    kind: str = "miss"  # "memory" | "disk" | "semantic" | "miss"
+    embedding: list[float] | None = None  # query embedding, reused by store()
+
+
+class _DiskTier:
+    """SQLite-backed second tier (blocking calls run in a worker thread)."""
+
+    def __init__(self, path: str, max_rows: int = DEFAULT_DISK_MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._writes = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                " key TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _get(self, key: str) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM llm_response_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _put(self, key: str, payload: dict[str, Any], expires_at: float) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload, default=str), expires_at, now),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM llm_response_cache WHERE key IN ("
+                    " SELECT key FROM llm_response_cache ORDER BY created_at DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, payload: dict[str, Any], expires_at: float) -> None:
+        await asyncio.to_thread(self._put, key, payload, expires_at)
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + optional disk) cache of completion payloads.
+
+    Payloads are plain dicts (LLMResponse fields) so they serialize to the
+    disk tier unchanged. Tier failures are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        disk_path: str | None = None,
+        similarity_threshold: float = 0.0,
+        embed: Embedder | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self._memory: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._semantic: OrderedDict[str, list[tuple[list[float], str]]] = OrderedDict()
+        self._disk: _DiskTier | None = None
+        if disk_path:
+            try:
+                self._disk = _DiskTier(disk_path)
+            except Exception as e:
+                logger.warning("Response cache disk tier disabled (%s): %s", disk_path, e)
+        self._hits: dict[str, int] = {"memory": 0, "disk": 0, "semantic": 0}
+        self._misses = 0
+        self._saved_tokens = 0
+        self._saved_cost_usd = 0.0
+
+    # ── Lookup / store ───────────────────────────────────────────
+
+    async def lookup(
+        self,
+        key: str,
+        semantic: tuple[str, str] | None = None,
+    ) -> CacheLookup:
+        """
+        Find a cached payload: memory, then disk, then semantic neighbours.
+
+        Args:
+            key: cache_key() of the request.
+            semantic: semantic_scope() result; only pass it for
+                      deterministic (temperature-0) requests.
+        """
+        payload = self._memory_get(key)
+        if payload is not None:
+            return self._hit("memory", payload)
+
+        if self._disk is not None:
+            try:
+                payload = await self._disk.get(key)
+            except Exception as e:
+                logger.debug("Response cache disk read failed: %s", e)
+                payload = None
+            if payload is not None:
+                self._memory_put(key, payload, time.time() + self.ttl_seconds)
+                return self._hit("disk", payload)
+
+        embedding = None
+        if semantic and self.embed and self.similarity_threshold > 0:
+            scope, query = semantic
+            embedding = await self._embed(query)
+            if embedding is not None:
+                best_key, best_score = None, self.similarity_threshold
+                for vector, candidate in self._semantic.get(scope, ()):
+                    score = _cosine(embedding, vector)
+                    if score >= best_score:
+                        best_key, best_score = candidate, score
+                if best_key is not None:
+                    payload = self._memory_get(best_key)
+                    if payload is not None:
+                        return self._hit("semantic", payload)
+
+        self._misses += 1
+        METRICS.llm_cache_requests.labels(result="miss").inc()
+        return CacheLookup(embedding=embedding)
+
+    async def store(
+        self,
+        key: str,
+        payload: dict[str, Any],
+        semantic: tuple[str, str] | None = None,
+        embedding: list[float] | None = None,
+    ) -> None:
+        """Cache a payload in every tier (and index it for semantic lookup)."""
+        expires_at = time.time() + self.ttl_seconds
+        self._memory_put(key, payload, expires_at)
+        if semantic and embedding is not None:
+            candidates = self._semantic.setdefault(semantic[0], [])
+            candidates.append((embedding, key))
+            del candidates[:-SEMANTIC_MAX_PER_SCOPE]
+            self._semantic.move_to_end(semantic[0])
+            while len(self._semantic) > self.max_entries:
+                self._semantic.popitem(last=False)
+        if self._disk is not None:
+            try:
+                await self._disk.put(key, payload, expires_at)
+            except Exception as e:
+                logger.debug("Response cache disk write failed: %s", e)
+
+    def record_bypass(self) -> None:
+        METRICS.llm_cache_requests.labels(result="bypass").inc()
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (disk entries expire by TTL)."""
+        self._memory.clear()
+        self._semantic.clear()
+
+    # ── Introspection ────────────────────────────────────────────
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return cache statistics for monitoring."""
+        hits = sum(self._hits.values())
+        total = hits + self._misses
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_tier": self._disk.path if self._disk else None,
+            "hits": dict(self._hits),
+            "misses": self._misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "saved_tokens": self._saved_tokens,
+            "saved_cost_usd": round(self._saved_cost_usd, 6),
+        }
+
+    # ── Internals ────────────────────────────────────────────────
+
+    def _hit(self, kind: str, payload: dict[str, Any]) -> CacheLookup:
+        self._hits[kind] += 1
+        self._saved_tokens += payload.get("input_tokens", 0) + payload.get("output_tokens", 0)
+        self._saved_cost_usd += payload.get("cost_usd", 0.0) or 0.0
+        METRICS.llm_cache_requests.labels(result=f"{kind}_hit").inc()
+        return CacheLookup(payload=payload, kind=kind)
+
+    def _memory_get(self, key: str) -> dict[str, Any] | None:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return payload
+
+    def _memory_put(self, key: str, payload: dict[str, Any], expires_at: float) -> None:
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _embed(self, text: str) -> list[float] | None:
+        try:
+            return await self.embed(text)
+        except Exception as e:
+            logger.debug("Response cache embedding failed (semantic match skipped): %s", e)
+            return None
@@ -1,21 +1,27 @@
 """
-Engine Roundtable — multi-agent collaborative discussion using TaskGroup.
+Engine Roundtable — multi-agent collaborative discussion.
 
 Ports roundtable logic from aria_agents/coordinator.py with:
-- Structured concurrency via asyncio.TaskGroup (Python 3.11+)
+- Concurrent agent turns per round, streamed to callers as they finish
+  (on_turn callback, or the stream() async iterator)
+- Incremental rounds: a round can close once a quorum of agents has
+  answered or a soft deadline has passed; stragglers keep running and
+  their answers are collected in the next round (the agent is not
+  re-prompted while it is still answering)
 - Proper agent pool integration (S4-01)
 - Session isolation per roundtable (S4-02)
-- All turns persisted to chat_messages
-- Per-agent timeout handling with ExceptionGroup
+- All turns persisted to chat_messages, one batched write per round
+- Per-agent timeout handling
 - Pheromone score updates after each contribution
 - Configurable rounds, timeout, and synthesis
 """
 import asyncio
 import logging
+import math
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, AsyncIterator
 from uuid import uuid4
 
 from sqlalchemy import select, func, and_
@@ -28,6 +34,7 @@ from aria_engine.config import EngineConfig
 from aria_engine.exceptions import EngineError
 from aria_engine.routing import EngineRouter
 from aria_engine.session_isolation import AgentSessionScope
+from aria_engine.transcript_cache import get_transcript_cache
 
 logger = logging.getLogger("aria.engine.roundtable")
 
@@ -96,6 +103,35 @@ class RoundtableResult:
         }
 
 
+def _quorum_count(quorum: int | float | None, participants: int) -> int:
+    """Answers needed to close a round: count, fraction of participants, or all."""
+    if quorum is None or participants == 0:
+        return participants
+    if isinstance(quorum, float) and 0 < quorum <= 1:
+        needed = math.ceil(quorum * participants)
+    else:
+        needed = int(quorum)
+    return max(1, min(needed, participants))
+
+
+async def _cancel_tasks(tasks: Any) -> None:
+    """Cancel ``tasks`` and wait until they have finished unwinding."""
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _emit_turn(on_turn: Any, turn: RoundtableTurn) -> None:
+    """Invoke the per-turn callback, never letting it break the round."""
+    if on_turn is None:
+        return
+    try:
+        await on_turn(turn)
+    except Exception:
+        logger.exception("on_turn callback failed")
+
+
 class Roundtable:
     """
     Multi-agent collaborative discussion engine.
@@ -116,6 +152,11 @@ class Roundtable:
         )
         # result.synthesis contains the final combined answer
         # result.turns contains all individual contributions
+
+        # Incremental rounds, turns streamed as they finish:
+        async for item in roundtable.stream(topic, agent_ids, quorum=0.67,
+                                            soft_deadline=20):
+            ...  # RoundtableTurn …, then the RoundtableResult
     """
 
     def __init__(
@@ -142,6 +183,8 @@ class Roundtable:
         agent_timeout: int = DEFAULT_AGENT_TIMEOUT,
         total_timeout: int = DEFAULT_TOTAL_TIMEOUT,
         on_turn: Any = None,  # Optional async callback(RoundtableTurn)
+        quorum: int | float | None = None,
+        soft_deadline: float | None = None,
     ) -> RoundtableResult:
         """
         Run a multi-round collaborative discussion.
@@ -149,6 +192,11 @@ class Roundtable:
         Each round sends the topic + prior context to each agent.
         After all rounds, a synthesizer agent combines the insights.
 
+        By default a round waits for every agent. With ``quorum`` and/or
+        ``soft_deadline`` it closes as soon as enough agents answered or
+        the deadline passed (with at least one answer), so the slowest
+        model no longer sets every round's latency.
+
         Args:
             topic: Discussion topic / question.
             agent_ids: List of agents to participate.
@@ -156,8 +204,12 @@ class Roundtable:
             synthesizer_id: Agent to produce the final synthesis.
             agent_timeout: Seconds per agent response (default 60).
             total_timeout: Max total seconds (default 300).
-            on_turn: Optional async callback invoked after each agent turn
-                     (for WebSocket streaming).
+            on_turn: Optional async callback invoked as each agent turn
+                     finishes (for WebSocket streaming).
+            quorum: Answers that close a round — a count, or a fraction
+                    of participants (0 < q <= 1). None = all agents.
+            soft_deadline: Seconds after which a round closes with the
+                           answers it has. None = no soft deadline.
 
         Returns:
             RoundtableResult with all turns and final synthesis.
@@ -184,42 +236,49 @@ class Roundtable:
         )
 
         turns: list[RoundtableTurn] = []
+        # agent_id → still-running task from an earlier round
+        stragglers: dict[str, asyncio.Task[RoundtableTurn]] = {}
 
-        for round_num in range(1, rounds + 1):
-            # Check total timeout
-            elapsed = time.monotonic() - start
-            if elapsed > total_timeout:
-                logger.warning(
-                    "Roundtable total timeout after round %d (%.0fs)",
-                    round_num - 1,
-                    elapsed,
-                )
-                break
+        try:
+            for round_num in range(1, rounds + 1):
+                # Check total timeout
+                elapsed = time.monotonic() - start
+                if elapsed > total_timeout:
+                    logger.warning(
+                        "Roundtable total timeout after round %d (%.0fs)",
+                        round_num - 1,
+                        elapsed,
+                    )
+                    break
 
-            remaining = total_timeout - elapsed
-            round_timeout = min(
-                agent_timeout * len(agent_ids),
-                remaining,
-            )
+                remaining = total_timeout - elapsed
+                round_timeout = min(
+                    agent_timeout * len(agent_ids),
+                    remaining,
+                )
 
-            round_turns = await self._run_round(
-                session_id=session_id,
-                topic=topic,
-                agent_ids=agent_ids,
-                round_number=round_num,
-                prior_turns=turns,
-                agent_timeout=agent_timeout,
-                round_timeout=round_timeout,
-            )
-            turns.extend(round_turns)
+                round_turns = await self._run_round(
+                    session_id=session_id,
+                    topic=topic,
+                    agent_ids=agent_ids,
+                    round_number=round_num,
+                    prior_turns=turns,
+                    agent_timeout=agent_timeout,
+                    round_timeout=round_timeout,
+                    quorum=quorum,
+                    soft_deadline=soft_deadline,
+                    stragglers=stragglers,
+                    on_turn=on_turn,
+                )
+                turns.extend(round_turns)
 
-            # Invoke per-turn callback for WS streaming
-            if on_turn is not None:
-                for t in round_turns:
-                    try:
-                        await on_turn(t)
-                    except Exception as e:
-                        logger.exception("on_turn callback failed")
+            # Keep stragglers that have finished by now; don't wait for the rest
+            turns.extend(await self._collect_stragglers(session_id, stragglers, on_turn))
+        finally:
+            # Cancelled by the caller (WebSocket gone, stream() closed) or a
+            # round failed after carrying tasks over: don't leave them running
+            await _cancel_tasks(stragglers.values())
+            stragglers.clear()
 
         # Synthesis round
         elapsed = time.monotonic() - start
@@ -277,6 +336,40 @@ class Roundtable:
 
         return result
 
+    async def stream(
+        self,
+        topic: str,
+        agent_ids: list[str],
+        **kwargs: Any,
+    ) -> AsyncIterator[RoundtableTurn | RoundtableResult]:
+        """
+        discuss() as an async iterator: yields each RoundtableTurn as it
+        finishes, then the RoundtableResult last. Takes discuss()'s
+        keyword arguments (except on_turn).
+        """
+        turns: asyncio.Queue[RoundtableTurn] = asyncio.Queue()
+        run = asyncio.create_task(
+            self.discuss(topic, agent_ids, on_turn=turns.put, **kwargs)
+        )
+        getter: asyncio.Task[RoundtableTurn] | None = None
+        try:
+            while True:
+                getter = asyncio.create_task(turns.get())
+                done, _ = await asyncio.wait(
+                    {getter, run}, return_when=asyncio.FIRST_COMPLETED,
+                )
+                if getter in done:
+                    yield getter.result()
+                    continue
+                getter.cancel()
+                while not turns.empty():
+                    yield turns.get_nowait()
+                yield run.result()
+                return
+        finally:
+            # Closed early (client gone): stop discuss() and its agent tasks
+            await _cancel_tasks([t for t in (getter, run) if t is not None and not t.done()])
+
     async def _run_round(
         self,
         session_id: str,
@@ -286,54 +379,90 @@ class Roundtable:
         prior_turns: list[RoundtableTurn],
         agent_timeout: int,
         round_timeout: float,
+        quorum: int | float | None = None,
+        soft_deadline: float | None = None,
+        stragglers: dict[str, asyncio.Task[RoundtableTurn]] | None = None,
+        on_turn: Any = None,
     ) -> list[RoundtableTurn]:
-        """Run one round of discussion, collecting all agent responses."""
+        """
+        Run one round of discussion, returning turns in completion order.
+
+        Agents still answering an earlier round (``stragglers``) are not
+        re-prompted; their answer counts toward this round. Tasks still
+        pending when the round closes are left running in ``stragglers``.
+        """
         context = self._build_context(prior_turns)
 
         prompt = self._build_round_prompt(
             topic, round_number, context, len(agent_ids)
         )
 
-        # Run all agents in parallel using TaskGroup (structured concurrency)
+        if stragglers is None:
+            stragglers = {}
+        pending: dict[asyncio.Task[RoundtableTurn], str] = {
+            task: agent_id for agent_id, task in stragglers.items()
+        }
+        stragglers.clear()
+        for agent_id in agent_ids:
+            if agent_id in pending.values():
+                continue
+            task = asyncio.create_task(
+                self._get_agent_response(
+                    session_id=session_id,
+                    agent_id=agent_id,
+                    prompt=prompt,
+                    round_number=round_number,
+                    timeout=agent_timeout,
+                ),
+                name=f"round-{round_number}-{agent_id}",
+            )
+            pending[task] = agent_id
+
+        needed = _quorum_count(quorum, len(pending))
         turns: list[RoundtableTurn] = []
-        futures: dict[str, asyncio.Task[RoundtableTurn]] = {}
+        start = time.monotonic()
 
         try:
-            async with asyncio.TaskGroup() as tg:
-                for agent_id in agent_ids:
-                    future = tg.create_task(
-                        asyncio.wait_for(
-                            self._get_agent_response(
-                                session_id=session_id,
-                                agent_id=agent_id,
-                                prompt=prompt,
-                                round_number=round_number,
-                                timeout=agent_timeout,
-                            ),
-                            timeout=round_timeout,
-                        ),
-                        name=f"round-{round_number}-{agent_id}",
+            while pending and len(turns) < needed:
+                elapsed = time.monotonic() - start
+                if elapsed >= round_timeout:
+                    logger.warning(
+                        "Round %d timed out after %.0fs",
+                        round_number,
+                        round_timeout,
                     )
-                    futures[agent_id] = future
-
-            # Collect results from completed tasks
-            for agent_id, future in futures.items():
-                try:
-                    turns.append(future.result())
-                except Exception as e:
-                    logger.warning("Agent %s response error: %s", agent_id, e)
-
-        except* asyncio.TimeoutError:
-            logger.warning(
-                "Round %d timed out after %.0fs",
+                    break
+                if soft_deadline is not None and elapsed >= soft_deadline and turns:
+                    break
+                wait = round_timeout - elapsed
+                if soft_deadline is not None and elapsed < soft_deadline:
+                    wait = min(wait, soft_deadline - elapsed)
+                done, _ = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    agent_id = pending.pop(task)
+                    try:
+                        turn = task.result()
+                    except Exception as e:
+                        logger.warning("Agent %s response error: %s", agent_id, e)
+                        continue
+                    turns.append(turn)
+                    await _emit_turn(on_turn, turn)
+        except BaseException:
+            # Cancelled, or on_turn failed: the round's tasks die with it
+            await _cancel_tasks(pending)
+            raise
+
+        for task, agent_id in pending.items():
+            stragglers[agent_id] = task
+        if pending:
+            logger.info(
+                "Round %d closed early; carrying %s into the next round",
                 round_number,
-                round_timeout,
+                sorted(stragglers),
             )
 
-        except* Exception as eg:
-            for exc in eg.exceptions:
-                logger.warning("Round %d agent error: %s", round_number, exc)
-
         logger.debug(
             "Round %d: %d/%d responses",
             round_number,
@@ -341,6 +470,33 @@ class Roundtable:
             len(agent_ids),
         )
 
+        await self._persist_turns(session_id, turns)
+        return turns
+
+    async def _collect_stragglers(
+        self,
+        session_id: str,
+        stragglers: dict[str, asyncio.Task[RoundtableTurn]],
+        on_turn: Any = None,
+    ) -> list[RoundtableTurn]:
+        """Keep finished straggler turns and cancel the ones still running."""
+        turns: list[RoundtableTurn] = []
+        dropped: list[asyncio.Task[RoundtableTurn]] = []
+        for agent_id, task in stragglers.items():
+            if not task.done():
+                dropped.append(task)
+                logger.info("Dropping unfinished turn from %s", agent_id)
+                continue
+            try:
+                turn = task.result()
+            except (Exception, asyncio.CancelledError) as e:
+                logger.warning("Agent %s response error: %s", agent_id, e)
+                continue
+            turns.append(turn)
+            await _emit_turn(on_turn, turn)
+        stragglers.clear()
+        await _cancel_tasks(dropped)
+        await self._persist_turns(session_id, turns)
         return turns
 
     async def _get_agent_response(
@@ -351,7 +507,7 @@ class Roundtable:
         round_number: int,
         timeout: int,
     ) -> RoundtableTurn:
-        """Get a single agent's response with timeout."""
+        """Get a single agent's response with timeout (persisted by the round)."""
         start = time.monotonic()
 
         try:
@@ -372,23 +528,13 @@ class Roundtable:
 
         duration_ms = int((time.monotonic() - start) * 1000)
 
-        turn = RoundtableTurn(
+        return RoundtableTurn(
             agent_id=agent_id,
             round_number=round_number,
             content=content,
             duration_ms=duration_ms,
         )
 
-        # Persist to DB
-        await self._persist_message(
-            session_id,
-            agent_id,
-            content,
-            f"round-{round_number}",
-        )
-
-        return turn
-
     async def _synthesize(
         self,
         session_id: str,
@@ -535,8 +681,33 @@ class Roundtable:
                     role=role,
                     content=content,
                     metadata_json={"agent_id": agent_id},
+                    created_at=datetime.now(timezone.utc),
                 )
                 session.add(msg)
+        await get_transcript_cache().extend(session_id, [msg])
+
+    async def _persist_turns(
+        self,
+        session_id: str,
+        turns: list[RoundtableTurn],
+    ) -> None:
+        """Persist a round's turns to chat_messages in one transaction (ORM)."""
+        if not turns:
+            return
+        async with self._async_session() as session:
+            async with session.begin():
+                rows = [
+                    EngineChatMessage(
+                        session_id=session_id,
+                        role=f"round-{t.round_number}",
+                        content=t.content,
+                        metadata_json={"agent_id": t.agent_id},
+                        created_at=t.created_at,  # completion order, not commit time
+                    )
+                    for t in turns
+                ]
+                session.add_all(rows)
+        await get_transcript_cache().extend(session_id, rows)
 
     async def list_roundtables(
         self,
@@ -5,28 +5,38 @@ Ports scoring logic from aria_agents/scoring.py to engine with DB persistence.
 Features:
 - Multi-factor routing: specialty match + load + pheromone + success rate
 - Pheromone score update after each interaction (boost on success, decay on failure)
-- Scores persisted to engine_agent_state.pheromone_score
+- Scores persisted to engine_agent_state.pheromone_score in coalesced
+  batches (one executemany per SCORE_FLUSH_SECONDS)
 - Cold start handling (new agents get neutral 0.500 score)
-- Time-decay weighting (recent performance matters more)
+- Time-decay weighting (recent performance matters more), kept as an
+  O(1) decayed accumulator per agent (DecayedScore)
+- Agent states served from an in-memory RoutingTable — no DB round-trip
+  on the routing hot path
 """
+import asyncio
 import logging
 import re
+import time
+from collections import deque
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import select, update, func
+from sqlalchemy import bindparam, update, func
 from sqlalchemy.ext.asyncio import AsyncEngine
 from db.models import EngineAgentState
 
 from aria_engine.config import EngineConfig
 from aria_engine.exceptions import EngineError
+from aria_engine.metrics import METRICS
+from aria_engine.routing_table import ROUTING_TABLE_TTL_SECONDS, RoutingTable
 
 logger = logging.getLogger("aria.engine.routing")
 
 # Scoring parameters (ported from aria_agents/scoring.py)
 DECAY_FACTOR = 0.95          # Per-day decay
 COLD_START_SCORE = 0.500     # Neutral starting score
-MAX_RECORDS_PER_AGENT = 200  # History cap
+RECENT_WINDOW = 10           # Interactions behind the recency factor
+SCORE_FLUSH_SECONDS = 5.0    # Coalescing window for pheromone_score writes
 
 # Routing weight factors
 WEIGHTS = {
@@ -166,10 +176,10 @@ def compute_pheromone_score(records: list[dict[str, Any]]) -> float:
         age_days = max((now - created).total_seconds() / 86400, 0)
         decay = DECAY_FACTOR**age_days
 
-        s = (
-            float(r.get("success", False)) * 0.6
-            + r.get("speed_score", 0.5) * 0.3
-            + r.get("cost_score", 0.5) * 0.1
+        s = record_value(
+            r.get("success", False),
+            r.get("speed_score", 0.5),
+            r.get("cost_score", 0.5),
         )
         score += s * decay
         weight_sum += decay
@@ -177,6 +187,53 @@ def compute_pheromone_score(records: list[dict[str, Any]]) -> float:
     return score / weight_sum if weight_sum > 0 else COLD_START_SCORE
 
 
+def record_value(success: bool, speed_score: float, cost_score: float) -> float:
+    """Score of a single interaction before time decay."""
+    return float(success) * 0.6 + speed_score * 0.3 + cost_score * 0.1
+
+
+class DecayedScore:
+    """
+    Running form of compute_pheromone_score() — O(1) per interaction.
+
+    Keeps the decayed sums of record values and weights as of the newest
+    record. Older mass is scaled by DECAY_FACTOR^days on each add, so
+    score equals compute_pheromone_score() over every record seen (the
+    mean is invariant to decaying all weights alike), without storing
+    or re-parsing records.
+    """
+
+    __slots__ = ("weighted", "weight", "updated_at", "count")
+
+    def __init__(self) -> None:
+        self.weighted = 0.0
+        self.weight = 0.0
+        self.updated_at: float | None = None  # epoch seconds of newest record
+        self.count = 0
+
+    def add(self, value: float, at: float | None = None) -> float:
+        """Fold one record in; returns the new score."""
+        at = time.time() if at is None else at
+        if self.updated_at is None:
+            self.updated_at = at
+        if at >= self.updated_at:
+            decay = DECAY_FACTOR ** ((at - self.updated_at) / 86400)
+            self.weighted *= decay
+            self.weight *= decay
+            self.updated_at = at
+            w = 1.0
+        else:  # late record: decay it to the current reference time instead
+            w = DECAY_FACTOR ** ((self.updated_at - at) / 86400)
+        self.weighted += value * w
+        self.weight += w
+        self.count += 1
+        return self.score
+
+    @property
+    def score(self) -> float:
+        return self.weighted / self.weight if self.weight > 0 else COLD_START_SCORE
+
+
 class EngineRouter:
     """
     Routes messages to the best available agent based on multi-factor scoring.
@@ -195,14 +252,41 @@ class EngineRouter:
             success=True,
             duration_ms=1500,
         )
+
+        # Shutdown: write scores still inside the coalescing window
+        await router.close()
     """
 
-    def __init__(self, db_engine: AsyncEngine):
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        *,
+        table_ttl_seconds: float = ROUTING_TABLE_TTL_SECONDS,
+        flush_seconds: float = SCORE_FLUSH_SECONDS,
+    ):
         self._db_engine = db_engine
-        # In-memory record cache per agent (synced to DB periodically)
-        self._records: dict[str, list[dict[str, Any]]] = {}
+        self._table = RoutingTable(db_engine, ttl_seconds=table_ttl_seconds)
+        # Per-agent decayed score and last RECENT_WINDOW outcomes
+        self._scores: dict[str, DecayedScore] = {}
+        self._recent: dict[str, deque[bool]] = {}
+        # Scores not yet written to engine_agent_state (latest wins)
+        self._pending_scores: dict[str, float] = {}
+        self._flush_seconds = flush_seconds
+        self._flush_task: asyncio.Task | None = None
         self._total_invocations = 0
 
+    def _pheromone(self, agent_id: str, state: dict[str, Any]) -> float:
+        acc = self._scores.get(agent_id)
+        if acc is not None:
+            return acc.score
+        return float(state.get("pheromone_score") or COLD_START_SCORE)
+
+    def _recency(self, agent_id: str) -> float | None:
+        recent = self._recent.get(agent_id)
+        if not recent:
+            return None
+        return sum(recent) / len(recent)
+
     async def route_message(
         self,
         message: str,
@@ -233,8 +317,8 @@ class EngineRouter:
         if len(available_agents) == 1:
             return available_agents[0]
 
-        # Load agent state from DB
-        agent_states = await self._load_agent_states(available_agents)
+        start = time.perf_counter()
+        agent_states = await self._table.get(available_agents)
 
         scores: dict[str, float] = {}
 
@@ -242,7 +326,7 @@ class EngineRouter:
             state = agent_states.get(agent_id, {})
 
             # Factor 1: Pheromone score
-            pheromone = float(state.get("pheromone_score", COLD_START_SCORE))
+            pheromone = self._pheromone(agent_id, state)
 
             # Factor 2: Specialty match
             focus_type = state.get("focus_type")
@@ -253,14 +337,9 @@ class EngineRouter:
             failures = state.get("consecutive_failures", 0)
             load = compute_load_score(status, failures)
 
-            # Factor 4: Recency (last 10 interactions)
-            records = self._records.get(agent_id, [])
-            recent = records[-10:] if records else []
-            if recent:
-                recency = sum(
-                    1 for r in recent if r.get("success")
-                ) / len(recent)
-            else:
+            # Factor 4: Recency (last RECENT_WINDOW interactions)
+            recency = self._recency(agent_id)
+            if recency is None:
                 recency = 0.5  # Neutral for new agents
 
             # Combined score
@@ -279,6 +358,8 @@ class EngineRouter:
             )
 
         best = max(scores, key=scores.get)  # type: ignore[arg-type]
+        METRICS.agent_routing_duration.observe(time.perf_counter() - start)
+        METRICS.agent_routing_total.labels(selected_agent=best).inc()
         logger.info(
             "Routed message to %s (score=%.3f, runners-up: %s)",
             best,
@@ -318,7 +399,7 @@ class EngineRouter:
         current_id = agent_id
         while current_id and current_id not in visited:
             visited.add(current_id)
-            state = await self._load_agent_states([current_id])
+            state = await self._table.get([current_id])
             info = state.get(current_id)
             if info is None:
                 break
@@ -354,8 +435,8 @@ class EngineRouter:
         """
         Update pheromone scores after an interaction.
 
-        Records the result, recomputes the agent's pheromone score,
-        and persists to engine_agent_state.
+        Folds the result into the agent's decayed score (O(1)) and queues
+        the new score for the next batched write to engine_agent_state.
 
         Args:
             agent_id: The agent that handled the interaction.
@@ -370,31 +451,28 @@ class EngineRouter:
         speed_score = max(0.0, 1.0 - (duration_ms / 30000))
         cost_score = max(0.0, 1.0 - min(token_cost, 1.0))
 
-        record = {
-            "success": success,
-            "speed_score": round(speed_score, 3),
-            "cost_score": round(cost_score, 3),
-            "duration_ms": duration_ms,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        }
-
-        if agent_id not in self._records:
-            self._records[agent_id] = []
-
-        self._records[agent_id].append(record)
+        acc = self._scores.get(agent_id)
+        if acc is None:
+            acc = self._scores[agent_id] = DecayedScore()
+        new_score = acc.add(
+            record_value(success, round(speed_score, 3), round(cost_score, 3))
+        )
+        recent = self._recent.get(agent_id)
+        if recent is None:
+            recent = self._recent[agent_id] = deque(maxlen=RECENT_WINDOW)
+        recent.append(bool(success))
         self._total_invocations += 1
 
-        # Trim old records
-        if len(self._records[agent_id]) > MAX_RECORDS_PER_AGENT:
-            self._records[agent_id] = self._records[agent_id][
-                -MAX_RECORDS_PER_AGENT:
-            ]
-
-        # Recompute pheromone score
-        new_score = compute_pheromone_score(self._records[agent_id])
+        METRICS.agent_pheromone_score.labels(agent_id=agent_id).set(new_score)
 
-        # Persist to DB
-        await self._persist_score(agent_id, new_score)
+        # Persist (coalesced)
+        self._pending_scores[agent_id] = new_score
+        if self._flush_seconds <= 0:
+            await self.flush_scores()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_later()
+            )
 
         logger.debug(
             "Updated %s: %s (%dms) -> score=%.3f",
@@ -406,104 +484,101 @@ class EngineRouter:
 
         return new_score
 
-    async def _load_agent_states(
-        self,
-        agent_ids: list[str],
-    ) -> dict[str, dict[str, Any]]:
-        """Load agent states from DB for routing decisions."""
-        if not agent_ids:
-            return {}
-
-        async with self._db_engine.begin() as conn:
-            result = await conn.execute(
-                select(EngineAgentState)
-                .where(
-                    EngineAgentState.agent_id.in_(agent_ids),
-                    EngineAgentState.enabled == True,
+    async def _flush_later(self) -> None:
+        """Write pending scores after the coalescing window (retries on failure)."""
+        while self._pending_scores:
+            await asyncio.sleep(self._flush_seconds)
+            try:
+                await self.flush_scores()
+            except Exception as e:
+                logger.warning(
+                    "Pheromone score flush failed (%d agents kept): %s",
+                    len(self._pending_scores), e,
                 )
-            )
-            rows = result.scalars().all()
 
-        return {
-            row.agent_id: {
-                "agent_id": row.agent_id,
-                "agent_type": row.agent_type,
-                "focus_type": row.focus_type,
-                "model": row.model,
-                "fallback_model": row.fallback_model,
-                "parent_agent_id": row.parent_agent_id,
-                "status": row.status,
-                "enabled": row.enabled,
-                "skills": row.skills,
-                "capabilities": row.capabilities,
-                "consecutive_failures": row.consecutive_failures,
-                "pheromone_score": row.pheromone_score,
-                "last_active_at": row.last_active_at,
-            }
-            for row in rows
-        }
+    async def flush_scores(self) -> int:
+        """
+        Persist pending pheromone scores in one transaction.
 
-    async def _persist_score(
-        self,
-        agent_id: str,
-        score: float,
-    ) -> None:
-        """Persist pheromone score to agent_state table."""
+        Rows are written in agent_id order (consistent lock order); a
+        failed flush puts its scores back unless a newer one arrived.
+        Returns the number of agents written.
+        """
+        if not self._pending_scores:
+            return 0
+        batch, self._pending_scores = self._pending_scores, {}
+        params = [
+            {"aid": agent_id, "score": round(score, 3)}
+            for agent_id, score in sorted(batch.items())
+        ]
+        try:
+            await self._write_scores(params)
+        except Exception:
+            for agent_id, score in batch.items():
+                self._pending_scores.setdefault(agent_id, score)
+            raise
+        return len(params)
+
+    async def _write_scores(self, params: list[dict[str, Any]]) -> None:
+        """One executemany UPDATE of pheromone_score ({"aid", "score"} rows)."""
         async with self._db_engine.begin() as conn:
             await conn.execute(
                 update(EngineAgentState)
-                .where(EngineAgentState.agent_id == agent_id)
+                .where(EngineAgentState.agent_id == bindparam("aid"))
                 .values(
-                    pheromone_score=round(score, 3),
+                    pheromone_score=bindparam("score"),
                     updated_at=func.now(),
-                )
+                ),
+                params,
             )
 
+    async def close(self) -> None:
+        """Stop the flush timer and write whatever is still pending."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        try:
+            await self.flush_scores()
+        except Exception as e:
+            logger.warning("Final pheromone score flush failed: %s", e)
+
     async def get_routing_table(self) -> list[dict[str, Any]]:
         """Get current routing table with all agent scores and stats."""
-        async with self._db_engine.begin() as conn:
-            result = await conn.execute(
-                select(EngineAgentState)
-                .where(
-                    EngineAgentState.status != "disabled",
-                    EngineAgentState.enabled == True,
-                )
-                .order_by(EngineAgentState.pheromone_score.desc())
-            )
-            rows = result.scalars().all()
+        await self._table.refresh()
 
         table = []
-        for row in rows:
-            agent_id = row.agent_id
-            records = self._records.get(agent_id, [])
-            recent = records[-10:] if records else []
-            success_rate = (
-                sum(1 for r in recent if r.get("success")) / len(recent)
-                if recent
-                else None
-            )
+        for state in self._table.snapshot():
+            if state["status"] == "disabled":
+                continue
+            agent_id = state["agent_id"]
+            success_rate = self._recency(agent_id)
+            acc = self._scores.get(agent_id)
+            last_active = state["last_active_at"]
 
             table.append({
                 "agent_id": agent_id,
-                "display_name": row.display_name,
-                "agent_type": row.agent_type or "agent",
-                "focus_type": row.focus_type,
-                "status": row.status,
-                "skills": row.skills or [],
-                "capabilities": row.capabilities or [],
-                "pheromone_score": float(row.pheromone_score or 0.5),
-                "consecutive_failures": row.consecutive_failures,
+                "display_name": state["display_name"],
+                "agent_type": state["agent_type"] or "agent",
+                "focus_type": state["focus_type"],
+                "status": state["status"],
+                "skills": state["skills"] or [],
+                "capabilities": state["capabilities"] or [],
+                "pheromone_score": self._pheromone(agent_id, state),
+                "consecutive_failures": state["consecutive_failures"],
                 "recent_success_rate": (
                     round(success_rate, 3) if success_rate is not None else None
                 ),
-                "total_records": len(records),
+                "total_records": acc.count if acc else 0,
                 "last_active_at": (
-                    row.last_active_at.isoformat()
-                    if row.last_active_at
-                    else None
+                    last_active.isoformat() if last_active else None
                 ),
             })
 
+        table.sort(key=lambda r: r["pheromone_score"], reverse=True)
         return table
 
     # ── Auto-escalation detection ────────────────────────────────────
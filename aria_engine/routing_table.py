@@ -0,0 +1,144 @@
+"""
+Routing table — in-memory snapshot of engine_agent_state for routing.
+
+EngineRouter used to SELECT every candidate's agent-state row for each
+routed message (and once per hop when building a fallback chain). The
+table holds one snapshot of all agents instead; routing reads it without
+touching the database.
+
+Features:
+- One SELECT loads every agent; lookups are dict reads
+- Refresh on change notification (notify_agent_changed(), called by
+  AgentPool and the agent CRUD endpoints) or after ttl_seconds
+  (ROUTING_TABLE_TTL_SECONDS, default 10) — whichever comes first
+- Stale-while-revalidate: a stale table keeps serving its snapshot while
+  one background task reloads it; only the very first lookup waits
+- Unknown agent ids trigger a background reload (at most one per
+  MIN_REFRESH_INTERVAL) so newly created agents show up without a restart
+- Disabled rows (enabled = false) are known but never returned, matching
+  the old ``enabled == True`` filter
+
+Usage:
+    table = RoutingTable(db_engine)
+    states = await table.get(["main", "aria-devops"])
+    states["aria-devops"]["focus_type"]
+
+    # after writing engine_agent_state elsewhere in the process:
+    notify_agent_changed()
+"""
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from db.models import EngineAgentState
+
+logger = logging.getLogger("aria.engine.routing_table")
+
+ROUTING_TABLE_TTL_SECONDS = 10.0
+MIN_REFRESH_INTERVAL = 1.0  # floor between reloads caused by unknown ids
+
+_TABLES: "weakref.WeakSet[RoutingTable]" = weakref.WeakSet()
+
+
+def notify_agent_changed() -> None:
+    """Mark every routing table in this process stale after an agent-state write."""
+    for table in list(_TABLES):
+        table.invalidate()
+
+
+def _row_state(row: Any) -> dict[str, Any]:
+    return {
+        "agent_id": row.agent_id,
+        "display_name": row.display_name,
+        "agent_type": row.agent_type,
+        "focus_type": row.focus_type,
+        "model": row.model,
+        "fallback_model": row.fallback_model,
+        "parent_agent_id": row.parent_agent_id,
+        "status": row.status,
+        "enabled": row.enabled,
+        "skills": row.skills,
+        "capabilities": row.capabilities,
+        "consecutive_failures": row.consecutive_failures,
+        "pheromone_score": row.pheromone_score,
+        "last_active_at": row.last_active_at,
+    }
+
+
+class RoutingTable:
+    """Agent states for routing, reloaded on notification or TTL."""
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        *,
+        ttl_seconds: float = ROUTING_TABLE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._db_engine = db_engine
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._states: dict[str, dict[str, Any]] = {}  # every row, enabled or not
+        self._loaded_at: float | None = None
+        self._stale = False
+        self._refresh_task: asyncio.Task | None = None
+        _TABLES.add(self)
+
+    def invalidate(self) -> None:
+        """Reload on the next lookup (the current snapshot is served meanwhile)."""
+        self._stale = True
+
+    async def refresh(self) -> None:
+        """Reload every agent row in one query."""
+        self._stale = False
+        rows = await self._load_rows()
+        self._states = {row.agent_id: _row_state(row) for row in rows}
+        self._loaded_at = self._clock()
+
+    async def get(self, agent_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """States of the enabled agents among ``agent_ids``."""
+        agent_ids = list(agent_ids)
+        if self._loaded_at is None:
+            await self.refresh()
+        else:
+            age = self._clock() - self._loaded_at
+            unknown = any(aid not in self._states for aid in agent_ids)
+            if (
+                self._stale
+                or age >= self.ttl_seconds
+                or (unknown and age >= MIN_REFRESH_INTERVAL)
+            ):
+                self._refresh_in_background()
+        states = self._states
+        return {
+            aid: states[aid]
+            for aid in agent_ids
+            if aid in states and states[aid]["enabled"]
+        }
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Every enabled agent's state from the current snapshot."""
+        return [s for s in self._states.values() if s["enabled"]]
+
+    async def _load_rows(self) -> list[Any]:
+        async with self._db_engine.begin() as conn:
+            # Core connection: rows carry the columns as attributes
+            return list((await conn.execute(select(EngineAgentState))).all())
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            # Keep serving the old snapshot; retry after another TTL
+            self._loaded_at = self._clock()
+            logger.warning("Routing table refresh failed: %s", e)
@@ -6,8 +6,14 @@ Features:
 - APScheduler 4.x async scheduler with SQLAlchemy data store
 - Job definitions stored in aria_engine.cron_jobs table
 - Job execution routed to agents via AgentPool
+- Prompt jobs dispatched in-process through an attached ChatEngine when
+  co-located with the engine; otherwise through aria-api on one pooled
+  HTTP client (scheduler_dispatch_mode: auto | direct | http)
 - Job state tracking (last_run, status, duration, next_run)
 - Error handling with retry + exponential backoff
+- Execution through a JobQueue: priority classes, per-agent caps,
+  token/cost budgets, jittered starts; retries are re-queued with their
+  backoff instead of sleeping in an execution slot
 - Dynamic job management (add/remove/update at runtime)
 """
 import asyncio
@@ -27,7 +33,8 @@ from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessi
 
 from aria_engine.config import EngineConfig
 from aria_engine.exceptions import SchedulerError
-from db.models import EngineCronJob, ActivityLog
+from aria_engine.job_queue import PRIORITIES, JobQueue, QueuedJob, normalize_priority
+from db.models import EngineCronJob, ActivityLog, HeartbeatLog
 
 # aria-api base URL (inside Docker network) — dynamic port via env var
 _API_BASE = os.getenv("ENGINE_API_BASE_URL", "http://aria-api:8000")
@@ -40,6 +47,9 @@ MAX_CONCURRENT_JOBS = 5
 # Retry backoff cap (seconds)
 MAX_BACKOFF_SECONDS = 600
 
+# Valid values for EngineConfig.scheduler_dispatch_mode
+DISPATCH_MODES = ("auto", "direct", "http")
+
 # Module-level reference to the active EngineScheduler instance.
 # Required because APScheduler 4.x serializes task references and cannot
 # handle bound methods — only module-level callables.
@@ -56,6 +66,7 @@ async def _scheduler_dispatch(
     retry_count: int,
     model: str = "",
     job_name: str = "",
+    priority: str = "normal",
 ) -> None:
     """Module-level trampoline that APScheduler can serialize.
 
@@ -76,6 +87,7 @@ async def _scheduler_dispatch(
             retry_count=retry_count,
             model=model,
             job_name=job_name,
+            priority=priority,
         )
     except Exception as exc:
         logger.error(
@@ -84,6 +96,11 @@ async def _scheduler_dispatch(
         )
 
 
+def job_priority(metadata: dict[str, Any] | None) -> str:
+    """Priority class of a cron job (``metadata.priority``, default 'normal')."""
+    return normalize_priority((metadata or {}).get("priority"))
+
+
 def parse_schedule(schedule_str: str) -> CronTrigger | IntervalTrigger:
     """
     Parse a schedule string into an APScheduler trigger.
@@ -171,18 +188,67 @@ class EngineScheduler:
         config: EngineConfig,
         db_engine: AsyncEngine,
         agent_pool: Any | None = None,
+        chat_engine: Any | None = None,
+        prompt_assembler: Any | None = None,
     ):
         self.config = config
         self._db_engine = db_engine
         self._agent_pool = agent_pool
+        self._chat_engine = chat_engine
+        self._prompt_assembler = prompt_assembler
+        self._dispatch_mode = getattr(config, "scheduler_dispatch_mode", "auto")
+        if self._dispatch_mode not in DISPATCH_MODES:
+            raise SchedulerError(
+                f"Invalid scheduler_dispatch_mode {self._dispatch_mode!r} "
+                f"(expected one of {', '.join(DISPATCH_MODES)})"
+            )
+        # Shared aiohttp session for the HTTP path (created on first use)
+        self._http: Any | None = None
         self._scheduler: AsyncScheduler | None = None
         self._running = False
-        self._job_semaphore = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+        self._queue = self._make_queue()
         # ORM session maker for queries that need mapped instances
         self._session_factory = async_sessionmaker(
             self._db_engine, expire_on_commit=False,
         )
-        self._active_executions: dict[str, asyncio.Task] = {}
+
+    def _make_queue(self) -> JobQueue:
+        return JobQueue(
+            self._run_queued,
+            max_concurrent=MAX_CONCURRENT_JOBS,
+            per_agent_limit=self.config.scheduler_max_concurrent_per_agent,
+            token_budget=self.config.scheduler_token_budget,
+            cost_budget_usd=self.config.scheduler_cost_budget_usd,
+            budget_window_seconds=self.config.scheduler_budget_window_seconds,
+            jitter_seconds=self.config.scheduler_start_jitter_seconds,
+        )
+
+    def set_chat_engine(self, chat_engine: Any, prompt_assembler: Any | None = None) -> None:
+        """Attach an in-process ChatEngine (and PromptAssembler) for direct dispatch."""
+        self._chat_engine = chat_engine
+        self._prompt_assembler = prompt_assembler
+
+    @property
+    def dispatch_mode(self) -> str:
+        """Effective prompt dispatch path: 'direct' or 'http'."""
+        if self._dispatch_mode == "http" or self._chat_engine is None:
+            return "http"
+        return "direct"
+
+    def _http_client(self) -> Any:
+        """Pooled aiohttp session shared by every HTTP dispatch / heartbeat."""
+        import aiohttp
+
+        if self._http is None or self._http.closed:
+            headers = {}
+            api_key = os.getenv("ARIA_API_KEY", "")
+            if api_key:
+                headers["X-API-Key"] = api_key  # S-103
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_JOBS * 2),
+                headers=headers,
+            )
+        return self._http
 
     async def start(self) -> None:
         """
@@ -217,9 +283,16 @@ class EngineScheduler:
         # Wait for aria-api to be reachable before jobs start dispatching.
         # IntervalTrigger jobs fire immediately, so without this check
         # they fail with "Cannot connect to host aria-api:8000" on cold start.
-        await self._wait_for_api()
-
-        logger.info("EngineScheduler started — jobs loaded and processing")
+        # Direct dispatch never touches aria-api, so there is nothing to wait for.
+        if self._dispatch_mode == "direct" and self._chat_engine is None:
+            logger.warning("scheduler_dispatch_mode=direct but no ChatEngine attached — using HTTP")
+        if self.dispatch_mode == "http":
+            await self._wait_for_api()
+
+        logger.info(
+            "EngineScheduler started — jobs loaded and processing (dispatch=%s)",
+            self.dispatch_mode,
+        )
 
     async def _wait_for_api(self, timeout: int = 60) -> None:
         """Block until aria-api is reachable, up to *timeout* seconds."""
@@ -228,8 +301,9 @@ class EngineScheduler:
         deadline = time.monotonic() + timeout
         while time.monotonic() < deadline:
             try:
-                async with aiohttp.ClientSession() as http:
-                    resp = await http.get(f"{_API_BASE}/api/health", timeout=aiohttp.ClientTimeout(total=5))
+                async with self._http_client().get(
+                    f"{_API_BASE}/api/health", timeout=aiohttp.ClientTimeout(total=5),
+                ) as resp:
                     if resp.status == 200:
                         logger.info("aria-api is reachable")
                         return
@@ -248,17 +322,9 @@ class EngineScheduler:
         self._running = False
         _active_scheduler = None
 
-        # Cancel active executions
-        for job_id, task in list(self._active_executions.items()):
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-            logger.debug("Cancelled active execution: %s", job_id)
-
-        self._active_executions.clear()
+        # Cancel active executions and drop queued runs
+        await self._queue.close()
+        self._queue = self._make_queue()
 
         # Shutdown APScheduler
         if self._scheduler is not None:
@@ -269,6 +335,10 @@ class EngineScheduler:
             await self._scheduler.__aexit__(None, None, None)
             self._scheduler = None
 
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
         logger.info("EngineScheduler stopped")
 
     async def _load_jobs_from_db(self) -> None:
@@ -317,6 +387,7 @@ class EngineScheduler:
                         "retry_count": row["retry_count"],
                         "model": row.get("model", "") or "",
                         "job_name": row["name"],
+                        "priority": job_priority(row["metadata"]),
                     },
                     conflict_policy=ConflictPolicy.replace,
                     misfire_grace_time=60,  # skip if >60s late (prevents backfill storm on restart)
@@ -339,113 +410,139 @@ class EngineScheduler:
         retry_count: int,
         model: str = "",
         job_name: str = "",
-    ) -> None:
+        priority: str = "normal",
+        jitter: bool = True,
+    ) -> bool:
         """
-        Execute a single cron job with concurrency control, timeout,
-        and retry with exponential backoff.
+        Queue a run of a cron job. Scheduled fires start after a random
+        jitter; the queue decides when a slot, agent cap and budget allow
+        it to start. Returns False if a run of the job is already waiting.
         """
-        async with self._job_semaphore:
-            attempt = 0
-            max_attempts = retry_count + 1
-            last_error: str | None = None
-            elapsed_ms = 0
-            dispatch_result: dict = {}
-
-            while attempt < max_attempts:
-                start_time = time.monotonic()
-                try:
-                    # Update state: running
-                    await self._update_job_state(
-                        job_id,
-                        status="running",
-                        last_run_at=datetime.now(timezone.utc),
-                    )
-
-                    # Execute with timeout
-                    dispatch_result = await asyncio.wait_for(
-                        self._dispatch_to_agent(
-                            job_id=job_id,
-                            agent_id=agent_id,
-                            payload_type=payload_type,
-                            payload=payload,
-                            session_mode=session_mode,
-                            model=model,
-                            job_name=job_name,
-                        ),
-                        timeout=max_duration,
-                    ) or {}
-
-                    elapsed_ms = int((time.monotonic() - start_time) * 1000)
-
-                    # Update state: success
-                    await self._update_job_state(
-                        job_id,
-                        status="success",
-                        last_duration_ms=elapsed_ms,
-                        increment_success=True,
-                    )
-
-                    # Write heartbeat log entry
-                    model = dispatch_result.get("model", "")
-                    tokens = dispatch_result.get("total_tokens", 0)
-                    cost = dispatch_result.get("cost_usd", 0)
-                    details = f"model={model}, tokens={tokens}, cost=${cost}" if model else "OK"
-                    await self._write_heartbeat_log(
-                        job_name=job_id,
-                        status="success",
-                        details=details,
-                        duration_ms=elapsed_ms,
-                    )
-
-                    logger.info(
-                        "Job %s completed in %dms", job_id, elapsed_ms
-                    )
-                    return
-
-                except asyncio.TimeoutError:
-                    elapsed_ms = int((time.monotonic() - start_time) * 1000)
-                    last_error = f"Timeout after {max_duration}s"
-                    logger.warning("Job %s timed out (attempt %d)", job_id, attempt + 1)
-
-                except Exception as e:
-                    elapsed_ms = int((time.monotonic() - start_time) * 1000)
-                    last_error = str(e)
-                    logger.error(
-                        "Job %s failed (attempt %d): %s", job_id, attempt + 1, e
-                    )
+        return self._queue.submit(
+            QueuedJob(
+                job_id=job_id,
+                agent_id=agent_id,
+                priority=priority,
+                params={
+                    "payload_type": payload_type,
+                    "payload": payload,
+                    "session_mode": session_mode,
+                    "max_duration": max_duration,
+                    "retry_count": retry_count,
+                    "model": model,
+                    "job_name": job_name,
+                },
+            ),
+            jitter=jitter,
+        )
 
-                attempt += 1
+    async def _run_queued(self, job: QueuedJob) -> dict | None:
+        """
+        One attempt of a queued job, with timeout. On failure the next
+        attempt is re-queued after an exponential backoff (the slot is
+        released meanwhile); the last failure is recorded.
 
-                if attempt < max_attempts:
-                    # Exponential backoff: 2^attempt seconds, capped
-                    backoff = min(2**attempt, MAX_BACKOFF_SECONDS)
-                    logger.info(
-                        "Job %s retrying in %ds (attempt %d/%d)",
-                        job_id, backoff, attempt + 1, max_attempts,
-                    )
-                    await asyncio.sleep(backoff)
+        Returns the dispatch result (tokens / cost) for budget accounting.
+        """
+        params = job.params
+        job_id = job.job_id
+        max_duration = params["max_duration"]
+        max_attempts = params["retry_count"] + 1
+        start_time = time.monotonic()
+        try:
+            # Update state: running
+            await self._update_job_state(
+                job_id,
+                status="running",
+                last_run_at=datetime.now(timezone.utc),
+            )
 
-            # All retries exhausted
+            # Execute with timeout
+            dispatch_result = await asyncio.wait_for(
+                self._dispatch_to_agent(
+                    job_id=job_id,
+                    agent_id=job.agent_id,
+                    payload_type=params["payload_type"],
+                    payload=params["payload"],
+                    session_mode=params["session_mode"],
+                    model=params["model"],
+                    job_name=params["job_name"],
+                ),
+                timeout=max_duration,
+            ) or {}
+
+            elapsed_ms = int((time.monotonic() - start_time) * 1000)
+
+            # Update state: success
             await self._update_job_state(
                 job_id,
-                status="failed",
+                status="success",
                 last_duration_ms=elapsed_ms,
-                last_error=last_error,
-                increment_fail=True,
+                increment_success=True,
             )
 
-            # Write heartbeat log entry for failure
+            # Write heartbeat log entry
+            model = dispatch_result.get("model", "")
+            tokens = dispatch_result.get("total_tokens", 0)
+            cost = dispatch_result.get("cost_usd", 0)
+            details = f"model={model}, tokens={tokens}, cost=${cost}" if model else "OK"
             await self._write_heartbeat_log(
                 job_name=job_id,
-                status="error",
-                details=last_error or "Unknown error",
+                status="success",
+                details=details,
                 duration_ms=elapsed_ms,
             )
 
+            logger.info(
+                "Job %s completed in %dms", job_id, elapsed_ms
+            )
+            return dispatch_result
+
+        except asyncio.TimeoutError:
+            elapsed_ms = int((time.monotonic() - start_time) * 1000)
+            last_error = f"Timeout after {max_duration}s"
+            logger.warning("Job %s timed out (attempt %d)", job_id, job.attempt + 1)
+
+        except Exception as e:
+            elapsed_ms = int((time.monotonic() - start_time) * 1000)
+            last_error = str(e)
             logger.error(
-                "Job %s failed after %d attempts: %s", job_id, max_attempts, last_error
+                "Job %s failed (attempt %d): %s", job_id, job.attempt + 1, e
             )
 
+        if job.attempt + 1 < max_attempts:
+            # Exponential backoff: 2^attempt seconds, capped — waited out
+            # in the queue, not in an execution slot
+            backoff = min(2 ** (job.attempt + 1), MAX_BACKOFF_SECONDS)
+            logger.info(
+                "Job %s retrying in %ds (attempt %d/%d)",
+                job_id, backoff, job.attempt + 2, max_attempts,
+            )
+            self._queue.submit(job.retry(), delay=backoff)
+            return None
+
+        # All retries exhausted
+        await self._update_job_state(
+            job_id,
+            status="failed",
+            last_duration_ms=elapsed_ms,
+            last_error=last_error,
+            increment_fail=True,
+        )
+
+        # Write heartbeat log entry for failure
+        await self._write_heartbeat_log(
+            job_name=job_id,
+            status="error",
+            details=last_error or "Unknown error",
+            duration_ms=elapsed_ms,
+        )
+
+        logger.error(
+            "Job %s failed after %d attempts: %s", job_id, max_attempts, last_error
+        )
+        return None
+
     async def _dispatch_to_agent(
         self,
         job_id: str,
@@ -457,43 +554,103 @@ class EngineScheduler:
         job_name: str = "",
     ) -> dict:
         """
-        Dispatch a job by creating a session via aria-api and sending
-        the payload as a message.  This reuses the same proven code path
-        as the web UI: prompt assembly, litellm proxy, session tracking.
+        Dispatch a job by creating a session and sending the payload as
+        a message — the same code path as the web UI: prompt assembly,
+        litellm proxy, session tracking.
 
-        Returns dict with model, total_tokens, cost_usd from the API response.
-        """
-        import aiohttp
+        Runs in-process on the attached ChatEngine when available,
+        otherwise through aria-api.
 
+        Returns dict with model, total_tokens, cost_usd from the response.
+        """
         if payload_type != "prompt":
             # skill / pipeline payloads are not session-based
             await self._dispatch_non_prompt(job_id, payload_type, payload)
             return {}
 
-        async with aiohttp.ClientSession() as http:
-            # S-103: Build auth headers for API calls
-            _headers = {}
-            _api_key = os.getenv("ARIA_API_KEY", "")
-            if _api_key:
-                _headers["X-API-Key"] = _api_key
-            # 1. Create a session via aria-api
-            # Build a human-readable title: "⏱ work_cycle · 14:30"
-            from datetime import datetime as _dt
-            _time_label = _dt.now().strftime("%H:%M")
-            _title = f"⏱ {job_name} · {_time_label}" if job_name else None
-            session_body: dict = {
-                "agent_id": agent_id,
-                "session_type": "cron",
-                "title": _title,
-                "metadata": {"cron_job_id": job_id, "job_name": job_name},
-            }
-            if model:
-                session_body["model"] = model
-            create_resp = await http.post(
-                f"{_API_BASE}/api/engine/chat/sessions",
-                json=session_body,
-                headers=_headers,
+        if self.dispatch_mode == "direct":
+            return await self._dispatch_direct(job_id, agent_id, payload, model, job_name)
+        return await self._dispatch_http(job_id, agent_id, payload, model, job_name)
+
+    @staticmethod
+    def _session_title(job_name: str) -> str | None:
+        """Human-readable session title: "⏱ work_cycle · 14:30"."""
+        return f"⏱ {job_name} · {datetime.now().strftime('%H:%M')}" if job_name else None
+
+    async def _dispatch_direct(
+        self, job_id: str, agent_id: str, payload: str, model: str, job_name: str,
+    ) -> dict:
+        """Run a prompt job on the in-process ChatEngine (no HTTP hop)."""
+        engine = self._chat_engine
+
+        # Same system prompt the /engine/chat/sessions endpoint assembles
+        system_prompt = None
+        if self._prompt_assembler is not None:
+            try:
+                assembled = await self._prompt_assembler.assemble_for_session(
+                    agent_id=agent_id or "aria",
+                    db_session_factory=self._session_factory,
+                )
+                system_prompt = str(assembled)
+            except Exception as e:
+                logger.warning("Job %s: prompt assembly failed (using None): %s", job_id, e)
+
+        session = await engine.create_session(
+            agent_id=agent_id,
+            model=model or None,
+            session_type="cron",
+            title=self._session_title(job_name),
+            system_prompt=system_prompt,
+            metadata={"cron_job_id": job_id, "job_name": job_name},
+        )
+        session_id = session["id"]
+        logger.info(
+            "Job %s: created session %s (agent=%s, direct)",
+            job_id, session_id, agent_id,
+        )
+
+        try:
+            # Work cycles repeat near-identical prompts — opt in to the
+            # response cache (tool-call turns are never served from it)
+            response = await engine.send_message(
+                session_id, payload, enable_thinking=False, enable_tools=True,
+                cache=True,
             )
+        finally:
+            # Close the session on success and failure (no ghost sessions)
+            try:
+                await engine.end_session(session_id)
+            except Exception as cleanup_err:
+                logger.warning(
+                    "Job %s: failed to close session %s: %s",
+                    job_id, session_id, cleanup_err,
+                )
+
+        result = response.to_dict()
+        logger.info(
+            "Job %s: completed (model=%s, tokens=%s, cost=$%s)",
+            job_id, result["model"], result["total_tokens"], result["cost_usd"],
+        )
+        return result
+
+    async def _dispatch_http(
+        self, job_id: str, agent_id: str, payload: str, model: str, job_name: str,
+    ) -> dict:
+        """Run a prompt job through aria-api's chat endpoints."""
+        http = self._http_client()
+
+        # 1. Create a session via aria-api
+        session_body: dict = {
+            "agent_id": agent_id,
+            "session_type": "cron",
+            "title": self._session_title(job_name),
+            "metadata": {"cron_job_id": job_id, "job_name": job_name},
+        }
+        if model:
+            session_body["model"] = model
+        async with http.post(
+            f"{_API_BASE}/api/engine/chat/sessions", json=session_body,
+        ) as create_resp:
             if create_resp.status != 201:
                 body = await create_resp.text()
                 raise SchedulerError(
@@ -501,63 +658,58 @@ class EngineScheduler:
                     f"HTTP {create_resp.status} — {body}"
                 )
             session_data = await create_resp.json()
-            session_id = session_data["id"]
+        session_id = session_data["id"]
 
-            logger.info(
-                "Job %s: created session %s (agent=%s)",
-                job_id, session_id, agent_id,
-            )
+        logger.info(
+            "Job %s: created session %s (agent=%s)",
+            job_id, session_id, agent_id,
+        )
 
-            try:
-                # 2. Send the cron payload as a message
-                msg_resp = await http.post(
-                    f"{_API_BASE}/api/engine/chat/sessions/{session_id}/messages",
-                    json={
-                        "content": payload,
-                        "enable_thinking": False,
-                        "enable_tools": True,
-                    },
-                    headers=_headers,
-                )
+        try:
+            # 2. Send the cron payload as a message
+            async with http.post(
+                f"{_API_BASE}/api/engine/chat/sessions/{session_id}/messages",
+                json={
+                    "content": payload,
+                    "enable_thinking": False,
+                    "enable_tools": True,
+                },
+            ) as msg_resp:
                 if msg_resp.status != 200:
                     body = await msg_resp.text()
                     raise SchedulerError(
                         f"Job {job_id} message failed: HTTP {msg_resp.status} — {body}"
                     )
-            except Exception:
-                # Clean up the empty session so it doesn't become a ghost
-                try:
-                    await http.delete(
-                        f"{_API_BASE}/api/engine/chat/sessions/{session_id}",
-                        headers=_headers,
-                    )
-                    logger.info(
-                        "Job %s: cleaned up empty session %s after failure",
-                        job_id, session_id,
-                    )
-                except Exception as cleanup_err:
-                    logger.warning(
-                        "Job %s: failed to cleanup session %s: %s",
-                        job_id, session_id, cleanup_err,
-                    )
-                raise
-
-            result = await msg_resp.json()
-            logger.info(
-                "Job %s: completed (model=%s, tokens=%s, cost=$%s)",
-                job_id,
-                result.get("model", "?"),
-                result.get("total_tokens", "?"),
-                result.get("cost_usd", "?"),
-            )
+                result = await msg_resp.json()
+        except Exception:
+            # Clean up the empty session so it doesn't become a ghost
+            try:
+                async with http.delete(f"{_API_BASE}/api/engine/chat/sessions/{session_id}"):
+                    pass
+                logger.info(
+                    "Job %s: cleaned up empty session %s after failure",
+                    job_id, session_id,
+                )
+            except Exception as cleanup_err:
+                logger.warning(
+                    "Job %s: failed to cleanup session %s: %s",
+                    job_id, session_id, cleanup_err,
+                )
+            raise
+
+        logger.info(
+            "Job %s: completed (model=%s, tokens=%s, cost=$%s)",
+            job_id,
+            result.get("model", "?"),
+            result.get("total_tokens", "?"),
+            result.get("cost_usd", "?"),
+        )
 
-            # 3. Close the session
-            await http.delete(
-                f"{_API_BASE}/api/engine/chat/sessions/{session_id}",
-                headers=_headers,
-            )
+        # 3. Close the session
+        async with http.delete(f"{_API_BASE}/api/engine/chat/sessions/{session_id}"):
+            pass
 
-            return result
+        return result
 
     async def _dispatch_non_prompt(
         self, job_id: str, payload_type: str, payload: str,
@@ -636,26 +788,35 @@ class EngineScheduler:
         details: str,
         duration_ms: int,
     ) -> None:
-        """Write a heartbeat_log entry via aria-api so the heartbeat page shows it."""
-        import aiohttp
-
+        """
+        Write a heartbeat_log entry so the heartbeat page shows it —
+        straight to the DB in direct mode, via aria-api otherwise.
+        """
+        executed_at = datetime.now(timezone.utc)
         try:
-            async with aiohttp.ClientSession() as http:
-                _hb_headers = {}
-                _hb_key = os.getenv("ARIA_API_KEY", "")
-                if _hb_key:
-                    _hb_headers["X-API-Key"] = _hb_key
-                await http.post(
-                    f"{_API_BASE}/api/heartbeat",
-                    json={
-                        "job_name": job_name,
-                        "status": status,
-                        "details": details,
-                        "executed_at": datetime.now(timezone.utc).isoformat(),
-                        "duration_ms": duration_ms,
-                    },
-                    headers=_hb_headers,
-                )
+            if self.dispatch_mode == "direct":
+                async with self._session_factory() as session:
+                    session.add(HeartbeatLog(
+                        id=uuid4(),
+                        job_name=job_name,
+                        status=status,
+                        details={"raw": details},  # same shape POST /heartbeat stores
+                        executed_at=executed_at,
+                        duration_ms=duration_ms,
+                    ))
+                    await session.commit()
+                return
+            async with self._http_client().post(
+                f"{_API_BASE}/api/heartbeat",
+                json={
+                    "job_name": job_name,
+                    "status": status,
+                    "details": details,
+                    "executed_at": executed_at.isoformat(),
+                    "duration_ms": duration_ms,
+                },
+            ):
+                pass
         except Exception as e:
             logger.warning("Failed to write heartbeat log for %s: %s", job_name, e)
 
@@ -686,6 +847,10 @@ class EngineScheduler:
                 session_mode=job_data.get("session_mode", "isolated"),
                 max_duration_seconds=job_data.get("max_duration_seconds", 300),
                 retry_count=job_data.get("retry_count", 0),
+                metadata_json=(
+                    {"priority": normalize_priority(job_data["priority"])}
+                    if "priority" in job_data else {}
+                ),
             )
             await conn.execute(stmt)
 
@@ -704,6 +869,7 @@ class EngineScheduler:
                     "session_mode": job_data.get("session_mode", "isolated"),
                     "max_duration": job_data.get("max_duration_seconds", 300),
                     "retry_count": job_data.get("retry_count", 0),
+                    "priority": job_priority(job_data),
                 },
             )
 
@@ -726,6 +892,10 @@ class EngineScheduler:
             "payload", "session_mode", "max_duration_seconds", "retry_count",
         }
         filtered = {k: v for k, v in updates.items() if k in allowed_fields}
+        if "priority" in updates:
+            filtered["metadata_json"] = EngineCronJob.metadata_json.op("||")(
+                func.jsonb_build_object("priority", normalize_priority(updates["priority"]))
+            )
         if not filtered:
             return False
 
@@ -743,7 +913,7 @@ class EngineScheduler:
                 return False
 
         # Re-register with APScheduler if schedule or enabled changed
-        if self._scheduler and ("schedule" in updates or "enabled" in updates):
+        if self._scheduler and updates.keys() & {"schedule", "enabled", "priority"}:
             # Remove old schedule
             try:
                 await self._scheduler.remove_schedule(job_id)
@@ -768,6 +938,7 @@ class EngineScheduler:
                             "session_mode": job["session_mode"],
                             "max_duration": job["max_duration_seconds"],
                             "retry_count": job["retry_count"],
+                            "priority": job_priority(job["metadata"]),
                         },
                     )
 
@@ -807,22 +978,25 @@ class EngineScheduler:
         if not job:
             return False
 
-        # Run in background task
-        task = asyncio.create_task(
-            self._execute_job(
-                job_id=job_id,
-                agent_id=job["agent_id"],
-                payload_type=job["payload_type"],
-                payload=job["payload"],
-                session_mode=job["session_mode"],
-                max_duration=job["max_duration_seconds"],
-                retry_count=0,  # No retry for manual triggers
-            )
+        # Queue without jitter, ahead of routine work (at least "high")
+        priority = job_priority(job["metadata"])
+        if PRIORITIES[priority] > PRIORITIES["high"]:
+            priority = "high"
+        queued = await self._execute_job(
+            job_id=job_id,
+            agent_id=job["agent_id"],
+            payload_type=job["payload_type"],
+            payload=job["payload"],
+            session_mode=job["session_mode"],
+            max_duration=job["max_duration_seconds"],
+            retry_count=0,  # No retry for manual triggers
+            priority=priority,
+            jitter=False,
         )
-        self._active_executions[job_id] = task
-        task.add_done_callback(lambda _: self._active_executions.pop(job_id, None))
 
-        logger.info("Manually triggered job: %s", job_id)
+        logger.info(
+            "Manually triggered job: %s%s", job_id, "" if queued else " (already queued)",
+        )
         return True
 
     async def get_job(self, job_id: str) -> dict[str, Any] | None:
@@ -916,7 +1090,8 @@ class EngineScheduler:
         """Get scheduler status summary."""
         return {
             "running": self._running,
-            "active_executions": len(self._active_executions),
-            "active_job_ids": list(self._active_executions.keys()),
+            "active_executions": len(self._queue.running),
+            "active_job_ids": list(self._queue.running),
             "max_concurrent": MAX_CONCURRENT_JOBS,
+            "queue": self._queue.stats(),
         }
@@ -23,6 +23,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
 from aria_engine.config import EngineConfig
 from aria_engine.exceptions import EngineError
+from aria_engine.transcript_cache import get_transcript_cache
 from db.models import EngineChatSession, EngineChatMessage
 
 logger = logging.getLogger("aria.engine.session_isolation")
@@ -290,6 +291,7 @@ class AgentSessionScope:
                     cost=cost,
                     latency_ms=latency_ms,
                     metadata_json=metadata or {},
+                    created_at=datetime.now(timezone.utc),
                 )
                 session.add(msg)
 
@@ -311,6 +313,8 @@ class AgentSessionScope:
                     )
                 )
 
+        # Committed — keep any cached transcript for this session current
+        await get_transcript_cache().extend(session_id, [msg])
         return message_id
 
     async def get_messages(
@@ -23,6 +23,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
 from aria_engine.config import EngineConfig
 from aria_engine.exceptions import EngineError
+from aria_engine.transcript_cache import CachedMessage, get_transcript_cache
 from db.models import (
     Base,
     EngineChatSession,
@@ -79,6 +80,7 @@ class NativeSessionManager:
         self._async_session = async_sessionmaker(
             db_engine, expire_on_commit=False,
         )
+        self._transcripts = get_transcript_cache()
 
     # ── Session CRUD ──────────────────────────────────────────
 
@@ -366,6 +368,7 @@ class NativeSessionManager:
                 )
                 deleted = result.first() is not None
 
+        await self._transcripts.invalidate(session_id)
         if deleted:
             logger.info("Deleted session %s", session_id)
 
@@ -466,7 +469,8 @@ class NativeSessionManager:
                     )
                 )
 
-                return {
+                cached = CachedMessage.from_row(msg)
+                payload = {
                     "id": str(msg.id),
                     "session_id": str(msg.session_id),
                     "role": msg.role,
@@ -475,6 +479,10 @@ class NativeSessionManager:
                     "created_at": msg.created_at.isoformat(),
                 }
 
+        # Committed — keep any cached transcript for this session current
+        await self._transcripts.extend(session_id, [cached])
+        return payload
+
     async def get_messages(
         self,
         session_id: str,
@@ -546,7 +554,11 @@ class NativeSessionManager:
         async with self._async_session() as session:
             async with session.begin():
                 result = await session.execute(stmt)
-                return result.first() is not None
+                deleted = result.first() is not None
+
+        if deleted:
+            await self._transcripts.invalidate(session_id)
+        return deleted
 
     # ── Maintenance ───────────────────────────────────────────
 
@@ -727,6 +739,8 @@ class NativeSessionManager:
                     .where(EngineChatSession.id.in_(stale_ids))
                 )
 
+        await self._transcripts.invalidate_many(stale_ids)
+
         logger.info(
             "Pruned %d sessions after archive (%d messages, >%d days old)",
             len(stale_ids), msg_count, days,
@@ -914,6 +928,8 @@ class NativeSessionManager:
                     .where(EngineChatSession.id.in_(stale_ids))
                 )
 
+        await self._transcripts.invalidate_many(stale_ids)
+
         logger.info(
             "Type purge: archived+deleted %d '%s' sessions (%d messages, >%d days old)",
             len(stale_ids), session_type, msg_count, days,
@@ -1024,6 +1040,8 @@ class NativeSessionManager:
                     .where(EngineChatSession.id == session_id)
                 )
 
+        await self._transcripts.invalidate(session_id)
+
         logger.info("Archived session %s to archive tables", session_id)
         return True
 
@@ -1119,8 +1137,10 @@ class NativeSessionManager:
                     .where(where_clause)
                     .returning(EngineChatSession.id)
                 )
-                deleted = len(result.all())
+                ghost_ids = [r[0] for r in result.all()]
+                deleted = len(ghost_ids)
 
+        await self._transcripts.invalidate_many(ghost_ids)
         if deleted:
             logger.info(
                 "Ghost purge: deleted %d empty sessions (older_than=%d min)",
@@ -2,7 +2,7 @@
 Session Protection — rate limiting, validation, and concurrent write safety.
 
 Features:
-- Per-session rate limiting (sliding window)
+- Per-session rate limiting (bucketed sliding window, idle keys evicted)
 - Per-agent rate limiting (aggregate cap)
 - Message content validation (length, encoding, patterns)
 - Session size limits (max messages per session)
@@ -13,8 +13,7 @@ import asyncio
 import logging
 import re
 import time
-from collections import defaultdict
-from dataclasses import dataclass, field
+import weakref
 from typing import Any
 
 from sqlalchemy import select, func
@@ -22,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 
 from aria_engine.config import EngineConfig
 from aria_engine.exceptions import EngineError
+from aria_engine.rate_limit import MemoryStore, SlidingWindow  # noqa: F401 — re-exported
 from db.models import EngineChatMessage
 
 logger = logging.getLogger("aria.engine.session_protection")
@@ -32,6 +32,7 @@ logger = logging.getLogger("aria.engine.session_protection")
 DEFAULT_MAX_MESSAGES_PER_MINUTE = 20
 DEFAULT_MAX_MESSAGES_PER_HOUR = 200
 DEFAULT_MAX_MESSAGES_PER_SESSION = 500
+RATE_WINDOWS = (60, 3600)  # seconds — bucketed counters, see aria_engine.rate_limit
 AGENT_RATE_LIMITS = {
     "main": {"per_minute": 30, "per_hour": 300},
     "aria-talk": {"per_minute": 20, "per_hour": 200},
@@ -59,6 +60,15 @@ INJECTION_PATTERNS = [
     re.compile(r"\[INST\]|\[/INST\]|<\|im_start\|>", re.I),
 ]
 
+# ── Locking ───────────────────────────────────────────────────
+
+# Process-wide advisory locks keyed by session id. Weak values: a lock
+# disappears once no holder or waiter references it, so idle sessions
+# don't accumulate.
+_SESSION_LOCKS: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
 # ── Errors ────────────────────────────────────────────────────
 
 
@@ -85,23 +95,6 @@ class SessionFullError(EngineError):
 # ── Data Classes ──────────────────────────────────────────────
 
 
-@dataclass
-class SlidingWindow:
-    """Sliding window rate limiter for a single key."""
-
-    timestamps: list = field(default_factory=list)
-
-    def add(self) -> None:
-        self.timestamps.append(time.monotonic())
-
-    def count_in_window(self, window_seconds: float) -> int:
-        cutoff = time.monotonic() - window_seconds
-        self.timestamps = [
-            t for t in self.timestamps if t > cutoff
-        ]
-        return len(self.timestamps)
-
-
 class SessionProtection:
     """
     Session protection layer — validation, rate limiting, and locking.
@@ -138,16 +131,9 @@ class SessionProtection:
         self._max_per_hour = max_per_hour
         self._max_per_session = max_per_session
 
-        # In-memory rate limiters (per session + per agent)
-        self._session_windows: dict[str, SlidingWindow] = defaultdict(
-            SlidingWindow
-        )
-        self._agent_windows: dict[str, SlidingWindow] = defaultdict(
-            SlidingWindow
-        )
-
-        # Advisory lock set (track which sessions are locked)
-        self._locks: dict[str, asyncio.Lock] = {}
+        # In-memory rate limiters (per session + per agent); idle keys evicted
+        self._session_windows = MemoryStore()
+        self._agent_windows = MemoryStore()
 
     async def validate_and_check(
         self,
@@ -205,7 +191,8 @@ class SessionProtection:
         self._check_injection(content, session_id, agent_id)
 
         # 5. Rate limiting — per session
-        session_window = self._session_windows[session_id]
+        now = time.time()
+        session_window = self._session_windows.window_for(session_id, RATE_WINDOWS, now)
         minute_count = session_window.count_in_window(60)
         if minute_count >= self._max_per_minute:
             raise RateLimitError(
@@ -230,7 +217,7 @@ class SessionProtection:
                 "per_hour": self._max_per_hour,
             },
         )
-        agent_window = self._agent_windows[agent_id]
+        agent_window = self._agent_windows.window_for(agent_id, RATE_WINDOWS, now)
         agent_minute = agent_window.count_in_window(60)
         if agent_minute >= agent_limits["per_minute"]:
             raise RateLimitError(
@@ -248,8 +235,8 @@ class SessionProtection:
             )
 
         # Record the request in rate limiter windows
-        session_window.add()
-        agent_window.add()
+        session_window.add(now)
+        agent_window.add(now)
 
         return content
 
@@ -316,39 +303,23 @@ class SessionProtection:
             async with protector.session_lock("abc123"):
                 await mgr.add_message(...)
         """
-        if session_id not in self._locks:
-            self._locks[session_id] = asyncio.Lock()
-        return SessionLock(self._locks[session_id])
+        return session_lock(session_id)
 
     def cleanup_windows(self, max_age_seconds: int = 7200) -> int:
         """
         Clean up stale rate limiter windows.
 
-        Should be called periodically to prevent memory leaks.
+        Idle keys are also evicted as the stores are used; this forces
+        a sweep with a custom age.
 
         Returns:
             Number of windows cleaned up.
         """
-        cutoff = time.monotonic() - max_age_seconds
-        cleaned = 0
-
-        for key in list(self._session_windows.keys()):
-            window = self._session_windows[key]
-            window.timestamps = [
-                t for t in window.timestamps if t > cutoff
-            ]
-            if not window.timestamps:
-                del self._session_windows[key]
-                cleaned += 1
-
-        for key in list(self._agent_windows.keys()):
-            window = self._agent_windows[key]
-            window.timestamps = [
-                t for t in window.timestamps if t > cutoff
-            ]
-            if not window.timestamps:
-                del self._agent_windows[key]
-                cleaned += 1
+        now = time.time()
+        cleaned = (
+            self._session_windows.evict_idle(now, max_age_seconds)
+            + self._agent_windows.evict_idle(now, max_age_seconds)
+        )
 
         if cleaned:
             logger.debug("Cleaned %d stale rate limit windows", cleaned)
@@ -364,7 +335,7 @@ class SessionProtection:
         status: dict[str, Any] = {}
 
         if session_id and session_id in self._session_windows:
-            w = self._session_windows[session_id]
+            w = self._session_windows.get(session_id)
             status["session"] = {
                 "per_minute": w.count_in_window(60),
                 "per_hour": w.count_in_window(3600),
@@ -380,7 +351,7 @@ class SessionProtection:
                     "per_hour": self._max_per_hour,
                 },
             )
-            w = self._agent_windows[agent_id]
+            w = self._agent_windows.get(agent_id)
             status["agent"] = {
                 "per_minute": w.count_in_window(60),
                 "per_hour": w.count_in_window(3600),
@@ -391,6 +362,22 @@ class SessionProtection:
         return status
 
 
+def session_lock(session_id: str) -> "SessionLock":
+    """
+    Get the process-wide advisory lock for a session.
+
+    Shared by every SessionProtection instance, so all in-process writers
+    of a session serialize on the same lock. Not reentrant; the transcript
+    cache uses locks of its own, so add_message() is safe while holding it.
+    """
+    key = str(session_id)
+    lock = _SESSION_LOCKS.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _SESSION_LOCKS[key] = lock
+    return SessionLock(lock)
+
+
 class SessionLock:
     """
     Async context manager for session advisory locking.
@@ -35,10 +35,14 @@ from typing import Any
 from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
 
 from aria_engine.config import EngineConfig
+from aria_engine.context_manager import ContextManager
 from aria_engine.exceptions import SessionError, LLMError
 from aria_engine.llm_gateway import LLMGateway, StreamChunk
-from aria_engine.telemetry import log_model_usage, log_skill_invocation, _parse_skill_from_tool
+from aria_engine.telemetry import (
+    log_model_usage, log_skill_invocation, _parse_skill_from_tool, get_telemetry_writer,
+)
 from aria_engine.tool_registry import ToolRegistry, ToolResult
+from aria_engine.transcript_cache import get_transcript_cache
 
 logger = logging.getLogger("aria.engine.stream")
 
@@ -88,6 +92,9 @@ class StreamManager:
         self.gateway = gateway
         self.tools = tool_registry
         self._db_factory = db_session_factory
+        self._context = ContextManager(config)
+        self._transcripts = get_transcript_cache(config)
+        get_telemetry_writer(db_session_factory, config)  # sized from config
         self._active_connections: dict[str, WebSocket] = {}
         # Per-session locks to serialize message handling and prevent DB deadlocks
         # when multiple WS connections target the same session simultaneously.
@@ -277,15 +284,67 @@ class StreamManager:
             )
             db.add(user_msg)
             await db.flush()
+            # Rows written this turn — published to the transcript cache
+            # only after the commit succeeds.
+            new_rows: list[Any] = [user_msg]
 
             # Build conversation context
-            messages = await self._build_context(db, session, content)
+            messages = await self._context.build_session_context(
+                db, session, pending=[user_msg],
+            )
             tools_for_llm = self.tools.get_tools_for_llm() if enable_tools else None
 
             # ── Stream LLM response ───────────────────────────────────────
             max_tool_iterations = 20
             max_per_tool_failures = 3
             tool_failure_counts: dict[str, int] = {}
+
+            def _guard_tool(tc: dict[str, Any]) -> ToolResult | None:
+                # Per-tool failure cap
+                fn_name = tc["function"]["name"]
+                if tool_failure_counts.get(fn_name, 0) >= max_per_tool_failures:
+                    logger.warning(
+                        "Tool %s failed %d times in stream %s — blocking",
+                        fn_name, tool_failure_counts[fn_name], session_id,
+                    )
+                    return ToolResult(
+                        tool_call_id=tc["id"],
+                        name=fn_name,
+                        content=json.dumps({
+                            "error": f"Tool '{fn_name}' has failed "
+                            f"{tool_failure_counts[fn_name]} consecutive "
+                            "times this turn. Do NOT call it again — "
+                            "use an alternative or inform the user."
+                        }),
+                        success=False,
+                    )
+                return None
+
+            async def _on_tool_result(tc: dict[str, Any], tool_result: ToolResult) -> None:
+                # Track failures
+                fn_name = tc["function"]["name"]
+                if tool_result.success:
+                    tool_failure_counts.pop(fn_name, None)
+                else:
+                    tool_failure_counts[fn_name] = tool_failure_counts.get(fn_name, 0) + 1
+
+                # Notify client about tool result as soon as it lands
+                await self._send_json(websocket, {
+                    "type": "tool_result",
+                    "name": tool_result.name,
+                    "content": tool_result.content,
+                    "id": tool_result.tool_call_id,
+                    "success": tool_result.success,
+                })
+
+            async def _announce_tool_call(tc: dict[str, Any]) -> None:
+                await self._send_json(websocket, {
+                    "type": "tool_call",
+                    "name": tc["function"]["name"],
+                    "arguments": tc["function"]["arguments"],
+                    "id": tc["id"],
+                })
+
             for iteration in range(max_tool_iterations):
                 # Notify frontend: iteration starting
                 await self._send_json(websocket, {
@@ -293,6 +352,16 @@ class StreamManager:
                     "iteration": iteration + 1,
                     "tool_calls_so_far": len(accumulator.tool_calls),
                 })
+                # Tool calls completed mid-stream start executing right away
+                streamed_calls: list[dict[str, Any]] = []
+                tool_batch = self.tools.start_batch(
+                    max_concurrency=self.config.max_concurrent_tools,
+                    guard=_guard_tool,
+                    on_result=_on_tool_result,
+                )
+                thinking_start = len(accumulator.thinking)
+                turn_usage = (0, 0, 0.0)
+                disconnected = False
                 try:
                     async for chunk in self.gateway.stream(
                         messages=messages,
@@ -304,8 +373,15 @@ class StreamManager:
                     ):
                         if not await self._is_connected(websocket):
                             logger.warning("Client disconnected during stream")
+                            disconnected = True
                             break
 
+                        # Final chunk: usage for this LLM call
+                        if chunk.input_tokens or chunk.output_tokens:
+                            turn_usage = (
+                                chunk.input_tokens, chunk.output_tokens, chunk.cost_usd,
+                            )
+
                         # Stream thinking tokens
                         if chunk.thinking:
                             accumulator.thinking += chunk.thinking
@@ -322,62 +398,111 @@ class StreamManager:
                                 "content": chunk.content,
                             })
 
+                        # Dispatch each tool call as soon as it is complete
+                        if chunk.tool_call_delta:
+                            tc = chunk.tool_call_delta
+                            streamed_calls.append(tc)
+                            await _announce_tool_call(tc)
+                            tool_batch.submit(tc)
+
                         # Capture finish reason
                         if chunk.finish_reason:
                             accumulator.finish_reason = chunk.finish_reason
 
                 except LLMError as e:
+                    await tool_batch.aclose()
                     await self._send_json(websocket, {
                         "type": "error",
                         "message": f"LLM error: {e}",
                     })
                     break
 
+                if disconnected:
+                    # Nobody is waiting for tool output; stop the calls
+                    # already started and keep the partial response.
+                    await tool_batch.aclose()
+                    break
+
+                self._add_usage(accumulator, turn_usage)
+
+                has_tool_calls = accumulator.finish_reason == "tool_calls"
+                if streamed_calls and not has_tool_calls:
+                    # Calls closed mid-stream but the turn ended otherwise
+                    # (e.g. cut off at max_tokens): don't act on them
+                    logger.warning(
+                        "Dropping %d streamed tool call(s): finish_reason=%r",
+                        len(streamed_calls), accumulator.finish_reason,
+                    )
+                    await tool_batch.aclose()
+                    streamed_calls = []
+
                 # Notify frontend: iteration result
                 await self._send_json(websocket, {
                     "type": "iteration_end",
                     "iteration": iteration + 1,
-                    "has_tool_calls": accumulator.finish_reason == "tool_calls",
-                    "tool_count": 0,  # updated below after resolving tool_calls
+                    "has_tool_calls": has_tool_calls,
+                    "tool_count": len(streamed_calls),
                 })
 
-                # Check for tool calls in accumulated content
-                # If the model requested tool calls, we re-call non-streaming
-                if accumulator.finish_reason == "tool_calls":
-                    # Fall back to non-streaming for tool call execution
-                    try:
-                        llm_response = await self.gateway.complete(
-                            messages=messages,
-                            model=session.model,
-                            temperature=session.temperature,
-                            max_tokens=session.max_tokens,
-                            tools=tools_for_llm,
-                            enable_thinking=enable_thinking,
-                        )
-                    except LLMError as e:
-                        await self._send_json(websocket, {
-                            "type": "error",
-                            "message": f"Tool call LLM error: {e}",
-                        })
-                        break
+                if has_tool_calls:
+                    if streamed_calls:
+                        tool_calls = streamed_calls
+                        turn_content = accumulator.content
+                        turn_thinking = accumulator.thinking[thinking_start:]
+                        usage = turn_usage
+                    else:
+                        # Provider signalled tool_calls without streaming them —
+                        # fall back to non-streaming for tool call execution
+                        try:
+                            llm_response = await self.gateway.complete(
+                                messages=messages,
+                                model=session.model,
+                                temperature=session.temperature,
+                                max_tokens=session.max_tokens,
+                                tools=tools_for_llm,
+                                enable_thinking=enable_thinking,
+                            )
+                        except LLMError as e:
+                            await self._send_json(websocket, {
+                                "type": "error",
+                                "message": f"Tool call LLM error: {e}",
+                            })
+                            break
+                        self._add_usage(accumulator, (
+                            llm_response.input_tokens,
+                            llm_response.output_tokens,
+                            llm_response.cost_usd,
+                        ))
+
+                        if not llm_response.tool_calls:
+                            # No tool calls after all — use the response content
+                            accumulator.content = llm_response.content
+                            accumulator.thinking = llm_response.thinking or accumulator.thinking
+                            break
 
-                    if not llm_response.tool_calls:
-                        # No tool calls after all — use the response content
-                        accumulator.content = llm_response.content
-                        accumulator.thinking = llm_response.thinking or accumulator.thinking
-                        break
+                        tool_calls = llm_response.tool_calls
+                        turn_content = llm_response.content or ""
+                        turn_thinking = llm_response.thinking or ""
+                        usage = (
+                            llm_response.input_tokens,
+                            llm_response.output_tokens,
+                            llm_response.cost_usd,
+                        )
+                        # Notify client about every tool call up front
+                        for tc in tool_calls:
+                            await _announce_tool_call(tc)
+                            tool_batch.submit(tc)
 
-                    # Execute tool calls
-                    accumulator.tool_calls.extend(llm_response.tool_calls)
+                    accumulator.tool_calls.extend(tool_calls)
                     assistant_entry: dict[str, Any] = {
                         "role": "assistant",
-                        "content": llm_response.content or "",
-                        "tool_calls": llm_response.tool_calls,
+                        "content": turn_content,
+                        "tool_calls": tool_calls,
                     }
                     # Include thinking so models that require reasoning_content
                     # on tool-call messages (e.g. Kimi) don't reject the request
-                    if llm_response.thinking:
-                        assistant_entry["reasoning_content"] = llm_response.thinking
+                    if turn_thinking:
+                        assistant_entry["reasoning_content"] = turn_thinking
                     messages.append(assistant_entry)
 
                     # Persist intermediate assistant message so tool results
@@ -386,61 +511,26 @@ class StreamManager:
                         id=uuid.uuid4(),
                         session_id=uuid.UUID(session_id),
                         role="assistant",
-                        content=llm_response.content or "",
-                        thinking=llm_response.thinking or None,
-                        tool_calls=llm_response.tool_calls,
+                        content=turn_content,
+                        thinking=turn_thinking or None,
+                        tool_calls=tool_calls,
                         model=accumulator.model,
-                        tokens_input=llm_response.input_tokens if hasattr(llm_response, 'input_tokens') else 0,
-                        tokens_output=llm_response.output_tokens if hasattr(llm_response, 'output_tokens') else 0,
-                        cost=llm_response.cost_usd if hasattr(llm_response, 'cost_usd') else 0,
+                        tokens_input=usage[0],
+                        tokens_output=usage[1],
+                        cost=usage[2],
                         latency_ms=accumulator.latency_ms,
                         created_at=datetime.now(timezone.utc),
                     )
                     db.add(intermediate_msg)
                     await db.flush()
+                    new_rows.append(intermediate_msg)
 
-                    for tc in llm_response.tool_calls:
-                        fn_name = tc["function"]["name"]
-
-                        # Notify client about tool call
-                        await self._send_json(websocket, {
-                            "type": "tool_call",
-                            "name": fn_name,
-                            "arguments": tc["function"]["arguments"],
-                            "id": tc["id"],
-                        })
-
-                        # Per-tool failure cap
-                        if tool_failure_counts.get(fn_name, 0) >= max_per_tool_failures:
-                            logger.warning(
-                                "Tool %s failed %d times in stream %s — blocking",
-                                fn_name, tool_failure_counts[fn_name], session_id,
-                            )
-                            tool_result = ToolResult(
-                                tool_call_id=tc["id"],
-                                name=fn_name,
-                                content=json.dumps({
-                                    "error": f"Tool '{fn_name}' has failed "
-                                    f"{tool_failure_counts[fn_name]} consecutive "
-                                    "times this turn. Do NOT call it again — "
-                                    "use an alternative or inform the user."
-                                }),
-                                success=False,
-                            )
-                        else:
-                            # Execute tool
-                            tool_result = await self.tools.execute(
-                                tool_call_id=tc["id"],
-                                function_name=fn_name,
-                                arguments=tc["function"]["arguments"],
-                            )
-
-                        # Track failures
-                        if tool_result.success:
-                            tool_failure_counts.pop(fn_name, None)
-                        else:
-                            tool_failure_counts[fn_name] = tool_failure_counts.get(fn_name, 0) + 1
+                    # Wait for the tool calls (independent calls run concurrently,
+                    # streamed ones have been running since they closed)
+                    tool_results = await tool_batch.results()
 
+                    for tc, tool_result in zip(tool_calls, tool_results):
+                        fn_name = tc["function"]["name"]
                         accumulator.tool_results.append({
                             "tool_call_id": tool_result.tool_call_id,
                             "name": tool_result.name,
@@ -450,25 +540,16 @@ class StreamManager:
                         })
 
                         # Telemetry → aria_data.skill_invocations
-                        asyncio.ensure_future(log_skill_invocation(
+                        log_skill_invocation(
                             self._db_factory,
                             skill_name=_parse_skill_from_tool(fn_name),
                             tool_name=fn_name,
                             duration_ms=tool_result.duration_ms,
                             success=tool_result.success,
                             model_used=accumulator.model,
-                        ))
-
-                        # Notify client about tool result
-                        await self._send_json(websocket, {
-                            "type": "tool_result",
-                            "name": tool_result.name,
-                            "content": tool_result.content,
-                            "id": tool_result.tool_call_id,
-                            "success": tool_result.success,
-                        })
+                        )
 
-                        # Add to messages for next LLM turn
+                        # Add to messages for next LLM turn (tool_call order)
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_result.tool_call_id,
@@ -489,6 +570,7 @@ class StreamManager:
                             created_at=datetime.now(timezone.utc),
                         )
                         db.add(tool_msg)
+                        new_rows.append(tool_msg)
 
                     # Reset accumulator content for next stream
                     accumulator.content = ""
@@ -516,9 +598,11 @@ class StreamManager:
                 created_at=datetime.now(timezone.utc),
             )
             db.add(assistant_msg)
+            new_rows.append(assistant_msg)
 
             # Commit messages first (critical data).
             await db.commit()
+            await self._transcripts.extend(session.id, new_rows)
 
             # ── Update session counters (separate transaction) ────────────
             # Done in its own transaction so a transient lock/deadlock doesn't
@@ -560,7 +644,7 @@ class StreamManager:
                 )
 
             # Telemetry → aria_data.model_usage
-            asyncio.ensure_future(log_model_usage(
+            log_model_usage(
                 self._db_factory,
                 model=accumulator.model or "unknown",
                 input_tokens=accumulator.input_tokens,
@@ -568,7 +652,7 @@ class StreamManager:
                 cost_usd=accumulator.cost_usd,
                 latency_ms=accumulator.latency_ms,
                 success=True,
-            ))
+            )
 
             # ── Send stream_end (combines usage + done for frontend) ────
             await self._send_json(websocket, {
@@ -611,130 +695,6 @@ class StreamManager:
                 await db.commit()
                 logger.info("Reactivated ended session %s for WS reconnect", session_id)
 
-    async def _build_context(
-        self,
-        db,
-        session,
-        current_content: str,
-    ) -> list[dict[str, Any]]:
-        """Build conversation context from DB messages (same as ChatEngine)."""
-        from db.models import EngineChatMessage
-        from sqlalchemy import select
-
-        messages: list[dict[str, Any]] = []
-
-        if session.system_prompt:
-            messages.append({"role": "system", "content": session.system_prompt})
-
-        window = session.context_window or 50
-        MIN_CONVERSATION_TURNS = 10  # always keep at least this many user+assistant msgs
-        fetch_limit = max(window * 3, 200)  # over-fetch so we have room to pick
-        result = await db.execute(
-            select(EngineChatMessage)
-            .where(EngineChatMessage.session_id == session.id)
-            .order_by(EngineChatMessage.created_at.desc())
-            .limit(fetch_limit)
-        )
-        all_db_messages = list(reversed(result.scalars().all()))
-
-        # Split into conversation (user/assistant) and tool/system messages
-        conversation_msgs = [m for m in all_db_messages if m.role in ("user", "assistant")]
-        tool_msgs = [m for m in all_db_messages if m.role not in ("user", "assistant")]
-
-        # Always keep at least MIN_CONVERSATION_TURNS of conversation history
-        # plus the most recent tool messages that fit within the window
-        keep_conv = conversation_msgs[-max(MIN_CONVERSATION_TURNS, window // 2):]
-        keep_conv_ids = {id(m) for m in keep_conv}
-
-        # Budget remaining window slots for tool messages (most recent first)
-        tool_budget = max(window - len(keep_conv), 10)
-        keep_tools = tool_msgs[-tool_budget:]
-        keep_tool_ids = {id(m) for m in keep_tools}
-
-        # Merge back in original chronological order
-        db_messages = [
-            m for m in all_db_messages
-            if id(m) in keep_conv_ids or id(m) in keep_tool_ids
-        ]
-
-        if len(all_db_messages) > window:
-            logger.info(
-                "Context protection: %d total msgs → kept %d conversation + %d tool "
-                "(window=%d, fetched=%d)",
-                len(all_db_messages), len(keep_conv), len(keep_tools),
-                window, fetch_limit,
-            )
-
-        for msg in db_messages:
-            entry: dict[str, Any] = {"role": msg.role, "content": msg.content or ""}
-            if msg.tool_calls:
-                entry["tool_calls"] = msg.tool_calls
-            # Include thinking as reasoning_content for models that require it
-            # (e.g. Kimi/Moonshot rejects assistant tool-call msgs without it)
-            if msg.role == "assistant" and hasattr(msg, "thinking") and msg.thinking:
-                entry["reasoning_content"] = msg.thinking
-            # Tool messages MUST have a valid tool_call_id or the provider rejects them
-            if msg.role == "tool":
-                tc_id = (msg.tool_results or {}).get("tool_call_id", "") if msg.tool_results else ""
-                if tc_id:
-                    entry["tool_call_id"] = tc_id
-                else:
-                    continue  # Skip orphan / corrupt tool messages
-            messages.append(entry)
-
-        # ── Post-process: fix tool-call ordering anomalies ────────────────
-        # DB may store tool results BEFORE the assistant message that triggered
-        # them (race in persistence timing).  We re-order so each assistant
-        # with tool_calls is immediately followed by its tool results, and any
-        # orphaned tool/assistant messages are dropped.
-
-        # 1. Build a set of all tool_call_ids declared by assistant messages
-        declared_tc_ids: set[str] = set()
-        for m in messages:
-            if m.get("tool_calls"):
-                for tc in m["tool_calls"]:
-                    declared_tc_ids.add(tc.get("id", ""))
-
-        # 2. Separate tool messages into a map keyed by tool_call_id
-        tool_msgs_by_id: dict[str, dict] = {}
-        non_tool_msgs: list[dict[str, Any]] = []
-        for m in messages:
-            if m.get("role") == "tool" and m.get("tool_call_id"):
-                tc_id = m["tool_call_id"]
-                if tc_id in declared_tc_ids:
-                    tool_msgs_by_id[tc_id] = m
-                # else: orphan tool message — drop silently
-            else:
-                non_tool_msgs.append(m)
-
-        # 3. Rebuild: after each assistant with tool_calls, inject its tool results
-        cleaned: list[dict[str, Any]] = []
-        for m in non_tool_msgs:
-            if m.get("tool_calls"):
-                # Check which tool results exist for this assistant
-                owned_ids = [tc.get("id", "") for tc in m["tool_calls"]]
-                existing = [tool_msgs_by_id[tid] for tid in owned_ids if tid in tool_msgs_by_id]
-                if existing:
-                    cleaned.append(m)
-                    cleaned.extend(existing)
-                else:
-                    # No tool results found — strip tool_calls, drop if empty
-                    stripped = {k: v for k, v in m.items() if k != "tool_calls"}
-                    if stripped.get("role") == "assistant" and not stripped.get("content"):
-                        continue
-                    cleaned.append(stripped)
-            else:
-                # Drop empty assistant messages (no content, no tool_calls)
-                # — these are often artifacts from failed LLM calls.
-                if m.get("role") == "assistant" and not m.get("content") and not m.get("tool_calls"):
-                    continue
-                cleaned.append(m)
-        messages = cleaned
-
-        # NOTE: user message is already persisted (flush) before _build_context
-        # is called, so the DB query above includes it — do NOT append again.
-        return messages
-
     async def _keepalive(self, websocket: WebSocket, connection_id: str) -> None:
         """Send ping every ws_ping_interval seconds to keep connection alive."""
         try:
@@ -749,6 +709,13 @@ class StreamManager:
         except Exception as e:
             logger.warning("Keepalive loop error: %s", e)
 
+    @staticmethod
+    def _add_usage(accumulator: StreamAccumulator, usage: tuple[int, int, float]) -> None:
+        """Add one LLM call's (input, output, cost) to the turn totals."""
+        accumulator.input_tokens += usage[0]
+        accumulator.output_tokens += usage[1]
+        accumulator.cost_usd += usage[2]
+
     @staticmethod
     async def _is_connected(websocket: WebSocket) -> bool:
         """Check if WebSocket is still connected."""
@@ -5,14 +5,21 @@ Unlike Roundtable (structured rounds + central synthesizer), Swarm uses:
 - Pheromone-weighted voting instead of a single synthesizer
 - Stigmergy: agents share state via a "trail" — each agent reads all
   prior contributions and reinforces or diverges
-- Iterative convergence: rounds continue until consensus threshold is met
-  or max iterations reached
+- Iterative convergence: rounds continue until the lower bound of the
+  weighted-consensus confidence interval clears the threshold, the swarm
+  stalls, or max iterations is reached
+- Adaptive polling: pheromone weights are loaded once per run; after an
+  agent's first two votes it is only re-polled while its vote is still
+  changing or it dissents from the weighted majority — settled votes
+  carry forward
+- One transaction per iteration for vote persistence
 - No fixed roles — any agent can lead, follow, or dissent
 
 Topology: fully-connected mesh (every agent sees every other agent's output).
 """
 import asyncio
 import logging
+import math
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -28,6 +35,7 @@ from aria_engine.agent_pool import AgentPool
 from aria_engine.config import EngineConfig
 from aria_engine.exceptions import EngineError
 from aria_engine.routing import EngineRouter
+from aria_engine.transcript_cache import get_transcript_cache
 
 logger = logging.getLogger("aria.engine.swarm")
 
@@ -38,6 +46,10 @@ DEFAULT_AGENT_TIMEOUT = 60
 DEFAULT_TOTAL_TIMEOUT = 600
 MIN_AGENTS = 2
 MAX_AGENTS = 12
+# One-sided z for the consensus lower bound (~84%). At the default
+# threshold a 2-of-3 split never converges, while 3 confident unanimous
+# agents (conf ≥ 0.7) do
+CONSENSUS_Z = 1.0
 
 
 @dataclass
@@ -49,6 +61,7 @@ class SwarmVote:
     vote: str          # "agree" | "disagree" | "extend" | "pivot"
     confidence: float  # 0.0 – 1.0
     duration_ms: int
+    tokens: int = 0    # input + output tokens reported by the agent
     created_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -66,6 +79,9 @@ class SwarmResult:
     consensus_score: float  # 0.0 – 1.0 (how converged)
     converged: bool         # True if consensus_threshold was met
     total_duration_ms: int
+    consensus_lower: float = 0.0  # lower bound of the consensus interval
+    agent_calls: int = 0          # votes requested (carried votes excluded)
+    total_tokens: int = 0
     created_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -83,8 +99,11 @@ class SwarmResult:
             "vote_count": self.vote_count,
             "consensus": self.consensus,
             "consensus_score": round(self.consensus_score, 3),
+            "consensus_lower": round(self.consensus_lower, 3),
             "converged": self.converged,
             "total_duration_ms": self.total_duration_ms,
+            "agent_calls": self.agent_calls,
+            "total_tokens": self.total_tokens,
             "created_at": self.created_at.isoformat(),
             "votes": [
                 {
@@ -98,6 +117,7 @@ class SwarmResult:
                     "vote": v.vote,
                     "confidence": round(v.confidence, 3),
                     "duration_ms": v.duration_ms,
+                    "tokens": v.tokens,
                 }
                 for v in self.votes
             ],
@@ -177,8 +197,14 @@ class SwarmOrchestrator:
             topic[:80], agent_ids, max_iterations, consensus_threshold,
         )
 
+        # Pheromone scores only change when a run finishes — load once
+        pheromone_weights = await self._get_pheromone_weights(agent_ids)
+
         all_votes: list[SwarmVote] = []
+        latest: dict[str, SwarmVote] = {}     # agent → current vote
+        previous: dict[str, SwarmVote] = {}   # agent → vote before that
         consensus_score = 0.0
+        consensus_lower = 0.0
         converged = False
 
         for iteration in range(1, max_iterations + 1):
@@ -190,40 +216,56 @@ class SwarmOrchestrator:
                 )
                 break
 
+            to_poll = self._agents_to_poll(
+                agent_ids, latest, previous, pheromone_weights,
+            )
+            if not to_poll:
+                logger.info(
+                    "Swarm settled at iteration %d without reaching %.3f "
+                    "(lower=%.3f) — no votes left to change",
+                    iteration - 1, consensus_threshold, consensus_lower,
+                )
+                break
+
             remaining = total_timeout - elapsed
             round_timeout = min(
-                agent_timeout * len(agent_ids), remaining,
+                agent_timeout * len(to_poll), remaining,
             )
 
-            # Get pheromone scores for weighted influence
-            pheromone_weights = await self._get_pheromone_weights(agent_ids)
-
             iteration_votes = await self._run_iteration(
                 session_id=session_id,
                 topic=topic,
-                agent_ids=agent_ids,
+                agent_ids=to_poll,
                 iteration=iteration,
                 prior_votes=all_votes,
                 pheromone_weights=pheromone_weights,
                 agent_timeout=agent_timeout,
                 round_timeout=round_timeout,
                 on_vote=on_vote,
+                participant_count=len(agent_ids),
             )
             all_votes.extend(iteration_votes)
-
-            # Calculate consensus from this iteration
-            consensus_score = self._calculate_consensus(iteration_votes)
+            for vote in iteration_votes:
+                if vote.agent_id in latest:
+                    previous[vote.agent_id] = latest[vote.agent_id]
+                latest[vote.agent_id] = vote
+
+            # Consensus over every agent's current vote (polled or carried)
+            consensus_score, consensus_lower = self._calculate_consensus(
+                list(latest.values()), pheromone_weights,
+            )
 
             logger.info(
-                "Swarm iteration %d: %d votes, consensus=%.3f",
-                iteration, len(iteration_votes), consensus_score,
+                "Swarm iteration %d: %d/%d polled, consensus=%.3f (lower=%.3f)",
+                iteration, len(iteration_votes), len(agent_ids),
+                consensus_score, consensus_lower,
             )
 
-            if consensus_score >= consensus_threshold:
+            if consensus_lower >= consensus_threshold:
                 converged = True
                 logger.info(
-                    "Swarm converged at iteration %d (score=%.3f >= %.3f)",
-                    iteration, consensus_score, consensus_threshold,
+                    "Swarm converged at iteration %d (lower=%.3f >= %.3f)",
+                    iteration, consensus_lower, consensus_threshold,
                 )
                 break
 
@@ -234,7 +276,7 @@ class SwarmOrchestrator:
                 session_id=session_id,
                 topic=topic,
                 votes=all_votes,
-                pheromone_weights=await self._get_pheromone_weights(agent_ids),
+                pheromone_weights=pheromone_weights,
                 timeout=min(agent_timeout * 2, total_timeout - elapsed_before_consensus),
             )
         else:
@@ -255,6 +297,9 @@ class SwarmOrchestrator:
             consensus_score=consensus_score,
             converged=converged,
             total_duration_ms=total_ms,
+            consensus_lower=consensus_lower,
+            agent_calls=len(all_votes),
+            total_tokens=sum(v.tokens for v in all_votes),
         )
 
         # Persist consensus
@@ -275,9 +320,10 @@ class SwarmOrchestrator:
                 )
 
         logger.info(
-            "Swarm complete: %d votes, %d iterations, consensus=%.3f, converged=%s, %.1fs",
+            "Swarm complete: %d votes, %d iterations, consensus=%.3f, "
+            "converged=%s, %d tokens, %.1fs",
             len(all_votes), iterations_completed, consensus_score,
-            converged, total_ms / 1000,
+            converged, result.total_tokens, total_ms / 1000,
         )
 
         return result
@@ -293,11 +339,15 @@ class SwarmOrchestrator:
         agent_timeout: int,
         round_timeout: float,
         on_vote: Any = None,
+        participant_count: int | None = None,
     ) -> list[SwarmVote]:
-        """Run one swarm iteration — all agents vote in parallel."""
+        """
+        Run one swarm iteration — ``agent_ids`` vote in parallel and the
+        iteration's votes are persisted in one transaction.
+        """
         trail = self._build_trail(prior_votes, pheromone_weights)
         prompt = self._build_iteration_prompt(
-            topic, iteration, trail, len(agent_ids)
+            topic, iteration, trail, participant_count or len(agent_ids)
         )
 
         votes: list[SwarmVote] = []
@@ -339,6 +389,7 @@ class SwarmOrchestrator:
             for exc in eg.exceptions:
                 logger.warning("Swarm iteration %d error: %s", iteration, exc)
 
+        await self._persist_votes(session_id, votes)
         return votes
 
     async def _get_agent_vote(
@@ -349,8 +400,9 @@ class SwarmOrchestrator:
         iteration: int,
         timeout: int,
     ) -> SwarmVote:
-        """Get a single agent's vote for this iteration."""
+        """Get a single agent's vote for this iteration (persisted by the iteration)."""
         start = time.monotonic()
+        tokens = 0
 
         try:
             response = await asyncio.wait_for(
@@ -361,11 +413,13 @@ class SwarmOrchestrator:
                 ),
                 timeout=timeout,
             )
-            content = (
-                response.get("content", "")
-                if isinstance(response, dict)
-                else str(response)
-            )
+            if isinstance(response, dict):
+                content = response.get("content", "")
+                tokens = int(response.get("input_tokens") or 0) + int(
+                    response.get("output_tokens") or 0
+                )
+            else:
+                content = str(response)
         except asyncio.TimeoutError:
             content = f"[{agent_id} timed out after {timeout}s]"
         except Exception as e:
@@ -387,12 +441,8 @@ class SwarmOrchestrator:
             vote=vote_type,
             confidence=confidence,
             duration_ms=duration_ms,
+            tokens=tokens,
         )
-
-        await self._persist_message(
-            session_id, agent_id, content, f"swarm-{iteration}",
-        )
-
         return vote
 
     def _parse_vote(self, content: str) -> tuple[str, float]:
@@ -445,27 +495,71 @@ class SwarmOrchestrator:
 
         return vote_type, round(confidence, 3)
 
-    def _calculate_consensus(self, votes: list[SwarmVote]) -> float:
-        """
-        Calculate consensus score from an iteration's votes.
+    @staticmethod
+    def _weighted_majority(
+        votes: list[SwarmVote],
+        pheromone_weights: dict[str, float],
+    ) -> str | None:
+        """Vote type carrying the most pheromone weight."""
+        mass: dict[str, float] = {}
+        for v in votes:
+            mass[v.vote] = mass.get(v.vote, 0.0) + pheromone_weights.get(v.agent_id, 0.5)
+        return max(mass, key=mass.get) if mass else None
 
-        Uses weighted agreement: agents who agree with the majority
-        and have high confidence contribute more to the score.
+    def _agents_to_poll(
+        self,
+        agent_ids: list[str],
+        latest: dict[str, SwarmVote],
+        previous: dict[str, SwarmVote],
+        pheromone_weights: dict[str, float],
+    ) -> list[str]:
         """
-        if not votes:
-            return 0.0
-
-        # Count vote types
-        vote_counts: dict[str, int] = {}
-        for v in votes:
-            vote_counts[v.vote] = vote_counts.get(v.vote, 0) + 1
+        Agents whose vote may still move: not yet voted twice, changed
+        their vote last time, or dissenting from the weighted majority.
+        Everyone else carries their current vote forward.
+        """
+        majority = self._weighted_majority(list(latest.values()), pheromone_weights)
+        return [
+            aid for aid in agent_ids
+            if aid not in previous
+            or latest[aid].vote != previous[aid].vote
+            or latest[aid].vote != majority
+        ]
 
-        # Majority vote type
-        majority_type = max(vote_counts, key=vote_counts.get)
-        majority_count = vote_counts[majority_type]
+    def _calculate_consensus(
+        self,
+        votes: list[SwarmVote],
+        pheromone_weights: dict[str, float] | None = None,
+    ) -> tuple[float, float]:
+        """
+        Weighted consensus over each agent's current vote.
 
-        # Base consensus: fraction of agents in majority
-        base = majority_count / len(votes)
+        Returns (score, lower_bound). The agreement ratio is the share of
+        pheromone weight behind the weighted-majority vote; its Wilson
+        lower bound uses the Kish effective sample size of the weights, so
+        a few heavily weighted agents count as fewer independent voters.
+        Both values blend 60% agreement + 40% mean majority confidence.
+        """
+        if not votes:
+            return 0.0, 0.0
+
+        weights = pheromone_weights or {}
+        w = [max(weights.get(v.agent_id, 0.5), 1e-6) for v in votes]
+        total = sum(w)
+        majority_type = self._weighted_majority(votes, weights)
+
+        agree = sum(wi for v, wi in zip(votes, w) if v.vote == majority_type)
+        p = agree / total
+        n_eff = total * total / sum(wi * wi for wi in w)
+
+        z2 = CONSENSUS_Z * CONSENSUS_Z
+        center = (p + z2 / (2 * n_eff)) / (1 + z2 / n_eff)
+        margin = (
+            CONSENSUS_Z
+            * math.sqrt(p * (1 - p) / n_eff + z2 / (4 * n_eff * n_eff))
+            / (1 + z2 / n_eff)
+        )
+        p_lower = max(0.0, center - margin)
 
         # Weight by confidence of majority voters
         majority_confidences = [
@@ -477,8 +571,10 @@ class SwarmOrchestrator:
             else 0.5
         )
 
-        # Combined score: 60% agreement ratio + 40% confidence
-        return base * 0.6 + avg_confidence * 0.4
+        return (
+            p * 0.6 + avg_confidence * 0.4,
+            p_lower * 0.6 + avg_confidence * 0.4,
+        )
 
     def _build_trail(
         self,
@@ -693,8 +789,33 @@ class SwarmOrchestrator:
                     role=role,
                     content=content,
                     metadata_json={"agent_id": agent_id},
+                    created_at=datetime.now(timezone.utc),
                 )
                 session.add(msg)
+        await get_transcript_cache().extend(session_id, [msg])
+
+    async def _persist_votes(
+        self,
+        session_id: str,
+        votes: list[SwarmVote],
+    ) -> None:
+        """Persist an iteration's votes to chat_messages in one transaction (ORM)."""
+        if not votes:
+            return
+        async with self._async_session() as session:
+            async with session.begin():
+                rows = [
+                    EngineChatMessage(
+                        session_id=session_id,
+                        role=f"swarm-{v.iteration}",
+                        content=v.content,
+                        metadata_json={"agent_id": v.agent_id},
+                        created_at=v.created_at,
+                    )
+                    for v in votes
+                ]
+                session.add_all(rows)
+        await get_transcript_cache().extend(session_id, rows)
 
     async def list_swarms(
         self,
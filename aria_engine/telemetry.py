@@ -6,15 +6,193 @@ This module mirrors key telemetry into aria_data.model_usage and aria_data.skill
 so the observability dashboards (/model-usage, /skill-stats) show real data from conversations.
 
 Fire-and-forget: failures are logged but never break the chat flow.
+
+Features:
+- log_model_usage() / log_skill_invocation() only enqueue a row (no DB
+  session, no task per call)
+- One TelemetryWriter per session factory flushes multi-row INSERTs every
+  ``batch_size`` rows or ``flush_interval`` seconds
+- Backpressure: when the queue is full new rows are dropped and counted
+- Queue depth, flush latency and written/dropped rows in aria_engine.metrics
+- shutdown_telemetry() drains every writer on shutdown
+
+Usage:
+    log_model_usage(db_factory, model="kimi", input_tokens=120, output_tokens=40)
+    ...
+    await shutdown_telemetry()
 """
+import asyncio
 import logging
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timezone
+from typing import Any
+
+from aria_engine.metrics import METRICS
 
 logger = logging.getLogger("aria.engine.telemetry")
 
+# Defaults — override via EngineConfig.telemetry_* settings
+DEFAULT_QUEUE_MAX = 10_000
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL_SECONDS = 0.5
+
+
+class TelemetryWriter:
+    """
+    Bounded in-process queue of telemetry rows with a background flusher.
+
+    Rows are ``(table, values)`` pairs; each flush groups them per table
+    into one multi-row INSERT inside a single session / commit.
+    """
+
+    def __init__(
+        self,
+        db_factory,
+        max_queue: int = DEFAULT_QUEUE_MAX,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.db_factory = db_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: deque[tuple[str, dict[str, Any]]] = deque()
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._closing = False
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._last_flush_seconds = 0.0
+
+    def enqueue(self, table: str, values: dict[str, Any]) -> bool:
+        """Queue one row; False (and counted as dropped) when the queue is full."""
+        if len(self._queue) >= self.max_queue:
+            self._dropped += 1
+            METRICS.telemetry_rows_dropped.labels(table=table).inc()
+            return False
+        self._queue.append((table, values))
+        METRICS.telemetry_queue_depth.set(len(self._queue))
+        self._ensure_flusher()
+        if len(self._queue) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write everything queued right now; returns rows written."""
+        written = 0
+        while self._queue:
+            written += await self._flush_batch()
+        return written
+
+    async def aclose(self) -> None:
+        """Stop the background flusher and drain the queue."""
+        self._closing = True
+        if self._task is not None and not self._task.done():
+            self._wakeup.set()
+            try:
+                await self._task
+            except Exception as e:
+                logger.debug("Telemetry flusher exited with error: %s", e)
+        self._task = None
+        await self.flush()
+        self._closing = False
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return writer statistics for monitoring."""
+        return {
+            "queued": len(self._queue),
+            "max_queue": self.max_queue,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "last_flush_ms": round(self._last_flush_seconds * 1000, 1),
+        }
+
+    # ── Internals ────────────────────────────────────────────────
+
+    def _ensure_flusher(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop yet — the next enqueue / flush() picks the rows up
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._queue and not self._closing:
+                await self._flush_batch()
 
-async def log_model_usage(
+    async def _flush_batch(self) -> int:
+        """One INSERT per table for up to ``batch_size`` queued rows."""
+        batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        METRICS.telemetry_queue_depth.set(len(self._queue))
+        if not batch:
+            return 0
+        by_table: dict[str, list[dict[str, Any]]] = {}
+        for table, values in batch:
+            by_table.setdefault(table, []).append(values)
+
+        start = time.monotonic()
+        try:
+            from sqlalchemy import insert
+            from db.models import ModelUsage, SkillInvocation
+
+            tables = {"ModelUsage": ModelUsage, "SkillInvocation": SkillInvocation}
+            async with self.db_factory() as db:
+                for table, rows in by_table.items():
+                    await db.execute(insert(tables[table]).values(rows))
+                await db.commit()
+        except Exception as e:
+            self._failed += len(batch)
+            logger.debug("Telemetry flush of %d rows failed (non-fatal): %s", len(batch), e)
+            return 0
+        finally:
+            self._last_flush_seconds = time.monotonic() - start
+            METRICS.telemetry_flush_duration.set(self._last_flush_seconds)
+
+        self._written += len(batch)
+        for table, rows in by_table.items():
+            METRICS.telemetry_rows_written.labels(table=table).inc(len(rows))
+        return len(batch)
+
+
+_writers: dict[Any, TelemetryWriter] = {}
+
+
+def get_telemetry_writer(db_factory, config: Any | None = None) -> TelemetryWriter:
+    """Get (or lazily create) the writer for ``db_factory``."""
+    writer = _writers.get(db_factory)
+    if writer is None:
+        writer = TelemetryWriter(
+            db_factory,
+            max_queue=getattr(config, "telemetry_queue_max", DEFAULT_QUEUE_MAX),
+            batch_size=getattr(config, "telemetry_batch_size", DEFAULT_BATCH_SIZE),
+            flush_interval=getattr(
+                config, "telemetry_flush_interval_ms", DEFAULT_FLUSH_INTERVAL_SECONDS * 1000,
+            ) / 1000,
+        )
+        _writers[db_factory] = writer
+    return writer
+
+
+async def shutdown_telemetry() -> None:
+    """Flush and stop every telemetry writer (call on shutdown)."""
+    for writer in list(_writers.values()):
+        await writer.aclose()
+
+
+def log_model_usage(
     db_factory,
     *,
     model: str,
@@ -25,32 +203,32 @@ async def log_model_usage(
     latency_ms: int | None = None,
     success: bool = True,
     error_message: str | None = None,
+    cache_hit: bool = False,
 ) -> None:
-    """Log an LLM call to aria_data.model_usage."""
-    try:
-        from db.models import ModelUsage
-
-        async with db_factory() as db:
-            row = ModelUsage(
-                id=uuid.uuid4(),
-                model=model or "unknown",
-                provider=_infer_provider(model, provider),
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cost_usd=cost_usd,
-                latency_ms=latency_ms,
-                success=success,
-                error_message=error_message,
-                # session_id left NULL — FK targets aria_data.agent_sessions,
-                # not aria_engine.chat_sessions
-            )
-            db.add(row)
-            await db.commit()
-    except Exception as e:
-        logger.debug("telemetry.log_model_usage failed (non-fatal): %s", e)
-
-
-async def log_skill_invocation(
+    """
+    Queue an LLM call for aria_data.model_usage.
+
+    For response-cache hits (``cache_hit=True``) the tokens / cost are the
+    amounts *saved*, not spent; usage stats report them separately.
+    """
+    get_telemetry_writer(db_factory).enqueue("ModelUsage", {
+        "id": uuid.uuid4(),
+        "model": model or "unknown",
+        "provider": _infer_provider(model, provider),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": cost_usd,
+        "latency_ms": latency_ms,
+        "success": success,
+        "error_message": error_message,
+        "cache_hit": cache_hit,
+        "created_at": datetime.now(timezone.utc),
+        # session_id left NULL — FK targets aria_data.agent_sessions,
+        # not aria_engine.chat_sessions
+    })
+
+
+def log_skill_invocation(
     db_factory,
     *,
     skill_name: str,
@@ -61,25 +239,18 @@ async def log_skill_invocation(
     tokens_used: int | None = None,
     model_used: str | None = None,
 ) -> None:
-    """Log a tool/skill call to aria_data.skill_invocations."""
-    try:
-        from db.models import SkillInvocation
-
-        async with db_factory() as db:
-            row = SkillInvocation(
-                id=uuid.uuid4(),
-                skill_name=skill_name,
-                tool_name=tool_name,
-                duration_ms=duration_ms,
-                success=success,
-                error_type=error_type,
-                tokens_used=tokens_used,
-                model_used=model_used,
-            )
-            db.add(row)
-            await db.commit()
-    except Exception as e:
-        logger.debug("telemetry.log_skill_invocation failed (non-fatal): %s", e)
+    """Queue a tool/skill call for aria_data.skill_invocations."""
+    get_telemetry_writer(db_factory).enqueue("SkillInvocation", {
+        "id": uuid.uuid4(),
+        "skill_name": skill_name,
+        "tool_name": tool_name,
+        "duration_ms": duration_ms,
+        "success": success,
+        "error_type": error_type,
+        "tokens_used": tokens_used,
+        "model_used": model_used,
+        "created_at": datetime.now(timezone.utc),
+    })
 
 
 def _infer_provider(model: str, provider: str | None) -> str:
@@ -19,12 +19,15 @@ import logging
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 
 from aria_engine.exceptions import ToolError
 
 logger = logging.getLogger("aria.engine.tools")
 
+# Default number of tool calls allowed in flight at once within one turn
+DEFAULT_TOOL_CONCURRENCY = 4
+
 
 @dataclass
 class ToolDefinition:
@@ -47,6 +50,83 @@ class ToolResult:
     duration_ms: int = 0
 
 
+class ToolBatch:
+    """
+    One turn's tool calls, fed incrementally (see ToolRegistry.start_batch).
+
+    Each submitted call starts right away under the batch semaphore; a call
+    to a function that already has a call in this batch waits for that call
+    to finish first, preserving per-tool sequential semantics.
+    """
+
+    def __init__(
+        self,
+        registry: "ToolRegistry",
+        max_concurrency: int,
+        guard: Callable[[dict[str, Any]], ToolResult | None] | None,
+        on_result: Callable[[dict[str, Any], ToolResult], Awaitable[None]] | None,
+    ):
+        self._registry = registry
+        self._guard = guard
+        self._on_result = on_result
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._tasks: list[asyncio.Task] = []
+        self._last_by_name: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, tool_call: dict[str, Any]) -> None:
+        """Schedule a tool call ({id, function: {name, arguments}})."""
+        name = tool_call["function"]["name"]
+        task = asyncio.ensure_future(
+            self._run(tool_call, self._last_by_name.get(name))
+        )
+        self._last_by_name[name] = task
+        self._tasks.append(task)
+
+    async def results(self) -> list[ToolResult]:
+        """Wait for every submitted call; results in submission order."""
+        try:
+            return list(await asyncio.gather(*self._tasks))
+        except BaseException:
+            # One call failed (or we were cancelled): stop the siblings too
+            await self.aclose()
+            raise
+
+    def cancel(self) -> None:
+        """Cancel calls that have not finished (e.g. the turn was aborted)."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def aclose(self) -> None:
+        """Cancel unfinished calls and wait until every task has stopped."""
+        self.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(
+        self, tc: dict[str, Any], previous: asyncio.Task | None,
+    ) -> ToolResult:
+        if previous is not None:
+            await asyncio.wait([previous])
+        result = self._guard(tc) if self._guard else None
+        if result is None:
+            async with self._semaphore:
+                result = await self._registry.execute(
+                    tool_call_id=tc["id"],
+                    function_name=tc["function"]["name"],
+                    arguments=tc["function"]["arguments"],
+                )
+        if self._on_result:
+            try:
+                await self._on_result(tc, result)
+            except Exception as e:
+                # A failed notification must not lose the tool's result
+                logger.warning("on_result failed for %s: %s", tc["function"]["name"], e)
+        return result
+
+
 class ToolRegistry:
     """
     Discovers and manages tools from aria_skills.
@@ -66,6 +146,8 @@ class ToolRegistry:
         self._tools: dict[str, ToolDefinition] = {}
         self._skill_instances: dict[str, Any] = {}
         self._initialized_skills: set[str] = set()
+        # Serializes lazy skill initialize() when tool calls run concurrently
+        self._init_locks: dict[str, asyncio.Lock] = {}
         self._timeout = timeout_seconds
 
     def discover_from_skills(self, skill_registry) -> int:
@@ -410,17 +492,20 @@ class ToolRegistry:
         # Lazy-initialize skill instance on first use
         skill_name = tool.skill_name
         if skill_name not in self._initialized_skills:
-            instance = self._skill_instances.get(skill_name)
-            if instance is not None and hasattr(instance, "initialize"):
-                try:
-                    ok = await instance.initialize()
-                    if ok:
-                        logger.info("Lazy-initialized skill: %s", skill_name)
-                    else:
-                        logger.warning("Skill %s initialize() returned False", skill_name)
-                except Exception as init_err:
-                    logger.warning("Skill %s initialize() failed: %s", skill_name, init_err)
-            self._initialized_skills.add(skill_name)
+            lock = self._init_locks.setdefault(skill_name, asyncio.Lock())
+            async with lock:
+                if skill_name not in self._initialized_skills:
+                    instance = self._skill_instances.get(skill_name)
+                    if instance is not None and hasattr(instance, "initialize"):
+                        try:
+                            ok = await instance.initialize()
+                            if ok:
+                                logger.info("Lazy-initialized skill: %s", skill_name)
+                            else:
+                                logger.warning("Skill %s initialize() returned False", skill_name)
+                        except Exception as init_err:
+                            logger.warning("Skill %s initialize() failed: %s", skill_name, init_err)
+                    self._initialized_skills.add(skill_name)
 
         # Parse arguments
         if isinstance(arguments, str):
@@ -496,6 +581,55 @@ class ToolRegistry:
                 duration_ms=elapsed_ms,
             )
 
+    async def execute_batch(
+        self,
+        tool_calls: list[dict[str, Any]],
+        *,
+        max_concurrency: int = DEFAULT_TOOL_CONCURRENCY,
+        guard: Callable[[dict[str, Any]], ToolResult | None] | None = None,
+        on_result: Callable[[dict[str, Any], ToolResult], Awaitable[None]] | None = None,
+    ) -> list[ToolResult]:
+        """
+        Execute one turn's tool calls with bounded concurrency.
+
+        Calls to different functions run together under a per-batch
+        semaphore. Repeated calls to the *same* function run one after
+        another in tool_call order, so per-tool state kept by the caller
+        (e.g. consecutive-failure caps) evolves exactly as it would if the
+        whole batch ran sequentially.
+
+        Args:
+            tool_calls: LLM tool calls ({id, function: {name, arguments}}).
+            max_concurrency: Max tool calls in flight (1 = fully sequential).
+            guard: Checked right before each call; returning a ToolResult
+                   skips execution and uses that result instead.
+            on_result: Awaited as soon as each result is available.
+
+        Returns:
+            ToolResults in the same order as tool_calls.
+        """
+        batch = self.start_batch(
+            max_concurrency=max_concurrency, guard=guard, on_result=on_result,
+        )
+        for tc in tool_calls:
+            batch.submit(tc)
+        return await batch.results()
+
+    def start_batch(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_TOOL_CONCURRENCY,
+        guard: Callable[[dict[str, Any]], ToolResult | None] | None = None,
+        on_result: Callable[[dict[str, Any], ToolResult], Awaitable[None]] | None = None,
+    ) -> "ToolBatch":
+        """
+        Open an incremental batch: tool calls start as soon as they are
+        submitted (e.g. while the LLM is still streaming later calls).
+
+        Same scheduling rules and callbacks as execute_batch().
+        """
+        return ToolBatch(self, max_concurrency, guard, on_result)
+
     def list_tools(self) -> list[dict[str, str]]:
         """List all registered tools (for debugging)."""
         return [
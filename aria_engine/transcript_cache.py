@@ -0,0 +1,325 @@
+"""
+Transcript Cache — In-process per-session message cache for context building.
+
+Every chat turn used to re-load up to ``max(window*3, 200)`` chat_messages
+rows from PostgreSQL just to rebuild the conversation context. This module
+keeps the recent transcript of busy sessions in memory so a context build
+only costs the messages written since the previous turn.
+
+Features:
+- LRU over sessions with a max-sessions bound and per-entry TTL
+- Per-session tail bound (oldest messages trimmed once over the load limit)
+- Incremental append after the writer's transaction commits
+- Dedup by message id (a miss-load may race with a concurrent writer)
+- Per-session cache locks of its own (never session_protection's lock, so
+  writers holding that lock can still extend the cache)
+- Per-message token counts with prefix sums, so a token-budgeted tail is
+  a bisect instead of re-tokenizing the transcript every turn
+- Hit / miss / eviction counters in aria_engine.metrics
+
+Usage:
+    cache = get_transcript_cache()
+
+    # Context build (loads from DB on miss), newest rows within 6000 tokens:
+    rows = await cache.get_or_load(session_id, fetch_limit, loader, token_budget=6000)
+
+    # After committing new messages:
+    await cache.extend(session_id, [user_msg, assistant_msg])
+
+    # After deleting/rewriting messages out of band:
+    await cache.invalidate(session_id)
+    await cache.invalidate_many(pruned_session_ids)
+"""
+import asyncio
+import bisect
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Iterable
+
+from aria_engine.metrics import METRICS
+
+logger = logging.getLogger("aria.engine.transcript_cache")
+
+# Defaults — override via EngineConfig.transcript_cache_* settings
+DEFAULT_MAX_SESSIONS = 256
+DEFAULT_TTL_SECONDS = 900.0
+
+
+@dataclass(slots=True)
+class CachedMessage:
+    """Detached snapshot of the chat_messages columns used for context."""
+    id: Any
+    role: str
+    content: str | None
+    thinking: str | None = None
+    tool_calls: Any = None
+    tool_results: Any = None
+    created_at: datetime | None = None
+    tokens: int | None = None  # filled once by the cache's token counter
+
+    @classmethod
+    def from_row(cls, row: Any) -> "CachedMessage":
+        """Snapshot an EngineChatMessage ORM row (or any duck-typed object)."""
+        return cls(
+            id=row.id,
+            role=row.role,
+            content=row.content,
+            thinking=getattr(row, "thinking", None),
+            tool_calls=getattr(row, "tool_calls", None),
+            tool_results=getattr(row, "tool_results", None),
+            created_at=getattr(row, "created_at", None),
+        )
+
+
+@dataclass
+class _Entry:
+    """Cached tail of one session's transcript (chronological order)."""
+    messages: list[CachedMessage]
+    limit: int
+    complete: bool  # True when the DB held fewer rows than `limit` at load time
+    loaded_at: float
+    ids: set = field(default_factory=set)
+    # prefix[i] = tokens in all messages before messages[i]; len == len(messages) + 1.
+    # Offsets are absolute, so trimming the head only deletes from the front.
+    prefix: list[int] = field(default_factory=lambda: [0])
+
+
+Loader = Callable[[int], Awaitable[Iterable[Any]]]
+TokenCounter = Callable[[list[CachedMessage]], list[int]]
+
+
+class TranscriptCache:
+    """
+    LRU + TTL cache of recent chat messages per session.
+
+    All mutations for a session run under a per-session cache lock, so a
+    cache miss that reloads from the DB can't interleave with an append
+    from another writer for the same session. The lock is private to the
+    cache: callers may already hold session_protection.session_lock().
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        token_counter: TokenCounter | None = None,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.token_counter = token_counter
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Weak values: a lock disappears once nobody holds or awaits it
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ── Reads ────────────────────────────────────────────────────
+
+    async def get_or_load(
+        self,
+        session_id: Any,
+        fetch_limit: int,
+        loader: Loader,
+        token_budget: int | None = None,
+    ) -> list[CachedMessage]:
+        """
+        Return up to ``fetch_limit`` most recent messages, oldest first.
+
+        Args:
+            session_id: Session UUID (or string).
+            fetch_limit: Number of tail messages the caller needs.
+            loader: ``async (limit) -> rows`` returning the newest ``limit``
+                    rows in chronological order. Called only on a miss.
+            token_budget: If set, further cut to the newest messages whose
+                    combined token count fits (binary search on prefix sums).
+        """
+        key = str(session_id)
+        async with self._lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and self._is_usable(entry, fetch_limit):
+                entry.limit = max(entry.limit, fetch_limit)
+                self._entries.move_to_end(key)
+                self._hits += 1
+                METRICS.transcript_cache_requests.labels(result="hit").inc()
+                return self._tail(entry, fetch_limit, token_budget)
+
+            self._misses += 1
+            METRICS.transcript_cache_requests.labels(result="miss").inc()
+            rows = [CachedMessage.from_row(r) for r in await loader(fetch_limit)]
+            entry = self._store(key, rows, fetch_limit, complete=len(rows) < fetch_limit)
+            return self._tail(entry, fetch_limit, token_budget)
+
+    def count_tokens(self, rows: list[CachedMessage]) -> None:
+        """Fill ``tokens`` on rows that don't have a count yet."""
+        missing = [r for r in rows if r.tokens is None]
+        if not missing:
+            return
+        if self.token_counter is None:
+            for r in missing:
+                r.tokens = 0
+            return
+        for r, n in zip(missing, self.token_counter(missing)):
+            r.tokens = n
+
+    # ── Writes ───────────────────────────────────────────────────
+
+    async def extend(self, session_id: Any, rows: Iterable[Any]) -> None:
+        """
+        Append committed messages to a cached session (no-op if not cached).
+
+        Call only after the writer's transaction has committed, so rolled-back
+        messages never become visible through the cache.
+        """
+        key = str(session_id)
+        async with self._lock(key):
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            start = len(entry.messages)
+            for row in rows:
+                msg = row if isinstance(row, CachedMessage) else CachedMessage.from_row(row)
+                if msg.id in entry.ids:
+                    continue
+                entry.messages.append(msg)
+                entry.ids.add(msg.id)
+            if len(entry.messages) == start:
+                return
+            self.count_tokens(entry.messages[start:])
+            # Concurrent writers may commit slightly out of order — only the
+            # newly appended tail needs checking.
+            tail = entry.messages[max(start - 1, 0):]
+            if any(
+                a.created_at and b.created_at and a.created_at > b.created_at
+                for a, b in zip(tail, tail[1:])
+            ):
+                entry.messages.sort(key=lambda m: (m.created_at is None, m.created_at))
+                entry.prefix = self._prefix_sums(entry.messages, entry.prefix[0])
+            else:
+                for msg in entry.messages[start:]:
+                    entry.prefix.append(entry.prefix[-1] + msg.tokens)
+            overflow = len(entry.messages) - entry.limit
+            if overflow > 0:
+                for dropped in entry.messages[:overflow]:
+                    entry.ids.discard(dropped.id)
+                del entry.messages[:overflow]
+                del entry.prefix[:overflow]
+                entry.complete = False
+
+    async def invalidate(self, session_id: Any) -> None:
+        """Drop a session's cached transcript (after deletes / edits)."""
+        key = str(session_id)
+        async with self._lock(key):
+            if self._entries.pop(key, None) is not None:
+                METRICS.transcript_cache_sessions.set(len(self._entries))
+
+    async def invalidate_many(self, session_ids: Iterable[Any]) -> None:
+        """Drop several sessions' cached transcripts (after prune / archive)."""
+        for session_id in session_ids:
+            await self.invalidate(session_id)
+
+    def clear(self) -> None:
+        """Drop every cached transcript."""
+        self._entries.clear()
+        METRICS.transcript_cache_sessions.set(0)
+
+    # ── Introspection ────────────────────────────────────────────
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return cache statistics for monitoring."""
+        total = self._hits + self._misses
+        return {
+            "sessions": len(self._entries),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+        }
+
+    # ── Internals ────────────────────────────────────────────────
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def _is_usable(self, entry: _Entry, fetch_limit: int) -> bool:
+        if time.monotonic() - entry.loaded_at > self.ttl_seconds:
+            return False
+        # A larger window than we loaded needs a reload unless we hold it all
+        return entry.complete or fetch_limit <= entry.limit
+
+    @staticmethod
+    def _tail(
+        entry: _Entry,
+        fetch_limit: int,
+        token_budget: int | None,
+    ) -> list[CachedMessage]:
+        """Newest ``fetch_limit`` messages, cut further to ``token_budget``."""
+        start = max(len(entry.messages) - fetch_limit, 0)
+        if token_budget is not None:
+            # Smallest i with tokens(messages[i:]) <= budget
+            floor = entry.prefix[-1] - max(token_budget, 0)
+            start = bisect.bisect_left(entry.prefix, floor, lo=start, hi=len(entry.messages))
+        return entry.messages[start:]
+
+    @staticmethod
+    def _prefix_sums(rows: list[CachedMessage], base: int = 0) -> list[int]:
+        prefix = [base]
+        for r in rows:
+            prefix.append(prefix[-1] + (r.tokens or 0))
+        return prefix
+
+    def _store(
+        self,
+        key: str,
+        rows: list[CachedMessage],
+        limit: int,
+        complete: bool,
+    ) -> _Entry:
+        self.count_tokens(rows)
+        entry = _Entry(
+            messages=list(rows),
+            limit=limit,
+            complete=complete,
+            loaded_at=time.monotonic(),
+            ids={r.id for r in rows},
+            prefix=self._prefix_sums(rows),
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_sessions:
+            evicted, _ = self._entries.popitem(last=False)
+            self._evictions += 1
+            METRICS.transcript_cache_evictions.inc()
+            logger.debug("Transcript cache evicted session %s", evicted)
+        METRICS.transcript_cache_sessions.set(len(self._entries))
+        return entry
+
+
+# ── Process-wide instance ─────────────────────────────────────────────────────
+
+_cache: TranscriptCache | None = None
+
+
+def get_transcript_cache(config: Any | None = None) -> TranscriptCache:
+    """Get (or lazily create) the process-wide transcript cache."""
+    global _cache
+    if _cache is None:
+        from aria_engine.context_manager import count_cached_message_tokens
+        _cache = TranscriptCache(
+            max_sessions=getattr(config, "transcript_cache_max_sessions", DEFAULT_MAX_SESSIONS),
+            ttl_seconds=getattr(config, "transcript_cache_ttl_seconds", DEFAULT_TTL_SECONDS),
+            token_counter=count_cached_message_tokens,
+        )
+    return _cache
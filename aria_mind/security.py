@@ -28,6 +28,9 @@ from functools import wraps
 from typing import Any, Callable, TypeVar
 from collections import defaultdict
 
+from aria_engine.pattern_scan import PatternScanner
+from aria_engine.rate_limit import SlidingWindowLimiter, Window
+
 logger = logging.getLogger("aria.security")
 
 
@@ -219,6 +222,8 @@ class PromptGuard:
         block_threshold: ThreatLevel = ThreatLevel.HIGH,
     ):
         self.patterns = INJECTION_PATTERNS + (custom_patterns or [])
+        # Literal prefilter: only patterns whose keywords occur get run
+        self._scanner = PatternScanner((p, p.pattern) for p in self.patterns)
         self.block_threshold = block_threshold
         self._severity_order = [
             ThreatLevel.NONE,
@@ -244,18 +249,16 @@ class PromptGuard:
         detections = []
         max_severity = ThreatLevel.NONE
         
-        for pattern in self.patterns:
-            matches = pattern.pattern.findall(text)
-            if matches:
-                detections.append({
-                    "pattern": pattern.name,
-                    "severity": pattern.severity.value,
-                    "description": pattern.description,
-                    "matches": len(matches) if isinstance(matches, list) else 1,
-                })
-                
-                if self._severity_order.index(pattern.severity) > self._severity_order.index(max_severity):
-                    max_severity = pattern.severity
+        for pattern, _, matches in self._scanner.findall(text):
+            detections.append({
+                "pattern": pattern.name,
+                "severity": pattern.severity.value,
+                "description": pattern.description,
+                "matches": len(matches),
+            })
+            
+            if self._severity_order.index(pattern.severity) > self._severity_order.index(max_severity):
+                max_severity = pattern.severity
         
         # Additional heuristics
         heuristic_detections = self._heuristic_analysis(text)
@@ -442,8 +445,11 @@ class RateLimitConfig:
 
 class RateLimiter:
     """
-    Token bucket rate limiter with multiple time windows.
-    
+    Multi-window rate limiter (burst / minute / hour) with cooldowns.
+
+    Backed by the bucketed sliding-window counters in aria_engine.rate_limit
+    (O(1) per check, idle identifiers evicted).
+
     Usage:
         limiter = RateLimiter()
         if limiter.is_allowed("user_123"):
@@ -451,71 +457,45 @@ class RateLimiter:
         else:
             # Rate limited
     """
-    
+
     def __init__(self, config: RateLimitConfig | None = None):
         self.config = config or RateLimitConfig()
-        self._requests: dict[str, list[float]] = defaultdict(list)
+        self._limiter = SlidingWindowLimiter([
+            Window("burst", 5, self.config.burst_limit),
+            Window("minute", 60, self.config.requests_per_minute),
+            Window("hour", 3600, self.config.requests_per_hour),
+        ])
         self._cooldowns: dict[str, float] = {}
-    
+
     def is_allowed(self, identifier: str) -> bool:
         """Check if request is allowed for identifier."""
         now = time.time()
-        
+
         # Check cooldown
         if identifier in self._cooldowns:
             if now < self._cooldowns[identifier]:
                 return False
             del self._cooldowns[identifier]
-        
-        # Clean old entries
-        self._cleanup(identifier, now)
-        
-        requests = self._requests[identifier]
-        
-        # Check burst limit (last 5 seconds)
-        burst_cutoff = now - 5
-        burst_count = sum(1 for ts in requests if ts > burst_cutoff)
-        if burst_count >= self.config.burst_limit:
-            self._cooldowns[identifier] = now + self.config.cooldown_seconds
-            logger.warning(f"Rate limit: burst exceeded for {identifier}")
-            return False
-        
-        # Check per-minute limit
-        minute_cutoff = now - 60
-        minute_count = sum(1 for ts in requests if ts > minute_cutoff)
-        if minute_count >= self.config.requests_per_minute:
-            self._cooldowns[identifier] = now + self.config.cooldown_seconds
-            logger.warning(f"Rate limit: per-minute exceeded for {identifier}")
-            return False
-        
-        # Check per-hour limit
-        hour_cutoff = now - 3600
-        hour_count = sum(1 for ts in requests if ts > hour_cutoff)
-        if hour_count >= self.config.requests_per_hour:
-            self._cooldowns[identifier] = now + self.config.cooldown_seconds * 5
-            logger.warning(f"Rate limit: per-hour exceeded for {identifier}")
-            return False
-        
-        # Record this request
-        requests.append(now)
-        return True
-    
-    def _cleanup(self, identifier: str, now: float):
-        """Remove entries older than 1 hour."""
-        cutoff = now - 3600
-        self._requests[identifier] = [
-            ts for ts in self._requests[identifier] if ts > cutoff
-        ]
-    
+
+        violated = self._limiter.check_sync(identifier, now)
+        if violated is None:
+            return True
+
+        cooldown = self.config.cooldown_seconds
+        if violated.name == "hour":
+            cooldown *= 5
+        self._cooldowns[identifier] = now + cooldown
+        logger.warning(f"Rate limit: {violated.name} limit exceeded for {identifier}")
+        return False
+
     def get_status(self, identifier: str) -> dict[str, Any]:
         """Get rate limit status for identifier."""
         now = time.time()
-        self._cleanup(identifier, now)
-        requests = self._requests[identifier]
-        
+        counts = self._limiter.counts_sync(identifier, now)
+
         return {
-            "requests_last_minute": sum(1 for ts in requests if ts > now - 60),
-            "requests_last_hour": len(requests),
+            "requests_last_minute": counts["minute"],
+            "requests_last_hour": counts["hour"],
             "in_cooldown": identifier in self._cooldowns,
             "cooldown_remaining": max(0, self._cooldowns.get(identifier, 0) - now),
         }
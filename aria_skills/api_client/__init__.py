@@ -1313,6 +1313,28 @@ class AriaAPIClient(BaseSkill):
         except Exception as e:
             return SkillResult.fail(f"Failed to search semantic memories: {e}")
 
+    async def hybrid_search(
+        self, query: str, limit: int = 20,
+        category: str = None, min_importance: float = 0.0,
+        backends: list[str] | None = None,
+        weights: dict[str, float] | None = None, k: int = 60,
+    ) -> SkillResult:
+        """Fused semantic + trigram + graph + KV search, RRF-merged server-side."""
+        try:
+            params: dict[str, Any] = {"query": query, "limit": limit, "k": k}
+            if category:
+                params["category"] = category
+            if min_importance > 0:
+                params["min_importance"] = min_importance
+            if backends:
+                params["backends"] = ",".join(backends)
+            for name, weight in (weights or {}).items():
+                params[f"w_{name}"] = weight
+            resp = await self._request_with_retry("GET", "/memories/hybrid-search", params=params)
+            return SkillResult.ok(resp.json())
+        except Exception as e:
+            return SkillResult.fail(f"Failed to run hybrid search: {e}")
+
     async def list_semantic_memories(
         self, category: str = None, source: str = None,
         limit: int = 50, page: int = 1,
@@ -219,6 +219,7 @@ class EmbeddingSentimentClassifier:
         self._min_similarity = min_similarity
         # Internal API URL for DB queries (runs inside same container network)
         self._api_url = os.environ.get("ARIA_API_URL", "http://aria-api:8000")
+        self._service = None
 
     @staticmethod
     def _resolve_embedding_model() -> str:
@@ -241,8 +242,25 @@ class EmbeddingSentimentClassifier:
         )
 
     # ── embedding generation ────────────────────────────────────────
+    def _embedding_service(self) -> Any:
+        if self._service is None:
+            try:
+                from aria_engine.embeddings import EmbeddingService, get_embedding_service
+            except Exception:
+                self._service = False  # aria_engine not installed here — call the proxy
+                return None
+            service = get_embedding_service()
+            if (service.base_url, service.api_key) != (self._litellm_url.rstrip("/"), self._litellm_key):
+                # Explicit endpoint override — keep a private client for it
+                service = EmbeddingService(base_url=self._litellm_url, api_key=self._litellm_key)
+            self._service = service
+        return self._service or None
+
     async def _embed(self, text: str) -> list[float]:
-        """Generate embedding via LiteLLM proxy using configured model."""
+        """Generate embedding via the shared batched/cached embedding service."""
+        service = self._embedding_service()
+        if service is not None:
+            return await service.embed(text[:2000], model=self._embedding_model, timeout=10)
         import httpx
         async with httpx.AsyncClient(timeout=10) as client:
             resp = await client.post(
@@ -253,6 +271,15 @@ class EmbeddingSentimentClassifier:
             resp.raise_for_status()
             return resp.json()["data"][0]["embedding"]
 
+    async def prefetch(self, texts: list[str]) -> None:
+        """Warm the embedding cache for ``texts`` in one batched request."""
+        service = self._embedding_service()
+        if service is None:
+            return  # no shared cache to warm; _embed() calls the proxy per text
+        await service.embed_many(
+            [t[:2000] for t in texts], model=self._embedding_model, timeout=30,
+        )
+
     # ── reference lookup via API ────────────────────────────────────
     async def _find_nearest_references(
         self, query_embedding: list[float],
@@ -348,9 +375,16 @@ class EmbeddingSentimentClassifier:
 # ═══════════════════════════════════════════════════════════════════
 
 class LLMSentimentClassifier:
-    """LLM-based sentiment classification for higher accuracy."""
+    """
+    LLM-based sentiment classification for higher accuracy.
+
+    Calls go through the process-wide aria_engine LLMGateway with the
+    response cache enabled (repeated messages are classified once); when
+    aria_engine is unavailable they go straight to the LiteLLM proxy.
+    """
 
-    def __init__(self, model: str = None):
+    def __init__(self, model: str = None, gateway: Any = None):
+        self._gateway = gateway
         self._litellm_url = os.environ.get("LITELLM_URL", "http://litellm:4000")
         self._litellm_key = os.environ.get("LITELLM_MASTER_KEY", "")
         # Resolve model from models.yaml profiles.sentiment — NO hardcoded model names
@@ -383,19 +417,27 @@ class LLMSentimentClassifier:
             '"confidence": float, "primary_emotion": str, "labels": [str]}'
         )
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                f"{self._litellm_url}/v1/chat/completions",
-                json={
-                    "model": self._model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 200,
-                    "temperature": 0.2,
-                },
-                headers={"Authorization": f"Bearer {self._litellm_key}"},
+        messages = [{"role": "user", "content": prompt}]
+        gateway = self._get_gateway()
+        if gateway is not None:
+            response = await gateway.complete(
+                messages, model=self._model, temperature=0.2, max_tokens=200, cache=True,
             )
-            resp.raise_for_status()
-            raw = resp.json()["choices"][0]["message"]["content"]
+            raw = response.content or ""
+        else:
+            async with httpx.AsyncClient(timeout=30) as client:
+                resp = await client.post(
+                    f"{self._litellm_url}/v1/chat/completions",
+                    json={
+                        "model": self._model,
+                        "messages": messages,
+                        "max_tokens": 200,
+                        "temperature": 0.2,
+                    },
+                    headers={"Authorization": f"Bearer {self._litellm_key}"},
+                )
+                resp.raise_for_status()
+                raw = resp.json()["choices"][0]["message"]["content"]
 
         json_match = re.search(r"\{[^{}]*\}", raw, re.DOTALL)
         if json_match:
@@ -412,6 +454,15 @@ class LLMSentimentClassifier:
         # Could not parse — raise so caller falls back to lexicon
         raise ValueError(f"Unparseable LLM response: {raw[:200]}")
 
+    def _get_gateway(self) -> Any:
+        if self._gateway is None:
+            try:
+                from aria_engine.llm_gateway import get_llm_gateway
+                self._gateway = get_llm_gateway()
+            except Exception:
+                self._gateway = False  # aria_engine not installed here — use the proxy
+        return self._gateway or None
+
 
 # ═══════════════════════════════════════════════════════════════════
 # Sentiment Analyzer (Multi-Strategy Blend)
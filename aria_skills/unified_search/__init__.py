@@ -2,10 +2,16 @@
 """
 Unified Search — Full Production Implementation.
 
-Merges three retrieval backends using Reciprocal Rank Fusion (RRF):
+Merges retrieval backends using Reciprocal Rank Fusion (RRF):
   1. Semantic search  — pgvector cosine similarity (nomic-embed-text 768d)
   2. Knowledge graph  — ILIKE entity/relation search via skill graph
   3. Memory search    — Full-text keyword search on memories table
+  4. Text search      — trigram match on semantic memories (fused mode only)
+
+By default search() makes one call to /memories/hybrid-search, which
+embeds the query once, runs every backend concurrently server-side and
+returns the RRF-merged list. If that call fails, the per-backend path
+below is used instead.
 
 RRF formula:  score(d) = SUM( 1 / (k + rank_i(d)) )  for each backend
   k = 60 (standard smoothing constant)
@@ -15,11 +21,19 @@ Supports:
   - Category/source filters
   - Importance thresholds
   - Deduplication by content hash
+  - Concurrent backends, each bounded by its own deadline
+  - Short-TTL result cache keyed by normalized query + filters
+  - Early exit once the pending backends can't reorder the top results
+  - Per-backend latency in every search payload
 
 All retrieval via api_client → FastAPI → PostgreSQL.
 """
 
+import asyncio
+import copy
 import hashlib
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
@@ -130,11 +144,100 @@ class RRFMerger:
 
         return merged[:limit]
 
+    def scores(self, ranked_lists: dict[str, list[SearchResult]]) -> dict[str, float]:
+        """RRF score per content hash (no mutation of the results)."""
+        score_map: dict[str, float] = {}
+        for backend, results in ranked_lists.items():
+            w = self.weights.get(backend, 0.5)
+            for rank_idx, result in enumerate(results):
+                h = result.content_hash
+                score_map[h] = score_map.get(h, 0.0) + w / (self.k + rank_idx + 1)
+        return score_map
+
+    def top(self, ranked_lists: dict[str, list[SearchResult]], limit: int) -> list[str]:
+        """Content hashes of the current top ``limit`` in RRF order."""
+        score_map = self.scores(ranked_lists)
+        return sorted(score_map, key=score_map.__getitem__, reverse=True)[:limit]
+
+    def is_settled(self, ranked_lists: dict[str, list[SearchResult]],
+                   pending: list[str], limit: int) -> bool:
+        """
+        True when no answer from the ``pending`` backends could change the
+        top ``limit`` ranking.
+
+        A pending backend adds at most weight / (k + 1) to any document, so
+        the ranking is settled once every gap in the top ``limit`` (and the
+        gap to the first document outside it) exceeds the sum of those
+        bounds.
+        """
+        bound = sum(self.weights.get(b, 0.5) / (self.k + 1) for b in pending)
+        if bound == 0:
+            return True
+        ordered = sorted(self.scores(ranked_lists).values(), reverse=True)
+        if len(ordered) < limit:
+            return False
+        ordered = ordered[:limit + 1] + [0.0]
+        return all(ordered[i] - ordered[i + 1] > bound for i in range(limit))
+
+
+# ═══════════════════════════════════════════════════════════════════
+# Result Cache
+# ═══════════════════════════════════════════════════════════════════
+
+class QueryCache:
+    """Small TTL + LRU cache for unified search payloads."""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 256):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+
+    @staticmethod
+    def key(query: str, backends: list[str], limit: int,
+            category: str | None, min_importance: float) -> tuple:
+        """Cache key: case/whitespace-normalized query plus every filter."""
+        return (
+            " ".join(query.casefold().split()),
+            tuple(sorted(set(backends))),
+            limit,
+            category or "",
+            round(float(min_importance), 4),
+        )
+
+    def get(self, key: tuple) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, payload = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(payload)
+
+    def put(self, key: tuple, payload: dict) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(payload))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 # ═══════════════════════════════════════════════════════════════════
 # Search Backends
 # ═══════════════════════════════════════════════════════════════════
 
+class BackendError(Exception):
+    """A backend call failed (as opposed to matching nothing)."""
+
+
 class SemanticBackend:
     """Search via pgvector cosine similarity."""
 
@@ -145,31 +248,38 @@ class SemanticBackend:
                      category: str | None = None,
                      min_importance: float = 0.0) -> list[SearchResult]:
         try:
-            result = await self._api.search_memories_semantic(
-                query=query, limit=limit, category=category,
-                min_importance=min_importance)
-            if not result.success:
-                return []
-
-            items = result.data if isinstance(result.data, list) else (
-                result.data.get("results", result.data.get("items", []))
-                if isinstance(result.data, dict) else [])
-
-            results: list[SearchResult] = []
-            for item in items:
-                results.append(SearchResult(
-                    content=item.get("content", ""),
-                    score=float(item.get("similarity", item.get("score", 0.5))),
-                    source="semantic",
-                    category=item.get("category", ""),
-                    importance=float(item.get("importance", 0)),
-                    metadata=item.get("metadata", {}),
-                    original_id=str(item.get("id", "")),
-                ))
-            return results
+            return await self.fetch(query, limit=limit, category=category,
+                                    min_importance=min_importance)
         except Exception:
             return []
 
+    async def fetch(self, query: str, limit: int = 20,
+                    category: str | None = None,
+                    min_importance: float = 0.0) -> list[SearchResult]:
+        """Like search(), but raises BackendError instead of returning []."""
+        result = await self._api.search_memories_semantic(
+            query=query, limit=limit, category=category,
+            min_importance=min_importance)
+        if not result.success:
+            raise BackendError(result.error or "semantic search failed")
+
+        items = result.data if isinstance(result.data, list) else (
+            result.data.get("results", result.data.get("items", []))
+            if isinstance(result.data, dict) else [])
+
+        results: list[SearchResult] = []
+        for item in items:
+            results.append(SearchResult(
+                content=item.get("content", ""),
+                score=float(item.get("similarity", item.get("score", 0.5))),
+                source="semantic",
+                category=item.get("category", ""),
+                importance=float(item.get("importance", 0)),
+                metadata=item.get("metadata", {}),
+                original_id=str(item.get("id", "")),
+            ))
+        return results
+
 
 class GraphBackend:
     """Search via knowledge graph entity/relation ILIKE."""
@@ -180,32 +290,37 @@ class GraphBackend:
     async def search(self, query: str, limit: int = 20,
                      entity_type: str | None = None) -> list[SearchResult]:
         try:
-            result = await self._api.graph_search(
-                query=query, limit=limit, entity_type=entity_type)
-            if not result.success:
-                return []
-
-            items = result.data if isinstance(result.data, list) else (
-                result.data.get("results", result.data.get("entities", []))
-                if isinstance(result.data, dict) else [])
-
-            results: list[SearchResult] = []
-            for item in items:
-                name = item.get("name", item.get("label", ""))
-                desc = item.get("description", item.get("properties", {}).get("description", ""))
-                content = f"{name}: {desc}" if desc else name
-                results.append(SearchResult(
-                    content=content,
-                    score=float(item.get("score", item.get("relevance", 0.5))),
-                    source="graph",
-                    category=item.get("entity_type", item.get("type", "")),
-                    metadata={k: v for k, v in item.items() if k not in ("name", "description")},
-                    original_id=str(item.get("id", "")),
-                ))
-            return results
+            return await self.fetch(query, limit=limit, entity_type=entity_type)
         except Exception:
             return []
 
+    async def fetch(self, query: str, limit: int = 20,
+                    entity_type: str | None = None) -> list[SearchResult]:
+        """Like search(), but raises BackendError instead of returning []."""
+        result = await self._api.graph_search(
+            query=query, limit=limit, entity_type=entity_type)
+        if not result.success:
+            raise BackendError(result.error or "graph search failed")
+
+        items = result.data if isinstance(result.data, list) else (
+            result.data.get("results", result.data.get("entities", []))
+            if isinstance(result.data, dict) else [])
+
+        results: list[SearchResult] = []
+        for item in items:
+            name = item.get("name", item.get("label", ""))
+            desc = item.get("description", item.get("properties", {}).get("description", ""))
+            content = f"{name}: {desc}" if desc else name
+            results.append(SearchResult(
+                content=content,
+                score=float(item.get("score", item.get("relevance", 0.5))),
+                source="graph",
+                category=item.get("entity_type", item.get("type", "")),
+                metadata={k: v for k, v in item.items() if k not in ("name", "description")},
+                original_id=str(item.get("id", "")),
+            ))
+        return results
+
 
 class MemoryBackend:
     """Search via traditional text-match memories."""
@@ -216,37 +331,42 @@ class MemoryBackend:
     async def search(self, query: str, limit: int = 20,
                      category: str | None = None) -> list[SearchResult]:
         try:
-            # get_memories() does not accept a 'search' kwarg;
-            # fetch by category then client-side keyword filter.
-            result = await self._api.get_memories(
-                category=category, limit=limit)
-            if not result.success:
-                return []
-
-            items = result.data if isinstance(result.data, list) else (
-                result.data.get("items", result.data.get("memories", []))
-                if isinstance(result.data, dict) else [])
-
-            query_lower = query.lower() if query else ""
-            results: list[SearchResult] = []
-            for item in items:
-                content = item.get("content", "")
-                # Client-side keyword filter
-                if query_lower and query_lower not in content.lower():
-                    continue
-                results.append(SearchResult(
-                    content=content,
-                    score=0.5,
-                    source="memory",
-                    category=item.get("category", ""),
-                    importance=float(item.get("importance", item.get("importance_score", 0))),
-                    metadata=item.get("metadata", {}),
-                    original_id=str(item.get("id", "")),
-                ))
-            return results
+            return await self.fetch(query, limit=limit, category=category)
         except Exception:
             return []
 
+    async def fetch(self, query: str, limit: int = 20,
+                    category: str | None = None) -> list[SearchResult]:
+        """Like search(), but raises BackendError instead of returning []."""
+        # get_memories() does not accept a 'search' kwarg;
+        # fetch by category then client-side keyword filter.
+        result = await self._api.get_memories(
+            category=category, limit=limit)
+        if not result.success:
+            raise BackendError(result.error or "memory search failed")
+
+        items = result.data if isinstance(result.data, list) else (
+            result.data.get("items", result.data.get("memories", []))
+            if isinstance(result.data, dict) else [])
+
+        query_lower = query.lower() if query else ""
+        results: list[SearchResult] = []
+        for item in items:
+            content = item.get("content", "")
+            # Client-side keyword filter
+            if query_lower and query_lower not in content.lower():
+                continue
+            results.append(SearchResult(
+                content=content,
+                score=0.5,
+                source="memory",
+                category=item.get("category", ""),
+                importance=float(item.get("importance", item.get("importance_score", 0))),
+                metadata=item.get("metadata", {}),
+                original_id=str(item.get("id", "")),
+            ))
+        return results
+
 
 # ═══════════════════════════════════════════════════════════════════
 # Skill Class
@@ -262,8 +382,20 @@ class UnifiedSearchSkill(BaseSkill):
       semantic_search  — Search semantic memories only
       graph_search     — Search knowledge graph only
       memory_search    — Search traditional memories only
+
+    Config:
+      backend_timeout_s  — per-backend deadline (default 5.0); override one
+                           backend with timeout_semantic / timeout_graph /
+                           timeout_memory
+      cache_ttl_s        — result cache TTL, 0 disables (default 30)
+      cache_max_entries  — result cache size (default 256)
+      early_exit         — default for search(early_exit=...) (default false)
+      fused              — one /memories/hybrid-search call instead of a
+                           request per backend (default true; timeout_fused)
     """
 
+    BACKENDS = ("semantic", "graph", "memory")
+
     def __init__(self, config: SkillConfig | None = None):
         super().__init__(config or SkillConfig(name="unified_search"))
         self._api = None
@@ -271,6 +403,10 @@ class UnifiedSearchSkill(BaseSkill):
         self._graph: GraphBackend | None = None
         self._memory: MemoryBackend | None = None
         self._merger: RRFMerger | None = None
+        self._cache: QueryCache | None = None
+        self._timeouts: dict[str, float] = {}
+        self._early_exit = False
+        self._fused = True
         self._search_count = 0
 
     @property
@@ -294,12 +430,26 @@ class UnifiedSearchSkill(BaseSkill):
             "semantic": float(self.config.config.get("weight_semantic", 1.0)),
             "graph": float(self.config.config.get("weight_graph", 0.8)),
             "memory": float(self.config.config.get("weight_memory", 0.6)),
+            "text": float(self.config.config.get("weight_text", 0.8)),
         }
         k = int(self.config.config.get("rrf_k", 60))
         self._merger = RRFMerger(k=k, weights=weights)
 
+        cfg = self.config.config
+        default_timeout = float(cfg.get("backend_timeout_s", 5.0))
+        self._timeouts = {
+            b: float(cfg.get(f"timeout_{b}", default_timeout)) for b in (*self.BACKENDS, "fused")
+        }
+        self._fused = bool(cfg.get("fused", True))
+        self._cache = QueryCache(
+            ttl_seconds=float(cfg.get("cache_ttl_s", 30.0)),
+            max_entries=int(cfg.get("cache_max_entries", 256)),
+        )
+        self._early_exit = bool(cfg.get("early_exit", False))
+
         self._status = SkillStatus.AVAILABLE
-        self.logger.info("Unified search initialized (weights=%s, k=%d)", weights, k)
+        self.logger.info("Unified search initialized (weights=%s, k=%d, timeouts=%s)",
+                         weights, k, self._timeouts)
         return True
 
     async def health_check(self) -> SkillStatus:
@@ -307,23 +457,47 @@ class UnifiedSearchSkill(BaseSkill):
             self._status = SkillStatus.UNAVAILABLE
         return self._status
 
+    async def _run_backend(
+        self, name: str, call,
+    ) -> tuple[str, list[SearchResult] | None, str | None, float]:
+        """Await one backend under its deadline; ``None`` results = timed out or failed."""
+        start = time.monotonic()
+        error = None
+        try:
+            results = await asyncio.wait_for(call, timeout=self._timeouts.get(name, 5.0))
+        except asyncio.TimeoutError:
+            results = None
+        except Exception as e:
+            results, error = None, str(e)[:200] or type(e).__name__
+        return name, results, error, (time.monotonic() - start) * 1000
+
     @logged_method()
     async def search(self, query: str = "", limit: int = 20,
                      backends: list[str] | None = None,
                      category: str | None = None,
-                     min_importance: float = 0.0, **kwargs) -> SkillResult:
+                     min_importance: float = 0.0,
+                     early_exit: bool | None = None,
+                     use_cache: bool = True, **kwargs) -> SkillResult:
         """
         Unified search across all backends with RRF merge.
 
+        Fused mode makes a single /memories/hybrid-search call. Otherwise
+        (or when that call fails) backends run concurrently; one that misses
+        its deadline is dropped from the merge and listed in
+        ``backends_timed_out``, one that fails is listed in
+        ``backend_errors``. Only complete, non-early-exit answers are cached.
+
         Args:
             query: Search query text
             limit: Max results to return
-            backends: Which backends to use (default: all)
+            backends: Which backends to use (default: all; "text" is only
+                served in fused mode)
             category: Optional category filter
             min_importance: Minimum importance threshold
+            early_exit: Stop waiting once the pending backends can no longer
+                change the top ``limit`` ranking (default: skill config)
+            use_cache: Serve/store results in the short-TTL query cache
         """
-        import time
-
         # Guard: ensure initialize() succeeded
         if self._merger is None:
             return SkillResult.fail(
@@ -335,44 +509,145 @@ class UnifiedSearchSkill(BaseSkill):
         if not query:
             return SkillResult.fail("No query provided")
 
-        backends = backends or kwargs.get("backends", ["semantic", "graph", "memory"])
+        backends = backends or kwargs.get("backends")
+        early_exit = self._early_exit if early_exit is None else bool(early_exit)
         start = time.monotonic()
 
-        ranked_lists: dict[str, list[SearchResult]] = {}
-        backend_counts: dict[str, int] = {}
+        cache_key = QueryCache.key(query, backends or ["*"], limit, category, min_importance)
+        if use_cache and self._cache is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._search_count += 1
+                cached.update(
+                    query=query,
+                    cached=True,
+                    elapsed_ms=round((time.monotonic() - start) * 1000, 1),
+                    search_number=self._search_count,
+                )
+                return SkillResult.ok(cached)
+
+        payload = None
+        if self._fused:
+            payload = await self._fused_search(query, limit, backends, category, min_importance)
+        if payload is None:
+            payload = await self._search_backends(
+                query, limit, backends or list(self.BACKENDS), category,
+                min_importance, early_exit,
+            )
 
-        # Run backends (sequential to avoid overwhelming API)
+        # Only complete answers are cached: an early-exit payload has
+        # different RRF scores than a full search for the same key
+        if (use_cache and self._cache is not None and not payload["early_exit"]
+                and not payload["backends_timed_out"] and not payload["backend_errors"]):
+            self._cache.put(cache_key, payload)
+
+        self._search_count += 1
+        payload.update(
+            query=query,
+            cached=False,
+            elapsed_ms=round((time.monotonic() - start) * 1000, 1),
+            search_number=self._search_count,
+        )
+        return SkillResult.ok(payload)
+
+    async def _fused_search(self, query: str, limit: int, backends: list[str] | None,
+                            category: str | None, min_importance: float) -> dict | None:
+        """One server-side hybrid search; ``None`` tells the caller to fall back."""
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                self._api.hybrid_search(
+                    query=query, limit=limit, category=category,
+                    min_importance=min_importance, backends=backends,
+                    weights=dict(self._merger.weights), k=self._merger.k,
+                ),
+                timeout=self._timeouts.get("fused", 5.0),
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning("hybrid-search timed out, falling back to per-backend search")
+            return None
+        data = result.data if result.success else None
+        if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+            self.logger.debug("hybrid-search unavailable (%s), falling back", result.error)
+            return None
+
+        return {
+            "results": data["results"],
+            "total_results": len(data["results"]),
+            "backends_used": data.get("backends_used", []),
+            "backend_counts": data.get("backend_counts", {}),
+            "backend_latency_ms": data.get("backend_latency_ms", {}),
+            "backend_errors": data.get("errors", {}),
+            "backends_timed_out": [],
+            "backends_skipped": [],
+            "early_exit": False,
+            "fused": True,
+            "round_trip_ms": round((time.monotonic() - start) * 1000, 1),
+        }
+
+    async def _search_backends(self, query: str, limit: int, backends: list[str],
+                               category: str | None, min_importance: float,
+                               early_exit: bool) -> dict:
+        """Per-backend path: one api_client call per backend, merged here."""
+        calls = {}
         if "semantic" in backends and self._semantic:
-            results = await self._semantic.search(
+            calls["semantic"] = self._semantic.fetch(
                 query, limit=limit, category=category, min_importance=min_importance)
-            ranked_lists["semantic"] = results
-            backend_counts["semantic"] = len(results)
-
         if "graph" in backends and self._graph:
-            results = await self._graph.search(query, limit=limit)
-            ranked_lists["graph"] = results
-            backend_counts["graph"] = len(results)
-
+            calls["graph"] = self._graph.fetch(query, limit=limit)
         if "memory" in backends and self._memory:
-            results = await self._memory.search(query, limit=limit, category=category)
-            ranked_lists["memory"] = results
-            backend_counts["memory"] = len(results)
+            calls["memory"] = self._memory.fetch(query, limit=limit, category=category)
 
-        # RRF merge
-        merged = self._merger.merge(ranked_lists, limit=limit)
-        elapsed = (time.monotonic() - start) * 1000
-
-        self._search_count += 1
+        tasks = {
+            asyncio.create_task(self._run_backend(name, call)): name
+            for name, call in calls.items()
+        }
+        ranked_lists: dict[str, list[SearchResult]] = {}
+        backend_latency: dict[str, float] = {}
+        timed_out: list[str] = []
+        errors: dict[str, str] = {}
+        pending = set(tasks)
+        settled_early = False
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, results, error, latency_ms = task.result()
+                backend_latency[name] = round(latency_ms, 1)
+                if error is not None:
+                    errors[name] = error
+                elif results is None:
+                    timed_out.append(name)
+                else:
+                    ranked_lists[name] = results
+            if early_exit and pending and self._merger.is_settled(
+                    ranked_lists, [tasks[t] for t in pending], limit):
+                settled_early = True
+                break
+
+        skipped = sorted(tasks[t] for t in pending)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # RRF merge (backend order fixed so ties break the same way every time)
+        ordered = {b: ranked_lists[b] for b in self.BACKENDS if b in ranked_lists}
+        ordered.update({b: r for b, r in ranked_lists.items() if b not in ordered})
+        merged = self._merger.merge(ordered, limit=limit)
 
-        return SkillResult.ok({
-            "query": query,
+        return {
             "results": [r.to_dict() for r in merged],
             "total_results": len(merged),
-            "backends_used": list(ranked_lists.keys()),
-            "backend_counts": backend_counts,
-            "elapsed_ms": round(elapsed, 1),
-            "search_number": self._search_count,
-        })
+            "backends_used": list(ordered.keys()),
+            "backend_counts": {b: len(r) for b, r in ordered.items()},
+            "backend_latency_ms": backend_latency,
+            "backend_errors": errors,
+            "backends_timed_out": sorted(timed_out),
+            "backends_skipped": skipped,
+            "early_exit": settled_early,
+            "fused": False,
+        }
 
     @logged_method()
     async def semantic_search(self, query: str = "", limit: int = 20,
@@ -432,4 +707,6 @@ class UnifiedSearchSkill(BaseSkill):
         self._semantic = None
         self._graph = None
         self._memory = None
+        if self._cache is not None:
+            self._cache.clear()
         self._status = SkillStatus.UNAVAILABLE
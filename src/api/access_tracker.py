@@ -0,0 +1,127 @@
+"""
+Access tracker — coalesced access_count / accessed_at updates.
+
+/memories/search used to bump ``accessed_at`` and ``access_count`` on
+every returned row and commit inside the request, turning each search
+into a write transaction that row-locks the most popular memories.
+Searches now only record the hit in memory; a background loop writes
+the accumulated counts in one batched UPDATE.
+
+Features:
+- record(ids): O(1) per id, no I/O — safe on read-only / replica sessions
+- Repeated hits on the same row between flushes coalesce into one
+  ``access_count + n`` and the latest ``accessed_at``
+- flush(): one UPDATE … FROM unnest(ids, counts, times) per table, rows
+  in id order (consistent lock order between concurrent flushers)
+- Failed flushes put their counts back for the next attempt
+- run_access_flush_loop(): background task (ACCESS_FLUSH_SECONDS,
+  default 5), final flush on cancellation
+
+Usage:
+    semantic_access.record(mem.id for mem, _ in rows)
+
+    # API startup:
+    asyncio.create_task(run_access_flush_loop())
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import text
+
+from db.session import AsyncSessionLocal
+
+logger = logging.getLogger("aria.api.access_tracker")
+
+ACCESS_FLUSH_SECONDS = float(os.getenv("ACCESS_FLUSH_SECONDS", "5"))
+
+
+class AccessCounter:
+    """Pending access increments for one table with (id, access_count, accessed_at)."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self._pending: dict[Any, list] = {}  # id → [count, last accessed]
+
+    def record(self, ids: Iterable[Any], when: datetime | None = None) -> None:
+        when = when or datetime.now(timezone.utc)
+        for row_id in ids:
+            entry = self._pending.get(row_id)
+            if entry is None:
+                self._pending[row_id] = [1, when]
+            else:
+                entry[0] += 1
+                if when > entry[1]:
+                    entry[1] = when
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _restore(self, batch: dict[Any, list]) -> None:
+        for row_id, (count, when) in batch.items():
+            entry = self._pending.get(row_id)
+            if entry is None:
+                self._pending[row_id] = [count, when]
+            else:
+                entry[0] += count
+                entry[1] = max(entry[1], when)
+
+    async def flush(self) -> int:
+        """Write pending increments; returns the number of rows touched."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        ordered = sorted(batch.items(), key=lambda item: str(item[0]))
+        params = {
+            "ids": [str(row_id) for row_id, _ in ordered],
+            "counts": [count for _, (count, _) in ordered],
+            "times": [when for _, (_, when) in ordered],
+        }
+        committed = False
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(text(f"""
+                    UPDATE {self.table} AS t
+                    SET access_count = COALESCE(t.access_count, 0) + v.n,
+                        accessed_at = GREATEST(t.accessed_at, v.ts)
+                    FROM unnest(CAST(:ids AS uuid[]), CAST(:counts AS int[]),
+                                CAST(:times AS timestamptz[])) AS v(id, n, ts)
+                    WHERE t.id = v.id
+                """), params)
+                await db.commit()
+                committed = True
+        except BaseException:
+            # Includes CancelledError from a shutdown mid-flush
+            if not committed:
+                self._restore(batch)
+            raise
+        return len(ordered)
+
+
+semantic_access = AccessCounter("aria_data.semantic_memories")
+
+COUNTERS = (semantic_access,)
+
+
+async def flush_all() -> None:
+    for counter in COUNTERS:
+        try:
+            await counter.flush()
+        except Exception as exc:
+            logger.warning("Access flush for %s failed (%d rows kept): %s",
+                           counter.table, counter.pending(), exc)
+
+
+async def run_access_flush_loop() -> None:
+    """Background task: flush access counters every ACCESS_FLUSH_SECONDS."""
+    while True:
+        try:
+            await asyncio.sleep(ACCESS_FLUSH_SECONDS)
+            await flush_all()
+        except asyncio.CancelledError:
+            # Final flush, including a batch restored by a cancelled flush
+            await flush_all()
+            break
@@ -0,0 +1,37 @@
+"""s53 — partial HNSW indexes for hot semantic-memory categories
+
+Revision ID: s53_semantic_hnsw_partial
+Revises: s52_pg17_pgvector_hnsw
+Create Date: 2026-10-16
+
+Notes:
+  - Lookups filtered to one category (EmbeddingSentimentClassifier →
+    category = 'sentiment_reference') either post-filter the global
+    HNSW index's ef_search candidates or fall back to an exact scan.
+    A partial index per hot category keeps them on an ANN path.
+  - Same DDL as ensure_schema() (vector_index.index_ddl), so either
+    path creates identical indexes.
+"""
+
+from alembic import op
+
+revision = "s53_semantic_hnsw_partial"
+down_revision = "s52_pg17_pgvector_hnsw"
+branch_labels = None
+depends_on = None
+
+HOT_CATEGORIES = ("sentiment_reference",)
+
+
+def upgrade() -> None:
+    for category in HOT_CATEGORIES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_semantic_embedding_hnsw_{category} "
+            "ON aria_data.semantic_memories USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = 16, ef_construction = 64) WHERE category = '{category}'"
+        )
+
+
+def downgrade() -> None:
+    for category in HOT_CATEGORIES:
+        op.execute(f"DROP INDEX IF EXISTS aria_data.idx_semantic_embedding_hnsw_{category}")
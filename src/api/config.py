@@ -49,6 +49,9 @@ if not DATABASE_URL:
         "DATABASE_URL not set — using fallback DSN from DB_* env/defaults"
     )
 
+# Optional read replica for read-only endpoints (falls back to DATABASE_URL)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
+
 # ── Networking ────────────────────────────────────────────────────────────────
 DOCKER_HOST_IP = os.getenv("DOCKER_HOST_IP", "host.docker.internal")
 MLX_ENABLED = os.getenv("MLX_ENABLED", "false").lower() == "true"
@@ -67,6 +67,18 @@ def _estimate_max_duration(name: str) -> int:
     return 300
 
 
+def _estimate_priority(name: str) -> str:
+    """Default scheduler queue priority class based on job type."""
+    high = {"health_check", "session_cleanup", "db_maintenance"}
+    low = {"social_post", "memeothy_prophecy", "moltbook_check",
+           "weekly_summary", "nightly_tests", "weekly_security_scan"}
+    if name in high:
+        return "high"
+    if name in low:
+        return "low"
+    return "normal"
+
+
 def _transform_job(job: Dict[str, Any]) -> Dict[str, Any]:
     """Transform a YAML job dict into column values for EngineCronJob."""
     name = job["name"]
@@ -81,6 +93,7 @@ def _transform_job(job: Dict[str, Any]) -> Dict[str, Any]:
         "session_mode": job.get("session", "isolated"),
         "max_duration_seconds": _estimate_max_duration(name),
         "retry_count": 1 if job.get("enabled", True) else 0,
+        "metadata_json": {"priority": job.get("priority") or _estimate_priority(name)},
     }
 
 
@@ -145,6 +158,9 @@ async def sync_cron_jobs_from_yaml() -> Dict[str, int]:
                         changed = True
                     if existing_row.retry_count != job_data["retry_count"]:
                         changed = True
+                    existing_meta = existing_row.metadata_json or {}
+                    if existing_meta.get("priority") != job_data["metadata_json"]["priority"]:
+                        changed = True
 
                     if changed:
                         # UPDATE only config fields — preserve runtime state
@@ -157,6 +173,7 @@ async def sync_cron_jobs_from_yaml() -> Dict[str, int]:
                         existing_row.session_mode = job_data["session_mode"]
                         existing_row.max_duration_seconds = job_data["max_duration_seconds"]
                         existing_row.retry_count = job_data["retry_count"]
+                        existing_row.metadata_json = {**existing_meta, **job_data["metadata_json"]}
                         existing_row.updated_at = datetime.now(timezone.utc)
                         stats["updated"] += 1
                         logger.info("Updated cron job: %s", job_id)
@@ -3,6 +3,12 @@ Aria database layer — SQLAlchemy 2.0 ORM with psycopg3 async driver.
 """
 
 from .models import Base
-from .session import async_engine, AsyncSessionLocal, ensure_schema, litellm_engine, LiteLLMSessionLocal
+from .session import (
+    async_engine, AsyncSessionLocal, ensure_schema, litellm_engine, LiteLLMSessionLocal,
+    read_engine, ReadSessionLocal, read_only_session,
+)
 
-__all__ = ["Base", "async_engine", "AsyncSessionLocal", "ensure_schema", "litellm_engine", "LiteLLMSessionLocal"]
+__all__ = [
+    "Base", "async_engine", "AsyncSessionLocal", "ensure_schema", "litellm_engine", "LiteLLMSessionLocal",
+    "read_engine", "ReadSessionLocal", "read_only_session",
+]
@@ -16,7 +16,7 @@ from decimal import Decimal
 from typing import Any
 
 from sqlalchemy import (
-    Boolean, DateTime, Float, ForeignKey, Integer, Numeric, String, Text, Index, UniqueConstraint, text,
+    BigInteger, Boolean, DateTime, Float, ForeignKey, Integer, Numeric, String, Text, Index, UniqueConstraint, text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -519,6 +519,18 @@ Index("idx_session_messages_session_created", SessionMessage.session_id, Session
 Index("idx_session_messages_ext_created", SessionMessage.external_session_id, SessionMessage.created_at.desc())
 
 
+class JsonlSyncCursor(Base):
+    """Per-file tail position for the autoscorer's JSONL → session_messages sync."""
+    __tablename__ = "jsonl_sync_cursors"
+    __table_args__ = {"schema": "aria_data"}
+
+    path: Mapped[str] = mapped_column(Text, primary_key=True)
+    inode: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    byte_offset: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    mtime: Mapped[float] = mapped_column(Float, nullable=False, server_default=text("0"))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("NOW()"))
+
+
 class SentimentEvent(Base):
     __tablename__ = "sentiment_events"
 
@@ -568,6 +580,8 @@ class ModelUsage(Base):
     latency_ms: Mapped[int | None] = mapped_column(Integer)
     success: Mapped[bool] = mapped_column(Boolean, server_default=text("true"))
     error_message: Mapped[str | None] = mapped_column(Text)
+    # Response-cache hit: tokens/cost are saved, not spent
+    cache_hit: Mapped[bool] = mapped_column(Boolean, server_default=text("false"))
     session_id: Mapped[Any | None] = mapped_column(UUID(as_uuid=True), ForeignKey("aria_data.agent_sessions.id", ondelete="SET NULL"))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("NOW()"))
 
@@ -600,6 +614,21 @@ class RateLimit(Base):
 Index("idx_rate_limits_skill", RateLimit.skill)
 
 
+class RateLimitBucket(Base):
+    """Shared sub-window counters for aria_engine.rate_limit.PostgresStore."""
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"schema": "aria_engine"}
+
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    window_seconds: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+Index("idx_rate_limit_buckets_expires", RateLimitBucket.expires_at)
+
+
 class ApiKeyRotation(Base):
     __tablename__ = "api_key_rotations"
     __table_args__ = {"schema": "aria_engine"}
@@ -712,6 +741,22 @@ Index("idx_semantic_category", SemanticMemory.category)
 Index("idx_semantic_importance", SemanticMemory.importance)
 Index("idx_semantic_created", SemanticMemory.created_at.desc())
 Index("idx_semantic_source", SemanticMemory.source)
+Index("idx_semantic_content_trgm", SemanticMemory.content, postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"})
+
+
+class EmbeddingCache(Base):
+    """Content-hash → embedding vector cache (aria_engine.embeddings)."""
+    __tablename__ = "embedding_cache"
+    __table_args__ = {"schema": "aria_data"}
+
+    # sha256(model + NUL + text) — see aria_engine.embeddings.content_hash
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(200), nullable=False)
+    embedding: Mapped[list] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("NOW()"))
+
+
+Index("idx_embedding_cache_created", EmbeddingCache.created_at)
 
 
 # ── Lessons Learned (S5-02) ──────────────────────────────────────────────────
@@ -790,6 +835,43 @@ Index("idx_invocation_created", SkillInvocation.created_at.desc())
 Index("idx_invocation_success", SkillInvocation.success)
 
 
+# ── Dashboard Rollups ────────────────────────────────────────────────────────
+
+class UsageRollup(Base):
+    """Hourly / daily pre-aggregates of model_usage, skill_invocations and activity_log (see usage_rollups.py)."""
+    __tablename__ = "usage_rollups"
+    __table_args__ = {"schema": "aria_data"}
+
+    source: Mapped[str] = mapped_column(String(32), primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)  # hour | day
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    dim1: Mapped[str] = mapped_column(String(200), primary_key=True, server_default=text("''"))
+    dim2: Mapped[str] = mapped_column(String(200), primary_key=True, server_default=text("''"))
+    dim3: Mapped[str] = mapped_column(String(200), primary_key=True, server_default=text("''"))
+    events: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    successes: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    failures: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    cost_usd: Mapped[float] = mapped_column(Numeric(16, 6), nullable=False, server_default=text("0"))
+    duration_ms_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    duration_ms_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+
+
+Index("idx_usage_rollups_lookup", UsageRollup.source, UsageRollup.granularity, UsageRollup.bucket)
+
+
+class RollupState(Base):
+    """Per-source watermark: every hour before rolled_until is in usage_rollups."""
+    __tablename__ = "rollup_state"
+    __table_args__ = {"schema": "aria_data"}
+
+    source: Mapped[str] = mapped_column(String(32), primary_key=True)
+    rolled_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("NOW()"))
+
+
 # ── Aria Engine (v2.0) ───────────────────────────────────────────────────────
 # Standalone engine tables — native runtime state
 
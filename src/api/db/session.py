@@ -7,6 +7,9 @@ ORM:    SQLAlchemy 2.0 async
 
 import logging
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -15,7 +18,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.schema import CreateIndex, CreateTable
 
-from config import DATABASE_URL
+from config import DATABASE_READ_URL, DATABASE_URL
 from .models import Base
 
 logger = logging.getLogger("aria.db")
@@ -74,6 +77,37 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+# ── Read-only sessions (replica when DATABASE_READ_URL is set) ──────────────
+
+read_engine = (
+    create_async_engine(
+        _as_psycopg_url(DATABASE_READ_URL),
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+        echo=False,
+    )
+    if DATABASE_READ_URL
+    else async_engine
+)
+
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+@asynccontextmanager
+async def read_only_session() -> AsyncIterator[AsyncSession]:
+    """Session whose transaction is READ ONLY (replica if configured)."""
+    async with ReadSessionLocal() as session:
+        await session.execute(text("SET TRANSACTION READ ONLY"))
+        yield session
+
+
 # ── LiteLLM database (separate DB, same PG instance) ────────────────────────
 
 litellm_engine = create_async_engine(
@@ -159,6 +193,8 @@ async def ensure_schema() -> None:
             ("aria_engine.agent_state", "capabilities", "JSONB", "'[]'::jsonb"),
             ("aria_engine.agent_state", "timeout_seconds", "INTEGER", "600"),
             ("aria_engine.agent_state", "rate_limit", "JSONB", "'{}'::jsonb"),
+            # LLM response cache hits (saved, not spent)
+            ("aria_data.model_usage", "cache_hit", "BOOLEAN", "false"),
         ]
         for tbl, col, col_type, default in _column_migrations:
             ddl = f"ALTER TABLE {tbl} ADD COLUMN IF NOT EXISTS {col} {col_type}"
@@ -231,13 +267,12 @@ async def ensure_schema() -> None:
                 )
 
         # HNSW vector indexes (pgvector 0.5+) — not in ORM metadata, added manually
-        # vector_cosine_ops matches the cosine_distance() calls in memories.py
-        await _run_isolated(
-            conn, "hnsw_semantic_embedding",
-            "CREATE INDEX IF NOT EXISTS idx_semantic_embedding_hnsw "
-            "ON aria_data.semantic_memories USING hnsw (embedding vector_cosine_ops) "
-            "WITH (m = 16, ef_construction = 64)",
-        )
+        # vector_cosine_ops matches the cosine_distance() calls in memories.py;
+        # semantic_memories gets a global index plus partial ones per hot
+        # category (see vector_index.py)
+        from vector_index import index_ddl
+        for index_name, ddl in index_ddl():
+            await _run_isolated(conn, f"hnsw_{index_name}", ddl)
         await _run_isolated(
             conn, "hnsw_session_messages_embedding",
             "CREATE INDEX IF NOT EXISTS idx_session_messages_embedding_hnsw "
@@ -7,7 +7,7 @@ from typing import AsyncGenerator
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.session import AsyncSessionLocal, LiteLLMSessionLocal
+from db.session import AsyncSessionLocal, LiteLLMSessionLocal, read_only_session
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -20,6 +20,12 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a READ ONLY session (replica when DATABASE_READ_URL is set)."""
+    async with read_only_session() as session:
+        yield session
+
+
 async def get_litellm_db() -> AsyncGenerator[AsyncSession, None]:
     """Yield a read-only async session to the LiteLLM schema (same DB)."""
     async with LiteLLMSessionLocal() as session:
@@ -4,7 +4,6 @@ Error handling wraps all DB operations in try/except (S-29).
 Cursor-based pagination available via *_connection resolvers.
 """
 
-import base64
 import logging
 import uuid
 
@@ -24,6 +23,7 @@ from db.models import (
     Thought,
 )
 from db.session import AsyncSessionLocal
+from pagination import count_total, fetch_page, row_cursor
 from .types import (
     ActivityConnection,
     ActivityEdge,
@@ -62,16 +62,6 @@ from .types import (
 logger = logging.getLogger("aria.gql.resolvers")
 
 
-# ── Cursor helpers ───────────────────────────────────────────────────────────
-
-def _encode_cursor(value: str) -> str:
-    return base64.urlsafe_b64encode(value.encode()).decode()
-
-
-def _decode_cursor(cursor: str) -> str:
-    return base64.urlsafe_b64decode(cursor.encode()).decode()
-
-
 async def _get_session():
     async with AsyncSessionLocal() as session:
         yield session
@@ -100,29 +90,27 @@ async def resolve_activities(limit: int = 25, offset: int = 0, action: str | Non
         return []
 
 
+_ACTIVITIES_KEYS = ((ActivityLog.created_at, True), (ActivityLog.id, True))
+
+
 async def resolve_activities_connection(
     first: int = 25,
     after: str | None = None,
     action: str | None = None,
+    exact_total: bool = False,
 ) -> ActivityConnection:
     """Cursor-based pagination for activities."""
     try:
         async with AsyncSessionLocal() as db:
-            total = (await db.execute(select(func.count(ActivityLog.id)))).scalar() or 0
-            stmt = select(ActivityLog).order_by(ActivityLog.created_at.desc())
+            stmt = select(ActivityLog)
             if action:
                 stmt = stmt.where(ActivityLog.action == action)
-            if after:
-                cursor_id = _decode_cursor(after)
-                stmt = stmt.where(ActivityLog.id < uuid.UUID(cursor_id))
-            stmt = stmt.limit(first + 1)
-            result = await db.execute(stmt)
-            rows = result.scalars().all()
-            has_next = len(rows) > first
-            rows = rows[:first]
+            total, _ = await count_total(db, stmt, exact=exact_total)
+            rows, next_cursor = await fetch_page(db, stmt, _ACTIVITIES_KEYS, limit=first, cursor=after)
+            has_next = next_cursor is not None
             edges = [
                 ActivityEdge(
-                    cursor=_encode_cursor(str(a.id)),
+                    cursor=row_cursor(a, _ACTIVITIES_KEYS),
                     node=ActivityType(
                         id=str(a.id), action=a.action, skill=a.skill,
                         details=a.details, success=a.success,
@@ -169,29 +157,27 @@ async def resolve_thoughts(limit: int = 20, offset: int = 0, category: str | Non
         return []
 
 
+_THOUGHTS_KEYS = ((Thought.created_at, True), (Thought.id, True))
+
+
 async def resolve_thoughts_connection(
     first: int = 20,
     after: str | None = None,
     category: str | None = None,
+    exact_total: bool = False,
 ) -> ThoughtConnection:
     """Cursor-based pagination for thoughts."""
     try:
         async with AsyncSessionLocal() as db:
-            total = (await db.execute(select(func.count(Thought.id)))).scalar() or 0
-            stmt = select(Thought).order_by(Thought.created_at.desc())
+            stmt = select(Thought)
             if category:
                 stmt = stmt.where(Thought.category == category)
-            if after:
-                cursor_id = _decode_cursor(after)
-                stmt = stmt.where(Thought.id < uuid.UUID(cursor_id))
-            stmt = stmt.limit(first + 1)
-            result = await db.execute(stmt)
-            rows = result.scalars().all()
-            has_next = len(rows) > first
-            rows = rows[:first]
+            total, _ = await count_total(db, stmt, exact=exact_total)
+            rows, next_cursor = await fetch_page(db, stmt, _THOUGHTS_KEYS, limit=first, cursor=after)
+            has_next = next_cursor is not None
             edges = [
                 ThoughtEdge(
-                    cursor=_encode_cursor(str(t.id)),
+                    cursor=row_cursor(t, _THOUGHTS_KEYS),
                     node=ThoughtType(
                         id=str(t.id), category=t.category, content=t.content,
                         metadata=t.metadata_json,
@@ -237,29 +223,27 @@ async def resolve_memories(limit: int = 20, offset: int = 0, category: str | Non
         return []
 
 
+_MEMORIES_KEYS = ((Memory.updated_at, True), (Memory.id, True))
+
+
 async def resolve_memories_connection(
     first: int = 20,
     after: str | None = None,
     category: str | None = None,
+    exact_total: bool = False,
 ) -> MemoryConnection:
     """Cursor-based pagination for memories."""
     try:
         async with AsyncSessionLocal() as db:
-            total = (await db.execute(select(func.count(Memory.id)))).scalar() or 0
-            stmt = select(Memory).order_by(Memory.updated_at.desc())
+            stmt = select(Memory)
             if category:
                 stmt = stmt.where(Memory.category == category)
-            if after:
-                cursor_id = _decode_cursor(after)
-                stmt = stmt.where(Memory.id < uuid.UUID(cursor_id))
-            stmt = stmt.limit(first + 1)
-            result = await db.execute(stmt)
-            rows = result.scalars().all()
-            has_next = len(rows) > first
-            rows = rows[:first]
+            total, _ = await count_total(db, stmt, exact=exact_total)
+            rows, next_cursor = await fetch_page(db, stmt, _MEMORIES_KEYS, limit=first, cursor=after)
+            has_next = next_cursor is not None
             edges = [
                 MemoryEdge(
-                    cursor=_encode_cursor(str(m.id)),
+                    cursor=row_cursor(m, _MEMORIES_KEYS),
                     node=MemoryType(
                         id=str(m.id), key=m.key, value=m.value, category=m.category,
                         created_at=m.created_at.isoformat() if m.created_at else None,
@@ -329,29 +313,27 @@ async def resolve_goals(limit: int = 25, offset: int = 0, status: str | None = N
         return []
 
 
+_GOALS_KEYS = ((Goal.priority, False), (Goal.created_at, True), (Goal.id, True))
+
+
 async def resolve_goals_connection(
     first: int = 25,
     after: str | None = None,
     status: str | None = None,
+    exact_total: bool = False,
 ) -> GoalConnection:
     """Cursor-based pagination for goals."""
     try:
         async with AsyncSessionLocal() as db:
-            total = (await db.execute(select(func.count(Goal.id)))).scalar() or 0
-            stmt = select(Goal).order_by(Goal.priority.asc(), Goal.created_at.desc())
+            stmt = select(Goal)
             if status:
                 stmt = stmt.where(Goal.status == status)
-            if after:
-                cursor_id = _decode_cursor(after)
-                stmt = stmt.where(Goal.id < uuid.UUID(cursor_id))
-            stmt = stmt.limit(first + 1)
-            result = await db.execute(stmt)
-            rows = result.scalars().all()
-            has_next = len(rows) > first
-            rows = rows[:first]
+            total, _ = await count_total(db, stmt, exact=exact_total)
+            rows, next_cursor = await fetch_page(db, stmt, _GOALS_KEYS, limit=first, cursor=after)
+            has_next = next_cursor is not None
             edges = [
                 GoalEdge(
-                    cursor=_encode_cursor(str(g.id)),
+                    cursor=row_cursor(g, _GOALS_KEYS),
                     node=GoalType(
                         id=str(g.id), goal_id=g.goal_id, title=g.title,
                         description=g.description, status=g.status,
@@ -464,29 +446,27 @@ async def resolve_sessions(limit: int = 25, offset: int = 0, status: str | None
         return []
 
 
+_SESSIONS_KEYS = ((AgentSession.started_at, True), (AgentSession.id, True))
+
+
 async def resolve_sessions_connection(
     first: int = 25,
     after: str | None = None,
     status: str | None = None,
+    exact_total: bool = False,
 ) -> SessionConnection:
     """Cursor-based pagination for sessions."""
     try:
         async with AsyncSessionLocal() as db:
-            total = (await db.execute(select(func.count(AgentSession.id)))).scalar() or 0
-            stmt = select(AgentSession).order_by(AgentSession.started_at.desc())
+            stmt = select(AgentSession)
             if status:
                 stmt = stmt.where(AgentSession.status == status)
-            if after:
-                cursor_id = _decode_cursor(after)
-                stmt = stmt.where(AgentSession.id < uuid.UUID(cursor_id))
-            stmt = stmt.limit(first + 1)
-            result = await db.execute(stmt)
-            rows = result.scalars().all()
-            has_next = len(rows) > first
-            rows = rows[:first]
+            total, _ = await count_total(db, stmt, exact=exact_total)
+            rows, next_cursor = await fetch_page(db, stmt, _SESSIONS_KEYS, limit=first, cursor=after)
+            has_next = next_cursor is not None
             edges = [
                 SessionEdge(
-                    cursor=_encode_cursor(str(s.id)),
+                    cursor=row_cursor(s, _SESSIONS_KEYS),
                     node=SessionType(
                         id=str(s.id), agent_id=s.agent_id, session_type=s.session_type,
                         started_at=s.started_at.isoformat() if s.started_at else None,
@@ -134,32 +134,47 @@ class Query:
     @strawberry.field
     async def activities_connection(
         self, first: int = 25, after: str | None = None, action: str | None = None,
+        exact_total: bool = False,
     ) -> ActivityConnection:
-        return await resolve_activities_connection(first=first, after=after, action=action)
+        return await resolve_activities_connection(
+            first=first, after=after, action=action, exact_total=exact_total,
+        )
 
     @strawberry.field
     async def thoughts_connection(
         self, first: int = 20, after: str | None = None, category: str | None = None,
+        exact_total: bool = False,
     ) -> ThoughtConnection:
-        return await resolve_thoughts_connection(first=first, after=after, category=category)
+        return await resolve_thoughts_connection(
+            first=first, after=after, category=category, exact_total=exact_total,
+        )
 
     @strawberry.field
     async def memories_connection(
         self, first: int = 20, after: str | None = None, category: str | None = None,
+        exact_total: bool = False,
     ) -> MemoryConnection:
-        return await resolve_memories_connection(first=first, after=after, category=category)
+        return await resolve_memories_connection(
+            first=first, after=after, category=category, exact_total=exact_total,
+        )
 
     @strawberry.field
     async def goals_connection(
         self, first: int = 25, after: str | None = None, status: str | None = None,
+        exact_total: bool = False,
     ) -> GoalConnection:
-        return await resolve_goals_connection(first=first, after=after, status=status)
+        return await resolve_goals_connection(
+            first=first, after=after, status=status, exact_total=exact_total,
+        )
 
     @strawberry.field
     async def sessions_connection(
         self, first: int = 25, after: str | None = None, status: str | None = None,
+        exact_total: bool = False,
     ) -> SessionConnection:
-        return await resolve_sessions_connection(first=first, after=after, status=status)
+        return await resolve_sessions_connection(
+            first=first, after=after, status=status, exact_total=exact_total,
+        )
 
 
 @strawberry.type
@@ -50,11 +50,11 @@ except ImportError:
 
 try:
     from .config import API_VERSION, SKILL_BACKFILL_ON_STARTUP
-    from .db import async_engine, ensure_schema
+    from .db import async_engine, ensure_schema, read_engine
     from .startup_skill_backfill import run_skill_invocation_backfill
 except ImportError:
     from config import API_VERSION, SKILL_BACKFILL_ON_STARTUP
-    from db import async_engine, ensure_schema
+    from db import async_engine, ensure_schema, read_engine
     from startup_skill_backfill import run_skill_invocation_backfill
 
 _logger = logging.getLogger("aria.api")
@@ -108,9 +108,10 @@ async def lifespan(app: FastAPI):
     # ── Phase 2: Initialize Aria Engine (chat, streaming, agents) ─────────
     # S-52/S-53: Now that DB is seeded, engine pool will find all agents.
     _rt_pool = None  # Keep reference for reload on POST /agents/db/sync
+    _rt_router = None  # Flushes coalesced pheromone scores on shutdown
     try:
         from aria_engine.config import EngineConfig
-        from aria_engine.llm_gateway import LLMGateway
+        from aria_engine.llm_gateway import get_llm_gateway
         from aria_engine.tool_registry import ToolRegistry
         from aria_engine.chat_engine import ChatEngine
         from aria_engine.streaming import StreamManager
@@ -122,7 +123,7 @@ async def lifespan(app: FastAPI):
             from db import AsyncSessionLocal
 
         engine_cfg = EngineConfig()
-        gateway = LLMGateway(engine_cfg)
+        gateway = get_llm_gateway(engine_cfg)
         tool_registry = ToolRegistry()
         # Auto-discover tools from aria_skills/*/skill.json manifests
         try:
@@ -206,11 +207,32 @@ async def lifespan(app: FastAPI):
                 f"model_usage={summary['model_usage']}, "
                 f"activity_log={summary['activity_log']})"
             )
+            if summary["total"] > 0:
+                # Backfilled rows land in already-rolled hours
+                try:
+                    from .usage_rollups import invalidate as _invalidate_rollup
+                    from .db import AsyncSessionLocal as _RollupSessionLocal
+                except ImportError:
+                    from usage_rollups import invalidate as _invalidate_rollup
+                    from db import AsyncSessionLocal as _RollupSessionLocal
+                async with _RollupSessionLocal() as _db:
+                    await _invalidate_rollup(_db, "skills")
         except Exception as e:
             print(f"⚠️  Skill invocation backfill failed (non-fatal): {e}")
     else:
         print("ℹ️  Skill invocation backfill skipped (SKILL_BACKFILL_ON_STARTUP=false)")
 
+    # Shared embedding service: enable the Postgres vector-cache tier
+    try:
+        from aria_engine.embeddings import get_embedding_service
+        try:
+            from .db import AsyncSessionLocal as _EmbedSessionLocal
+        except ImportError:
+            from db import AsyncSessionLocal as _EmbedSessionLocal
+        get_embedding_service(db_factory=_EmbedSessionLocal)
+    except Exception as e:
+        print(f"⚠️  Embedding cache DB tier unavailable (non-fatal): {e}")
+
     # S-AUTO: Background sentiment auto-scorer (zero LLM tokens)
     try:
         from .sentiment_autoscorer import run_autoscorer_loop
@@ -219,9 +241,25 @@ async def lifespan(app: FastAPI):
     scorer_task = asyncio.create_task(run_autoscorer_loop())
     print("🎯 Sentiment auto-scorer background task launched")
 
+    # Dashboard usage rollups (hourly/daily pre-aggregates)
+    try:
+        from .usage_rollups import run_rollup_loop
+    except ImportError:
+        from usage_rollups import run_rollup_loop
+    rollup_task = asyncio.create_task(run_rollup_loop())
+    print("📊 Usage rollup background task launched")
+
+    # Semantic-memory access stats, batched off the search read path
+    try:
+        from .access_tracker import run_access_flush_loop
+    except ImportError:
+        from access_tracker import run_access_flush_loop
+    access_task = asyncio.create_task(run_access_flush_loop())
+
     # S-67: Background session auto-cleanup (every 6 hours)
     async def _session_cleanup_loop():
-        """Prune stale sessions (>30 days) every 6 hours."""
+        """Prune stale sessions (>30 days) and the embedding cache every 6 hours."""
+        from aria_engine.embeddings import get_embedding_service
         from aria_engine.session_manager import NativeSessionManager
         mgr = NativeSessionManager(async_engine)
         while True:
@@ -237,6 +275,15 @@ async def lifespan(app: FastAPI):
                 break
             except Exception as exc:
                 _logger.warning("Session cleanup error: %s", exc)
+            # aria_data.embedding_cache: >30 days old, capped at 200k rows
+            try:
+                pruned = await get_embedding_service().prune_db()
+                if pruned:
+                    _logger.info("Embedding cache cleanup: pruned %d rows", pruned)
+            except asyncio.CancelledError:
+                break
+            except Exception as exc:
+                _logger.warning("Embedding cache cleanup error: %s", exc)
 
     # Ghost session purge: delete 0-message sessions older than 60 min every 10 min
     # RT-01 decision: 1 hour TTL (15 min was too aggressive for slow typers)
@@ -290,20 +337,35 @@ async def lifespan(app: FastAPI):
     cleanup_task = asyncio.create_task(_session_cleanup_loop())
     ghost_task = asyncio.create_task(_ghost_purge_loop())
     cron_cleanup_task = asyncio.create_task(_cron_session_cleanup_loop())
-    print("🧹 Session auto-cleanup launched (every 6h, >30d) + ghost purge (every 10m, 0-msg >60m) + cron TTL (every 1h, >1d, runs on startup)")
+    print("🧹 Session + embedding-cache auto-cleanup launched (every 6h, >30d) + ghost purge (every 10m, 0-msg >60m) + cron TTL (every 1h, >1d, runs on startup)")
 
     yield
 
     # Graceful shutdown
-    for task in (scorer_task, cleanup_task, ghost_task, cron_cleanup_task):
+    for task in (scorer_task, rollup_task, access_task, cleanup_task, ghost_task, cron_cleanup_task):
         task.cancel()
         try:
             await task
         except asyncio.CancelledError:
             pass
-    print("🛑 Background tasks stopped (auto-scorer + session-cleanup + ghost-purge + cron-cleanup)")
+    print("🛑 Background tasks stopped (auto-scorer + usage-rollups + access-flush + session-cleanup + ghost-purge + cron-cleanup)")
+
+    if _rt_router is not None:
+        await _rt_router.close()
+    try:
+        from aria_engine.embeddings import get_embedding_service
+        await get_embedding_service().aclose()
+    except Exception:
+        pass
+    try:
+        from aria_engine.telemetry import shutdown_telemetry
+        await shutdown_telemetry()
+    except Exception:
+        pass
 
     await async_engine.dispose()
+    if read_engine is not async_engine:
+        await read_engine.dispose()
     print("🔌 Database engine disposed")
 
 
@@ -350,12 +412,23 @@ app.add_middleware(
 # Security middleware — rate limiting, injection scanning, security headers
 from security_middleware import SecurityMiddleware, RateLimiter
 
+# RATE_LIMIT_BACKEND=postgres shares counts across uvicorn workers
+_rate_limit_store = None
+if os.environ.get("RATE_LIMIT_BACKEND", "memory").strip().lower() == "postgres":
+    from aria_engine.rate_limit import PostgresStore
+    try:
+        from .db import AsyncSessionLocal as _RateLimitSessionLocal
+    except ImportError:
+        from db import AsyncSessionLocal as _RateLimitSessionLocal
+    _rate_limit_store = PostgresStore(_RateLimitSessionLocal)
+
 app.add_middleware(
     SecurityMiddleware,
     rate_limiter=RateLimiter(
         requests_per_minute=300,
         requests_per_hour=5000,
         burst_limit=50,
+        store=_rate_limit_store,
     ),
     max_body_size=2_000_000,
 )
@@ -1,7 +1,31 @@
-"""Shared pagination utilities for all API endpoints."""
+"""Shared pagination utilities for all API endpoints.
 
+Two styles:
+- OFFSET/LIMIT pages (paginate_query / build_paginated_response)
+- Keyset ("seek") pages (fetch_page / build_keyset_response): opaque
+  cursors holding the sort-key values of the last row, so page N costs
+  the same index range scan as page 1. Sort keys must be non-null and
+  end in a unique column (id) so ties are ordered.
+
+Totals: count_total() returns a planner estimate by default
+(pg_class.reltuples for unfiltered lists, EXPLAIN row estimate when
+filtered) and an exact COUNT(*) only on request.
+"""
+
+import base64
+import binascii
+import json
 import math
-from typing import Any
+import uuid
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Table, and_, func, literal, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# (column, descending) pairs, e.g. ((Thought.created_at, True), (Thought.id, True))
+Keys = Sequence[tuple[Any, bool]]
 
 
 def paginate_query(stmt, page: int = 1, limit: int = 25):
@@ -24,3 +48,157 @@ def build_paginated_response(
         "limit": limit,
         "pages": math.ceil(total / limit) if limit > 0 else 0,
     }
+
+
+# ── Keyset pagination ────────────────────────────────────────────────────────
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _load(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "u" in value:
+            return uuid.UUID(value["u"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort-key values."""
+    raw = json.dumps([_dump(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Sort-key values from a cursor; ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        parsed = json.loads(raw)
+        values = [_load(v) for v in parsed] if isinstance(parsed, list) else None
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"invalid cursor: {e}") from e
+    if values is None or len(values) != size or any(v is None for v in values):
+        raise ValueError("invalid cursor: wrong shape")
+    return values
+
+
+def row_cursor(row: Any, keys: Keys) -> str:
+    """Cursor pointing just past ``row``."""
+    return encode_cursor([getattr(row, col.key) for col, _ in keys])
+
+
+def seek_after(keys: Keys, values: Sequence[Any]):
+    """WHERE clause selecting rows strictly after ``values`` in ``keys`` order.
+
+    Includes a plain range bound on the leading key so a single-column
+    index on it (e.g. ``created_at DESC``) drives the scan.
+    """
+    first, first_desc = keys[0]
+    bound = first <= values[0] if first_desc else first >= values[0]
+    if all(desc == first_desc for _, desc in keys):
+        columns = tuple_(*(col for col, _ in keys))
+        row = tuple_(*(literal(v, col.type) for (col, _), v in zip(keys, values)))
+        return and_(bound, columns < row if first_desc else columns > row)
+    branches = []
+    for i, (col, desc) in enumerate(keys):
+        equal = [keys[j][0] == values[j] for j in range(i)]
+        branches.append(and_(*equal, col < values[i] if desc else col > values[i]))
+    return and_(bound, or_(*branches))
+
+
+def order_by_keys(stmt, keys: Keys):
+    return stmt.order_by(*(col.desc() if desc else col.asc() for col, desc in keys))
+
+
+async def fetch_page(
+    db: AsyncSession,
+    stmt,
+    keys: Keys,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    page: int = 1,
+) -> tuple[list[Any], str | None]:
+    """
+    One page of ORM rows ordered by ``keys``, plus the next cursor.
+
+    With ``cursor`` the page is a seek past that row; without it, the
+    legacy ``page`` number is used (OFFSET), so old clients keep working
+    and page 1 / cursor pages share the same plan. ``stmt`` must not be
+    ordered yet.
+    """
+    stmt = order_by_keys(stmt, keys)
+    if cursor:
+        try:
+            values = decode_cursor(cursor, len(keys))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        stmt = stmt.where(seek_after(keys, values))
+    elif page > 1:
+        stmt = stmt.offset((page - 1) * limit)
+    rows = list((await db.execute(stmt.limit(limit + 1))).scalars().all())
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, row_cursor(rows[-1], keys)
+    return rows, None
+
+
+async def estimate_count(db: AsyncSession, stmt) -> int | None:
+    """Planner row estimate for ``stmt``; None when unavailable."""
+    froms = stmt.get_final_froms()
+    async with db.begin_nested():
+        if stmt.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+            table = froms[0]
+            name = f"{table.schema}.{table.name}" if table.schema else table.name
+            reltuples = (await db.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+                {"name": name},
+            )).scalar()
+            # -1 = never vacuumed/analyzed
+            return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+        compiled = stmt.compile(dialect=db.bind.dialect)
+        conn = await db.connection()
+        plan = (await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params,
+        )).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_total(db: AsyncSession, stmt, *, exact: bool = False) -> tuple[int, bool]:
+    """(total, is_exact) for an unordered, unpaginated ``stmt``."""
+    if not exact:
+        try:
+            estimate = await estimate_count(db, stmt)
+        except Exception:
+            estimate = None
+        if estimate is not None:
+            return estimate, False
+    total = (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar() or 0
+    return total, True
+
+
+def build_keyset_response(
+    items: list[Any],
+    total: int,
+    limit: int,
+    next_cursor: str | None,
+    *,
+    page: int = 1,
+    total_exact: bool = True,
+) -> dict:
+    """build_paginated_response plus ``next_cursor`` / ``has_more`` / ``total_exact``."""
+    response = build_paginated_response(items, total, page, limit)
+    response.update(
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+        total_exact=total_exact,
+    )
+    return response
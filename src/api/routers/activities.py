@@ -8,13 +8,14 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import Float, case, cast, desc, func, or_, select
+from sqlalchemy import Float, cast, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import ActivityLog, SocialPost
 from deps import get_db
-from pagination import paginate_query, build_paginated_response
+from pagination import build_keyset_response, count_total, fetch_page
 from schemas.requests import CreateActivity, UpdateActivity
+from usage_rollups import aggregate, regroup, total as rollup_total
 
 router = APIRouter(tags=["Activities"])
 logger = logging.getLogger("aria.api.activities")
@@ -59,18 +60,19 @@ async def api_activities(
     page: int = 1,
     limit: int = 50,
     action: str | None = None,
+    cursor: str | None = None,
+    exact_total: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
     base = select(ActivityLog)
     if action:
         base = base.where(ActivityLog.action == action)
-    base = base.order_by(ActivityLog.created_at.desc())
 
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt, _ = paginate_query(base, page, limit)
-    rows = (await db.execute(stmt)).scalars().all()
+    total, total_exact = await count_total(db, base, exact=exact_total)
+    rows, next_cursor = await fetch_page(
+        db, base, ((ActivityLog.created_at, True), (ActivityLog.id, True)),
+        limit=limit, cursor=cursor, page=page,
+    )
     items = [
         {
             "id": str(a.id),
@@ -85,7 +87,7 @@ async def api_activities(
         }
         for a in rows
     ]
-    return build_paginated_response(items, total, page, limit)
+    return build_keyset_response(items, total, limit, next_cursor, page=page, total_exact=total_exact)
 
 
 @router.post("/activities")
@@ -203,44 +205,15 @@ async def activity_visualization(
     cutoff = now_utc - timedelta(hours=max(1, min(hours, 24 * 30)))
     limit = max(1, min(limit, 200))
 
-    hour_bucket = func.date_trunc("hour", ActivityLog.created_at).label("hour")
-
-    hourly_rows = (
-        await db.execute(
-            select(
-                hour_bucket,
-                func.count(ActivityLog.id).label("count"),
-            )
-            .where(ActivityLog.created_at >= cutoff)
-            .group_by(hour_bucket)
-            .order_by(hour_bucket)
-        )
-    ).all()
-
-    actions_rows = (
-        await db.execute(
-            select(ActivityLog.action, func.count(ActivityLog.id).label("count"))
-            .where(ActivityLog.created_at >= cutoff)
-            .group_by(ActivityLog.action)
-            .order_by(desc(func.count(ActivityLog.id)))
-            .limit(12)
-        )
-    ).all()
-
-    skill_bucket = func.coalesce(ActivityLog.skill, "unknown").label("skill")
-
-    skills_rows = (
-        await db.execute(
-            select(
-                skill_bucket,
-                func.count(ActivityLog.id).label("count"),
-            )
-            .where(ActivityLog.created_at >= cutoff)
-            .group_by(skill_bucket)
-            .order_by(desc(func.count(ActivityLog.id)))
-            .limit(12)
-        )
-    ).all()
+    # Counts come from the usage rollups (see usage_rollups.py)
+    hourly_rows = sorted(
+        await aggregate(db, "activity", cutoff, group_by=("hour",)),
+        key=lambda r: r["hour"],
+    )
+    action_skill_rows = await aggregate(db, "activity", cutoff, group_by=("action", "skill"))
+    actions_rows = regroup(action_skill_rows, ("action",))[:12]
+    skills_rows = regroup(action_skill_rows, ("skill",))[:12]
+    total_rows = rollup_total(action_skill_rows)
 
     all_skills_rows = []
     creative_hourly_rows = []
@@ -255,40 +228,33 @@ async def activity_visualization(
             "memeothy",
         ]
 
-        skill_expr = func.lower(func.replace(func.coalesce(ActivityLog.skill, ""), "-", "_"))
         creative_candidates = set(creative_skill_targets)
         creative_candidates.update({f"aria_{name}" for name in creative_skill_targets})
         creative_candidates.update({
             "factcheck",
         })
 
+        def _is_creative(skill_column):
+            skill_expr = func.lower(func.replace(skill_column, "-", "_"))
+            return or_(*[skill_expr == value for value in sorted(creative_candidates)])
+
+        skill_expr = func.lower(func.replace(func.coalesce(ActivityLog.skill, ""), "-", "_"))
         creative_filter = or_(*[skill_expr == value for value in sorted(creative_candidates)])
 
-        all_skills_rows = (
-            await db.execute(
-                select(
-                    skill_bucket,
-                    func.count(ActivityLog.id).label("count"),
-                )
-                .where(ActivityLog.created_at >= cutoff)
-                .where(creative_filter)
-                .group_by(skill_bucket)
-                .order_by(desc(func.count(ActivityLog.id)))
-            )
-        ).all()
+        creative_action_skill_rows = [
+            row for row in action_skill_rows
+            if row["skill"].lower().replace("-", "_") in creative_candidates
+        ]
+        all_skills_rows = regroup(creative_action_skill_rows, ("skill",))
+        creative_actions_rows = regroup(creative_action_skill_rows, ("action",))[:8]
 
-        creative_hourly_rows = (
-            await db.execute(
-                select(
-                    hour_bucket,
-                    func.count(ActivityLog.id).label("count"),
-                )
-                .where(ActivityLog.created_at >= cutoff)
-                .where(creative_filter)
-                .group_by(hour_bucket)
-                .order_by(hour_bucket)
-            )
-        ).all()
+        creative_hourly_rows = sorted(
+            await aggregate(
+                db, "activity", cutoff, group_by=("hour",),
+                filters={"skill": _is_creative},
+            ),
+            key=lambda r: r["hour"],
+        )
 
         creative_recent_items = (
             await db.execute(
@@ -300,27 +266,6 @@ async def activity_visualization(
             )
         ).scalars().all()
 
-        creative_actions_rows = (
-            await db.execute(
-                select(ActivityLog.action, func.count(ActivityLog.id).label("count"))
-                .where(ActivityLog.created_at >= cutoff)
-                .where(creative_filter)
-                .group_by(ActivityLog.action)
-                .order_by(desc(func.count(ActivityLog.id)))
-                .limit(8)
-            )
-        ).all()
-
-    total_rows = (
-        await db.execute(
-            select(
-                func.count(ActivityLog.id).label("total"),
-                func.sum(case((ActivityLog.success == True, 1), else_=0)).label("success"),
-                func.sum(case((ActivityLog.success == False, 1), else_=0)).label("fail"),
-            ).where(ActivityLog.created_at >= cutoff)
-        )
-    ).one()
-
     recent_items = (
         await db.execute(
             select(ActivityLog)
@@ -353,7 +298,7 @@ async def activity_visualization(
         return alias_map.get(skill, skill)
 
     all_skill_counts = {
-        _normalize_skill_name(row.skill): int(row.count or 0)
+        _normalize_skill_name(row["skill"]): int(row["events"])
         for row in all_skills_rows
     }
     creative_skills = [
@@ -393,20 +338,20 @@ async def activity_visualization(
         "window_hours": hours,
         "generated_at": now_utc.isoformat(),
         "summary": {
-            "total": int(total_rows.total or 0),
-            "success": int(total_rows.success or 0),
-            "fail": int(total_rows.fail or 0),
+            "total": int(total_rows["events"]),
+            "success": int(total_rows["successes"]),
+            "fail": int(total_rows["failures"]),
         },
         "hourly": [
-            {"hour": row.hour.isoformat() if row.hour else None, "count": int(row.count or 0)}
+            {"hour": row["hour"].isoformat() if row["hour"] else None, "count": int(row["events"])}
             for row in hourly_rows
         ],
         "actions": [
-            {"action": row.action or "unknown", "count": int(row.count or 0)}
+            {"action": row["action"] or "unknown", "count": int(row["events"])}
             for row in actions_rows
         ],
         "skills": [
-            {"skill": row.skill or "unknown", "count": int(row.count or 0)}
+            {"skill": row["skill"] or "unknown", "count": int(row["events"])}
             for row in skills_rows
         ],
         "creative": {
@@ -415,11 +360,11 @@ async def activity_visualization(
             "total": creative_total,
             "skills": creative_skills,
             "hourly": [
-                {"hour": row.hour.isoformat() if row.hour else None, "count": int(row.count or 0)}
+                {"hour": row["hour"].isoformat() if row["hour"] else None, "count": int(row["events"])}
                 for row in creative_hourly_rows
             ],
             "actions": [
-                {"action": row.action or "unknown", "count": int(row.count or 0)}
+                {"action": row["action"] or "unknown", "count": int(row["events"])}
                 for row in creative_actions_rows
             ],
             "recent": [
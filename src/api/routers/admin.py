@@ -7,12 +7,13 @@ import logging
 import os
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import ARIA_ADMIN_TOKEN, SERVICE_CONTROL_ENABLED
 from deps import get_db
+from vector_index import index_report
 
 router = APIRouter(tags=["Admin"])
 # Separate router for read-only file browser endpoints — mounted with
@@ -261,3 +262,19 @@ async def table_stats(db: AsyncSession = Depends(get_db)):
          "last_vacuum": r.last_vacuum.isoformat() if r.last_vacuum else None}
         for r in rows
     ]
+
+
+@router.get("/admin/vector-index")
+async def vector_index_stats(
+    sample: int = Query(20, ge=1, le=200, description="Random stored embeddings used as queries"),
+    k: int = Query(10, ge=1, le=100),
+    ef_search: int | None = Query(None, ge=1, le=1000),
+    category: str | None = None,
+    min_importance: float = 0.0,
+    db: AsyncSession = Depends(get_db),
+):
+    """HNSW index sizes for semantic_memories and ANN recall@k vs exact search."""
+    return await index_report(
+        db, sample=sample, k=k, ef_search=ef_search,
+        category=category, min_importance=min_importance,
+    )
@@ -21,6 +21,8 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 
+from aria_engine.routing_table import notify_agent_changed
+
 logger = logging.getLogger("aria.api.agents_crud")
 
 router = APIRouter(tags=["Agents DB"])
@@ -213,6 +215,7 @@ async def create_agent_db(body: AgentCreate):
         )
         db.add(row)
         await db.commit()
+        notify_agent_changed()
         await db.refresh(row)
         return _row_to_response(row)
 
@@ -238,6 +241,7 @@ async def update_agent_db(agent_id: str, body: AgentUpdate):
         row.app_managed = True
         row.updated_at = datetime.now(timezone.utc)
         await db.commit()
+        notify_agent_changed()
         await db.refresh(row)
         return _row_to_response(row)
 
@@ -256,6 +260,7 @@ async def delete_agent_db(agent_id: str):
             raise HTTPException(404, f"Agent '{agent_id}' not found")
         await db.delete(row)
         await db.commit()
+        notify_agent_changed()
         return {"status": "deleted", "agent_id": agent_id}
 
 
@@ -275,6 +280,7 @@ async def enable_agent(agent_id: str):
         row.status = "idle"
         row.updated_at = datetime.now(timezone.utc)
         await db.commit()
+        notify_agent_changed()
         return {"status": "enabled", "agent_id": agent_id}
 
 
@@ -294,6 +300,7 @@ async def disable_agent(agent_id: str):
         row.status = "disabled"
         row.updated_at = datetime.now(timezone.utc)
         await db.commit()
+        notify_agent_changed()
         return {"status": "disabled", "agent_id": agent_id}
 
 
@@ -335,6 +342,7 @@ async def enable_core_agents():
             enabled_ids.append(row.agent_id)
 
         await db.commit()
+        notify_agent_changed()
         return {
             "status": "enabled_core",
             "enabled_count": len(enabled_ids),
@@ -365,6 +373,7 @@ async def enable_all_agents():
             enabled_ids.append(row.agent_id)
 
         await db.commit()
+        notify_agent_changed()
         return {
             "status": "enabled_all",
             "enabled_count": len(enabled_ids),
@@ -388,6 +397,7 @@ async def sync_agents_from_md(request: Request, force: bool = False):
         from .db import AsyncSessionLocal
 
     stats = await sync_agents_from_markdown(AsyncSessionLocal, force=force)
+    notify_agent_changed()
 
     # Reload the in-memory agent pool so roundtable/swarm see the new state
     pool = getattr(request.app.state, "agent_pool", None)
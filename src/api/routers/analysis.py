@@ -10,10 +10,8 @@ Sentiment endpoints have been extracted to routers/sentiment.py.
 """
 
 import logging
-import os
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
@@ -27,8 +25,6 @@ from db.models import (
 )
 from deps import get_db
 
-LITELLM_URL = os.environ.get("LITELLM_URL", "http://litellm:4000")
-LITELLM_KEY = os.environ.get("LITELLM_MASTER_KEY", "")
 
 logger = logging.getLogger(__name__)
 
@@ -36,18 +32,11 @@ router = APIRouter(prefix="/analysis", tags=["Analysis"])
 
 
 async def _generate_embedding(text: str) -> list[float]:
-    """Generate embedding via LiteLLM embedding endpoint.
-    Falls back to zero-vector if Ollama/LiteLLM is unreachable (timeout 5s).
+    """Generate embedding via the shared (batched, cached) embedding service.
+    Raises if Ollama/LiteLLM is unreachable (timeout 5s).
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{LITELLM_URL}/v1/embeddings",
-            json={"model": "nomic-embed-text", "input": text},
-            headers={"Authorization": f"Bearer {LITELLM_KEY}"},
-            timeout=5,
-        )
-        resp.raise_for_status()
-        return resp.json()["data"][0]["embedding"]
+    from aria_engine.embeddings import get_embedding_service
+    return await get_embedding_service().embed(text, model="nomic-embed-text", timeout=5)
 
 
 
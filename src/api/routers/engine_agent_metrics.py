@@ -13,10 +13,11 @@ from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import select, func, case, cast, Integer, Numeric
+from sqlalchemy import select, func, cast, Numeric
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from aria_engine.config import EngineConfig
+from usage_rollups import aggregate, avg_duration
 
 try:
     from db.models import EngineAgentState, EngineChatMessage, EngineChatSession
@@ -90,52 +91,24 @@ async def _get_db_engine():
 
 
 async def _msg_stats_for_agent(db: AsyncSession, agent_id: str | None = None):
-    """Compute message stats per agent using ORM joins.
+    """Message stats per agent, served from the usage rollups.
 
     Returns dict keyed by agent_id with msg_count, total_tokens, avg_latency_ms, error_count.
     If agent_id is given, filters to that single agent.
     """
-    # Join messages → sessions to get agent_id
-    query = (
-        select(
-            EngineChatSession.agent_id.label("agent_id"),
-            func.count(EngineChatMessage.id).label("msg_count"),
-            func.coalesce(
-                func.sum(
-                    cast(
-                        EngineChatMessage.metadata_json["token_count"].as_string(),
-                        Integer,
-                    )
-                ),
-                0,
-            ).label("total_tokens"),
-            func.coalesce(
-                cast(
-                    func.avg(
-                        cast(
-                            EngineChatMessage.metadata_json["latency_ms"].as_string(),
-                            Integer,
-                        )
-                    ),
-                    Integer,
-                ),
-                0,
-            ).label("avg_latency_ms"),
-            func.count(
-                case(
-                    (EngineChatMessage.metadata_json["error"].as_string().is_not(None), 1),
-                )
-            ).label("error_count"),
-        )
-        .join(EngineChatSession, EngineChatSession.id == EngineChatMessage.session_id)
-        .group_by(EngineChatSession.agent_id)
+    rows = await aggregate(
+        db, "agent_messages", None, group_by=("agent_id",),
+        filters={"agent_id": lambda col: col == agent_id} if agent_id is not None else None,
     )
-
-    if agent_id is not None:
-        query = query.where(EngineChatSession.agent_id == agent_id)
-
-    result = await db.execute(query)
-    return {row.agent_id: row._mapping for row in result.all()}
+    return {
+        row["agent_id"]: {
+            "msg_count": row["events"],
+            "total_tokens": row["tokens"],
+            "avg_latency_ms": round(avg_duration(row)),
+            "error_count": row["failures"],
+        }
+        for row in rows
+    }
 
 
 # ── Endpoints ────────────────────────────────────────────────────────────────
@@ -80,6 +80,11 @@ class CronJobCreate(BaseModel):
         ge=0,
         le=5,
     )
+    priority: str | None = Field(
+        None,
+        description="Queue priority class: critical, high, normal (default) or low",
+        pattern="^(critical|high|normal|low)$",
+    )
 
     @field_validator("schedule")
     @classmethod
@@ -106,6 +111,7 @@ class CronJobUpdate(BaseModel):
     )
     max_duration_seconds: int | None = Field(None, ge=10, le=3600)
     retry_count: int | None = Field(None, ge=0, le=5)
+    priority: str | None = Field(None, pattern="^(critical|high|normal|low)$")
 
     @field_validator("schedule")
     @classmethod
@@ -177,6 +183,10 @@ class SchedulerStatusResponse(BaseModel):
     active_executions: int
     active_job_ids: list[str]
     max_concurrent: int
+    queue: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Job queue depth, wait times, slot utilization and budget use",
+    )
 
 
 class TriggerResponse(BaseModel):
@@ -216,7 +226,14 @@ def get_scheduler() -> EngineScheduler:
             db_url = db_url.replace(prefix, "postgresql+psycopg://", 1)
             break
     db = create_async_engine(db_url, pool_size=5, max_overflow=10)
-    return EngineScheduler(config, db)
+    # Manual triggers run inside this process — use its ChatEngine directly
+    try:
+        from .engine_chat import _chat_engine, _prompt_assembler
+    except ImportError:
+        from routers.engine_chat import _chat_engine, _prompt_assembler
+    return EngineScheduler(
+        config, db, chat_engine=_chat_engine, prompt_assembler=_prompt_assembler,
+    )
 
 
 # ── Endpoints ────────────────────────────────────────────────────────
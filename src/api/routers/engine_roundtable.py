@@ -16,7 +16,7 @@ from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, WebSocket
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy import func, select, delete, and_, or_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, async_sessionmaker
@@ -30,6 +30,7 @@ from db.models import (
     EngineChatMessageArchive,
 )
 from aria_engine.roundtable import Roundtable, RoundtableResult
+from aria_engine.transcript_cache import get_transcript_cache
 
 logger = logging.getLogger("aria.api.engine_roundtable")
 
@@ -51,6 +52,15 @@ class StartRoundtableRequest(BaseModel):
     synthesizer_id: str = Field(default="main", description="Agent ID for final synthesis")
     agent_timeout: int = Field(default=60, ge=10, le=300, description="Seconds per agent")
     total_timeout: int = Field(default=300, ge=30, le=900, description="Max total seconds")
+    quorum: float | None = Field(
+        default=None, gt=0, le=10,
+        description="Answers that close a round: a count (>1) or a fraction of agents (<=1). "
+                    "Unanswered agents carry over to the next round. Default: wait for all",
+    )
+    soft_deadline: float | None = Field(
+        default=None, ge=1, le=300,
+        description="Seconds after which a round closes with the answers it has",
+    )
 
 
 class RoundtableTurnResponse(BaseModel):
@@ -149,6 +159,10 @@ class RoundtableStatusResponse(BaseModel):
     topic: str | None = None
     participants: list[str] = Field(default_factory=list)
     turn_count: int = 0
+    turns: list[RoundtableTurnResponse] = Field(
+        default_factory=list,
+        description="Turns finished so far (while running)",
+    )
     message: str | None = None
 
 
@@ -255,6 +269,13 @@ async def _validate_requested_agents(agent_ids: list[str]) -> None:
 
 # ── Background task runner ───────────────────────────────────────────────────
 
+def _quorum(value: float | None) -> int | float | None:
+    """JSON quorum → Roundtable quorum: fractions stay floats, counts become ints."""
+    if value is None:
+        return None
+    return float(value) if value <= 1 else int(value)
+
+
 async def _run_roundtable_task(
     request: StartRoundtableRequest,
     roundtable: Roundtable,
@@ -265,7 +286,20 @@ async def _run_roundtable_task(
     key = hashlib.sha256(f"{request.topic}:{','.join(request.agent_ids)}".encode()).hexdigest()[:16]
 
     try:
-        _running[key] = {"status": "running", "topic": request.topic, "participants": request.agent_ids}
+        live_turns: list[dict[str, Any]] = []
+        _running[key] = {
+            "status": "running", "topic": request.topic,
+            "participants": request.agent_ids, "turns": live_turns,
+        }
+
+        async def on_turn(turn) -> None:
+            # Visible on GET /status/{key} as soon as each agent answers
+            live_turns.append({
+                "agent_id": turn.agent_id,
+                "round": turn.round_number,
+                "content": turn.content,
+                "duration_ms": turn.duration_ms,
+            })
 
         result = await roundtable.discuss(
             topic=request.topic,
@@ -274,6 +308,9 @@ async def _run_roundtable_task(
             synthesizer_id=request.synthesizer_id,
             agent_timeout=request.agent_timeout,
             total_timeout=request.total_timeout,
+            on_turn=on_turn,
+            quorum=_quorum(request.quorum),
+            soft_deadline=request.soft_deadline,
         )
 
         _completed[result.session_id] = result
@@ -308,6 +345,8 @@ async def start_roundtable(
             synthesizer_id=body.synthesizer_id,
             agent_timeout=body.agent_timeout,
             total_timeout=body.total_timeout,
+            quorum=_quorum(body.quorum),
+            soft_deadline=body.soft_deadline,
         )
 
         _completed[result.session_id] = result
@@ -512,11 +551,14 @@ async def get_roundtable_status(key: str):
     """Check status of an async roundtable started via /async."""
     if key in _running:
         info = _running[key]
+        turns = info.get("turns", [])
         return RoundtableStatusResponse(
             session_id=info.get("session_id", key),
             status=info["status"],
             topic=info.get("topic"),
             participants=info.get("participants", []),
+            turn_count=len(turns),
+            turns=[RoundtableTurnResponse(**t) for t in turns],
             message=info.get("error"),
         )
 
@@ -772,6 +814,7 @@ async def delete_roundtable(session_id: str):
         # Clean up in-memory caches
         _completed.pop(session_id, None)
         _swarm_completed.pop(session_id, None)
+        await get_transcript_cache().invalidate(session_id)
 
         return {"status": "archived", "session_id": session_id}
     except HTTPException:
@@ -823,6 +866,9 @@ class SwarmResponse(BaseModel):
     converged: bool
     total_duration_ms: int
     created_at: str
+    consensus_lower: float = 0.0
+    agent_calls: int = 0
+    total_tokens: int = 0
     votes: list[dict] = Field(default_factory=list)
 
 
@@ -1050,8 +1096,19 @@ async def _handle_roundtable_ws(
     data: dict,
 ) -> None:
     """Run a roundtable with turn-by-turn WS streaming."""
-    rounds = data.get("rounds", 3)
-    synthesizer = data.get("synthesizer_id", "main")
+    # Same bounds as the REST endpoint
+    try:
+        request = StartRoundtableRequest(
+            topic=topic,
+            agent_ids=agent_ids,
+            **{k: data[k] for k in ("rounds", "synthesizer_id", "quorum", "soft_deadline") if k in data},
+        )
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+        )
+        await _ws_send(websocket, {"type": "error", "message": f"Invalid request: {problems}"})
+        return
 
     async def on_turn(turn):
         """Callback fired after each agent turn."""
@@ -1065,11 +1122,13 @@ async def _handle_roundtable_ws(
 
     try:
         result = await _roundtable.discuss(
-            topic=topic,
-            agent_ids=agent_ids,
-            rounds=rounds,
-            synthesizer_id=synthesizer,
+            topic=request.topic,
+            agent_ids=request.agent_ids,
+            rounds=request.rounds,
+            synthesizer_id=request.synthesizer_id,
             on_turn=on_turn,
+            quorum=_quorum(request.quorum),
+            soft_deadline=request.soft_deadline,
         )
         _completed[result.session_id] = result
 
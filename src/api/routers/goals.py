@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import Goal, HourlyGoal
 from deps import get_db
-from pagination import paginate_query, build_paginated_response
+from pagination import build_keyset_response, build_paginated_response, count_total, fetch_page, paginate_query
 from schemas.requests import CreateGoal, UpdateGoal, MoveGoal, CreateHourlyGoal, UpdateHourlyGoal
 
 router = APIRouter(tags=["Goals"])
@@ -64,23 +64,25 @@ async def list_goals(
     page: int = 1,
     limit: int = 25,
     status: str | None = None,
+    cursor: str | None = None,
+    exact_total: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    base = select(Goal).order_by(Goal.priority.desc(), Goal.created_at.desc())
+    base = select(Goal)
     if status:
         # 'active' is a legacy alias — DB stores 'in_progress'
         if status == "active":
             status = "in_progress"
         base = base.where(Goal.status == status)
 
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt, _ = paginate_query(base, page, limit)
-    result = await db.execute(stmt)
-    items = [g.to_dict() for g in result.scalars().all()]
+    total, total_exact = await count_total(db, base, exact=exact_total)
+    rows, next_cursor = await fetch_page(
+        db, base, ((Goal.priority, True), (Goal.created_at, True), (Goal.id, True)),
+        limit=limit, cursor=cursor, page=page,
+    )
+    items = [g.to_dict() for g in rows]
 
-    return build_paginated_response(items, total, page, limit)
+    return build_keyset_response(items, total, limit, next_cursor, page=page, total_exact=total_exact)
 
 
 @router.post("/goals")
@@ -3,23 +3,28 @@ Memories endpoints — CRUD with upsert by key + semantic memory (S5-01).
 """
 
 import asyncio
+import hashlib
 import json as json_lib
 import logging
 import math
 import os
 import re
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import cast, func, or_, select, delete, String
+from sqlalchemy import cast, func, literal, or_, select, delete, String
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.models import Memory, SemanticMemory, WorkingMemory, Thought, LessonLearned
-from deps import get_db
-from pagination import paginate_query, build_paginated_response
+from db.models import Memory, SemanticMemory, SkillGraphEntity, WorkingMemory, Thought, LessonLearned
+from access_tracker import semantic_access
+from db.session import read_only_session
+from deps import get_db, get_read_db
+from pagination import build_keyset_response, count_total, fetch_page
 from schemas.requests import CreateMemory, CreateSemanticMemory, SearchByVector, SummarizeSession, UpdateMemory
+from vector_index import knn_search
 
 # LiteLLM connection for embeddings
 LITELLM_URL = os.environ.get("LITELLM_URL", "http://litellm:4000")
@@ -116,19 +121,21 @@ async def get_memories(
     page: int = 1,
     limit: int = 25,
     category: str = None,
+    cursor: str | None = None,
+    exact_total: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    base = select(Memory).order_by(Memory.updated_at.desc())
+    base = select(Memory)
     if category:
         base = base.where(Memory.category == category)
 
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt, _ = paginate_query(base, page, limit)
-    rows = (await db.execute(stmt)).scalars().all()
+    total, total_exact = await count_total(db, base, exact=exact_total)
+    rows, next_cursor = await fetch_page(
+        db, base, ((Memory.updated_at, True), (Memory.id, True)),
+        limit=limit, cursor=cursor, page=page,
+    )
     items = [m.to_dict() for m in rows]
-    return build_paginated_response(items, total, page, limit)
+    return build_keyset_response(items, total, limit, next_cursor, page=page, total_exact=total_exact)
 
 
 @router.post("/memories")
@@ -164,17 +171,15 @@ async def create_or_update_memory(
 # ===========================================================================
 
 async def generate_embedding(text: str) -> list[float]:
-    """Generate embedding via LiteLLM embedding endpoint."""
-    import httpx
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{LITELLM_URL}/v1/embeddings",
-            json={"model": "nomic-embed-text", "input": text},
-            headers={"Authorization": f"Bearer {LITELLM_KEY}"},
-            timeout=30,
-        )
-        resp.raise_for_status()
-        return resp.json()["data"][0]["embedding"]
+    """Generate embedding via the shared (batched, cached) embedding service."""
+    from aria_engine.embeddings import get_embedding_service
+    return await get_embedding_service().embed(text, model="nomic-embed-text", timeout=30)
+
+
+async def generate_embeddings(texts: list[str]) -> list[list[float]]:
+    """Embed several texts in one batched request (order preserved)."""
+    from aria_engine.embeddings import get_embedding_service
+    return await get_embedding_service().embed_many(texts, model="nomic-embed-text", timeout=30)
 
 
 @router.get("/memories/semantic/stats")
@@ -244,10 +249,12 @@ async def list_semantic_memories(
     limit: int = 50,
     page: int = 1,
     min_importance: float = 0.0,
+    cursor: str | None = None,
+    exact_total: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
     """List semantic memories with optional category/source filter. No embedding query needed."""
-    base = select(SemanticMemory).order_by(SemanticMemory.created_at.desc())
+    base = select(SemanticMemory)
     if category:
         base = base.where(SemanticMemory.category == category)
     if source:
@@ -255,13 +262,13 @@ async def list_semantic_memories(
     if min_importance > 0:
         base = base.where(SemanticMemory.importance >= min_importance)
 
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt, _ = paginate_query(base, page, limit)
-    rows = (await db.execute(stmt)).scalars().all()
+    total, total_exact = await count_total(db, base, exact=exact_total)
+    rows, next_cursor = await fetch_page(
+        db, base, ((SemanticMemory.created_at, True), (SemanticMemory.id, True)),
+        limit=limit, cursor=cursor, page=page,
+    )
     items = [m.to_dict() for m in rows]
-    return build_paginated_response(items, total, page, limit)
+    return build_keyset_response(items, total, limit, next_cursor, page=page, total_exact=total_exact)
 
 
 @router.post("/memories/semantic")
@@ -306,31 +313,31 @@ async def search_memories(
     limit: int = 5,
     category: str = None,
     min_importance: float = 0.0,
-    db: AsyncSession = Depends(get_db),
+    ef_search: int | None = Query(None, ge=1, le=1000, description="HNSW candidate list size"),
+    exact: bool = Query(False, description="Exact scan instead of the HNSW index"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Search memories by semantic similarity using pgvector cosine distance."""
+    """
+    Search memories by semantic similarity using pgvector cosine distance.
+
+    Read-only: access stats are recorded in the access tracker and
+    written in batches off the request path.
+    """
     try:
         query_embedding = await generate_embedding(query)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Embedding generation failed: {e}")
 
-    distance_col = SemanticMemory.embedding.cosine_distance(query_embedding).label("distance")
-    stmt = select(SemanticMemory, distance_col).order_by("distance").limit(limit)
-
-    if category:
-        stmt = stmt.where(SemanticMemory.category == category)
-    if min_importance > 0:
-        stmt = stmt.where(SemanticMemory.importance >= min_importance)
-
-    result = await db.execute(stmt)
+    rows = await knn_search(
+        db, query_embedding, limit, category=category,
+        min_importance=min_importance, ef_search=ef_search, exact=exact,
+    )
     memories = []
-    for mem, dist in result.all():
-        mem.accessed_at = func.now()
-        mem.access_count += 1
+    for mem, dist in rows:
         d = mem.to_dict()
         d["similarity"] = round(1 - dist, 4)
         memories.append(d)
-    await db.commit()
+    semantic_access.record(mem.id for mem, _ in rows)
     return {"memories": memories, "query": query}
 
 
@@ -346,21 +353,12 @@ async def search_memories_by_vector(
     """
     embedding = body.embedding
 
-    category = body.category
-    limit = body.limit
-    min_importance = body.min_importance
-
-    distance_col = SemanticMemory.embedding.cosine_distance(embedding).label("distance")
-    stmt = select(SemanticMemory, distance_col).order_by("distance").limit(limit)
-
-    if category:
-        stmt = stmt.where(SemanticMemory.category == category)
-    if min_importance > 0:
-        stmt = stmt.where(SemanticMemory.importance >= min_importance)
-
-    result = await db.execute(stmt)
+    rows = await knn_search(
+        db, embedding, body.limit, category=body.category,
+        min_importance=body.min_importance, ef_search=body.ef_search, exact=body.exact,
+    )
     memories = []
-    for mem, dist in result.all():
+    for mem, dist in rows:
         d = mem.to_dict()
         d["similarity"] = 0.0 if (dist is None or math.isnan(dist)) else round(1 - dist, 4)
         memories.append(d)
@@ -368,6 +366,229 @@ async def search_memories_by_vector(
     return {"memories": memories, "count": len(memories)}
 
 
+# ===========================================================================
+# Hybrid search — one round-trip for UnifiedSearchSkill
+# ===========================================================================
+
+HYBRID_BACKENDS = ("semantic", "text", "graph", "memory")
+HYBRID_DEFAULT_WEIGHTS = {"semantic": 1.0, "text": 0.8, "graph": 0.8, "memory": 0.6}
+
+
+def _hybrid_item(content: str, score: float, source: str, *, category: str = "",
+                 importance: float = 0.0, metadata: dict | None = None, id: str = "") -> dict:
+    return {
+        "content": content,
+        "score": score,
+        "source": source,
+        "category": category or "",
+        "importance": float(importance or 0.0),
+        "metadata": metadata or {},
+        "id": id,
+    }
+
+
+async def _hybrid_semantic(embedding: list[float], limit: int, category: str | None,
+                           min_importance: float, ef_search: int | None) -> list[dict]:
+    """pgvector cosine ranking (records access stats like /memories/search)."""
+    async with read_only_session() as db:
+        rows = await knn_search(
+            db, embedding, limit, category=category,
+            min_importance=min_importance, ef_search=ef_search,
+        )
+        items = []
+        for mem, dist in rows:
+            similarity = 0.0 if (dist is None or math.isnan(dist)) else round(1 - dist, 4)
+            items.append(_hybrid_item(
+                mem.content or "", similarity, "semantic", category=mem.category,
+                importance=mem.importance, metadata=mem.metadata_json, id=str(mem.id),
+            ))
+        semantic_access.record(mem.id for mem, _ in rows)
+        return items
+
+
+async def _hybrid_text(query: str, limit: int, category: str | None,
+                       min_importance: float) -> list[dict]:
+    """Trigram ranking over semantic memory content (substring or fuzzy word match)."""
+    async with read_only_session() as db:
+        rank = func.word_similarity(query, SemanticMemory.content).label("rank")
+        stmt = (
+            select(SemanticMemory, rank)
+            .where(or_(
+                SemanticMemory.content.ilike(f"%{query}%"),
+                literal(query).op("<%")(SemanticMemory.content),
+            ))
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+        if category:
+            stmt = stmt.where(SemanticMemory.category == category)
+        if min_importance > 0:
+            stmt = stmt.where(SemanticMemory.importance >= min_importance)
+        return [
+            _hybrid_item(
+                mem.content or "", round(float(score or 0.0), 4), "text", category=mem.category,
+                importance=mem.importance, metadata=mem.metadata_json, id=str(mem.id),
+            )
+            for mem, score in (await db.execute(stmt)).all()
+        ]
+
+
+async def _hybrid_graph(query: str, limit: int) -> list[dict]:
+    """Skill-graph entities by name/description, closest names first."""
+    async with read_only_session() as db:
+        description = SkillGraphEntity.properties["description"].astext
+        pattern = f"%{query}%"
+        rank = func.similarity(SkillGraphEntity.name, query).label("rank")
+        stmt = (
+            select(SkillGraphEntity, rank)
+            .where(or_(SkillGraphEntity.name.ilike(pattern), description.ilike(pattern)))
+            .order_by(rank.desc(), SkillGraphEntity.name)
+            .limit(limit)
+        )
+        items = []
+        for entity, score in (await db.execute(stmt)).all():
+            props = entity.properties or {}
+            desc = props.get("description", "")
+            items.append(_hybrid_item(
+                f"{entity.name}: {desc}" if desc else entity.name,
+                round(float(score or 0.0), 4), "graph", category=entity.type,
+                metadata={"type": entity.type, "properties": props}, id=str(entity.id),
+            ))
+        return items
+
+
+async def _hybrid_memory(query: str, limit: int, category: str | None) -> list[dict]:
+    """Key-value memories whose key or value contains the query."""
+    async with read_only_session() as db:
+        value_text = cast(Memory.value, String)
+        pattern = f"%{query}%"
+        rank = func.greatest(
+            func.similarity(Memory.key, query), func.word_similarity(query, value_text),
+        ).label("rank")
+        stmt = (
+            select(Memory, rank)
+            .where(or_(Memory.key.ilike(pattern), value_text.ilike(pattern)))
+            .order_by(rank.desc(), Memory.updated_at.desc())
+            .limit(limit)
+        )
+        if category:
+            stmt = stmt.where(Memory.category == category)
+        items = []
+        for mem, score in (await db.execute(stmt)).all():
+            value = mem.value
+            content = value if isinstance(value, str) else json_lib.dumps(value, default=str)
+            items.append(_hybrid_item(
+                f"{mem.key}: {content}", round(float(score or 0.0), 4), "memory",
+                category=mem.category, metadata={"key": mem.key}, id=str(mem.id),
+            ))
+        return items
+
+
+def _rrf_fuse(ranked: dict[str, list[dict]], weights: dict[str, float], k: int,
+              limit: int) -> list[dict]:
+    """
+    Weighted Reciprocal Rank Fusion, deduplicated by content hash.
+
+    Same scoring and dedup key as aria_skills.unified_search.RRFMerger.
+    """
+    fused: dict[str, dict] = {}
+    for backend in HYBRID_BACKENDS:
+        w = weights.get(backend, 0.5)
+        for rank_idx, item in enumerate(ranked.get(backend, [])):
+            h = hashlib.md5(item["content"].encode()).hexdigest()[:12]
+            entry = fused.get(h)
+            if entry is None:
+                entry = fused[h] = {"item": item, "rrf": 0.0, "sources": []}
+            elif item["score"] > entry["item"]["score"]:
+                entry["item"] = item
+            entry["rrf"] += w / (k + rank_idx + 1)
+            if backend not in entry["sources"]:
+                entry["sources"].append(backend)
+
+    results = []
+    for entry in sorted(fused.values(), key=lambda e: e["rrf"], reverse=True)[:limit]:
+        item = dict(entry["item"])
+        item["score"] = round(entry["rrf"], 6)
+        if len(entry["sources"]) > 1:
+            item["metadata"] = {**item["metadata"], "sources": entry["sources"]}
+            item["source"] = "+".join(entry["sources"])
+        results.append(item)
+    return results
+
+
+@router.get("/memories/hybrid-search")
+async def hybrid_search(
+    query: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    category: str | None = None,
+    min_importance: float = 0.0,
+    backends: str = Query(",".join(HYBRID_BACKENDS), description="Comma-separated: semantic,text,graph,memory"),
+    k: int = Query(60, ge=1, le=1000),
+    w_semantic: float = HYBRID_DEFAULT_WEIGHTS["semantic"],
+    w_text: float = HYBRID_DEFAULT_WEIGHTS["text"],
+    w_graph: float = HYBRID_DEFAULT_WEIGHTS["graph"],
+    w_memory: float = HYBRID_DEFAULT_WEIGHTS["memory"],
+    ef_search: int | None = Query(None, ge=1, le=1000, description="HNSW candidate list size"),
+):
+    """
+    Fused hybrid search: the query is embedded once, then the pgvector,
+    trigram, skill-graph and key-value lookups run concurrently (one
+    read-only connection each) and are merged with weighted RRF
+    server-side.
+
+    A failing backend is reported in ``errors`` and left out of the merge.
+    """
+    start = time.monotonic()
+    wanted = [b for b in HYBRID_BACKENDS if b in {x.strip() for x in backends.split(",")}]
+    weights = {"semantic": w_semantic, "text": w_text, "graph": w_graph, "memory": w_memory}
+    errors: dict[str, str] = {}
+    latency: dict[str, float] = {}
+
+    async def timed(name: str, coro) -> list[dict]:
+        t0 = time.monotonic()
+        try:
+            return await coro
+        finally:
+            latency[name] = round((time.monotonic() - t0) * 1000, 1)
+
+    calls = {}
+    if "semantic" in wanted:
+        try:
+            embedding = await timed("embedding", generate_embedding(query))
+            calls["semantic"] = _hybrid_semantic(embedding, limit, category, min_importance, ef_search)
+        except Exception as e:
+            errors["semantic"] = f"Embedding generation failed: {e}"
+    if "text" in wanted:
+        calls["text"] = _hybrid_text(query, limit, category, min_importance)
+    if "graph" in wanted:
+        calls["graph"] = _hybrid_graph(query, limit)
+    if "memory" in wanted:
+        calls["memory"] = _hybrid_memory(query, limit, category)
+
+    outcomes = await asyncio.gather(
+        *(timed(name, coro) for name, coro in calls.items()), return_exceptions=True,
+    )
+    ranked: dict[str, list[dict]] = {}
+    for name, outcome in zip(calls, outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning("hybrid-search backend %s failed: %s", name, outcome)
+            errors[name] = str(outcome)
+        else:
+            ranked[name] = outcome
+
+    results = _rrf_fuse(ranked, weights, k, limit)
+    return {
+        "query": query,
+        "results": results,
+        "total_results": len(results),
+        "backends_used": list(ranked),
+        "backend_counts": {name: len(items) for name, items in ranked.items()},
+        "backend_latency_ms": latency,
+        "errors": errors,
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+    }
+
+
 @router.post("/memories/summarize-session")
 async def summarize_session(
     body: SummarizeSession,
@@ -441,6 +662,13 @@ async def summarize_session(
 
     # Store episodic summary as semantic memory
     stored_ids = []
+    try:
+        # Warm the embedding cache in one round-trip for summary + decisions
+        await generate_embeddings(
+            [summary_text] + [d for d in decisions if isinstance(d, str) and d.strip()]
+        )
+    except Exception as e:
+        logger.debug("Batched embedding prefetch failed (per-item fallback): %s", e)
     try:
         emb = await generate_embedding(summary_text)
         mem = SemanticMemory(
@@ -797,6 +1025,7 @@ async def unified_memory_search(
     query: str = Query(..., min_length=1, max_length=500),
     limit: int = Query(10, ge=1, le=50),
     types: str = Query("all", description="Comma-separated: semantic,kv,working,thought,lesson"),
+    ef_search: int | None = Query(None, ge=1, le=1000, description="HNSW candidate list size"),
     db: AsyncSession = Depends(get_db),
 ):
     """Unified search across all memory types."""
@@ -812,18 +1041,7 @@ async def unified_memory_search(
         try:
             embedding = await generate_embedding(query)
             if embedding:
-                from pgvector.sqlalchemy import Vector
-                stmt = (
-                    select(
-                        SemanticMemory,
-                        SemanticMemory.embedding.cosine_distance(embedding).label("distance"),
-                    )
-                    .where(SemanticMemory.embedding.isnot(None))
-                    .order_by("distance")
-                    .limit(limit)
-                )
-                result = await db.execute(stmt)
-                for row in result.all():
+                for row in await knn_search(db, embedding, limit, ef_search=ef_search):
                     mem = row[0]
                     similarity = max(0.0, 1 - float(row[1]))
                     results.append({
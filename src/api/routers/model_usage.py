@@ -17,6 +17,7 @@ from db.models import ModelUsage
 from deps import get_db
 from pagination import build_paginated_response
 from schemas.requests import CreateModelUsage
+from usage_rollups import aggregate, avg_duration, regroup, total
 
 router = APIRouter(tags=["Model Usage"])
 logger = logging.getLogger("aria.api.model_usage")
@@ -100,6 +101,7 @@ async def get_model_usage(
             "latency_ms": r.latency_ms,
             "success": r.success,
             "error_message": r.error_message,
+            "cache_hit": bool(r.cache_hit),
             "session_id": str(r.session_id) if r.session_id else None,
             "created_at": r.created_at.isoformat() if r.created_at else None,
             "source": "engine",
@@ -132,80 +134,56 @@ async def get_model_usage_stats(
     hours: int = 24,
     db: AsyncSession = Depends(get_db),
 ):
-    """Aggregate stats from aria_data.model_usage.  hours=0 → all time."""
-    if hours > 0:
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-        window_filter = and_(ModelUsage.created_at > cutoff, _db_non_test_usage_filter())
-    else:
-        window_filter = _db_non_test_usage_filter()
-
-    # Aggregate totals
-    agg_result = await db.execute(
-        select(
-            func.count(ModelUsage.id).label("total_requests"),
-            func.coalesce(func.sum(ModelUsage.input_tokens + ModelUsage.output_tokens), 0).label("total_tokens"),
-            func.coalesce(func.sum(ModelUsage.input_tokens), 0).label("input_tokens"),
-            func.coalesce(func.sum(ModelUsage.output_tokens), 0).label("output_tokens"),
-            func.coalesce(func.sum(ModelUsage.cost_usd), 0).label("total_cost"),
-            func.coalesce(func.avg(ModelUsage.latency_ms), 0).label("avg_latency"),
-        ).where(window_filter)
-    )
-    agg = agg_result.one()
-
-    total_requests = int(agg.total_requests)
-    total_tokens = int(agg.total_tokens)
-    total_cost = float(agg.total_cost)
-    avg_latency = int(agg.avg_latency)
-
-    # Success rate
-    success_count = (
-        await db.execute(
-            select(func.count(ModelUsage.id))
-            .where(window_filter)
-            .where(ModelUsage.success.is_(True))
-        )
-    ).scalar() or 0
+    """Aggregate stats from aria_data.model_usage (via usage rollups).  hours=0 → all time."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours) if hours > 0 else None
+    rows = await aggregate(db, "model_usage", cutoff, group_by=("model", "provider", "cache_hit"))
+    # Response-cache hits log the tokens/cost they *saved* — report them
+    # in their own block instead of as spend.
+    spend_rows = [r for r in rows if r["cache_hit"] != "1"]
+    agg = total(spend_rows)
+    cache_agg = total(r for r in rows if r["cache_hit"] == "1")
+
+    total_requests = int(agg["events"])
+    total_tokens = int(agg["tokens"])
+    total_cost = float(agg["cost_usd"])
+    avg_latency = int(avg_duration(agg))
+
+    success_count = int(agg["successes"])
     success_rate = round(success_count / total_requests * 100, 1) if total_requests > 0 else 100
 
-    # Per-model breakdown
-    by_model_result = await db.execute(
-        select(
-            ModelUsage.model,
-            ModelUsage.provider,
-            func.count(ModelUsage.id).label("requests"),
-            func.coalesce(func.sum(ModelUsage.input_tokens), 0).label("input_tokens"),
-            func.coalesce(func.sum(ModelUsage.output_tokens), 0).label("output_tokens"),
-            func.coalesce(func.sum(ModelUsage.cost_usd), 0).label("cost"),
-            func.coalesce(func.avg(ModelUsage.latency_ms), 0).label("avg_latency"),
-        )
-        .where(window_filter)
-        .group_by(ModelUsage.model, ModelUsage.provider)
-        .order_by(func.count(ModelUsage.id).desc())
-    )
+    cache_hits = int(cache_agg["events"])
+    cache_lookups = cache_hits + success_count
+
     by_model_list = [
         {
-            "model": r[0],
-            "provider": r[1],
-            "requests": r[2],
-            "input_tokens": r[3],
-            "output_tokens": r[4],
-            "cost": float(r[5]),
-            "avg_latency": int(r[6]),
+            "model": r["model"],
+            "provider": r["provider"] or None,
+            "requests": int(r["events"]),
+            "input_tokens": int(r["input_tokens"]),
+            "output_tokens": int(r["output_tokens"]),
+            "cost": float(r["cost_usd"]),
+            "avg_latency": int(avg_duration(r)),
             "source": "engine",
         }
-        for r in by_model_result.all()
+        for r in regroup(spend_rows, ("model", "provider"))
     ]
 
     return {
         "period_hours": hours,
         "total_requests": total_requests,
         "total_tokens": total_tokens,
-        "input_tokens": int(agg.input_tokens),
-        "output_tokens": int(agg.output_tokens),
+        "input_tokens": int(agg["input_tokens"]),
+        "output_tokens": int(agg["output_tokens"]),
         "total_cost": total_cost,
         "avg_latency_ms": avg_latency,
         "success_rate": success_rate,
         "by_model": by_model_list,
+        "cache": {
+            "hits": cache_hits,
+            "hit_rate": round(cache_hits / cache_lookups * 100, 1) if cache_lookups > 0 else 0,
+            "saved_tokens": int(cache_agg["tokens"]),
+            "saved_cost": float(cache_agg["cost_usd"]),
+        },
         "sources": {
             "engine": {
                 "requests": total_requests,
@@ -17,7 +17,6 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy import delete, func, select
@@ -33,8 +32,6 @@ from db.models import (
 from deps import get_db
 from schemas.requests import SentimentFeedback
 
-LITELLM_URL = os.environ.get("LITELLM_URL", "http://litellm:4000")
-LITELLM_KEY = os.environ.get("LITELLM_MASTER_KEY", "")
 
 logger = logging.getLogger(__name__)
 
@@ -57,18 +54,11 @@ _TRANSCRIPT_TIME_RE = re.compile(
 
 
 async def _generate_embedding(text: str) -> list[float]:
-    """Generate embedding via LiteLLM embedding endpoint.
-    Falls back to zero-vector if Ollama/LiteLLM is unreachable (timeout 5s).
+    """Generate embedding via the shared (batched, cached) embedding service.
+    Raises if Ollama/LiteLLM is unreachable (timeout 5s).
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{LITELLM_URL}/v1/embeddings",
-            json={"model": "nomic-embed-text", "input": text},
-            headers={"Authorization": f"Bearer {LITELLM_KEY}"},
-            timeout=5,
-        )
-        resp.raise_for_status()
-        return resp.json()["data"][0]["embedding"]
+    from aria_engine.embeddings import get_embedding_service
+    return await get_embedding_service().embed(text, model="nomic-embed-text", timeout=5)
 
 
 def _sentiment_label_from_valence(valence: float) -> str:
@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import AgentSession, EngineChatSession, ModelUsage
 from deps import get_db, get_litellm_db
-from pagination import paginate_query, build_paginated_response
+from pagination import build_keyset_response, count_total, fetch_page
 from schemas.requests import CreateSession, UpdateSession
 
 logger = logging.getLogger(__name__)
@@ -34,10 +34,12 @@ async def get_agent_sessions(
     search: str | None = None,
     include_runtime_events: bool = False,
     include_cron_events: bool = False,
+    cursor: str | None = None,
+    exact_total: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
     """List engine chat sessions with filtering, search, and pagination."""
-    base = select(EngineChatSession).order_by(EngineChatSession.updated_at.desc())
+    base = select(EngineChatSession)
 
     if not include_runtime_events:
         base = base.where(EngineChatSession.session_type != "skill_exec")
@@ -58,14 +60,14 @@ async def get_agent_sessions(
             )
         )
 
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt, _ = paginate_query(base, page, limit)
-    rows = (await db.execute(stmt)).scalars().all()
+    total, total_exact = await count_total(db, base, exact=exact_total)
+    rows, next_cursor = await fetch_page(
+        db, base, ((EngineChatSession.updated_at, True), (EngineChatSession.id, True)),
+        limit=limit, cursor=cursor, page=page,
+    )
 
     items = [_engine_session_to_dict(s) for s in rows]
-    return build_paginated_response(items, total, page, limit)
+    return build_keyset_response(items, total, limit, next_cursor, page=page, total_exact=total_exact)
 
 
 # -- Hourly breakdown --------------------------------------------------------
@@ -8,13 +8,14 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func, case, text
+from sqlalchemy import select, func, case
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import SkillStatusRecord, SkillInvocation, KnowledgeQueryLog
 from deps import get_db
 from schemas.requests import CreateSkillInvocation
+from usage_rollups import aggregate, avg_duration, invalidate, regroup, total as rollup_total
 
 router = APIRouter(tags=["Skills"])
 logger = logging.getLogger("aria.api.skills")
@@ -275,6 +276,8 @@ async def purge_test_invocations(db: AsyncSession = Depends(get_db)):
     stmt = sa_delete(SkillInvocation).where(or_(*patterns))
     result = await db.execute(stmt)
     await db.commit()
+    if result.rowcount:
+        await invalidate(db, "skills")
     return {"purged": result.rowcount, "patterns": ["embedding-lookup-%", "etl-transform-%"]}
 
 
@@ -282,32 +285,18 @@ async def purge_test_invocations(db: AsyncSession = Depends(get_db)):
 async def skill_stats(hours: int = 24, db: AsyncSession = Depends(get_db)):
     """Skill performance stats for the last N hours."""
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-
-    stmt = (
-        select(
-            SkillInvocation.skill_name,
-            func.count().label("total"),
-            func.avg(SkillInvocation.duration_ms).label("avg_duration_ms"),
-            func.sum(case((SkillInvocation.success == True, 1), else_=0)).label("successes"),
-            func.sum(case((SkillInvocation.success == False, 1), else_=0)).label("failures"),
-            func.sum(SkillInvocation.tokens_used).label("total_tokens"),
-        )
-        .where(SkillInvocation.created_at >= cutoff)
-        .group_by(SkillInvocation.skill_name)
-        .order_by(func.count().desc())
-    )
-    result = await db.execute(stmt)
+    rows = await aggregate(db, "skills", cutoff, group_by=("skill_name",))
     stats = []
-    for row in result.all():
-        total = row.total or 1
+    for row in rows:
+        total = row["events"] or 1
         stats.append({
-            "skill_name": row.skill_name,
-            "total": row.total,
-            "avg_duration_ms": round(float(row.avg_duration_ms or 0), 1),
-            "successes": row.successes or 0,
-            "failures": row.failures or 0,
-            "error_rate": round((row.failures or 0) / total, 3),
-            "total_tokens": row.total_tokens or 0,
+            "skill_name": row["skill_name"],
+            "total": row["events"],
+            "avg_duration_ms": round(avg_duration(row), 1),
+            "successes": row["successes"],
+            "failures": row["failures"],
+            "error_rate": round(row["failures"] / total, 3),
+            "total_tokens": row["tokens"],
         })
     return {"stats": stats, "hours": hours}
 
@@ -316,38 +305,20 @@ async def skill_stats(hours: int = 24, db: AsyncSession = Depends(get_db)):
 async def skill_stats_summary(hours: int = 24, db: AsyncSession = Depends(get_db)):
     """Compact aggregate summary for skills telemetry widgets."""
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    rows = await aggregate(db, "skills", cutoff, group_by=("skill_name",))
+    summary = rollup_total(rows)
 
-    summary_row = (
-        await db.execute(
-            select(
-                func.count().label("total"),
-                func.sum(case((SkillInvocation.success == False, 1), else_=0)).label("failures"),
-                func.avg(SkillInvocation.duration_ms).label("avg_duration_ms"),
-            ).where(SkillInvocation.created_at >= cutoff)
-        )
-    ).one()
-
-    recent = (
-        await db.execute(
-            select(SkillInvocation.skill_name, func.count().label("count"))
-            .where(SkillInvocation.created_at >= cutoff)
-            .group_by(SkillInvocation.skill_name)
-            .order_by(func.count().desc())
-            .limit(10)
-        )
-    ).all()
-
-    total = int(summary_row.total or 0)
-    failures = int(summary_row.failures or 0)
+    total = int(summary["events"])
+    failures = int(summary["failures"])
     return {
         "hours": hours,
         "total": total,
         "failures": failures,
         "error_rate": round((failures / max(total, 1)), 3),
-        "avg_duration_ms": round(float(summary_row.avg_duration_ms or 0), 1),
+        "avg_duration_ms": round(avg_duration(summary), 1),
         "invocations": [
-            {"skill_name": row.skill_name, "count": int(row.count or 0)}
-            for row in recent
+            {"skill_name": row["skill_name"], "count": int(row["events"])}
+            for row in rows[:10]
         ],
     }
 
@@ -396,107 +367,52 @@ async def skills_insights(
     safe_limit = max(10, min(limit, 500))
     cutoff = datetime.now(timezone.utc) - timedelta(hours=safe_hours)
 
-    # Headline metrics
-    totals_row = (
-        await db.execute(
-            select(
-                func.count().label("total"),
-                func.sum(case((SkillInvocation.success == True, 1), else_=0)).label("successes"),
-                func.sum(case((SkillInvocation.success == False, 1), else_=0)).label("failures"),
-                func.avg(SkillInvocation.duration_ms).label("avg_duration_ms"),
-                func.coalesce(func.sum(SkillInvocation.tokens_used), 0).label("total_tokens"),
-                func.count(func.distinct(SkillInvocation.skill_name)).label("unique_skills"),
-                func.count(func.distinct(SkillInvocation.tool_name)).label("unique_tools"),
-            ).where(SkillInvocation.created_at >= cutoff)
-        )
-    ).one()
+    # Headline metrics, skill / tool breakdowns (one rollup read)
+    pair_rows = await aggregate(db, "skills", cutoff, group_by=("skill_name", "tool_name"))
+    totals = rollup_total(pair_rows)
 
-    total_invocations = int(totals_row.total or 0)
-    failures = int(totals_row.failures or 0)
-    successes = int(totals_row.successes or 0)
+    total_invocations = int(totals["events"])
+    failures = int(totals["failures"])
+    successes = int(totals["successes"])
     success_rate = round((successes / max(total_invocations, 1)) * 100, 1)
 
     # Skill-level breakdown
-    skill_rows = (
-        await db.execute(
-            select(
-                SkillInvocation.skill_name,
-                func.count().label("invocations"),
-                func.avg(SkillInvocation.duration_ms).label("avg_duration_ms"),
-                func.sum(case((SkillInvocation.success == True, 1), else_=0)).label("successes"),
-                func.sum(case((SkillInvocation.success == False, 1), else_=0)).label("failures"),
-                func.coalesce(func.sum(SkillInvocation.tokens_used), 0).label("tokens"),
-            )
-            .where(SkillInvocation.created_at >= cutoff)
-            .group_by(SkillInvocation.skill_name)
-            .order_by(func.count().desc())
-        )
-    ).all()
-
     by_skill = []
-    for row in skill_rows:
-        invocations = int(row.invocations or 0)
-        row_failures = int(row.failures or 0)
+    for row in regroup(pair_rows, ("skill_name",)):
+        invocations = int(row["events"])
+        row_failures = int(row["failures"])
         by_skill.append({
-            "skill_name": row.skill_name,
+            "skill_name": row["skill_name"],
             "invocations": invocations,
-            "avg_duration_ms": round(float(row.avg_duration_ms or 0), 1),
-            "successes": int(row.successes or 0),
+            "avg_duration_ms": round(avg_duration(row), 1),
+            "successes": int(row["successes"]),
             "failures": row_failures,
             "error_rate": round((row_failures / max(invocations, 1)) * 100, 1),
-            "total_tokens": int(row.tokens or 0),
+            "total_tokens": int(row["tokens"]),
         })
 
     # Tool-level breakdown
-    tool_rows = (
-        await db.execute(
-            select(
-                SkillInvocation.tool_name,
-                func.count().label("invocations"),
-                func.avg(SkillInvocation.duration_ms).label("avg_duration_ms"),
-                func.sum(case((SkillInvocation.success == False, 1), else_=0)).label("failures"),
-            )
-            .where(SkillInvocation.created_at >= cutoff)
-            .group_by(SkillInvocation.tool_name)
-            .order_by(func.count().desc())
-            .limit(20)
-        )
-    ).all()
-
+    tool_rows = regroup(pair_rows, ("tool_name",))
     by_tool = [
         {
-            "tool_name": row.tool_name,
-            "invocations": int(row.invocations or 0),
-            "avg_duration_ms": round(float(row.avg_duration_ms or 0), 1),
-            "error_rate": round((int(row.failures or 0) / max(int(row.invocations or 0), 1)) * 100, 1),
+            "tool_name": row["tool_name"],
+            "invocations": int(row["events"]),
+            "avg_duration_ms": round(avg_duration(row), 1),
+            "error_rate": round((int(row["failures"]) / max(int(row["events"]), 1)) * 100, 1),
         }
-        for row in tool_rows
+        for row in tool_rows[:20]
     ]
 
     # Timeline (hourly)
-    timeline_bucket = func.date_trunc("hour", SkillInvocation.created_at)
-    timeline_rows = (
-        await db.execute(
-            select(
-                timeline_bucket.label("bucket"),
-                func.count().label("invocations"),
-                func.avg(SkillInvocation.duration_ms).label("avg_duration_ms"),
-                func.sum(case((SkillInvocation.success == False, 1), else_=0)).label("failures"),
-            )
-            .where(SkillInvocation.created_at >= cutoff)
-            .group_by(timeline_bucket)
-            .order_by(text("1"))
-        )
-    ).all()
-
+    hourly_rows = await aggregate(db, "skills", cutoff, group_by=("hour",))
     timeline = [
         {
-            "hour": row.bucket.isoformat() if row.bucket else None,
-            "invocations": int(row.invocations or 0),
-            "avg_duration_ms": round(float(row.avg_duration_ms or 0), 1),
-            "error_rate": round((int(row.failures or 0) / max(int(row.invocations or 0), 1)) * 100, 1),
+            "hour": row["hour"].isoformat() if row["hour"] else None,
+            "invocations": int(row["events"]),
+            "avg_duration_ms": round(avg_duration(row), 1),
+            "error_rate": round((int(row["failures"]) / max(int(row["events"]), 1)) * 100, 1),
         }
-        for row in timeline_rows
+        for row in sorted(hourly_rows, key=lambda r: r["hour"])
     ]
 
     # Recent skill executions
@@ -551,10 +467,10 @@ async def skills_insights(
         "summary": {
             "total_invocations": total_invocations,
             "success_rate": success_rate,
-            "avg_duration_ms": round(float(totals_row.avg_duration_ms or 0), 1),
-            "total_tokens": int(totals_row.total_tokens or 0),
-            "unique_skills": int(totals_row.unique_skills or 0),
-            "unique_tools": int(totals_row.unique_tools or 0),
+            "avg_duration_ms": round(avg_duration(totals), 1),
+            "total_tokens": int(totals["tokens"]),
+            "unique_skills": len(by_skill),
+            "unique_tools": len(tool_rows),
             "failures": failures,
         },
         "by_skill": by_skill,
@@ -7,12 +7,12 @@ import logging
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import Thought
 from deps import get_db
-from pagination import paginate_query, build_paginated_response
+from pagination import build_keyset_response, count_total, fetch_page
 from schemas.requests import CreateThought as CreateThoughtBody, UpdateThought
 
 router = APIRouter(tags=["Thoughts"])
@@ -20,14 +20,20 @@ logger = logging.getLogger("aria.api.thoughts")
 
 
 @router.get("/thoughts")
-async def api_thoughts(page: int = 1, limit: int = 25, db: AsyncSession = Depends(get_db)):
-    base = select(Thought).order_by(Thought.created_at.desc())
+async def api_thoughts(
+    page: int = 1,
+    limit: int = 25,
+    cursor: str | None = None,
+    exact_total: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    base = select(Thought)
 
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt, _ = paginate_query(base, page, limit)
-    rows = (await db.execute(stmt)).scalars().all()
+    total, total_exact = await count_total(db, base, exact=exact_total)
+    rows, next_cursor = await fetch_page(
+        db, base, ((Thought.created_at, True), (Thought.id, True)),
+        limit=limit, cursor=cursor, page=page,
+    )
     items = [
         {
             "id": str(t.id),
@@ -37,7 +43,7 @@ async def api_thoughts(page: int = 1, limit: int = 25, db: AsyncSession = Depend
         }
         for t in rows
     ]
-    return build_paginated_response(items, total, page, limit)
+    return build_keyset_response(items, total, limit, next_cursor, page=page, total_exact=total_exact)
 
 
 @router.post("/thoughts")
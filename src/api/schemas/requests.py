@@ -108,6 +108,8 @@ class SearchByVector(BaseModel):
     category: str | None = None
     limit: int = 7
     min_importance: float = 0.0
+    ef_search: int | None = Field(None, ge=1, le=1000)
+    exact: bool = False
 
 
 class SummarizeSession(BaseModel):
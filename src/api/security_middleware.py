@@ -28,6 +28,9 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+from aria_engine.pattern_scan import PatternScanner, iter_json_strings
+from aria_engine.rate_limit import RateLimitStore, SlidingWindowLimiter, Window
+
 logger = logging.getLogger("aria.security.middleware")
 
 
@@ -87,58 +90,73 @@ SENSITIVE_FIELDS = {"password", "api_key", "token", "secret", "authorization", "
 # =============================================================================
 
 class RateLimiter:
-    """Simple in-memory rate limiter."""
-    
+    """Per-client burst / minute / hour limiter (bucketed sliding windows).
+
+    Counts live in a pluggable store (aria_engine.rate_limit): per-worker
+    memory by default, or PostgresStore so limits hold across workers.
+    """
+
+    # Violated window → (reason, block seconds)
+    _BLOCKS = {
+        "burst": ("burst_exceeded", 15),  # Short block for bursts
+        "minute": ("rpm_exceeded", 30),
+        "hour": ("rph_exceeded", 300),
+    }
+
     def __init__(
         self,
         requests_per_minute: int = 60,
         requests_per_hour: int = 500,
         burst_limit: int = 10,
+        store: RateLimitStore | None = None,
     ):
         self.rpm = requests_per_minute
         self.rph = requests_per_hour
         self.burst = burst_limit
-        self._requests: dict[str, list[float]] = defaultdict(list)
+        self._limiter = SlidingWindowLimiter(
+            [
+                Window("burst", 5, burst_limit),
+                Window("minute", 60, requests_per_minute),
+                Window("hour", 3600, requests_per_hour),
+            ],
+            store=store,
+        )
         self._blocked: dict[str, float] = {}
-    
+
     def is_allowed(self, identifier: str) -> tuple[bool, str | None]:
-        """Check if request is allowed."""
+        """Check if request is allowed (in-memory store only)."""
         now = time.time()
-        
-        # Check if blocked
-        if identifier in self._blocked:
-            if now < self._blocked[identifier]:
-                return False, "rate_limited"
-            del self._blocked[identifier]
-        
-        # Clean old entries
-        cutoff_hour = now - 3600
-        self._requests[identifier] = [
-            ts for ts in self._requests[identifier] if ts > cutoff_hour
-        ]
-        
-        requests = self._requests[identifier]
-        
-        # Check burst (5 seconds)
-        burst_count = sum(1 for ts in requests if ts > now - 5)
-        if burst_count >= self.burst:
-            self._blocked[identifier] = now + 15  # Short block for bursts
-            return False, "burst_exceeded"
-        
-        # Check per-minute
-        minute_count = sum(1 for ts in requests if ts > now - 60)
-        if minute_count >= self.rpm:
-            self._blocked[identifier] = now + 30
-            return False, "rpm_exceeded"
-        
-        # Check per-hour
-        if len(requests) >= self.rph:
-            self._blocked[identifier] = now + 300
-            return False, "rph_exceeded"
-        
-        # Record request
-        requests.append(now)
-        return True, None
+        blocked = self._check_blocked(identifier, now)
+        if blocked:
+            return False, blocked
+        return self._verdict(identifier, self._limiter.check_sync(identifier, now), now)
+
+    async def check(self, identifier: str) -> tuple[bool, str | None]:
+        """Check if request is allowed (any store)."""
+        now = time.time()
+        blocked = self._check_blocked(identifier, now)
+        if blocked:
+            return False, blocked
+        return self._verdict(identifier, await self._limiter.check(identifier, now), now)
+
+    def _check_blocked(self, identifier: str, now: float) -> str | None:
+        until = self._blocked.get(identifier)
+        if until is None:
+            return None
+        if now < until:
+            return "rate_limited"
+        del self._blocked[identifier]
+        return None
+
+    def _verdict(self, identifier: str, violated: Window | None, now: float) -> tuple[bool, str | None]:
+        if violated is None:
+            return True, None
+        reason, block_seconds = self._BLOCKS[violated.name]
+        self._blocked[identifier] = now + block_seconds
+        if len(self._blocked) > 10_000:
+            # Forget expired blocks of clients that never came back
+            self._blocked = {k: v for k, v in self._blocked.items() if v > now}
+        return False, reason
 
 
 # =============================================================================
@@ -170,6 +188,9 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         self.scan_body = scan_body
         self.blocked_ips = blocked_ips or set()
         self._threat_counts: dict[str, int] = defaultdict(int)
+        self._scanner = PatternScanner(
+            (threat_type, pattern) for pattern, threat_type in INJECTION_PATTERNS
+        )
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request through security checks."""
@@ -202,7 +223,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             return self._add_security_headers(response)
         
         # Rate limiting (POST/PUT/PATCH/DELETE only)
-        allowed, reason = self.rate_limiter.is_allowed(client_ip)
+        allowed, reason = await self.rate_limiter.check(client_ip)
         if not allowed:
             logger.warning(f"Rate limit exceeded for {client_ip}: {reason}")
             return JSONResponse(
@@ -213,15 +234,15 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         
         # Check content length
         content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > self.max_body_size:
-            return JSONResponse(
-                status_code=413,
-                content={"detail": "Request body too large"},
-            )
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            return self._too_large()
         
         # Scan request body for threats (skip exempt paths)
         if self.scan_body and not skip_body_scan and request.method in ("POST", "PUT", "PATCH"):
-            body_scan_result = await self._scan_body(request)
+            body = await self._read_body(request)
+            if body is None:
+                return self._too_large()
+            body_scan_result = self._scan_body(body)
             if body_scan_result:
                 threat_type, pattern = body_scan_result
                 self._threat_counts[threat_type] += 1
@@ -270,71 +291,57 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         
         return "unknown"
     
-    async def _scan_body(self, request: Request) -> tuple[str, str] | None:
-        """Scan request body for security threats."""
-        try:
-            # Read body (need to cache it for the actual handler)
-            body = await request.body()
-            
-            if not body:
+    def _too_large(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": "Request body too large"},
+        )
+    
+    async def _read_body(self, request: Request) -> bytes | None:
+        """
+        Read the body once, stopping as soon as it exceeds max_body_size.
+        
+        Returns None when the body is too large (chunked uploads carry no
+        Content-Length to reject up front). The bytes are left on the
+        request so the route handler reads the same buffer.
+        """
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > self.max_body_size:
                 return None
-            
-            # Try to decode as text
-            try:
-                text = body.decode("utf-8")
-            except UnicodeDecodeError:
-                return None  # Binary content, skip scanning
-            
-            # Check for injection patterns
-            for pattern, threat_type in INJECTION_PATTERNS:
-                if pattern.search(text):
-                    return (threat_type, pattern.pattern)
-            
-            # Try to parse as JSON and check nested values
-            try:
-                data = json.loads(text)
-                threat = self._scan_dict(data)
-                if threat:
-                    return threat
-            except json.JSONDecodeError:
-                pass
-            
+            chunks.append(chunk)
+        body = b"".join(chunks)
+        request._body = body  # replayed downstream by BaseHTTPMiddleware
+        return body
+    
+    def _scan_body(self, body: bytes) -> tuple[str, str] | None:
+        """
+        Scan a request body for security threats.
+        
+        JSON bodies are scanned once per decoded key / string value (so
+        escapes like \\u003c can't hide a pattern); anything else is
+        scanned as raw text. Binary content is skipped.
+        """
+        if not body:
             return None
-            
+        try:
+            text = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return None  # Binary content, skip scanning
+        
+        try:
+            hit = self._scanner.search_strings(iter_json_strings(json.loads(text)))
+        except (json.JSONDecodeError, RecursionError):
+            hit = self._scanner.search(text)
         except Exception as e:
             logger.error(f"Body scan error: {e}")
             return None
-    
-    def _scan_dict(self, data: Any, depth: int = 0) -> tuple[str, str] | None:
-        """Recursively scan dict/list for threats."""
-        if depth > 10:  # Prevent deep recursion
-            return None
-        
-        if isinstance(data, dict):
-            for key, value in data.items():
-                # Check key itself
-                if isinstance(key, str):
-                    for pattern, threat_type in INJECTION_PATTERNS:
-                        if pattern.search(key):
-                            return (threat_type, pattern.pattern)
-                
-                # Recurse into value
-                threat = self._scan_dict(value, depth + 1)
-                if threat:
-                    return threat
-                    
-        elif isinstance(data, list):
-            for item in data:
-                threat = self._scan_dict(item, depth + 1)
-                if threat:
-                    return threat
-                    
-        elif isinstance(data, str):
-            for pattern, threat_type in INJECTION_PATTERNS:
-                if pattern.search(data):
-                    return (threat_type, pattern.pattern)
         
-        return None
+        if hit is None:
+            return None
+        return (hit.label, hit.pattern.pattern)
     
     def _add_security_headers(self, response: Response) -> Response:
         """Add security headers to response."""
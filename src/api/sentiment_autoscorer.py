@@ -1,7 +1,7 @@
 """
 Background auto-scorer — three-phase pipeline:
 
-  Phase 1a ➜ JSONL → session_messages   (legacy: file-based agent logs)
+  Phase 1a ➜ JSONL → session_messages   (legacy: file-based agent logs, tail-followed)
   Phase 1b ➜ engine chat_messages → session_messages  (live engine conversations)
   Phase 2  ➜ session_messages → sentiment_events  (semantic + LLM + lexicon)
 
@@ -19,13 +19,13 @@ import time
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, select, func
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import ARIA_AGENTS_ROOT
 from db.session import AsyncSessionLocal
-from db.models import SessionMessage, SentimentEvent, EngineChatMessage, ModelUsage
+from db.models import SessionMessage, SentimentEvent, EngineChatMessage, ModelUsage, JsonlSyncCursor
 
 _logger = logging.getLogger("aria.sentiment_autoscorer")
 
@@ -35,6 +35,8 @@ MIN_CHARS = 8
 LLM_TIMEOUT_SECONDS = 30
 SEMANTIC_TIMEOUT_SECONDS = 15
 COMMIT_EVERY = 5
+JSONL_MAX_BYTES_PER_CYCLE = 8 * 1024 * 1024  # first sync of a large history spreads over cycles
+JSONL_INSERT_CHUNK = 500
 
 # ── Configurable method/model ────────────────────────────────────────────────
 # SENTIMENT_METHOD: "auto" (default) | "semantic" | "llm" | "lexicon"
@@ -164,97 +166,153 @@ def _extract_line_message(payload: dict) -> tuple[str, str, str | None]:
 
 # ── Phase 1: JSONL → session_messages ────────────────────────────────────────
 
+def _read_appended_lines(path: str, offset: int, max_bytes: int) -> tuple[list[bytes], int]:
+    """Complete lines appended after ``offset`` (at most ~``max_bytes``).
+
+    Returns (lines, new_offset). A trailing partial line is left for the
+    next cycle, so the cursor always sits on a line boundary.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        chunk = fh.read(max_bytes)
+        if len(chunk) == max_bytes:
+            # Finish the line we stopped inside of
+            chunk += fh.readline()
+    end = chunk.rfind(b"\n")
+    if end < 0:
+        return [], offset
+    return chunk[: end + 1].splitlines(), offset + end + 1
+
+
+def _jsonl_row(raw: bytes, session_id: str, agent_id: str) -> dict | None:
+    """session_messages insert values for one JSONL line, or None to skip."""
+    try:
+        parsed = json_lib.loads(raw)
+    except Exception:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+
+    role, content, ts_str = _extract_line_message(parsed)
+    if role not in ("user", "assistant"):
+        return None
+
+    text = _normalize(content)
+    if len(text) < MIN_CHARS or _is_noise(text):
+        return None
+
+    # Preserve original timestamp if available
+    created_at = None
+    if ts_str:
+        try:
+            from dateutil.parser import isoparse
+            created_at = isoparse(ts_str)
+        except Exception as e:
+            _logger.debug("Could not parse timestamp %r: %s", ts_str, e)
+
+    return {
+        "external_session_id": session_id,
+        "agent_id": agent_id,
+        "role": role,
+        "content": text,
+        "content_hash": hashlib.sha1(text.encode("utf-8")).hexdigest(),
+        "source_channel": "autoscorer_sync",
+        "metadata_json": {"origin": "legacy_jsonl", "timestamp": ts_str},
+        "created_at": created_at or datetime.now(timezone.utc),
+    }
+
+
 async def _sync_jsonl(db: AsyncSession) -> int:
-    """Scan ALL agent JSONL files and insert new messages into session_messages."""
+    """Tail agent JSONL files into session_messages.
+
+    A per-file cursor (inode, byte offset, mtime) in aria_data.jsonl_sync_cursors
+    means each cycle only parses bytes appended since the last one; a new
+    inode or a file shorter than the cursor (rotation / truncation) restarts
+    from byte 0. Rows go in with one bulk INSERT ... ON CONFLICT DO NOTHING on
+    (external_session_id, role, content_hash), committed together with the
+    cursors so a crash can't skip or double-count lines.
+    """
     if not ARIA_AGENTS_ROOT or not os.path.exists(ARIA_AGENTS_ROOT):
         return 0
 
-    # Fetch all existing content hashes to avoid duplicates (fast set lookup)
-    existing_hashes: set[str] = set()
-    rows = (await db.execute(select(SessionMessage.content_hash))).scalars().all()
-    for h in rows:
-        if h:
-            existing_hashes.add(h)
-
+    cursors = {
+        c.path: c for c in (await db.execute(select(JsonlSyncCursor))).scalars().all()
+    }
     pattern = os.path.join(ARIA_AGENTS_ROOT, "*", "sessions", "*.jsonl")
-    inserted = 0
+    paths = glob.glob(pattern)
 
-    for path in glob.glob(pattern):
-        fname = os.path.basename(path)
-        if not fname.endswith(".jsonl"):
+    rows: dict[tuple, dict] = {}
+    cursor_updates: list[dict] = []
+    budget = JSONL_MAX_BYTES_PER_CYCLE
+
+    for path in paths:
+        if budget <= 0:
+            break
+        try:
+            st = os.stat(path)
+        except OSError:
             continue
-        session_id = fname[:-6]  # external session id (UUID from filename)
-        agent_id = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        cursor = cursors.get(path)
+        offset = 0
+        if cursor is not None and cursor.inode == st.st_ino and st.st_size >= cursor.byte_offset:
+            offset = cursor.byte_offset
+        if offset == st.st_size:
+            continue  # nothing appended
 
         try:
-            with open(path, "r", encoding="utf-8") as fh:
-                for line in fh:
-                    raw = line.strip()
-                    if not raw:
-                        continue
-                    try:
-                        parsed = json_lib.loads(raw)
-                    except Exception:
-                        continue
-                    if not isinstance(parsed, dict):
-                        continue
-
-                    role, content, ts_str = _extract_line_message(parsed)
-                    if role not in ("user", "assistant"):
-                        continue
-
-                    text = _normalize(content)
-                    if len(text) < MIN_CHARS or _is_noise(text):
-                        continue
-
-                    text_sha1 = hashlib.sha1(text.encode("utf-8")).hexdigest()
-
-                    # Fast dedup via in-memory set
-                    dedup_key = f"{session_id}:{role}:{text_sha1}"
-                    if dedup_key in existing_hashes:
-                        continue
-                    existing_hashes.add(dedup_key)
-
-                    # Also check the DB unique constraint columns
-                    dup = (await db.execute(
-                        select(SessionMessage.id)
-                        .where(SessionMessage.external_session_id == session_id)
-                        .where(SessionMessage.role == role)
-                        .where(SessionMessage.content_hash == text_sha1)
-                        .limit(1)
-                    )).scalar_one_or_none()
-                    if dup:
-                        continue
-
-                    msg = SessionMessage(
-                        external_session_id=session_id,
-                        agent_id=agent_id,
-                        role=role,
-                        content=text,
-                        content_hash=text_sha1,
-                        source_channel="autoscorer_sync",
-                        metadata_json={"origin": "legacy_jsonl", "timestamp": ts_str},
-                    )
-                    # Preserve original timestamp if available
-                    if ts_str:
-                        try:
-                            from dateutil.parser import isoparse
-                            msg.created_at = isoparse(ts_str)
-                        except Exception as e:
-                            _logger.debug("Could not parse timestamp %r: %s", ts_str, e)
-
-                    db.add(msg)
-                    inserted += 1
-
-                    if inserted >= BATCH_SIZE * 4:
-                        break
+            lines, new_offset = await asyncio.to_thread(_read_appended_lines, path, offset, budget)
         except Exception:
             continue
+        if new_offset == offset:
+            continue
+        budget -= new_offset - offset
 
-        if inserted >= BATCH_SIZE * 4:
-            break
+        session_id = os.path.basename(path)[:-6]  # external session id (UUID from filename)
+        agent_id = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        for raw in lines:
+            row = _jsonl_row(raw, session_id, agent_id)
+            if row is not None:
+                rows.setdefault((session_id, row["role"], row["content_hash"]), row)
+        cursor_updates.append({
+            "path": path,
+            "inode": st.st_ino,
+            "byte_offset": new_offset,
+            "mtime": st.st_mtime,
+        })
+
+    inserted = 0
+    values = list(rows.values())
+    for i in range(0, len(values), JSONL_INSERT_CHUNK):
+        result = await db.execute(
+            pg_insert(SessionMessage)
+            .values(values[i:i + JSONL_INSERT_CHUNK])
+            .on_conflict_do_nothing(
+                index_elements=["external_session_id", "role", "content_hash"],
+            )
+            .returning(SessionMessage.id)
+        )
+        inserted += len(result.scalars().all())
+
+    if cursor_updates:
+        stmt = pg_insert(JsonlSyncCursor).values(cursor_updates)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[JsonlSyncCursor.path],
+                set_={
+                    "inode": stmt.excluded.inode,
+                    "byte_offset": stmt.excluded.byte_offset,
+                    "mtime": stmt.excluded.mtime,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    # Forget cursors of deleted files
+    gone = set(cursors) - set(paths)
+    if gone:
+        await db.execute(delete(JsonlSyncCursor).where(JsonlSyncCursor.path.in_(gone)))
 
-    if inserted:
+    if cursor_updates or gone:
         await db.commit()
     return inserted
 
@@ -378,6 +436,20 @@ async def _score_batch(db: AsyncSession) -> int:
     llm_classifier = LLMSentimentClassifier(model=SENTIMENT_MODEL)
     print(f"🎯 _score_batch: method={SENTIMENT_METHOD}, llm_model={llm_classifier._model}")
 
+    # One batched embedding round-trip for the whole batch; classify()
+    # below then reads vectors from the embedding cache.
+    if SENTIMENT_METHOD in ("auto", "semantic"):
+        texts = [(m.content or "").strip() for m in rows]
+        texts = [t for t in texts if not _is_noise(t) and not _is_operational_text(t)]
+        if texts:
+            try:
+                await asyncio.wait_for(
+                    semantic_classifier.prefetch(texts),
+                    timeout=SEMANTIC_TIMEOUT_SECONDS,
+                )
+            except Exception as e:
+                print(f"⚠️  _score_batch: embedding prefetch failed ({type(e).__name__}) — per-message fallback")
+
     scored = 0
     pending_inserts = 0
     processed = 0
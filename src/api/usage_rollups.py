@@ -0,0 +1,526 @@
+"""
+Usage rollups — hourly / daily pre-aggregates behind the dashboards.
+
+/model-usage/stats, /skills/stats, /skills/insights,
+/activities/visualization and /engine/agents/metrics used to GROUP BY
+the raw model_usage, skill_invocations, activity_log and
+aria_engine.chat_messages tables (5–8 scans per request) on every
+refresh. This module keeps summable per-bucket aggregates in
+aria_data.usage_rollups and answers those queries from them.
+
+Features:
+- One row per (source, hour|day, bucket, up to three dimensions) with
+  summable metrics: events, successes, failures, tokens, cost, duration
+  sum / count (averages are sum / count at read time)
+- Background loop recomputes the trailing REFRESH_HOURS of hourly rows
+  every ROLLUP_INTERVAL_SECONDS with one DELETE + INSERT … SELECT …
+  GROUP BY per source (late and backfilled rows are picked up), then
+  re-derives the touched days from the hourly rows
+- Per-source watermark (aria_data.rollup_state); the first run
+  backfills history in BACKFILL_STEP chunks
+- One worker at a time per source (pg_try_advisory_xact_lock); the
+  others skip that source until the next cycle
+- aggregate(): any [start, end) window = raw head (partial hour) +
+  hourly + daily + hourly rollups + raw tail since the watermark, so
+  response time stays flat as the raw tables grow
+
+Usage:
+    rows = await aggregate(db, "skills", cutoff, group_by=("skill_name",))
+    # [{"skill_name": "api_client", "events": 42, "failures": 1, ...}, ...]
+
+    # API startup:
+    asyncio.create_task(run_rollup_loop())
+"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import Integer, case, cast, delete, func, insert, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import (
+    ActivityLog,
+    EngineChatMessage,
+    EngineChatSession,
+    ModelUsage,
+    RollupState,
+    SkillInvocation,
+    UsageRollup,
+)
+from db.session import AsyncSessionLocal
+
+_logger = logging.getLogger("aria.usage_rollups")
+
+ROLLUP_INTERVAL_SECONDS = int(os.environ.get("ROLLUP_INTERVAL_SECONDS", "300"))
+REFRESH_HOURS = 3  # trailing hours recomputed every cycle
+BACKFILL_STEP = timedelta(days=7)  # max hours rolled per transaction
+HOURLY_RETENTION_DAYS = 90  # older hourly rows are pruned; daily rows are kept
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+DIM_COLUMNS = ("dim1", "dim2", "dim3")
+METRIC_COLUMNS = (
+    "events", "successes", "failures", "input_tokens", "output_tokens",
+    "tokens", "cost_usd", "duration_ms_sum", "duration_ms_count",
+)
+
+
+def _count_if(condition: Any) -> Any:
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _sum(column: Any) -> Any:
+    return func.coalesce(func.sum(column), 0)
+
+
+def _model_usage_filter() -> Any:
+    # Same test-row exclusion the model-usage endpoints apply to raw reads
+    from routers.model_usage import _db_non_test_usage_filter
+    return _db_non_test_usage_filter()
+
+
+def _message_meta_int(key: str) -> Any:
+    return cast(EngineChatMessage.metadata_json[key].as_string(), Integer)
+
+
+def _join_message_session(stmt: Any) -> Any:
+    return stmt.select_from(EngineChatMessage).join(
+        EngineChatSession, EngineChatSession.id == EngineChatMessage.session_id,
+    )
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    """A raw table, its dimensions (→ dim1..dim3) and metric aggregates."""
+    name: str
+    model: Any
+    dims: tuple[tuple[str, Any], ...]
+    metrics: tuple[tuple[str, Any], ...]
+    where: Callable[[], Any] | None = None
+    join: Callable[[Any], Any] | None = None  # adds FROM/JOIN for dims on other tables
+
+    def select(self, *columns: Any) -> Any:
+        stmt = select(*columns)
+        return self.join(stmt) if self.join is not None else stmt
+
+    def dim_column(self, dim: str) -> Any:
+        names = [name for name, _ in self.dims]
+        return getattr(UsageRollup, DIM_COLUMNS[names.index(dim)])
+
+    def dim_expr(self, dim: str) -> Any:
+        return dict(self.dims)[dim]
+
+
+SOURCES: dict[str, RollupSource] = {
+    "model_usage": RollupSource(
+        name="model_usage",
+        model=ModelUsage,
+        dims=(
+            ("model", ModelUsage.model),
+            ("provider", func.coalesce(ModelUsage.provider, literal_column("''"))),
+            ("cache_hit", case(
+                (ModelUsage.cache_hit.is_(True), literal_column("'1'")),
+                else_=literal_column("'0'"),
+            )),
+        ),
+        metrics=(
+            ("events", func.count()),
+            ("successes", _count_if(ModelUsage.success.is_(True))),
+            ("failures", _count_if(ModelUsage.success.is_(False))),
+            ("input_tokens", _sum(ModelUsage.input_tokens)),
+            ("output_tokens", _sum(ModelUsage.output_tokens)),
+            ("tokens", _sum(ModelUsage.input_tokens + ModelUsage.output_tokens)),
+            ("cost_usd", _sum(ModelUsage.cost_usd)),
+            ("duration_ms_sum", _sum(ModelUsage.latency_ms)),
+            ("duration_ms_count", func.count(ModelUsage.latency_ms)),
+        ),
+        where=_model_usage_filter,
+    ),
+    "skills": RollupSource(
+        name="skills",
+        model=SkillInvocation,
+        dims=(
+            ("skill_name", SkillInvocation.skill_name),
+            ("tool_name", SkillInvocation.tool_name),
+        ),
+        metrics=(
+            ("events", func.count()),
+            ("successes", _count_if(SkillInvocation.success.is_(True))),
+            ("failures", _count_if(SkillInvocation.success.is_(False))),
+            ("tokens", _sum(SkillInvocation.tokens_used)),
+            ("duration_ms_sum", _sum(SkillInvocation.duration_ms)),
+            ("duration_ms_count", func.count(SkillInvocation.duration_ms)),
+        ),
+    ),
+    "activity": RollupSource(
+        name="activity",
+        model=ActivityLog,
+        dims=(
+            ("action", ActivityLog.action),
+            ("skill", func.coalesce(ActivityLog.skill, literal_column("'unknown'"))),
+        ),
+        metrics=(
+            ("events", func.count()),
+            ("successes", _count_if(ActivityLog.success.is_(True))),
+            ("failures", _count_if(ActivityLog.success.is_(False))),
+        ),
+    ),
+    "agent_messages": RollupSource(
+        name="agent_messages",
+        model=EngineChatMessage,
+        dims=(("agent_id", EngineChatSession.agent_id),),
+        metrics=(
+            ("events", func.count()),
+            ("successes", _count_if(EngineChatMessage.metadata_json["error"].as_string().is_(None))),
+            ("failures", _count_if(EngineChatMessage.metadata_json["error"].as_string().is_not(None))),
+            ("tokens", _sum(_message_meta_int("token_count"))),
+            ("duration_ms_sum", _sum(_message_meta_int("latency_ms"))),
+            ("duration_ms_count", func.count(_message_meta_int("latency_ms"))),
+        ),
+        join=_join_message_session,
+    ),
+}
+
+
+# ── Time helpers ─────────────────────────────────────────────────────────────
+
+def floor_hour(ts: datetime) -> datetime:
+    return ts.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(ts: datetime) -> datetime:
+    floored = floor_hour(ts)
+    return floored if floored == ts else floored + HOUR
+
+
+def floor_day(ts: datetime) -> datetime:
+    return floor_hour(ts).replace(hour=0)
+
+
+def ceil_day(ts: datetime) -> datetime:
+    floored = floor_day(ts)
+    return floored if floored == ts else floored + DAY
+
+
+def plan_segments(
+    start: datetime | None,
+    end: datetime,
+    watermark: datetime | None,
+    allow_daily: bool = True,
+    hourly_since: datetime | None = None,
+) -> list[tuple[str, datetime | None, datetime]]:
+    """
+    Split [start, end) into ("raw" | "hour" | "day", from, to) segments.
+
+    ``start=None`` means all time. Rolled-up segments never reach past
+    ``watermark``; hourly segments never reach before ``hourly_since``
+    (pruned) — those parts are read from raw rows instead.
+    """
+    if watermark is None:
+        return [("raw", start, end)]
+    rolled_end = min(floor_hour(end), watermark)
+    rolled_start = ceil_hour(start) if start is not None else None
+    if rolled_start is not None and rolled_start >= rolled_end:
+        return [("raw", start, end)]
+
+    segments: list[tuple[str, datetime | None, datetime]] = []
+    if start is not None and start < rolled_start:
+        segments.append(("raw", start, rolled_start))
+
+    cursor = rolled_start
+    if allow_daily:
+        day_start = ceil_day(cursor) if cursor is not None else None
+        day_end = floor_day(rolled_end)
+        if day_start is None or day_start < day_end:
+            if cursor is not None and cursor < day_start:
+                segments.append(("hour", cursor, day_start))
+            segments.append(("day", day_start, day_end))
+            cursor = day_end
+    if cursor is None or cursor < rolled_end:
+        segments.append(("hour", cursor, rolled_end))
+    if rolled_end < end:
+        segments.append(("raw", rolled_end, end))
+
+    if hourly_since is not None:
+        # Hourly rows before the retention cut-off are gone: read raw instead
+        resolved = []
+        for kind, seg_start, seg_end in segments:
+            if kind == "hour" and (seg_start is None or seg_start < hourly_since):
+                split = min(hourly_since, seg_end)
+                resolved.append(("raw", seg_start, split))
+                if split < seg_end:
+                    resolved.append(("hour", split, seg_end))
+            else:
+                resolved.append((kind, seg_start, seg_end))
+        segments = resolved
+    return segments
+
+
+# ── Refresh ──────────────────────────────────────────────────────────────────
+
+async def _rollup_hours(db: AsyncSession, source: RollupSource, start: datetime, end: datetime) -> None:
+    """Recompute hourly rows for [start, end) from the raw table."""
+    created_at = source.model.created_at
+    bucket = func.date_trunc("hour", created_at, "UTC")
+    dim_exprs = [expr for _, expr in source.dims]
+    stmt = (
+        source.select(
+            literal(source.name), literal("hour"), bucket,
+            *dim_exprs, *(agg for _, agg in source.metrics),
+        )
+        .where(created_at >= start, created_at < end)
+        .group_by(bucket, *dim_exprs)
+    )
+    if source.where is not None:
+        stmt = stmt.where(source.where())
+
+    await db.execute(
+        delete(UsageRollup).where(
+            UsageRollup.source == source.name,
+            UsageRollup.granularity == "hour",
+            UsageRollup.bucket >= start,
+            UsageRollup.bucket < end,
+        )
+    )
+    await db.execute(
+        insert(UsageRollup).from_select(
+            ["source", "granularity", "bucket", *DIM_COLUMNS[:len(dim_exprs)],
+             *(name for name, _ in source.metrics)],
+            stmt,
+        )
+    )
+
+
+async def _rollup_days(db: AsyncSession, source: RollupSource, start: datetime, end: datetime) -> None:
+    """Re-derive daily rows for the (day-aligned) range [start, end) from hourly rows."""
+    day = func.date_trunc("day", UsageRollup.bucket, "UTC")
+    dims = [getattr(UsageRollup, c) for c in DIM_COLUMNS]
+    stmt = (
+        select(
+            literal(source.name), literal("day"), day, *dims,
+            *(func.sum(getattr(UsageRollup, m)) for m in METRIC_COLUMNS),
+        )
+        .where(
+            UsageRollup.source == source.name,
+            UsageRollup.granularity == "hour",
+            UsageRollup.bucket >= start,
+            UsageRollup.bucket < end,
+        )
+        .group_by(day, *dims)
+    )
+    await db.execute(
+        delete(UsageRollup).where(
+            UsageRollup.source == source.name,
+            UsageRollup.granularity == "day",
+            UsageRollup.bucket >= start,
+            UsageRollup.bucket < end,
+        )
+    )
+    await db.execute(
+        insert(UsageRollup).from_select(
+            ["source", "granularity", "bucket", *DIM_COLUMNS, *METRIC_COLUMNS], stmt,
+        )
+    )
+
+
+async def refresh_source(db: AsyncSession, source: RollupSource, now: datetime | None = None) -> bool:
+    """
+    Roll up one step of ``source``; returns True when it is caught up
+    (or another process is rolling it up right now).
+
+    Each step covers at most BACKFILL_STEP and always re-covers the
+    REFRESH_HOURS before the watermark. Steps are serialized across API
+    workers by a transaction-scoped advisory lock per source.
+    """
+    locked = (await db.execute(
+        select(func.pg_try_advisory_xact_lock(func.hashtext(f"usage_rollup:{source.name}")))
+    )).scalar()
+    if not locked:
+        await db.rollback()
+        return True
+
+    current_hour = floor_hour(now or datetime.now(timezone.utc))
+    state = await db.get(RollupState, source.name)
+    if state is None:
+        # Full rebuild (first run or after invalidate()): buckets older than
+        # the oldest remaining raw row would otherwise never be recomputed
+        await db.execute(delete(UsageRollup).where(UsageRollup.source == source.name))
+        oldest = (await db.execute(select(func.min(source.model.created_at)))).scalar()
+        start = floor_hour(oldest) if oldest is not None else current_hour
+    else:
+        start = min(state.rolled_until, current_hour) - REFRESH_HOURS * HOUR
+    end = min(current_hour, start + BACKFILL_STEP)
+
+    if start < end:
+        await _rollup_hours(db, source, start, end)
+        await _rollup_days(db, source, floor_day(start), ceil_day(end))
+    await db.execute(
+        pg_insert(RollupState)
+        .values(source=source.name, rolled_until=end, updated_at=func.now())
+        .on_conflict_do_update(
+            index_elements=[RollupState.source],
+            set_={"rolled_until": end, "updated_at": func.now()},
+        )
+    )
+    await db.commit()
+    return end >= current_hour
+
+
+async def refresh_all(now: datetime | None = None) -> None:
+    """Bring every source up to the last complete hour and prune old hourly rows."""
+    for source in SOURCES.values():
+        async with AsyncSessionLocal() as db:
+            while not await refresh_source(db, source, now):
+                pass
+    async with AsyncSessionLocal() as db:
+        cutoff = floor_day(datetime.now(timezone.utc)) - HOURLY_RETENTION_DAYS * DAY
+        await db.execute(
+            delete(UsageRollup).where(UsageRollup.granularity == "hour", UsageRollup.bucket < cutoff)
+        )
+        await db.commit()
+
+
+async def invalidate(db: AsyncSession, source_name: str) -> None:
+    """
+    Forget a source's watermark after rows were inserted or deleted in
+    the past (backfills, purges). Reads fall back to raw rows until the
+    loop has rebuilt the rollups from scratch.
+    """
+    await db.execute(delete(RollupState).where(RollupState.source == source_name))
+    await db.commit()
+
+
+async def run_rollup_loop() -> None:
+    """Background task: refresh rollups every ROLLUP_INTERVAL_SECONDS."""
+    while True:
+        try:
+            await refresh_all()
+        except asyncio.CancelledError:
+            break
+        except Exception as exc:
+            _logger.warning("Usage rollup refresh failed: %s", exc)
+        try:
+            await asyncio.sleep(ROLLUP_INTERVAL_SECONDS)
+        except asyncio.CancelledError:
+            break
+
+
+# ── Read path ────────────────────────────────────────────────────────────────
+
+def _number(value: Any) -> int | float:
+    if isinstance(value, Decimal):  # SUM(bigint) / SUM(numeric)
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value or 0
+
+
+async def aggregate(
+    db: AsyncSession,
+    source_name: str,
+    start: datetime | None,
+    end: datetime | None = None,
+    group_by: Iterable[str] = (),
+    filters: dict[str, Callable[[Any], Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Summed metrics for [start, end) grouped by ``group_by``.
+
+    ``group_by`` takes the source's dimension names plus "hour" / "day".
+    ``filters`` maps a dimension to a function building a WHERE clause
+    from that dimension's column (applied to rollup and raw segments
+    alike). Rows come back ordered by events, descending.
+    """
+    source = SOURCES[source_name]
+    end = end or datetime.now(timezone.utc)
+    group_by = tuple(group_by)
+    filters = filters or {}
+
+    watermark = (await db.execute(
+        select(RollupState.rolled_until).where(RollupState.source == source.name)
+    )).scalar()
+    segments = plan_segments(
+        start, end, watermark,
+        allow_daily="hour" not in group_by,
+        hourly_since=floor_day(end) - HOURLY_RETENTION_DAYS * DAY,
+    )
+
+    merged: dict[tuple, dict[str, Any]] = {}
+    metric_names = [name for name, _ in source.metrics]
+    for kind, seg_start, seg_end in segments:
+        if kind == "raw":
+            created_at = source.model.created_at
+            keys = [
+                func.date_trunc("hour", created_at, "UTC") if g == "hour"
+                else func.date_trunc("day", created_at, "UTC") if g == "day"
+                else source.dim_expr(g)
+                for g in group_by
+            ]
+            stmt = source.select(*keys, *(agg for _, agg in source.metrics)).where(created_at < seg_end)
+            if seg_start is not None:
+                stmt = stmt.where(created_at >= seg_start)
+            if source.where is not None:
+                stmt = stmt.where(source.where())
+            for dim, build in filters.items():
+                stmt = stmt.where(build(source.dim_expr(dim)))
+        else:
+            keys = [
+                UsageRollup.bucket if g == "hour"
+                else func.date_trunc("day", UsageRollup.bucket, "UTC") if g == "day"
+                else source.dim_column(g)
+                for g in group_by
+            ]
+            stmt = select(*keys, *(func.sum(getattr(UsageRollup, m)) for m in metric_names)).where(
+                UsageRollup.source == source.name,
+                UsageRollup.granularity == kind,
+                UsageRollup.bucket < seg_end,
+            )
+            if seg_start is not None:
+                stmt = stmt.where(UsageRollup.bucket >= seg_start)
+            for dim, build in filters.items():
+                stmt = stmt.where(build(source.dim_column(dim)))
+        if keys:
+            stmt = stmt.group_by(*keys)
+
+        for row in (await db.execute(stmt)).all():
+            key = tuple(row[:len(group_by)])
+            values = row[len(group_by):]
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {**dict(zip(group_by, key)), **{m: 0 for m in metric_names}}
+            for name, value in zip(metric_names, values):
+                entry[name] += _number(value)
+
+    rows = [row for row in merged.values() if row["events"]]
+    rows.sort(key=lambda r: r["events"], reverse=True)
+    return rows
+
+
+def avg_duration(row: dict[str, Any]) -> float:
+    """Mean duration / latency (ms) of a rollup row (nulls excluded, like AVG())."""
+    count = row.get("duration_ms_count") or 0
+    return row.get("duration_ms_sum", 0) / count if count else 0.0
+
+
+def regroup(rows: Iterable[dict[str, Any]], group_by: Iterable[str]) -> list[dict[str, Any]]:
+    """Re-aggregate aggregate() rows by a subset of their keys."""
+    group_by = tuple(group_by)
+    merged: dict[tuple, dict[str, Any]] = {}
+    for row in rows:
+        key = tuple(row[g] for g in group_by)
+        entry = merged.setdefault(key, dict(zip(group_by, key)))
+        for name in METRIC_COLUMNS:
+            if name in row:
+                entry[name] = entry.get(name, 0) + row[name]
+    result = list(merged.values())
+    result.sort(key=lambda r: r.get("events", 0), reverse=True)
+    return result
+
+
+def total(rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Sum of every metric across aggregate() rows."""
+    grouped = regroup(rows, ())
+    return grouped[0] if grouped else {name: 0 for name in METRIC_COLUMNS}
@@ -0,0 +1,255 @@
+"""
+Vector index — HNSW index management and tuned k-NN search for
+aria_data.semantic_memories.
+
+Every semantic lookup orders by ``embedding <=> :query``. With a
+category or importance filter in the same query, the global HNSW index
+returns its ef_search nearest rows and *then* the filter drops most of
+them (or the planner gives up on the index and scans exactly).
+
+Features:
+- Global HNSW index plus partial HNSW indexes for hot categories
+  (SEMANTIC_HNSW_CATEGORIES, default ``sentiment_reference``): a query
+  filtered to one of those categories walks a graph holding only that
+  category
+- Per-request knobs: ``ef_search`` (SET LOCAL hnsw.ef_search) and
+  ``exact`` (index scans off → exact ordering)
+- Over-fetch-then-filter for other selective filters: take the
+  limit × OVERFETCH nearest rows from the global index, filter those,
+  and fall back to an exact filtered scan when too few survive
+- index_report(): index sizes / scan counts and recall@k of the ANN
+  path measured against exact search on sampled stored embeddings
+
+Usage:
+    rows = await knn_search(db, embedding, limit=5, category="general",
+                            ef_search=100)
+    for memory, distance in rows:
+        ...
+
+    # schema bootstrap:
+    for name, ddl in index_ddl():
+        await run(name, ddl)
+"""
+
+import logging
+import os
+import re
+import statistics
+import time
+from typing import Any, Iterable
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import SemanticMemory
+
+logger = logging.getLogger("aria.api.vector_index")
+
+HNSW_M = int(os.getenv("SEMANTIC_HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("SEMANTIC_HNSW_EF_CONSTRUCTION", "64"))
+DEFAULT_EF_SEARCH = int(os.getenv("SEMANTIC_HNSW_EF_SEARCH", "40"))
+OVERFETCH = int(os.getenv("SEMANTIC_HNSW_OVERFETCH", "8"))
+MAX_EF_SEARCH = 1000  # pgvector's upper bound for hnsw.ef_search
+
+HOT_CATEGORIES: tuple[str, ...] = tuple(
+    c.strip()
+    for c in os.getenv("SEMANTIC_HNSW_CATEGORIES", "sentiment_reference").split(",")
+    if c.strip()
+)
+
+GLOBAL_INDEX = "idx_semantic_embedding_hnsw"
+
+
+def partial_index_name(category: str) -> str:
+    """Index name for a hot category (identifier-safe, ≤ 63 chars)."""
+    slug = re.sub(r"[^a-z0-9]+", "_", category.lower()).strip("_")
+    return f"{GLOBAL_INDEX}_{slug}"[:63]
+
+
+def index_ddl(categories: Iterable[str] = HOT_CATEGORIES) -> list[tuple[str, str]]:
+    """(name, CREATE INDEX IF NOT EXISTS …) for the global and partial HNSW indexes."""
+    with_clause = f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+    ddl = [(
+        GLOBAL_INDEX,
+        f"CREATE INDEX IF NOT EXISTS {GLOBAL_INDEX} "
+        f"ON aria_data.semantic_memories USING hnsw (embedding vector_cosine_ops) {with_clause}",
+    )]
+    for category in categories:
+        name = partial_index_name(category)
+        literal = category.replace("'", "''")
+        ddl.append((
+            name,
+            f"CREATE INDEX IF NOT EXISTS {name} "
+            f"ON aria_data.semantic_memories USING hnsw (embedding vector_cosine_ops) "
+            f"{with_clause} WHERE category = '{literal}'",
+        ))
+    return ddl
+
+
+async def _tune(db: AsyncSession, ef_search: int) -> None:
+    """Transaction-local hnsw.ef_search for the next k-NN query."""
+    ef = max(1, min(int(ef_search), MAX_EF_SEARCH))
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {ef}"))
+
+
+async def _exact_scan(db: AsyncSession, stmt) -> list:
+    """Run ``stmt`` with index scans off, then switch them back on.
+
+    SET LOCAL lasts until the transaction ends, so without the reset every
+    later query in the caller's transaction would skip its indexes. (If
+    the query fails the transaction is aborted, and its rollback undoes
+    the setting.)
+    """
+    await db.execute(text("SET LOCAL enable_indexscan = off"))
+    rows = list((await db.execute(stmt)).all())
+    await db.execute(text("SET LOCAL enable_indexscan = on"))
+    return rows
+
+
+def _filtered(stmt, category: str | None, min_importance: float):
+    if category:
+        stmt = stmt.where(SemanticMemory.category == category)
+    if min_importance > 0:
+        stmt = stmt.where(SemanticMemory.importance >= min_importance)
+    return stmt
+
+
+async def knn_search(
+    db: AsyncSession,
+    embedding: Any,
+    limit: int,
+    *,
+    category: str | None = None,
+    min_importance: float = 0.0,
+    ef_search: int | None = None,
+    exact: bool = False,
+) -> list[tuple[SemanticMemory, float]]:
+    """
+    Nearest semantic memories by cosine distance, nearest first.
+
+    Unfiltered queries and hot-category queries go straight to their
+    HNSW index; other filters use over-fetch-then-filter (see module
+    docstring). ``exact=True`` bypasses the indexes.
+    """
+    ef = ef_search or DEFAULT_EF_SEARCH
+    distance = SemanticMemory.embedding.cosine_distance(embedding).label("distance")
+    selective = (category and category not in HOT_CATEGORIES) or min_importance > 0
+
+    if exact or not selective:
+        await _tune(db, max(ef, limit))
+        stmt = _filtered(select(SemanticMemory, distance), category, min_importance)
+        stmt = stmt.order_by("distance").limit(limit)
+        if exact:
+            return await _exact_scan(db, stmt)
+        return list((await db.execute(stmt)).all())
+
+    fetch = min(limit * OVERFETCH, MAX_EF_SEARCH)
+    await _tune(db, max(ef, fetch))
+    candidates = (
+        select(SemanticMemory.id, distance).order_by("distance").limit(fetch).subquery()
+    )
+    stmt = _filtered(
+        select(SemanticMemory, candidates.c.distance)
+        .join(candidates, SemanticMemory.id == candidates.c.id),
+        category, min_importance,
+    ).order_by(candidates.c.distance).limit(limit)
+    rows = list((await db.execute(stmt)).all())
+    if len(rows) >= limit:
+        return rows
+
+    # Filter too selective for the candidate pool — exact filtered scan
+    stmt = _filtered(select(SemanticMemory, distance), category, min_importance)
+    return await _exact_scan(db, stmt.order_by("distance").limit(limit))
+
+
+async def index_report(
+    db: AsyncSession,
+    *,
+    sample: int = 20,
+    k: int = 10,
+    ef_search: int | None = None,
+    category: str | None = None,
+    min_importance: float = 0.0,
+) -> dict:
+    """
+    HNSW index sizes and recall@k of knn_search against exact search.
+
+    Query vectors are ``sample`` stored embeddings picked at random
+    (within ``category`` when given).
+    """
+    index_rows = (await db.execute(text("""
+        SELECT s.indexrelname AS name,
+               pg_relation_size(s.indexrelid) AS size_bytes,
+               pg_size_pretty(pg_relation_size(s.indexrelid)) AS size,
+               s.idx_scan AS scans,
+               pg_get_indexdef(s.indexrelid) AS definition
+        FROM pg_stat_user_indexes s
+        WHERE s.schemaname = 'aria_data'
+          AND s.relname = 'semantic_memories'
+          AND pg_get_indexdef(s.indexrelid) ILIKE '%USING hnsw%'
+        ORDER BY s.indexrelname
+    """))).all()
+    table = (await db.execute(text("""
+        SELECT count(*) AS row_count,
+               pg_size_pretty(pg_total_relation_size('aria_data.semantic_memories')) AS total_size
+        FROM aria_data.semantic_memories
+    """))).one()
+
+    queries_stmt = select(SemanticMemory.embedding)
+    if category:
+        queries_stmt = queries_stmt.where(SemanticMemory.category == category)
+    queries = (await db.execute(
+        queries_stmt.order_by(text("random()")).limit(sample)
+    )).scalars().all()
+
+    recalls: list[float] = []
+    ann_ms: list[float] = []
+    exact_ms: list[float] = []
+    for vector in queries:
+        t0 = time.perf_counter()
+        ann = await knn_search(db, vector, k, category=category,
+                               min_importance=min_importance, ef_search=ef_search)
+        t1 = time.perf_counter()
+        truth = await knn_search(db, vector, k, category=category,
+                                 min_importance=min_importance, exact=True)
+        t2 = time.perf_counter()
+        ann_ms.append((t1 - t0) * 1000)
+        exact_ms.append((t2 - t1) * 1000)
+        truth_ids = {mem.id for mem, _ in truth}
+        if truth_ids:
+            recalls.append(len(truth_ids & {mem.id for mem, _ in ann}) / len(truth_ids))
+    await db.rollback()  # drop the SET LOCAL hnsw.ef_search
+
+    def _ms(values: list[float]) -> dict:
+        if not values:
+            return {"mean": None, "p50": None, "max": None}
+        return {
+            "mean": round(statistics.fmean(values), 2),
+            "p50": round(statistics.median(values), 2),
+            "max": round(max(values), 2),
+        }
+
+    return {
+        "table": {"rows": table.row_count, "total_size": table.total_size},
+        "indexes": [
+            {
+                "name": r.name,
+                "size_bytes": r.size_bytes,
+                "size": r.size,
+                "scans": r.scans,
+                "definition": r.definition,
+            }
+            for r in index_rows
+        ],
+        "hot_categories": list(HOT_CATEGORIES),
+        "recall": {
+            "k": k,
+            "queries": len(recalls),
+            "ef_search": ef_search or DEFAULT_EF_SEARCH,
+            "category": category,
+            "min_importance": min_importance,
+            "mean": round(statistics.fmean(recalls), 4) if recalls else None,
+            "min": round(min(recalls), 4) if recalls else None,
+        },
+        "latency_ms": {"ann": _ms(ann_ms), "exact": _ms(exact_ms)},
+    }
@@ -3,15 +3,63 @@
 # Flask app with GraphQL, Grid, Search for Aria activities and records
 # =============================================================================
 
-from flask import Flask, render_template, make_response, request, Response, send_from_directory, jsonify, redirect
+from flask import Flask, render_template, make_response, request, Response, send_from_directory, jsonify, redirect, stream_with_context
 from flask_wtf.csrf import CSRFProtect
 import os
 import time
 import logging
+import threading
+from collections import OrderedDict
 import requests as http_requests
+from requests.adapters import HTTPAdapter
 
 _logger = logging.getLogger("aria.web")
 
+# Hop-by-hop headers (RFC 9110 §7.6.1) — never forwarded by the API proxy
+_HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade',
+}
+_PROXY_CHUNK_SIZE = 64 * 1024
+_PROXY_CACHE_MAX_BODY = 1_000_000
+
+
+def _proxy_session(pool_size: int) -> http_requests.Session:
+    """Keep-alive session shared by all API proxy requests in this worker."""
+    session = http_requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class _ProxyCache:
+    """Tiny thread-safe TTL cache for proxied GET responses (body kept as sent, possibly compressed)."""
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
 def create_app():
     app = Flask(__name__,
                 template_folder='templates',
@@ -81,6 +129,19 @@ def create_app():
     # Enables dashboard to work when accessed directly (port 5000)
     # without requiring Traefik (port 80)
     # =========================================================================
+    # Pooled keep-alive upstream session; responses are streamed through
+    # with their original content-encoding (no decompress / re-buffer).
+    # API_PROXY_CACHE_TTL > 0 serves GETs under API_PROXY_CACHE_PATHS
+    # (comma-separated prefixes) from a short-lived per-worker cache.
+    _proxy = _proxy_session(int(os.environ.get('API_PROXY_POOL_SIZE', '32')))
+    _proxy_cache_ttl = float(os.environ.get('API_PROXY_CACHE_TTL', '0'))
+    _proxy_cache = _ProxyCache(_proxy_cache_ttl) if _proxy_cache_ttl > 0 else None
+    _proxy_cache_paths = tuple(
+        p.strip().strip('/') for p in os.environ.get(
+            'API_PROXY_CACHE_PATHS', 'stats,model-usage/stats,activities,sessions/stats',
+        ).split(',') if p.strip()
+    )
+
     @app.route('/api/', defaults={'path': ''}, methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'])
     @app.route('/api/<path:path>', methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'])
     def api_proxy(path):
@@ -89,7 +150,7 @@ def create_app():
         try:
             upstream_headers = {
                 k: v for k, v in request.headers
-                if k.lower() not in ('host', 'transfer-encoding')
+                if k.lower() != 'host' and k.lower() not in _HOP_BY_HOP_HEADERS
             }
             if 'X-API-Key' not in upstream_headers:
                 if path.startswith('admin/') and _admin_key:
@@ -97,18 +158,55 @@ def create_app():
                 elif _api_key:
                     upstream_headers['X-API-Key'] = _api_key
 
-            resp = http_requests.request(
+            cache_key = None
+            if _proxy_cache is not None and request.method == 'GET' and path.startswith(_proxy_cache_paths):
+                cache_key = (
+                    path, request.query_string, upstream_headers.get('X-API-Key', ''),
+                    request.headers.get('Accept-Encoding', ''),
+                )
+                cached = _proxy_cache.get(cache_key)
+                if cached is not None:
+                    status, headers, body = cached
+                    return Response(body, status=status, headers=headers)
+
+            resp = _proxy.request(
                 method=request.method,
                 url=url,
                 params=request.args,
                 headers=upstream_headers,
                 data=request.get_data(),
-                timeout=30,
+                timeout=(5, 30),
+                stream=True,
+            )
+            # Build Flask response from upstream (body bytes untouched, so
+            # content-encoding / content-length stay valid)
+            headers = [(k, v) for k, v in resp.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS]
+
+            prefix = b''
+            if cache_key is not None and resp.status_code == 200:
+                prefix = resp.raw.read(_PROXY_CACHE_MAX_BODY + 1, decode_content=False)
+                if len(prefix) <= _PROXY_CACHE_MAX_BODY:
+                    resp.close()
+                    _proxy_cache.put(cache_key, (resp.status_code, headers, prefix))
+                    return Response(prefix, status=resp.status_code, headers=headers)
+                # Too large to cache: relay what was read, then the rest
+
+            def relay():
+                try:
+                    if prefix:
+                        yield prefix
+                    yield from resp.raw.stream(_PROXY_CHUNK_SIZE, decode_content=False)
+                except Exception as e:
+                    _logger.warning("API proxy stream interrupted: %s — %s", url, e)
+                finally:
+                    resp.close()  # returns the connection to the pool
+
+            return Response(
+                stream_with_context(relay()),
+                status=resp.status_code,
+                headers=headers,
+                direct_passthrough=True,
             )
-            # Build Flask response from upstream
-            excluded_headers = {'content-encoding', 'transfer-encoding', 'connection', 'content-length'}
-            headers = {k: v for k, v in resp.headers.items() if k.lower() not in excluded_headers}
-            return Response(resp.content, status=resp.status_code, headers=headers)
         except http_requests.exceptions.ConnectionError:
             _logger.error("API proxy connection error: cannot reach %s", url)
             return jsonify({
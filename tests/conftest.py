@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+import sys
 import time
 import uuid
 from unittest.mock import AsyncMock, MagicMock
@@ -371,6 +372,27 @@ def mock_skill_context():
 
 # ── Helper Functions ──────────────────────────────────────────────────────────
 
+def purge_mocked_aria_engine():
+    """Remove any MagicMock stubs for aria_engine from sys.modules.
+
+    Other test files (e.g. test_engine_roundtable_router) register MagicMock
+    stubs at module scope during collection.  Those stubs prevent real imports
+    of ``aria_engine.*`` sub-modules.  Call this before importing real code.
+    """
+    for key in list(sys.modules):
+        if (key == "aria_engine" or key.startswith("aria_engine.")) and isinstance(
+            sys.modules[key], MagicMock
+        ):
+            del sys.modules[key]
+
+
+def purge_mocked_db():
+    """Other router tests stub ``db`` / ``db.models`` at collection time."""
+    for key in ("db", "db.models", "db.session"):
+        if isinstance(sys.modules.get(key), MagicMock):
+            del sys.modules[key]
+
+
 def assert_api_called(mock_client, method: str, path: str | None = None):
     """Assert that an API method was called, optionally with a specific path."""
     method_mock = getattr(mock_client, method)
@@ -166,3 +166,48 @@ async def test_analyze_conversation(mock_api_client):
         result = await skill.analyze_conversation(messages=messages, store=False)
     assert result.success
     assert "trajectory" in result.data
+
+
+# ---------------------------------------------------------------------------
+# LLMSentimentClassifier
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_llm_classifier_uses_gateway_response_cache():
+    from aria_skills.sentiment_analysis import LLMSentimentClassifier
+
+    gateway = MagicMock()
+    gateway.complete = AsyncMock(return_value=MagicMock(
+        content='{"valence": -0.6, "arousal": 0.7, "dominance": 0.4, '
+                '"confidence": 0.8, "primary_emotion": "frustrated", "labels": []}',
+    ))
+    clf = LLMSentimentClassifier(model="routing-model", gateway=gateway)
+    sentiment = await clf.classify("this keeps breaking")
+    assert sentiment.primary_emotion == "frustrated"
+    assert gateway.complete.await_args.kwargs["cache"] is True
+    assert gateway.complete.await_args.kwargs["model"] == "routing-model"
+
+
+# ---------------------------------------------------------------------------
+# EmbeddingSentimentClassifier
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_embedding_classifier_calls_proxy_without_aria_engine(monkeypatch):
+    import sys
+    from aria_skills.sentiment_analysis import EmbeddingSentimentClassifier
+
+    monkeypatch.setitem(sys.modules, "aria_engine.embeddings", None)  # import fails
+    response = MagicMock()
+    response.json.return_value = {"data": [{"embedding": [0.1, 0.2]}]}
+    client = MagicMock()
+    client.post = AsyncMock(return_value=response)
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+
+    clf = EmbeddingSentimentClassifier(api_base_url="http://proxy", api_key="k", model="embed")
+    with patch("httpx.AsyncClient", return_value=client):
+        await clf.prefetch(["hello"])  # nothing to warm without the shared service
+        assert await clf._embed("hello") == [0.1, 0.2]
+    assert client.post.await_count == 1
+    assert client.post.await_args.args[0] == "http://proxy/v1/embeddings"
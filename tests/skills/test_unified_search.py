@@ -2,18 +2,25 @@
 Tests for the unified_search skill (Layer 3 — domain).
 
 Covers:
-- RRFMerger: merge, deduplication, weighting
+- RRFMerger: merge, deduplication, weighting, settled-ranking check
+- QueryCache: normalized keys, TTL
+- search(): fused single call, per-backend fallback with deadlines and
+  errors, cache (complete answers only)
 - Backend wrappers (SemanticBackend, GraphBackend, MemoryBackend)
 - UnifiedSearchSkill: initialize, search, semantic_search, graph_search, memory_search
 """
 from __future__ import annotations
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
 from aria_skills.base import SkillConfig, SkillResult, SkillStatus
 from aria_skills.unified_search import (
     UnifiedSearchSkill,
+    QueryCache,
     RRFMerger,
     SearchResult,
     SemanticBackend,
@@ -81,6 +88,29 @@ def test_rrf_merge_empty():
     assert merged == []
 
 
+def test_rrf_is_settled():
+    merger = RRFMerger(k=60, weights={"semantic": 1.0, "graph": 0.8, "memory": 0.01})
+    ranked = {"semantic": [_sr("a", 0.9, "semantic"), _sr("b", 0.8, "semantic")]}
+    # Low-weight memory can't close the semantic rank gaps; graph can
+    assert merger.is_settled(ranked, ["memory"], limit=1)
+    assert not merger.is_settled(ranked, ["graph"], limit=1)
+    # Fewer results than limit: any pending answer could add one
+    assert not merger.is_settled(ranked, ["memory"], limit=5)
+    assert merger.is_settled(ranked, [], limit=5)
+
+
+def test_query_cache_normalizes_and_expires():
+    cache = QueryCache(ttl_seconds=30)
+    key = QueryCache.key("  Hello   World ", ["graph", "semantic"], 10, None, 0.0)
+    cache.put(key, {"results": [{"content": "x"}]})
+    same = QueryCache.key("hello world", ["semantic", "graph"], 10, None, 0.0)
+    assert cache.get(same) == {"results": [{"content": "x"}]}
+    assert cache.get(QueryCache.key("hello world", ["semantic"], 10, None, 0.0)) is None
+
+    with patch("aria_skills.unified_search.time.monotonic", return_value=time.monotonic() + 31):
+        assert cache.get(same) is None
+
+
 # ---------------------------------------------------------------------------
 # Backend wrapper tests
 # ---------------------------------------------------------------------------
@@ -156,6 +186,118 @@ async def test_skill_search(mock_api_client):
     assert "semantic" in result.data["backends_used"]
 
 
+@pytest.mark.asyncio
+async def test_skill_search_concurrent_with_deadline(mock_api_client):
+    async def slow_graph(**kwargs):
+        await asyncio.sleep(5)
+        return SkillResult.ok({"results": [{"name": "late", "id": "g1"}]})
+
+    mock_api_client.search_memories_semantic = AsyncMock(return_value=SkillResult.ok([
+        {"content": "semantic result", "similarity": 0.9, "id": "s1"},
+    ]))
+    mock_api_client.graph_search = slow_graph
+    mock_api_client.get_memories = AsyncMock(return_value=SkillResult.ok([]))
+
+    with patch("aria_skills.api_client.get_api_client", new_callable=AsyncMock, return_value=mock_api_client):
+        skill = UnifiedSearchSkill(SkillConfig(name="unified_search", config={"timeout_graph": 0.05, "fused": False}))
+        await skill.initialize()
+        result = await skill.search(query="test query")
+        assert result.success
+        assert result.data["backends_timed_out"] == ["graph"]
+        assert result.data["backends_used"] == ["semantic", "memory"]
+        assert set(result.data["backend_latency_ms"]) == {"semantic", "graph", "memory"}
+        assert result.data["cached"] is False
+
+        # Partial answers are not cached
+        again = await skill.search(query="test query")
+        assert again.data["cached"] is False
+
+
+@pytest.mark.asyncio
+async def test_skill_search_backend_failure_is_reported_not_cached(mock_api_client):
+    mock_api_client.search_memories_semantic = AsyncMock(return_value=SkillResult.ok([
+        {"content": "semantic result", "similarity": 0.9, "id": "s1"},
+    ]))
+    mock_api_client.graph_search = AsyncMock(side_effect=ConnectionError("graph down"))
+    mock_api_client.get_memories = AsyncMock(return_value=SkillResult.fail("db busy"))
+
+    with patch("aria_skills.api_client.get_api_client", new_callable=AsyncMock, return_value=mock_api_client):
+        skill = UnifiedSearchSkill(SkillConfig(name="unified_search", config={"fused": False}))
+        await skill.initialize()
+        result = await skill.search(query="test query")
+        assert result.success
+        assert result.data["backend_errors"] == {"graph": "graph down", "memory": "db busy"}
+        assert result.data["backends_used"] == ["semantic"]
+        assert result.data["backends_timed_out"] == []
+
+        again = await skill.search(query="test query")
+        assert again.data["cached"] is False
+
+
+@pytest.mark.asyncio
+async def test_skill_search_early_exit_is_not_cached(mock_api_client):
+    async def slow_memories(**kwargs):
+        await asyncio.sleep(5)
+        return SkillResult.ok([])
+
+    mock_api_client.search_memories_semantic = AsyncMock(return_value=SkillResult.ok([
+        {"content": "semantic result", "similarity": 0.9, "id": "s1"},
+    ]))
+    mock_api_client.graph_search = AsyncMock(return_value=SkillResult.ok({"results": []}))
+    mock_api_client.get_memories = slow_memories
+
+    with patch("aria_skills.api_client.get_api_client", new_callable=AsyncMock, return_value=mock_api_client):
+        skill = UnifiedSearchSkill(SkillConfig(name="unified_search", config={"fused": False}))
+        await skill.initialize()
+        skill._merger.is_settled = lambda ranked, pending, limit: True
+        result = await skill.search(query="test query", early_exit=True)
+        assert result.data["early_exit"] is True
+        assert "memory" in result.data["backends_skipped"]
+
+        again = await skill.search(query="test query", early_exit=True)
+        assert again.data["cached"] is False
+
+
+@pytest.mark.asyncio
+async def test_skill_search_fused_single_call(mock_api_client):
+    mock_api_client.hybrid_search = AsyncMock(return_value=SkillResult.ok({
+        "results": [{"content": "fused hit", "score": 0.03, "source": "semantic+text", "id": "s1"}],
+        "backends_used": ["semantic", "text", "graph", "memory"],
+        "backend_counts": {"semantic": 1, "text": 1, "graph": 0, "memory": 0},
+        "backend_latency_ms": {"embedding": 4.0, "semantic": 3.0},
+        "errors": {},
+    }))
+    mock_api_client.search_memories_semantic = AsyncMock()
+
+    with patch("aria_skills.api_client.get_api_client", new_callable=AsyncMock, return_value=mock_api_client):
+        skill = UnifiedSearchSkill(SkillConfig(name="unified_search"))
+        await skill.initialize()
+        result = await skill.search(query="fused")
+    assert result.success
+    assert result.data["fused"] is True
+    assert result.data["results"][0]["content"] == "fused hit"
+    assert mock_api_client.hybrid_search.await_args.kwargs["weights"]["text"] == 0.8
+    mock_api_client.search_memories_semantic.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_skill_search_cache_hit(mock_api_client):
+    mock_api_client.search_memories_semantic = AsyncMock(return_value=SkillResult.ok([
+        {"content": "semantic result", "similarity": 0.9, "id": "s1"},
+    ]))
+    mock_api_client.graph_search = AsyncMock(return_value=SkillResult.ok({"results": []}))
+    mock_api_client.get_memories = AsyncMock(return_value=SkillResult.ok([]))
+
+    with patch("aria_skills.api_client.get_api_client", new_callable=AsyncMock, return_value=mock_api_client):
+        skill = UnifiedSearchSkill(SkillConfig(name="unified_search"))
+        await skill.initialize()
+        first = await skill.search(query="Test  Query")
+        second = await skill.search(query="test query")
+    assert second.data["cached"] is True
+    assert second.data["results"] == first.data["results"]
+    assert mock_api_client.search_memories_semantic.await_count == 1
+
+
 @pytest.mark.asyncio
 async def test_skill_search_no_query(mock_api_client):
     with patch("aria_skills.api_client.get_api_client", new_callable=AsyncMock, return_value=mock_api_client):
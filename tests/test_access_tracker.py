@@ -0,0 +1,89 @@
+"""
+Unit tests for the coalesced access counters (src/api/access_tracker.py).
+
+Covers: coalescing in record(), and flush() keeping its batch when the
+write fails or is cancelled mid-flight (fake AsyncSessionLocal).
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import purge_mocked_db
+
+# Ensure src/api is importable
+_api_dir = str(Path(__file__).resolve().parent.parent / "src" / "api")
+if _api_dir not in sys.path:
+    sys.path.insert(0, _api_dir)
+
+
+class _Session:
+    def __init__(self, execute):
+        self._execute = execute
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params):
+        await self._execute(params)
+
+    async def commit(self):
+        pass
+
+
+class TestAccessCounter:
+    @pytest.fixture(autouse=True)
+    def _import(self, monkeypatch):
+        purge_mocked_db()
+        import access_tracker
+        self.mod = access_tracker
+        self.writes: list[dict] = []
+        self.block: asyncio.Event | None = None
+        self.fail = False
+
+        async def execute(params):
+            if self.block is not None:
+                await self.block.wait()
+            if self.fail:
+                raise RuntimeError("db down")
+            self.writes.append(params)
+
+        monkeypatch.setattr(access_tracker, "AsyncSessionLocal", lambda: _Session(execute))
+        self.counter = access_tracker.AccessCounter("aria_data.semantic_memories")
+
+    @pytest.mark.asyncio
+    async def test_hits_coalesce_into_one_update(self):
+        self.counter.record(["b", "a", "b"])
+        assert await self.counter.flush() == 2
+        assert self.writes == [{"ids": ["a", "b"], "counts": [1, 2], "times": self.writes[0]["times"]}]
+        assert self.counter.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_counts(self):
+        self.counter.record(["a"])
+        self.fail = True
+        with pytest.raises(RuntimeError):
+            await self.counter.flush()
+        self.counter.record(["a"])
+        self.fail = False
+        await self.counter.flush()
+        assert self.writes[0]["counts"] == [2]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_keeps_counts(self):
+        self.counter.record(["a", "b"])
+        self.block = asyncio.Event()
+        task = asyncio.create_task(self.counter.flush())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert self.counter.pending() == 2
+        self.block = None
+        assert await self.counter.flush() == 2
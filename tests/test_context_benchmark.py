@@ -0,0 +1,159 @@
+"""
+Context build benchmarks.
+
+Compares, for sessions of 50 / 500 / 5,000 messages:
+- legacy: reload the transcript and token-count every message each turn
+  (what a token-aware build cost before the transcript cache)
+- engine: ContextManager.build_session_context on a warm transcript cache
+  (token-budgeted window via prefix sums)
+
+Microbenchmark: ContextManager.build_context on a 1,000-message history,
+cold (batched tokenizer call) and warm (token-count cache).
+
+Timings are printed for comparison only; assertions check behaviour (DB
+queries, messages tokenized, cache hits), so results don't depend on
+machine speed.
+
+Run:
+    pytest tests/test_context_benchmark.py -s
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src" / "api"))  # so 'from db.models import ...' works
+
+from tests.conftest import purge_mocked_aria_engine  # noqa: E402
+
+pytestmark = pytest.mark.slow
+
+SESSION_SIZES = (50, 500, 5000)
+TURNS = 5
+
+
+def _rows(n: int) -> list[SimpleNamespace]:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"message {i} " + "lorem ipsum dolor sit amet " * 8,
+            thinking=None,
+            tool_calls=None,
+            tool_results=None,
+            created_at=base + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+class _FakeDB:
+    """Minimal AsyncSession stand-in returning a fixed transcript."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def load(self, limit: int):
+        self.queries += 1
+        return self.rows[-limit:]
+
+
+def _session(n: int):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        system_prompt="You are Aria.",
+        context_window=n,
+        model="qwen3-mlx",
+        max_tokens=4096,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", SESSION_SIZES)
+async def test_context_build_benchmark(size):
+    purge_mocked_aria_engine()
+    from aria_engine.config import EngineConfig
+    from aria_engine.context_manager import ContextManager, _count_message_tokens, row_to_message
+    from aria_engine import transcript_cache
+
+    transcript_cache._cache = None
+    cm = ContextManager(EngineConfig())
+    rows = _rows(size)
+    session = _session(size)
+    db = _FakeDB(rows)
+    _count_message_tokens({"role": "user", "content": "warm-up"}, "gpt-4")  # load tokenizer
+
+    # Legacy: re-hydrate + re-count every message on every turn
+    start = time.perf_counter()
+    for _ in range(TURNS):
+        msgs = [row_to_message(r) for r in await db.load(size * 3)]
+        sum(_count_message_tokens(m, "gpt-4") for m in msgs)
+    legacy = (time.perf_counter() - start) / TURNS
+
+    # Engine: the first load warms the cache, later turns are prefix-sum lookups
+    cache = transcript_cache.get_transcript_cache(cm.config)
+    await cache.get_or_load(session.id, max(size * 3, 200), db.load)
+    queries = db.queries
+    hits = cache.get_stats()["hits"]
+    counted: list[int] = []
+    count_tokens = cache.token_counter
+
+    def _counting(rows):
+        counted.append(len(rows))
+        return count_tokens(rows)
+
+    cache.token_counter = _counting
+    start = time.perf_counter()
+    for _ in range(TURNS):
+        context = await cm.build_session_context(db, session)
+    engine = (time.perf_counter() - start) / TURNS
+
+    print(
+        f"\n[context bench] {size:>5} msgs: legacy {legacy * 1000:8.2f} ms/turn, "
+        f"engine {engine * 1000:8.2f} ms/turn ({legacy / max(engine, 1e-9):.1f}x)"
+    )
+    assert db.queries == queries  # warm turns never touch the DB
+    assert sum(counted) == 0  # transcript rows are tokenized once, at load
+    assert cache.get_stats()["hits"] == hits + TURNS
+    assert context[0]["role"] == "system"
+    transcript_cache._cache = None
+
+
+@pytest.mark.parametrize("size", [1000])
+def test_build_context_token_cache_microbenchmark(size):
+    purge_mocked_aria_engine()
+    from aria_engine.config import EngineConfig
+    from aria_engine.context_manager import ContextManager, _count_message_tokens
+
+    cm = ContextManager(EngineConfig())
+    cm._token_cache.clear()
+    history = [{"role": r.role, "content": r.content} for r in _rows(size)]
+    _count_message_tokens({"role": "user", "content": "warm-up"}, "gpt-4")  # load tokenizer
+
+    start = time.perf_counter()
+    cm.build_context(history, max_tokens=32768)
+    cold = time.perf_counter() - start
+
+    runs = 20
+    misses = cm._token_cache.get_stats()["misses"]
+    start = time.perf_counter()
+    for _ in range(runs):
+        context = cm.build_context(history, max_tokens=32768)
+    warm = (time.perf_counter() - start) / runs
+
+    print(
+        f"\n[token cache bench] build_context {size} msgs: "
+        f"cold {cold * 1000:.2f} ms, warm {warm * 1000:.2f} ms"
+    )
+    assert context
+    stats = cm._token_cache.get_stats()
+    assert stats["entries"] >= size
+    assert stats["misses"] == misses  # warm builds never call the tokenizer
@@ -28,6 +28,7 @@ sys.modules.setdefault("db.models", MagicMock())
 sys.modules.setdefault("deps", MagicMock())
 sys.modules.setdefault("aria_engine", MagicMock())
 sys.modules.setdefault("aria_engine.roundtable", MagicMock())
+sys.modules.setdefault("aria_engine.transcript_cache", MagicMock())
 
 from routers.engine_roundtable import (  # noqa: E402
     router,
@@ -216,3 +217,43 @@ def test_delete_roundtable_no_db(client):
     with patch("routers.engine_roundtable._db_session", None):
         resp = client.delete("/engine/roundtable/rt-001")
     assert resp.status_code == 503
+
+
+# ---------------------------------------------------------------------------
+# WebSocket start parameters
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("extra", [
+    {"quorum": "most"},
+    {"quorum": -1},
+    {"soft_deadline": 0},
+    {"rounds": 50},
+])
+async def test_ws_roundtable_rejects_invalid_params(mock_roundtable, extra):
+    from routers.engine_roundtable import _handle_roundtable_ws
+
+    sent: list[dict] = []
+    with patch("routers.engine_roundtable._roundtable", mock_roundtable), \
+            patch("routers.engine_roundtable._ws_send", AsyncMock(side_effect=lambda ws, msg: sent.append(msg))):
+        await _handle_roundtable_ws(MagicMock(), "Topic", ["agent_a", "agent_b"], {"type": "start", **extra})
+    assert [m["type"] for m in sent] == ["error"]
+    assert sent[0]["message"].startswith("Invalid request:")
+    mock_roundtable.discuss.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ws_roundtable_passes_validated_params(mock_roundtable):
+    from routers.engine_roundtable import _handle_roundtable_ws
+
+    sent: list[dict] = []
+    with patch("routers.engine_roundtable._roundtable", mock_roundtable), \
+            patch("routers.engine_roundtable._ws_send", AsyncMock(side_effect=lambda ws, msg: sent.append(msg))):
+        await _handle_roundtable_ws(
+            MagicMock(), "Topic", ["agent_a", "agent_b"],
+            {"type": "start", "quorum": 2, "soft_deadline": "15"},
+        )
+    kwargs = mock_roundtable.discuss.await_args.kwargs
+    assert (kwargs["rounds"], kwargs["quorum"], kwargs["soft_deadline"]) == (3, 2, 15.0)
+    assert isinstance(kwargs["quorum"], int)
+    assert [m["type"] for m in sent] == ["synthesis", "done"]
@@ -0,0 +1,108 @@
+"""
+Unit tests for keyset pagination helpers (src/api/pagination.py).
+
+Covers: cursor round-trips (datetime, UUID, scalars), malformed and
+wrong-shape cursors (ValueError → 400 from fetch_page), and the WHERE
+clauses seek_after builds for same- and mixed-direction keys.
+"""
+from __future__ import annotations
+
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Ensure src/api is importable
+_api_dir = str(Path(__file__).resolve().parent.parent / "src" / "api")
+if _api_dir not in sys.path:
+    sys.path.insert(0, _api_dir)
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, select  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.dialects.postgresql import UUID  # noqa: E402
+
+import pagination  # noqa: E402
+
+_items = Table(
+    "items", MetaData(),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("priority", Integer, nullable=False),
+)
+CREATED = datetime(2026, 2, 3, 4, 5, 6, 789, tzinfo=timezone.utc)
+ROW_ID = uuid.UUID("5c1f3a8e-2b4d-4e6f-8a9b-0c1d2e3f4a5b")
+
+
+def _sql(clause) -> tuple[str, list]:
+    compiled = clause.compile(dialect=postgresql.dialect())
+    return " ".join(str(compiled).split()), list(compiled.params.values())
+
+
+class TestCursorRoundTrip:
+    def test_datetime_uuid_and_scalars(self):
+        values = [CREATED, ROW_ID, 7, "name"]
+        cursor = pagination.encode_cursor(values)
+        assert "=" not in cursor
+        decoded = pagination.decode_cursor(cursor, 4)
+        assert decoded == values
+        assert decoded[0].tzinfo is not None
+        assert isinstance(decoded[1], uuid.UUID)
+
+    @pytest.mark.parametrize("cursor", [
+        "!!!not-base64!!!",
+        "bm90IGpzb24",  # "not json"
+        "eyJhIjogMX0",  # {"a": 1}: not a list
+        pagination.encode_cursor([CREATED]),  # wrong length
+        pagination.encode_cursor([None, ROW_ID]),  # null key
+    ])
+    def test_malformed_or_wrong_shape(self, cursor):
+        with pytest.raises(ValueError):
+            pagination.decode_cursor(cursor, 2)
+
+    def test_bad_typed_values(self):
+        with pytest.raises(ValueError):
+            pagination.decode_cursor(pagination.encode_cursor([{"dt": "yesterday"}]), 1)
+        with pytest.raises(ValueError):
+            pagination.decode_cursor(pagination.encode_cursor([{"u": "nope"}]), 1)
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_rejects_bad_cursor_with_400(self):
+        class _DB:
+            async def execute(self, stmt):
+                raise AssertionError("query must not run")
+
+        keys = ((_items.c.created_at, True), (_items.c.id, True))
+        with pytest.raises(HTTPException) as exc:
+            await pagination.fetch_page(_DB(), select(_items), keys, limit=10, cursor="bm90IGpzb24")
+        assert exc.value.status_code == 400
+        assert isinstance(exc.value.__cause__, ValueError)
+
+
+class TestSeekAfter:
+    def test_same_direction_uses_row_comparison_and_leading_bound(self):
+        keys = ((_items.c.created_at, True), (_items.c.id, True))
+        sql, params = _sql(pagination.seek_after(keys, [CREATED, ROW_ID]))
+        assert sql.startswith("items.created_at <= %(created_at_1)s AND ")
+        assert "(items.created_at, items.id) < (" in sql
+        assert " OR " not in sql
+        assert params == [CREATED, CREATED, ROW_ID]
+
+    def test_ascending_keys_compare_greater(self):
+        keys = ((_items.c.priority, False), (_items.c.id, False))
+        sql, _ = _sql(pagination.seek_after(keys, [3, ROW_ID]))
+        assert "items.priority >= " in sql
+        assert "(items.priority, items.id) > (" in sql
+
+    def test_mixed_direction_expands_into_branches(self):
+        keys = ((_items.c.priority, True), (_items.c.created_at, False), (_items.c.id, False))
+        sql, params = _sql(pagination.seek_after(keys, [3, CREATED, ROW_ID]))
+        leading, _, branches = sql.partition(" AND (")
+        assert leading == "items.priority <= %(priority_1)s"
+        assert branches.count(" OR ") == 2
+        assert "items.priority < " in branches
+        assert "items.priority = " in branches and "items.created_at > " in branches
+        assert "items.created_at = " in branches and "items.id > " in branches
+        assert params == [3, 3, 3, CREATED, 3, CREATED, ROW_ID]
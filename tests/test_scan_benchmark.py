@@ -0,0 +1,136 @@
+"""
+Injection scan benchmarks.
+
+Compares, for benign JSON request bodies of ~1 KB / 100 KB / 1 MB:
+- legacy: every INJECTION_PATTERNS regex over the raw body, then again
+  over every decoded key and string value (what SecurityMiddleware did
+  before the literal-prefiltered scanner)
+- scanner: SecurityMiddleware._scan_body (one prefiltered pass over the
+  decoded strings)
+
+Also PromptGuard.analyze on plain text of the same sizes, legacy
+per-pattern findall vs the prefiltered scanner.
+
+Run:
+    pytest tests/test_scan_benchmark.py -s
+"""
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src" / "api"))  # so 'import security_middleware' works
+
+from tests.conftest import purge_mocked_aria_engine  # noqa: E402
+
+pytestmark = pytest.mark.slow
+
+BODY_SIZES = {"1KB": 1_000, "100KB": 100_000, "1MB": 1_000_000}
+RUNS = 3
+
+WORDS = (
+    "the agent stored a memory about the goal and asked whether the session "
+    "context should include yesterday's notes before scheduling the next "
+    "research task for the team"
+).split()
+
+
+def _body(size: int) -> bytes:
+    rng = random.Random(size)
+    messages, total = [], 0
+    while total < size:
+        content = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+        messages.append({"role": "user", "content": content, "metadata": {"source": "chat"}})
+        total += len(content) + 60
+    return json.dumps({"session_id": "bench", "messages": messages}).encode()
+
+
+def _legacy_scan(body: bytes, patterns) -> tuple[str, str] | None:
+    text = body.decode("utf-8")
+    for pattern, threat_type in patterns:
+        if pattern.search(text):
+            return (threat_type, pattern.pattern)
+
+    def scan(data, depth=0):
+        if depth > 10:
+            return None
+        if isinstance(data, dict):
+            for key, value in data.items():
+                for pattern, threat_type in patterns:
+                    if pattern.search(key):
+                        return (threat_type, pattern.pattern)
+                threat = scan(value, depth + 1)
+                if threat:
+                    return threat
+        elif isinstance(data, list):
+            for item in data:
+                threat = scan(item, depth + 1)
+                if threat:
+                    return threat
+        elif isinstance(data, str):
+            for pattern, threat_type in patterns:
+                if pattern.search(data):
+                    return (threat_type, pattern.pattern)
+        return None
+
+    return scan(json.loads(text))
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fn()
+    return (time.perf_counter() - start) / RUNS
+
+
+@pytest.mark.parametrize("label", list(BODY_SIZES))
+def test_middleware_body_scan_benchmark(label):
+    purge_mocked_aria_engine()
+    from security_middleware import INJECTION_PATTERNS, SecurityMiddleware
+
+    middleware = SecurityMiddleware(MagicMock(), max_body_size=2_000_000)
+    body = _body(BODY_SIZES[label])
+
+    assert _legacy_scan(body, INJECTION_PATTERNS) is None
+    assert middleware._scan_body(body) is None
+    legacy = _timed(lambda: _legacy_scan(body, INJECTION_PATTERNS))
+    scanner = _timed(lambda: middleware._scan_body(body))
+
+    print(
+        f"\n[{label:>5} body, {len(body):>9,} bytes] legacy {legacy * 1000:8.2f} ms"
+        f" | scanner {scanner * 1000:8.2f} ms | {legacy / max(scanner, 1e-9):5.1f}x"
+    )
+    assert scanner < legacy
+
+    attack = body[:-2] + b', "note": "<script>alert(1)</script>"}'
+    assert middleware._scan_body(attack)[0] == "xss"
+
+
+@pytest.mark.parametrize("label", list(BODY_SIZES))
+def test_prompt_guard_benchmark(label):
+    purge_mocked_aria_engine()
+    from aria_mind.security import PromptGuard
+
+    guard = PromptGuard()
+    rng = random.Random(0)
+    text = " ".join(rng.choice(WORDS) for _ in range(BODY_SIZES[label] // 6))
+
+    def legacy():
+        return [p for p in guard.patterns if p.pattern.findall(text)]
+
+    assert [d["pattern"] for d in guard.analyze(text).detections if d["pattern"] in
+            {p.name for p in guard.patterns}] == [p.name for p in legacy()]
+    before = _timed(legacy)
+    after = _timed(lambda: guard._scanner.findall(text))
+
+    print(
+        f"\n[{label:>5} prompt] legacy {before * 1000:8.2f} ms"
+        f" | scanner {after * 1000:8.2f} ms | {before / max(after, 1e-9):5.1f}x"
+    )
+    assert after < before
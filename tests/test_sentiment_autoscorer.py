@@ -0,0 +1,211 @@
+"""
+Unit tests for the sentiment auto-scorer's JSONL tailing (Phase 1a).
+
+Covers: _read_appended_lines offsets and partial trailing lines,
+_jsonl_row filtering, and _sync_jsonl cursors across appends, rotation
+and truncation (fake AsyncSession, real files under tmp_path).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from tests.conftest import purge_mocked_db
+
+# Ensure src/api is importable
+_api_dir = str(Path(__file__).resolve().parent.parent / "src" / "api")
+if _api_dir not in sys.path:
+    sys.path.insert(0, _api_dir)
+
+SESSION_ID = "0b7f3c1e-5d7a-4d47-9d2b-1f8f6f0c2a11"
+
+
+def _line(role: str, content: str, **extra) -> bytes:
+    return (json.dumps({"role": role, "content": content, **extra}) + "\n").encode()
+
+
+class _Result:
+    def __init__(self, items):
+        self._items = items
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self._items)
+
+
+class _FakeDB:
+    """AsyncSession stand-in: serves cursors, records compiled writes."""
+
+    def __init__(self, cursors=()):
+        self.cursors = list(cursors)
+        self.writes: dict[str, list[dict]] = {}
+        self.commits = 0
+
+    async def execute(self, stmt):
+        from sqlalchemy.dialects import postgresql
+
+        if getattr(stmt, "is_select", False):
+            return _Result(self.cursors)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        rows: dict[str, dict] = {}
+        for key, value in params.items():
+            name, _, idx = key.rpartition("_m")
+            if not idx.isdigit():
+                name, idx = key, "0"
+            rows.setdefault(idx, {})[name] = value
+        kind = "delete" if stmt.is_delete else stmt.table.name
+        self.writes.setdefault(kind, []).extend(rows.values())
+        return _Result(range(len(rows)))
+
+    async def commit(self):
+        self.commits += 1
+
+
+class TestReadAppendedLines:
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        purge_mocked_db()
+        from sentiment_autoscorer import _read_appended_lines
+        self.read = _read_appended_lines
+
+    def test_reads_complete_lines_from_offset(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_bytes(b"one\ntwo\nthree\n")
+        assert self.read(str(path), 0, 1024) == ([b"one", b"two", b"three"], 14)
+        assert self.read(str(path), 4, 1024) == ([b"two", b"three"], 14)
+
+    def test_partial_trailing_line_is_left_for_next_cycle(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_bytes(b"one\ntw")
+        assert self.read(str(path), 0, 1024) == ([b"one"], 4)
+        assert self.read(str(path), 4, 1024) == ([], 4)
+        with open(path, "ab") as fh:
+            fh.write(b"o\n")
+        assert self.read(str(path), 4, 1024) == ([b"two"], 8)
+
+    def test_byte_budget_finishes_the_current_line(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_bytes(b"first line\nsecond\n")
+        assert self.read(str(path), 0, 3) == ([b"first line"], 11)
+
+
+class TestJsonlRow:
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        purge_mocked_db()
+        from sentiment_autoscorer import _jsonl_row
+        self.row = _jsonl_row
+
+    def test_user_message_becomes_row(self):
+        raw = _line("user", "  this   keeps breaking  ", timestamp="2026-01-02T03:04:05+00:00")
+        row = self.row(raw, SESSION_ID, "main")
+        assert row["content"] == "this keeps breaking"
+        assert (row["external_session_id"], row["agent_id"], row["role"]) == (SESSION_ID, "main", "user")
+        assert row["created_at"].isoformat() == "2026-01-02T03:04:05+00:00"
+
+    def test_nested_message_payload(self):
+        raw = (json.dumps({"message": {"role": "assistant", "content": [{"text": "happy to help"}]}}) + "\n").encode()
+        assert self.row(raw, SESSION_ID, "main")["content"] == "happy to help"
+
+    @pytest.mark.parametrize("raw", [
+        b"not json",
+        b"[1, 2]",
+        _line("tool", "tool output that is long enough"),
+        _line("user", "short"),
+        _line("user", "/status now"),
+    ])
+    def test_skipped_lines(self, raw):
+        assert self.row(raw, SESSION_ID, "main") is None
+
+
+class TestSyncJsonl:
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path, monkeypatch):
+        purge_mocked_db()
+        import sentiment_autoscorer
+        self.mod = sentiment_autoscorer
+        monkeypatch.setattr(sentiment_autoscorer, "ARIA_AGENTS_ROOT", str(tmp_path))
+        self.path = tmp_path / "main" / "sessions" / f"{SESSION_ID}.jsonl"
+        self.path.parent.mkdir(parents=True)
+
+    def _cursor(self, db: _FakeDB):
+        (update,) = db.writes["jsonl_sync_cursors"]
+        return SimpleNamespace(
+            path=update["path"], inode=update["inode"], byte_offset=update["byte_offset"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_first_sync_inserts_rows_and_saves_cursor(self):
+        self.path.write_bytes(
+            _line("user", "first message here")
+            + _line("assistant", "second message here")
+            + b'{"role": "user", "content": "half writ'
+        )
+        db = _FakeDB()
+        assert await self.mod._sync_jsonl(db) == 2
+        contents = [r["content"] for r in db.writes["session_messages"]]
+        assert contents == ["first message here", "second message here"]
+        cursor = self._cursor(db)
+        assert cursor.inode == os.stat(self.path).st_ino
+        assert cursor.byte_offset == self.path.read_bytes().rfind(b"\n") + 1
+        assert db.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_only_appended_lines_are_parsed(self):
+        self.path.write_bytes(_line("user", "first message here"))
+        db = _FakeDB()
+        await self.mod._sync_jsonl(db)
+        cursor = self._cursor(db)
+
+        idle = _FakeDB([cursor])
+        assert await self.mod._sync_jsonl(idle) == 0
+        assert idle.writes == {} and idle.commits == 0
+
+        with open(self.path, "ab") as fh:
+            fh.write(_line("assistant", "an appended reply"))
+        db = _FakeDB([cursor])
+        assert await self.mod._sync_jsonl(db) == 1
+        assert [r["content"] for r in db.writes["session_messages"]] == ["an appended reply"]
+        assert self._cursor(db).byte_offset == self.path.stat().st_size
+
+    @pytest.mark.asyncio
+    async def test_rotated_file_restarts_from_zero(self, tmp_path):
+        self.path.write_bytes(_line("user", "first message here"))
+        db = _FakeDB()
+        await self.mod._sync_jsonl(db)
+        cursor = self._cursor(db)
+
+        rotated = tmp_path / "rotated.jsonl"
+        rotated.write_bytes(_line("user", "after rotation one") + _line("user", "after rotation two"))
+        os.replace(rotated, self.path)  # new inode, larger than the old offset
+        db = _FakeDB([cursor])
+        assert await self.mod._sync_jsonl(db) == 2
+        assert self._cursor(db).inode == os.stat(self.path).st_ino
+
+    @pytest.mark.asyncio
+    async def test_truncated_file_restarts_from_zero(self):
+        self.path.write_bytes(_line("user", "first message here") + _line("user", "second message here"))
+        db = _FakeDB()
+        await self.mod._sync_jsonl(db)
+        cursor = self._cursor(db)
+
+        with open(self.path, "wb") as fh:  # same inode, shorter than the cursor
+            fh.write(_line("user", "fresh start"))
+        db = _FakeDB([cursor])
+        assert await self.mod._sync_jsonl(db) == 1
+        assert self._cursor(db).byte_offset == self.path.stat().st_size
+
+    @pytest.mark.asyncio
+    async def test_cursor_of_deleted_file_is_dropped(self):
+        gone = SimpleNamespace(path=str(self.path.parent / "old.jsonl"), inode=1, byte_offset=10)
+        db = _FakeDB([gone])
+        assert await self.mod._sync_jsonl(db) == 0
+        assert db.writes["delete"] == [{"path_1": [gone.path]}]
+        assert db.commits == 1
@@ -0,0 +1,125 @@
+"""
+Swarm convergence benchmarks.
+
+Runs SwarmOrchestrator.execute against a stub LLM gateway for 3 / 6 / 12
+agents and reports iterations-to-consensus, agent calls and total tokens
+(prompt ≈ len/4 tokens, fixed-size replies) for:
+- legacy: every agent re-polled every iteration, stop on the point
+  estimate, pheromone weights reloaded per iteration (what execute did
+  before adaptive polling) — it "converges" on a 2/3 split
+- fanout: every agent re-polled every iteration, stop on the consensus
+  lower bound (same answer as adaptive, no carried votes)
+- adaptive: weights loaded once, settled agents carry their vote forward,
+  stop when the consensus lower bound clears the threshold
+
+Agents in the stub start split and drift to "agree" after 0–2 polls;
+fanout vs adaptive is the cost of re-polling settled agents.
+
+Run:
+    pytest tests/test_swarm_benchmark.py -s
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src" / "api"))  # so 'from db.models import ...' works
+
+from tests.conftest import purge_mocked_aria_engine  # noqa: E402
+
+pytestmark = pytest.mark.slow
+
+AGENT_COUNTS = (3, 6, 12)
+REPLY_TOKENS = 60
+
+
+class _StubGateway:
+    """AgentPool stand-in: scripted votes, token counts from prompt size."""
+
+    def __init__(self, agent_ids: list[str]):
+        # agent i dissents for i % 3 polls, then agrees
+        self.scripts = {
+            aid: ["pivot"] * (i % 3) + ["agree"] for i, aid in enumerate(agent_ids)
+        }
+        self.polls: dict[str, int] = {aid: 0 for aid in agent_ids}
+
+    async def process_with_agent(self, agent_id, message, session_id):
+        input_tokens = len(message) // 4
+        if message.startswith("You are synthesizing"):
+            return {"content": "merged", "input_tokens": input_tokens, "output_tokens": 0}
+        script = self.scripts[agent_id]
+        vote = script[min(self.polls[agent_id], len(script) - 1)]
+        self.polls[agent_id] += 1
+        return {
+            "content": f"{agent_id} position. [VOTE: {vote}] [CONFIDENCE: 0.85]",
+            "input_tokens": input_tokens,
+            "output_tokens": REPLY_TOKENS,
+        }
+
+
+class _Router:
+    async def update_scores(self, **kwargs):
+        pass
+
+
+def _swarm(agent_ids: list[str], mode: str):
+    from aria_engine.swarm import SwarmOrchestrator
+
+    swarm = SwarmOrchestrator(None, _StubGateway(agent_ids), _Router())
+    swarm.weight_loads = 0
+
+    async def _noop(*args, **kwargs):
+        pass
+
+    async def _weights(ids):
+        swarm.weight_loads += 1
+        return {aid: 0.5 for aid in ids}
+
+    swarm._create_session = _noop
+    swarm._persist_message = _noop
+    swarm._persist_votes = _noop
+    swarm._get_pheromone_weights = _weights
+
+    if mode in ("legacy", "fanout"):
+        swarm._agents_to_poll = lambda agent_ids, *args: list(agent_ids)
+    if mode == "legacy":
+        interval_consensus = swarm._calculate_consensus
+
+        def _point_estimate(votes, weights=None):
+            score, _ = interval_consensus(votes, weights)
+            return score, score
+
+        swarm._calculate_consensus = _point_estimate
+    return swarm
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("agents", AGENT_COUNTS)
+async def test_swarm_convergence_benchmark(agents):
+    purge_mocked_aria_engine()
+    agent_ids = [f"agent-{i}" for i in range(agents)]
+
+    results = {}
+    for mode in ("legacy", "fanout", "adaptive"):
+        swarm = _swarm(agent_ids, mode)
+        result = await swarm.execute("Should we shard the queue?", agent_ids, max_iterations=6)
+        if mode == "legacy":
+            # legacy reloaded weights every iteration and once more for synthesis
+            swarm.weight_loads = result.iterations + 1
+        results[mode] = (result, swarm.weight_loads)
+
+    for mode, (r, loads) in results.items():
+        print(
+            f"\n[swarm bench] {agents:>2} agents {mode:>8}: {r.iterations} iterations, "
+            f"{r.agent_calls:>3} calls, {r.total_tokens:>6} tokens, "
+            f"{loads} weight loads, converged={r.converged}"
+        )
+
+    fanout, adaptive = results["fanout"][0], results["adaptive"][0]
+    assert adaptive.converged and fanout.converged
+    assert adaptive.iterations == fanout.iterations
+    assert results["adaptive"][1] == 1
+    assert adaptive.agent_calls < fanout.agent_calls
+    assert adaptive.total_tokens < fanout.total_tokens
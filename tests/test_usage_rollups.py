@@ -0,0 +1,294 @@
+"""
+Unit tests for the dashboard usage rollups (src/api/usage_rollups.py).
+
+Covers: plan_segments at hour / day boundaries, refresh_source watermark
+advancement, full rebuilds and the per-source worker lock, and
+aggregate() merging raw edge segments with hourly and daily rollups
+(fake AsyncSession, no database).
+"""
+from __future__ import annotations
+
+import dataclasses
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from tests.conftest import purge_mocked_db
+
+# Ensure src/api is importable
+_api_dir = str(Path(__file__).resolve().parent.parent / "src" / "api")
+if _api_dir not in sys.path:
+    sys.path.insert(0, _api_dir)
+
+H = timedelta(hours=1)
+D = timedelta(days=1)
+DAY0 = datetime(2026, 3, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def rollups():
+    purge_mocked_db()
+    import usage_rollups
+    return usage_rollups
+
+
+class TestPlanSegments:
+    def test_no_watermark_reads_raw(self, rollups):
+        end = DAY0 + 5 * H
+        assert rollups.plan_segments(DAY0, end, None) == [("raw", DAY0, end)]
+
+    def test_partial_leading_and_trailing_hours(self, rollups):
+        start = DAY0 + 10 * H + timedelta(minutes=20)
+        end = DAY0 + 3 * D + 5 * H + timedelta(minutes=40)
+        assert rollups.plan_segments(start, end, watermark=DAY0 + 3 * D + 5 * H) == [
+            ("raw", start, DAY0 + 11 * H),
+            ("hour", DAY0 + 11 * H, DAY0 + D),
+            ("day", DAY0 + D, DAY0 + 3 * D),
+            ("hour", DAY0 + 3 * D, DAY0 + 3 * D + 5 * H),
+            ("raw", DAY0 + 3 * D + 5 * H, end),
+        ]
+
+    def test_day_aligned_window_is_all_daily(self, rollups):
+        end = DAY0 + 2 * D
+        assert rollups.plan_segments(DAY0, end, watermark=end + 3 * H) == [
+            ("day", DAY0, end),
+        ]
+
+    def test_rollups_stop_at_watermark(self, rollups):
+        end = DAY0 + 20 * H
+        assert rollups.plan_segments(DAY0 + 2 * H, end, watermark=DAY0 + 6 * H) == [
+            ("hour", DAY0 + 2 * H, DAY0 + 6 * H),
+            ("raw", DAY0 + 6 * H, end),
+        ]
+
+    def test_window_inside_one_hour_is_raw(self, rollups):
+        start, end = DAY0 + timedelta(minutes=5), DAY0 + timedelta(minutes=50)
+        assert rollups.plan_segments(start, end, watermark=DAY0 + 2 * H) == [("raw", start, end)]
+
+    def test_hourly_grouping_skips_daily(self, rollups):
+        end = DAY0 + 2 * D
+        assert rollups.plan_segments(DAY0, end, watermark=end, allow_daily=False) == [
+            ("hour", DAY0, end),
+        ]
+
+    def test_all_time_and_pruned_hours(self, rollups):
+        end = DAY0 + 2 * D + 3 * H
+        assert rollups.plan_segments(
+            None, end, watermark=end, allow_daily=False, hourly_since=DAY0,
+        ) == [("raw", None, DAY0), ("hour", DAY0, end)]
+        assert rollups.plan_segments(None, end, watermark=end) == [
+            ("day", None, DAY0 + 2 * D),
+            ("hour", DAY0 + 2 * D, end),
+        ]
+
+
+class _Result:
+    def __init__(self, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def scalar(self):
+        return self._scalar
+
+    def all(self):
+        return list(self._rows)
+
+
+class TestRefreshSource:
+    @pytest.fixture(autouse=True)
+    def _setup(self, rollups, monkeypatch):
+        self.mod = rollups
+        self.source = rollups.SOURCES["skills"]
+        self.ranges: list[tuple[str, datetime, datetime]] = []
+
+        async def hours(db, source, start, end):
+            self.ranges.append(("hour", start, end))
+            db.buckets.add(start)
+
+        async def days(db, source, start, end):
+            self.ranges.append(("day", start, end))
+
+        monkeypatch.setattr(rollups, "_rollup_hours", hours)
+        monkeypatch.setattr(rollups, "_rollup_days", days)
+
+    def _db(self, rolled_until=None, oldest=None):
+        from sqlalchemy.dialects import postgresql
+
+        db = SimpleNamespace(watermarks=[], commits=0, buckets=set(), rollup_deletes=0)
+
+        async def get(model, key):
+            return SimpleNamespace(rolled_until=rolled_until) if rolled_until else None
+
+        async def execute(stmt):
+            if getattr(stmt, "is_insert", False):
+                params = stmt.compile(dialect=postgresql.dialect()).params
+                db.watermarks.append(params["rolled_until"])
+            elif getattr(stmt, "is_delete", False) and stmt.table.name == "usage_rollups":
+                db.rollup_deletes += 1
+                db.buckets.clear()
+            elif "pg_try_advisory_xact_lock" in str(stmt):
+                return _Result(scalar=db.lock_granted)
+            return _Result(scalar=db.oldest)
+
+        async def commit():
+            db.commits += 1
+
+        async def rollback():
+            db.rollbacks += 1
+
+        db.get, db.execute, db.commit, db.rollback = get, execute, commit, rollback
+        db.oldest, db.lock_granted, db.rollbacks = oldest, True, 0
+        return db
+
+    @pytest.mark.asyncio
+    async def test_first_run_backfills_in_steps(self):
+        now = DAY0 + 20 * D + 30 * timedelta(minutes=1)
+        oldest = DAY0 + 2 * H + timedelta(minutes=7)
+        db = self._db(oldest=oldest)
+        assert await self.mod.refresh_source(db, self.source, now) is False
+        step_end = DAY0 + 2 * H + self.mod.BACKFILL_STEP
+        assert self.ranges == [
+            ("hour", DAY0 + 2 * H, step_end),
+            ("day", DAY0, DAY0 + 8 * D),
+        ]
+        assert db.watermarks == [step_end] and db.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_rebuild_after_purging_oldest_rows_drops_their_buckets(self):
+        now = DAY0 + 5 * D
+        db = self._db(oldest=DAY0 + 3 * H)
+        assert await self.mod.refresh_source(db, self.source, now) is True
+        assert min(db.buckets) == DAY0 + 3 * H
+
+        # purge_test_invocations removed the oldest rows, then invalidate()
+        db.oldest = DAY0 + 2 * D + 6 * H
+        assert await self.mod.refresh_source(db, self.source, now) is True
+        assert db.rollup_deletes == 2  # every rebuild starts from an empty table
+        assert db.buckets == {DAY0 + 2 * D + 6 * H}  # nothing left from the purged rows
+
+    @pytest.mark.asyncio
+    async def test_source_locked_by_another_worker_is_skipped(self):
+        db = self._db(oldest=DAY0)
+        db.lock_granted = False
+        assert await self.mod.refresh_source(db, self.source, DAY0 + 5 * D) is True
+        assert self.ranges == [] and db.watermarks == [] and db.rollup_deletes == 0
+        assert (db.commits, db.rollbacks) == (0, 1)
+
+    @pytest.mark.asyncio
+    async def test_caught_up_run_recovers_trailing_hours(self):
+        now = DAY0 + 9 * H + timedelta(minutes=12)
+        db = self._db(rolled_until=DAY0 + 8 * H)
+        assert await self.mod.refresh_source(db, self.source, now) is True
+        assert self.ranges[0] == ("hour", DAY0 + 5 * H, DAY0 + 9 * H)
+        assert db.watermarks == [DAY0 + 9 * H]
+
+    @pytest.mark.asyncio
+    async def test_empty_source_sets_watermark_without_rolling(self):
+        now = DAY0 + 4 * H + timedelta(minutes=1)
+        db = self._db(oldest=None)
+        assert await self.mod.refresh_source(db, self.source, now) is True
+        assert self.ranges == []
+        assert db.watermarks == [DAY0 + 4 * H]
+
+
+class TestAggregate:
+    @pytest.fixture(autouse=True)
+    def _setup(self, rollups, monkeypatch):
+        self.mod = rollups
+        # Raw-row test filter lives in the model-usage router; not needed here
+        monkeypatch.setitem(
+            rollups.SOURCES, "model_usage",
+            dataclasses.replace(rollups.SOURCES["model_usage"], where=None),
+        )
+
+    def _db(self, watermark, rows_by_kind):
+        queried: list[str] = []
+
+        async def execute(stmt):
+            tables = {getattr(t, "name", "join") for t in stmt.get_final_froms()}
+            if tables == {"rollup_state"}:
+                return _Result(scalar=watermark)
+            if "usage_rollups" in tables:
+                kind = "day" if "day" in stmt.compile().params.values() else "hour"
+            else:
+                kind = "raw"
+            queried.append(kind)
+            return _Result(rows_by_kind.get(kind, []))
+
+        return SimpleNamespace(execute=execute, queried=queried)
+
+    @pytest.mark.asyncio
+    async def test_merges_raw_edges_with_rollups(self):
+        start = DAY0 + 22 * H + timedelta(minutes=30)
+        end = DAY0 + 2 * D + 1 * H + timedelta(minutes=15)
+        # model, cache_hit, events, successes, failures, in, out, tokens, cost, dur_sum, dur_count
+        rows = {
+            "raw": [("gpt", "0", 1, 1, 0, 10, 5, 15, Decimal("0.01"), 100, 1)],
+            "hour": [
+                ("gpt", "0", Decimal(2), Decimal(2), Decimal(0), Decimal(20), Decimal(10),
+                 Decimal(30), Decimal("0.02"), Decimal(300), Decimal(2)),
+                ("gpt", "1", Decimal(3), Decimal(3), Decimal(0), Decimal(30), Decimal(15),
+                 Decimal(45), Decimal(0), Decimal(30), Decimal(3)),
+            ],
+            "day": [
+                ("gpt", "1", Decimal(4), Decimal(4), Decimal(0), Decimal(40), Decimal(20),
+                 Decimal(60), Decimal(0), Decimal(40), Decimal(4)),
+                ("idle", "0", Decimal(0), Decimal(0), Decimal(0), Decimal(0), Decimal(0),
+                 Decimal(0), Decimal(0), Decimal(0), Decimal(0)),
+            ],
+        }
+        db = self._db(DAY0 + 2 * D + H, rows)
+        result = await self.mod.aggregate(
+            db, "model_usage", start, end, group_by=("model", "cache_hit"),
+        )
+        # raw head, hour, day, hour, raw tail
+        assert db.queried == ["raw", "hour", "day", "hour", "raw"]
+
+        cached, fresh = result  # ordered by events; the all-zero row is dropped
+        assert (cached["model"], cached["cache_hit"]) == ("gpt", "1")
+        assert cached["events"] == 3 * 2 + 4 and cached["cost_usd"] == 0
+        assert (fresh["model"], fresh["cache_hit"]) == ("gpt", "0")
+        assert fresh["events"] == 1 * 2 + 2 * 2
+        assert fresh["cost_usd"] == pytest.approx(0.01 * 2 + 0.02 * 2)
+        assert isinstance(fresh["tokens"], int)
+        assert self.mod.avg_duration(fresh) == pytest.approx((100 * 2 + 300 * 2) / 6)
+
+    @pytest.mark.asyncio
+    async def test_without_watermark_reads_raw_only(self):
+        db = self._db(None, {"raw": [("gpt", "1", 2, 2, 0, 1, 1, 2, 0, 0, 0)]})
+        result = await self.mod.aggregate(
+            db, "model_usage", DAY0, DAY0 + D, group_by=("model", "cache_hit"),
+        )
+        assert db.queried == ["raw"]
+        assert result == [{
+            "model": "gpt", "cache_hit": "1", "events": 2, "successes": 2, "failures": 0,
+            "input_tokens": 1, "output_tokens": 1, "tokens": 2, "cost_usd": 0,
+            "duration_ms_sum": 0, "duration_ms_count": 0,
+        }]
+
+    @pytest.mark.asyncio
+    async def test_joined_source_groups_by_session_agent(self):
+        from sqlalchemy.dialects import postgresql
+
+        statements = []
+        db = self._db(None, {"raw": [("main", 3, 2, 1, 40, 250, 2)]})
+        execute = db.execute
+
+        async def capture(stmt):
+            statements.append(stmt)
+            return await execute(stmt)
+
+        db.execute = capture
+        result = await self.mod.aggregate(
+            db, "agent_messages", None, group_by=("agent_id",),
+            filters={"agent_id": lambda col: col == "main"},
+        )
+        sql = str(statements[-1].compile(dialect=postgresql.dialect()))
+        assert "JOIN aria_engine.chat_sessions" in sql
+        assert "chat_sessions.agent_id = " in sql
+        assert result[0]["agent_id"] == "main" and result[0]["failures"] == 1
+        assert self.mod.avg_duration(result[0]) == 125
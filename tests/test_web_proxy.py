@@ -0,0 +1,87 @@
+"""
+Unit tests for the dashboard's /api/* reverse proxy (src/web/app.py).
+
+Covers: cached small GET bodies and oversized GET bodies that must be
+streamed whole (fake upstream session, Flask test client).
+"""
+from __future__ import annotations
+
+import importlib.util
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+_APP_PATH = Path(__file__).resolve().parent.parent / "src" / "web" / "app.py"
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes):
+        self.status_code = 200
+        self.headers = {"Content-Type": "application/json", "Content-Length": str(len(body))}
+        self.raw = self
+        self._body = io.BytesIO(body)
+        self.closed = False
+
+    def read(self, amt, decode_content=True):
+        return self._body.read(amt)
+
+    def stream(self, chunk_size, decode_content=True):
+        while chunk := self._body.read(chunk_size):
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeSession:
+    def __init__(self):
+        self.body = b""
+        self.calls = 0
+        self.responses: list[_FakeResponse] = []
+
+    def request(self, **kwargs):
+        self.calls += 1
+        resp = _FakeResponse(self.body)
+        self.responses.append(resp)
+        return resp
+
+
+@pytest.fixture
+def proxy(monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "test")
+    monkeypatch.setenv("SERVICE_HOST", "localhost")
+    monkeypatch.setenv("API_BASE_URL", "/api")
+    monkeypatch.setenv("API_PROXY_CACHE_TTL", "30")
+    spec = importlib.util.spec_from_file_location("aria_web_app", _APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "aria_web_app", module)
+    spec.loader.exec_module(module)
+
+    session = _FakeSession()
+    monkeypatch.setattr(module, "_proxy_session", lambda pool_size: session)
+    client = module.create_app().test_client()
+    return client, session, module._PROXY_CACHE_MAX_BODY
+
+
+class TestApiProxyCache:
+    def test_small_get_is_cached(self, proxy):
+        client, session, _ = proxy
+        session.body = b'{"ok": true}'
+        for _ in range(2):
+            r = client.get("/api/stats")
+            assert r.status_code == 200
+            assert r.data == session.body
+        assert session.calls == 1
+
+    def test_oversized_get_streams_whole_body_uncached(self, proxy):
+        client, session, max_body = proxy
+        session.body = bytes(range(256)) * (max_body // 256 + 1000)
+        for _ in range(2):
+            r = client.get("/api/stats")
+            assert r.status_code == 200
+            assert r.data == session.body
+            assert int(r.headers["Content-Length"]) == len(session.body)
+        assert session.calls == 2  # not served from the cache
+        assert all(resp.closed for resp in session.responses)